@@ -23,11 +23,14 @@ API_KEY = env('API_KEY')
 NAVER_CLIENT_ID = env("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = env("NAVER_CLIENT_SECRET")
 GMS_KEY = env("GMS_KEY")
+GMS_API_URL = env("GMS_API_URL", default="https://gms.ssafy.io/gmsapi/api.openai.com/v1/chat/completions")
 SECRET_KEY = env("DJANGO_SECRET_KEY")
 KAKAO_MOBILITY_REST_KEY = env("KAKAO_MOBILITY_REST_KEY")
 YOUTUBE_API_KEY = env("YOUTUBE_API_KEY")
 STOCK_PRICE_API_KEY = env("STOCK_PRICE_API_KEY")
 STOCK_PRICE_API_URL='https://apis.data.go.kr/1160100/service/GetStockSecuritiesInfoService/getStockPriceInfo'
+# runserver 시작 시 비어 있는 예/적금 데이터를 백그라운드로 동기화 (기본은 sync_fss_products 명령으로 직접)
+FINANCES_SYNC_ON_STARTUP = env.bool("FINANCES_SYNC_ON_STARTUP", default=False)
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
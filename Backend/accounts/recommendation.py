@@ -0,0 +1,562 @@
+# accounts/recommendation.py
+"""
+예금/적금 맞춤 추천 서비스 (recommend_products API, 챗봇 PRODUCT 의도 공용)
+- recommend_products_for_profile(profile): API 응답과 같은 dict (HTTP 요청 없이 호출)
+- 추천 결과는 profile_bucket(결과에 영향을 주는 입력만 정규화) + 카탈로그 버전으로 프로세스 LRU에 캐시
+  · 나이는 카탈로그 가입 나이 경계값 사이 구간으로, 투자 목표는 예금/적금 비율 결과로 묶음
+  · 상품 동기화로 카탈로그가 바뀌면 버전이 달라져 예전 항목은 자연히 안 쓰임
+- 'profile' / 'recommendation_reason'(프로필 원문 포함)은 캐시하지 않고 매번 생성
+- 캐시된 dict는 여러 요청이 공유하므로 호출 쪽에서 수정하지 말 것
+"""
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from finances.catalog import (
+    catalog_state,
+    ensure_product_catalog,
+    evaluate_condition_complexity as _evaluate_condition_complexity,
+    evaluate_join_convenience as _evaluate_join_convenience,
+    parse_join_member,
+)
+from finances.interest import deposit_interest, installment_interest
+from finances.models import ProductCatalog
+
+from .models import RISK_TYPE_MAPPING
+
+
+RECO_CACHE_SIZE = 512
+MONTHLY_DEPOSIT = 100  # 적금 월 납입액 (100만원)
+
+
+def _is_eligible_for_product(join_member, user_gender, user_age):
+    """
+    사용자가 상품 가입 대상인지 확인
+
+    Args:
+        join_member: 상품의 가입 대상 (예: "만18세이상 여성고객")
+        user_gender: 사용자 성별 ('M' or 'F')
+        user_age: 사용자 나이
+
+    Returns:
+        bool: 가입 가능 여부
+    """
+    return ProductCatalog(**parse_join_member(join_member)).is_eligible(user_gender, user_age)
+
+
+def _calculate_risk_adjusted_score(profile, product, option, condition_complexity=None, join_convenience=None):
+    """
+    투자 성향에 따른 가중치 적용 점수 계산
+
+    안정형 (timid_male, timid_female):
+    - 기본금리(intr_rate) 가중치 높음 (70%)
+    - 우대조건 간단할수록 가산점
+    - 가입 편의성 중요
+
+    중립형 (normal_male, normal_female):
+    - 기본금리 + 우대금리 균형 (50% / 50%)
+    - 모든 요소 균형있게 평가
+
+    공격형 (speculative_male, speculative_female):
+    - 최고금리(intr_rate2) 가중치 높음 (70%)
+    - 우대조건 복잡해도 OK
+    - 가입 편의성 덜 중요
+
+    Args:
+        profile: InvestmentProfile 객체
+        product: DepositProducts or SavingProducts (or ProductCatalog) 객체
+        option: DepositOptions or SavingOptions 객체 (save_trm/intr_rate/intr_rate2 속성)
+        condition_complexity, join_convenience: 카탈로그에 미리 계산된 값 (없으면 여기서 계산)
+
+    Returns:
+        float: 위험 조정 점수 (0~100)
+    """
+    base_score = 0
+    risk_type = profile.risk_type
+
+    # risk_type을 일반 카테고리로 매핑
+    if 'timid' in risk_type:
+        risk_category = 'conservative'
+    elif 'speculative' in risk_type:
+        risk_category = 'aggressive'
+    else:  # 'normal' in risk_type
+        risk_category = 'moderate'
+
+    # 기본금리와 우대금리
+    basic_rate = float(option.intr_rate) if option.intr_rate else 0
+    max_rate = float(option.intr_rate2) if option.intr_rate2 else 0
+
+    # 1. 금리 점수 (투자 성향별 가중치) - 최대 50점
+    if risk_category == 'conservative':  # 안정형
+        # 기본금리 70% + 우대금리 30%
+        weighted_rate = (basic_rate * 0.7 + max_rate * 0.3)
+        rate_score = weighted_rate * 10
+    elif risk_category == 'aggressive':  # 공격형
+        # 기본금리 30% + 우대금리 70%
+        weighted_rate = (basic_rate * 0.3 + max_rate * 0.7)
+        rate_score = weighted_rate * 10
+    else:  # 중립형 (moderate)
+        # 기본금리 50% + 우대금리 50%
+        weighted_rate = (basic_rate * 0.5 + max_rate * 0.5)
+        rate_score = weighted_rate * 10
+
+    base_score += min(rate_score, 50)
+
+    # 2. 우대조건 복잡도 평가 - 최대 20점
+    if condition_complexity is None:
+        condition_complexity = _evaluate_condition_complexity(product.spcl_cnd)
+
+    if risk_category == 'conservative':
+        # 안정형: 조건 간단할수록 선호
+        if condition_complexity == 'low':
+            base_score += 20  # 조건 1~2개
+        elif condition_complexity == 'medium':
+            base_score += 10  # 조건 3~4개
+        else:
+            base_score += 0   # 조건 5개 이상 (가산점 없음)
+
+    elif risk_category == 'aggressive':
+        # 공격형: 조건 많아도 OK (높은 금리 가능성)
+        if condition_complexity == 'high':
+            base_score += 15  # 복잡한 조건 = 높은 금리 가능
+        elif condition_complexity == 'medium':
+            base_score += 10
+        else:
+            base_score += 5
+
+    else:  # 중립형
+        # 균형: 적당한 조건 선호
+        if condition_complexity == 'medium':
+            base_score += 15
+        else:
+            base_score += 8
+
+    # 3. 가입 방법 편의성 - 최대 15점
+    convenience_score = join_convenience
+    if convenience_score is None:
+        convenience_score = _evaluate_join_convenience(product.join_way)
+
+    if risk_category == 'conservative':
+        # 안정형: 편의성 매우 중요
+        base_score += convenience_score * 1.5
+    elif risk_category == 'aggressive':
+        # 공격형: 편의성 덜 중요
+        base_score += convenience_score * 0.8
+    else:
+        # 중립형: 보통 중요
+        base_score += convenience_score
+
+    # 4. 투자 기간 일치도 - 최대 15점
+    if profile.investment_period and option.save_trm:
+        period_diff = abs(profile.investment_period - option.save_trm)
+        if period_diff == 0:
+            period_score = 15
+        elif period_diff <= 3:
+            period_score = 12
+        elif period_diff <= 6:
+            period_score = 8
+        elif period_diff <= 12:
+            period_score = 4
+        else:
+            period_score = 0
+
+        base_score += period_score
+    else:
+        base_score += 7  # 기본 점수
+
+    return min(base_score, 100)
+
+
+def _calculate_product_ratio(savings_amount, investment_period, investment_goal):
+    """
+    복합 조건 기반 예금/적금 추천 비율 계산
+
+    Args:
+        savings_amount: 현재 저축액 (만원)
+        investment_period: 투자 기간 (개월)
+        investment_goal: 투자 목표
+
+    Returns:
+        (deposit_count, saving_count): 예금 개수, 적금 개수
+    """
+    deposit_score = 0
+    saving_score = 0
+
+    # 1. 저축액 기반 점수 (0~40점)
+    if savings_amount >= 5000:  # 5,000만원 이상
+        deposit_score += 40  # 목돈 있음 → 예금 강력 선호
+        saving_score += 10
+    elif savings_amount >= 3000:  # 3,000~5,000만원
+        deposit_score += 30  # 예금 선호
+        saving_score += 20
+    elif savings_amount >= 1000:  # 1,000~3,000만원
+        deposit_score += 20  # 균형
+        saving_score += 30
+    else:  # 1,000만원 미만
+        deposit_score += 10  # 적금으로 모으기
+        saving_score += 40
+
+    # 2. 투자 기간 기반 점수 (0~40점)
+    if investment_period <= 6:  # 6개월 이하
+        deposit_score += 40  # 단기 → 예금 (즉시 인출)
+        saving_score += 10
+    elif investment_period <= 12:  # 6~12개월
+        deposit_score += 30  # 예금 선호
+        saving_score += 20
+    elif investment_period <= 24:  # 12~24개월
+        deposit_score += 20  # 균형
+        saving_score += 30
+    else:  # 24개월 이상
+        deposit_score += 10  # 장기 → 적금 (꾸준히 모으기)
+        saving_score += 40
+
+    # 3. 투자 목표 기반 점수 (0~20점)
+    goal_lower = investment_goal.lower()
+    if any(keyword in goal_lower for keyword in ['단기', '비상금', '생활비']):
+        deposit_score += 20  # 단기 목표 → 예금
+        saving_score += 5
+    elif any(keyword in goal_lower for keyword in ['장기', '노후', '은퇴']):
+        deposit_score += 5   # 장기 목표 → 적금
+        saving_score += 20
+    elif any(keyword in goal_lower for keyword in ['주택', '결혼', '자녀', '교육']):
+        deposit_score += 10  # 중대 목표 → 균형
+        saving_score += 15
+    else:
+        deposit_score += 10  # 기본값 → 균형
+        saving_score += 10
+
+    # 4. 점수 기반 비율 계산 (총 15개)
+    total_score = deposit_score + saving_score
+    deposit_ratio = deposit_score / total_score
+    saving_ratio = saving_score / total_score
+
+    # 최소 각 2개는 보장, 최대 13개까지
+    deposit_count = max(2, min(13, int(15 * deposit_ratio)))
+    saving_count = 15 - deposit_count
+
+    return deposit_count, saving_count
+
+
+def generate_investment_plan(profile, recommendations):
+    """
+    투자 계획 생성
+
+    투자 가능 기간과 성향을 고려하여 단계별 투자 계획 제안
+    """
+    investment_period = profile.investment_period or 12
+    risk_data = RISK_TYPE_MAPPING[profile.risk_type]
+
+    plan = {
+        'total_period_months': investment_period,
+        'risk_level': risk_data['name'],
+        'strategy': '',
+        'steps': [],
+        'tips': []
+    }
+
+    # 성향별 전략
+    if 'timid' in profile.risk_type:
+        plan['strategy'] = '안정성을 최우선으로 하는 보수적 투자 전략입니다. 원금 보장 상품 중심으로 단기~중기 분산 투자를 권장합니다.'
+        plan['tips'] = [
+            '3개월, 6개월, 12개월 단위로 분산하여 유동성 확보',
+            '금리가 높은 예금 상품 위주로 선택',
+            '만기 시 재투자하여 복리 효과 극대화',
+            '은행별 예금자 보호 한도(5천만원) 고려하여 분산'
+        ]
+    elif 'normal' in profile.risk_type:
+        plan['strategy'] = '안정성과 수익성의 균형을 추구하는 전략입니다. 중기 예금과 일부 변동금리 상품을 혼합하여 포트폴리오를 구성합니다.'
+        plan['tips'] = [
+            '12개월, 24개월 단위로 분산 투자',
+            '고금리 예금 50% + 적금 30% + 유동성자금 20%',
+            '우대조건 활용하여 금리 극대화',
+            '정기적으로 시장 금리 확인 후 재조정'
+        ]
+    else:  # speculative
+        plan['strategy'] = '적극적인 수익 추구 전략입니다. 장기 고금리 상품과 변동금리 상품을 활용하여 높은 수익을 목표로 합니다.'
+        plan['tips'] = [
+            '24개월, 36개월 장기 상품으로 고금리 확보',
+            '일부 자금은 주식형 펀드나 ETF로 분산',
+            '금리 상승기에는 단기 상품, 하락기에는 장기 상품',
+            '세제 혜택 상품(ISA, IRP 등) 적극 활용'
+        ]
+
+    # 투자 기간에 따른 단계별 계획
+    if investment_period <= 12:
+        # 단기 (1년 이내)
+        plan['steps'].append({
+            'period': '즉시~3개월',
+            'action': '단기 고금리 예금 가입',
+            'description': '유동성 확보를 위한 3~6개월 예금 중심'
+        })
+        plan['steps'].append({
+            'period': '3개월~12개월',
+            'action': '중기 예금 전환',
+            'description': '만기 도래 시 12개월 예금으로 재투자'
+        })
+    elif investment_period <= 24:
+        # 중기 (1~2년)
+        plan['steps'].append({
+            'period': '즉시~6개월',
+            'action': '6개월 예금 50% + 12개월 예금 50%',
+            'description': '분산 투자로 유동성과 수익성 균형'
+        })
+        plan['steps'].append({
+            'period': '6개월~18개월',
+            'action': '12개월 예금 집중',
+            'description': '안정적인 중기 상품으로 포트폴리오 전환'
+        })
+        plan['steps'].append({
+            'period': '18개월~24개월',
+            'action': '목표 달성 및 재투자',
+            'description': '만기 시 재평가 후 장기 상품 검토'
+        })
+    else:
+        # 장기 (2년 이상)
+        plan['steps'].append({
+            'period': '즉시~12개월',
+            'action': '12개월 예금 30% + 24개월 예금 40% + 적금 30%',
+            'description': '장기 투자 기반 마련'
+        })
+        plan['steps'].append({
+            'period': '12개월~24개월',
+            'action': '만기 자금 36개월 예금 전환',
+            'description': '고금리 장기 상품으로 재투자'
+        })
+        plan['steps'].append({
+            'period': '24개월 이후',
+            'action': '포트폴리오 재조정',
+            'description': '시장 상황에 따라 예금/적금/투자 비율 조정'
+        })
+
+    return plan
+
+
+def build_product_recommendations(profile) -> Dict[str, Any]:
+    """
+    프로필 → 추천 본문 (profile / recommendation_reason 제외한 나머지 응답 필드)
+
+    개선된 추천 로직 (finances.ProductCatalog 한 번 조회 + 메모리 점수 계산):
+    1. 성별/나이 필터링 - 부적합 상품 제외
+    2. 최고 금리순 정렬
+    3. 예금 + 적금 모두 포함
+    4. 예상 수익 계산
+    5. 투자 기간 매칭
+    """
+    user_gender = profile.gender
+    user_age = profile.age
+    user_period = profile.investment_period
+
+    # 기본 투자금 (프로필에 저축액이 있으면 사용, 없으면 1000만원 가정)
+    principal_amount = int(profile.savings) if profile.savings else 1000
+    monthly_deposit = MONTHLY_DEPOSIT
+
+    # ===== 예금/적금 후보: 미리 계산된 카탈로그 한 번 조회 (타입, 최고 금리 내림차순) =====
+    catalog = list(ProductCatalog.objects.filter(max_rate__isnull=False))
+    if not catalog and ensure_product_catalog():
+        catalog = list(ProductCatalog.objects.filter(max_rate__isnull=False))
+
+    deposit_recommendations = []
+    saving_recommendations = []
+    for item in catalog:
+        # 성별/나이 필터링 (파싱된 컬럼 비교)
+        if not item.is_eligible(user_gender, user_age):
+            continue
+
+        # 투자 기간 매칭 (±6개월 범위), 없으면 최고 금리 옵션 사용
+        picked = item.pick_option(user_period)
+        if not picked:
+            continue
+        matching_option = SimpleNamespace(**picked)
+
+        # 예상 수익 계산 (예금: 단리 / 적금: 옵션 금리 유형(단리/월복리)별 닫힌 식, finances.interest)
+        rate = float(matching_option.intr_rate2) if matching_option.intr_rate2 else 0
+        if item.product_type == 'deposit':
+            expected_profit = int(deposit_interest(principal_amount, matching_option.save_trm, rate))
+        else:
+            expected_profit = int(installment_interest(
+                monthly_deposit, matching_option.save_trm, rate,
+                rate_type=getattr(matching_option, 'intr_rate_type', None),
+                rsrv_type=getattr(matching_option, 'rsrv_type', None),
+            ))
+
+        # 투자 성향 기반 가중치 점수 계산
+        risk_adjusted_score = _calculate_risk_adjusted_score(
+            profile, item, matching_option,
+            condition_complexity=item.condition_complexity,
+            join_convenience=item.join_convenience,
+        )
+
+        recommendations = deposit_recommendations if item.product_type == 'deposit' else saving_recommendations
+        recommendations.append({
+            'type': item.product_type,
+            'product': {
+                'fin_prdt_cd': item.fin_prdt_cd,
+                'kor_co_nm': item.kor_co_nm,
+                'fin_prdt_nm': item.fin_prdt_nm,
+                'join_way': item.join_way,
+                'join_member': item.join_member,
+                'spcl_cnd': item.spcl_cnd,
+            },
+            'option': {
+                'save_trm': matching_option.save_trm,
+                'intr_rate': float(matching_option.intr_rate) if matching_option.intr_rate else 0,
+                'intr_rate2': rate,
+            },
+            'expected_profit': expected_profit,
+            'max_rate': rate,
+            'risk_adjusted_score': risk_adjusted_score,  # 가중치 점수 추가
+        })
+
+    # ===== 복합 조건 기반 예금/적금 비율 결정 =====
+    deposit_count, saving_count = _calculate_product_ratio(
+        savings_amount=int(profile.savings) if profile.savings else 0,
+        investment_period=user_period or 12,
+        investment_goal=profile.investment_goal or ""
+    )
+
+    # 예금 + 적금 합치기 (비율에 맞게)
+    # 1. 각각 금리순으로 정렬되어 있음
+    # 2. 지정된 개수만큼 가져오기
+    selected_deposits = deposit_recommendations[:deposit_count]
+    selected_savings = saving_recommendations[:saving_count]
+
+    # 3. 합치기
+    all_recommendations = selected_deposits + selected_savings
+
+    # 4. 투자 성향 기반 가중치 점수로 정렬 (예금+적금 혼합하여 최적 상품 우선)
+    all_recommendations.sort(key=lambda x: x['risk_adjusted_score'], reverse=True)
+
+    # 투자 계획 생성 (기존 함수 호환을 위해 변환)
+    legacy_format_recommendations = []
+    for rec in all_recommendations:
+        legacy_format_recommendations.append({
+            'product': rec['product'],
+            'option': rec['option'],
+            'match_score': rec['risk_adjusted_score'],  # 투자 성향 기반 가중치 점수
+            'reason': f"최고 금리 {rec['max_rate']}%로 {rec['expected_profit']}만원의 수익이 예상됩니다.",
+        })
+
+    investment_plan = generate_investment_plan(profile, legacy_format_recommendations)
+
+    return {
+        'recommendations': all_recommendations,  # 비율에 맞춘 추천 (15개)
+        'investment_plan': investment_plan,
+        'total_count': len(all_recommendations),
+        'total_deposits_available': len(deposit_recommendations),
+        'total_savings_available': len(saving_recommendations),
+        'recommended_deposit_count': deposit_count,  # 실제 추천된 예금 개수
+        'recommended_saving_count': saving_count,    # 실제 추천된 적금 개수
+    }
+
+
+def _profile_section(profile) -> Dict[str, Any]:
+    return {
+        'risk_type': profile.risk_type,
+        'risk_type_name': RISK_TYPE_MAPPING[profile.risk_type]['name'],
+        'risk_score': profile.risk_score,
+        'gender': profile.gender,
+        'gender_display': profile.get_gender_display(),
+        'age': profile.age,
+        'income': float(profile.income) if profile.income else 0,
+        'savings': float(profile.savings) if profile.savings else 0,
+        'investment_goal': profile.investment_goal,
+        'investment_period': profile.investment_period,
+    }
+
+
+def _recommendation_reason(profile, deposit_count, saving_count) -> str:
+    return (
+        f"저축액 {int(profile.savings) if profile.savings else 0}만원, "
+        f"투자기간 {profile.investment_period or 12}개월, "
+        f"투자목표 '{profile.investment_goal or '미설정'}'를 고려하여 "
+        f"예금 {deposit_count}개, 적금 {saving_count}개를 추천합니다."
+    )
+
+
+# -------------------------
+# 프로필 버킷 캐시
+# -------------------------
+def profile_bucket(profile, age_bounds=()) -> tuple:
+    """
+    추천 본문을 결정하는 입력만 정규화한 키
+    - risk_type: 점수 가중치 + 투자 계획
+    - gender / 나이 구간: 가입 대상 필터 (나이는 age_bounds 사이 어느 구간인지만 의미 있음)
+    - 저축액: 예금 예상 수익(원금) / 투자 기간: 옵션 매칭·점수·계획
+    - 예금/적금 개수: 저축액·기간·투자 목표 키워드의 결과 (목표 문자열 자체 대신)
+    """
+    savings = int(profile.savings) if profile.savings else 0
+    period = profile.investment_period or None
+    ratio = _calculate_product_ratio(
+        savings_amount=savings,
+        investment_period=period or 12,
+        investment_goal=profile.investment_goal or "",
+    )
+    age_band = bisect_right(age_bounds, profile.age) if profile.age else None
+    return (profile.risk_type, profile.gender or None, age_band, savings, period, ratio)
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "build_ms": 0.0}
+
+
+def recommend_products_for_profile(profile) -> Dict[str, Any]:
+    """
+    recommend_products API와 같은 응답 dict
+    - 같은 버킷 + 같은 카탈로그 버전이면 캐시된 본문 재사용 (DB 조회 없음)
+    """
+    version, age_bounds = catalog_state()
+    key = (version,) + profile_bucket(profile, age_bounds)
+
+    with _lock:
+        body = _entries.get(key)
+        if body is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+
+    if body is None:
+        t0 = time.perf_counter()
+        body = build_product_recommendations(profile)
+        elapsed = (time.perf_counter() - t0) * 1000
+        with _lock:
+            _stats["misses"] += 1
+            _stats["build_ms"] += elapsed
+            # 빈 카탈로그로 만든 결과는 캐시하지 않음 (첫 동기화 직후 바로 보이도록)
+            if body['total_deposits_available'] or body['total_savings_available']:
+                _entries[key] = body
+                _entries.move_to_end(key)
+                while len(_entries) > RECO_CACHE_SIZE:
+                    _entries.popitem(last=False)
+                    _stats["evictions"] += 1
+
+    return {
+        'profile': _profile_section(profile),
+        **body,
+        'recommendation_reason': _recommendation_reason(
+            profile, body['recommended_deposit_count'], body['recommended_saving_count']
+        ),
+    }
+
+
+def invalidate_recommendation_cache() -> None:
+    """현재 프로세스 추천 캐시 비우기 (카탈로그 버전은 다음 호출 때 다시 확인)"""
+    with _lock:
+        _entries.clear()
+
+
+def recommendation_cache_stats() -> Dict[str, Any]:
+    with _lock:
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "hit_rate": round(_stats["hits"] / total, 3) if total else 0.0,
+            "evictions": _stats["evictions"],
+            "entries": len(_entries),
+            "avg_build_ms": round(_stats["build_ms"] / _stats["misses"], 2) if _stats["misses"] else 0.0,
+        }
@@ -1,3 +1,84 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from finances.catalog import invalidate_catalog_state, refresh_product_catalog
+from finances.models import DepositOptions, DepositProducts, SavingOptions, SavingProducts
+
+from .models import InvestmentProfile
+from .recommendation import invalidate_recommendation_cache, recommend_products_for_profile
+
+
+JOIN_MEMBERS = ["제한없음", "만19세이상", "만65세이상", "여성", "만18세이상 만35세미만"]
+
+
+def create_products(count, start=0):
+    """예금/적금 상품 count개씩 + 상품마다 옵션 3개 (가입 기간 6/12/24개월)"""
+    for i in range(start, start + count):
+        deposit = DepositProducts.objects.create(
+            fin_prdt_cd=f"D{i:04d}", kor_co_nm=f"은행{i % 7}", fin_prdt_nm=f"예금{i}",
+            join_way="인터넷,스마트폰", join_member=JOIN_MEMBERS[i % len(JOIN_MEMBERS)], spcl_cnd="",
+        )
+        saving = SavingProducts.objects.create(
+            fin_prdt_cd=f"S{i:04d}", kor_co_nm=f"은행{i % 7}", fin_prdt_nm=f"적금{i}",
+            join_way="영업점", join_member=JOIN_MEMBERS[(i + 1) % len(JOIN_MEMBERS)], spcl_cnd="",
+        )
+        for k, trm in enumerate((6, 12, 24)):
+            rate = 2.0 + (i % 13) * 0.1 + k * 0.2
+            DepositOptions.objects.create(product=deposit, save_trm=trm, intr_rate=rate, intr_rate2=rate + 0.5)
+            SavingOptions.objects.create(
+                product=saving, save_trm=trm, intr_rate=rate, intr_rate2=rate + 0.7,
+                rsrv_type="S", intr_rate_type="M" if k % 2 else "S",
+            )
+    refresh_product_catalog()
+
+
+class RecommendProductsQueryCountTest(TestCase):
+    """recommend_products 쿼리 수가 카탈로그 크기와 무관한지 (상품/옵션마다 쿼리 없음)"""
+
+    SIZES = (5, 40)
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="reco", password="pw")
+        self.profile = InvestmentProfile.objects.create(
+            user=self.user, risk_type="normal_male", risk_score=50, gender="M", age=30,
+            income=4000, savings=2000, investment_goal="주택구매", investment_period=12,
+        )
+        invalidate_recommendation_cache()
+        invalidate_catalog_state()
+
+    def tearDown(self):
+        invalidate_recommendation_cache()
+        invalidate_catalog_state()
+
+    def _grow_to(self, size):
+        current = DepositProducts.objects.count()
+        create_products(size - current, start=current)
+        invalidate_recommendation_cache()
+        invalidate_catalog_state()
+
+    def test_profile_recommendation_queries_constant(self):
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                self._grow_to(size)
+                # 카탈로그 버전/나이 경계 2 + 카탈로그 조회 1
+                with self.assertNumQueries(3):
+                    result = recommend_products_for_profile(self.profile)
+                self.assertGreater(result["total_count"], 0)
+
+                # 같은 버킷 재호출: 캐시 hit → DB 조회 없음
+                with self.assertNumQueries(0):
+                    recommend_products_for_profile(self.profile)
+
+    def test_api_queries_constant(self):
+        client = APIClient()
+        for size in self.SIZES:
+            with self.subTest(size=size):
+                self._grow_to(size)
+                # 요청마다 새로 읽은 사용자 (investment_profile 캐시 없이 실제 요청과 같은 조회)
+                client.force_authenticate(get_user_model().objects.get(pk=self.user.pk))
+                # 프로필 1 + recommend_products_for_profile 3
+                with self.assertNumQueries(4):
+                    response = client.get("/accounts/recommendations/")
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(response.data["total_count"], 0)
@@ -33,6 +33,9 @@ urlpatterns = [
     
     # 맞춤 상품 추천
     path('recommendations/', views.recommend_products, name='recommend_products'),
+
+    # 맞춤 상품 추천 캐시 hit/miss 통계 (관리자용)
+    path('recommendations/cache-stats/', views.get_recommendation_cache_stats, name='recommendation_cache_stats'),
     
     # 추천 상품 북마크 토글
     path('recommendations/<str:fin_prdt_cd>/bookmark/', views.bookmark_recommendation, name='bookmark_recommendation'),
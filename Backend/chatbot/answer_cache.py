@@ -0,0 +1,185 @@
+# chatbot/answer_cache.py
+"""
+챗봇 답변 캐시 (ChatbotService.chat / chat_stream 앞단)
+
+실제로 재사용되는 범위 (사용자 간 공유 캐시가 아님):
+- CHAT 모드(인사/감사 등): 프로필/히스토리와 무관 → 모든 사용자가 공유, 사실상 주 대상
+- SERVICE 모드: 프롬프트와 컨텍스트 수집(상품 자격/종목 추천)이 정확한 프로필 값과 최근 대화를 쓰므로
+  · 프로필 필드 전체가 같은 경우에만 공유 (프로필 지문)
+  · chat/chat_stream 뷰는 최근 대화 5개를 항상 넘기므로 대화 기록이 있는 사용자는 우회
+  → 사용자의 첫 질문, 혹은 프로필이 완전히 같은 사용자 사이에서만 hit
+- stats의 bypass_rate로 우회 비율을 hit_rate와 같이 확인
+
+- 키: 정규화 질문 + 모드/의도 + 엔티티(종목/상품/날짜) + 프로필 지문 + as_of
+  - 프로필 지문: 프롬프트에 들어가는 프로필 필드 전체(나이/성별/소득/저축/목표 등)의 해시
+- 스탬프: as_of의 feature_version(daily_update/뉴스 재채점 시 증가) + 카탈로그 버전(상품 동기화 시 변경)
+  → 둘 다 DB 값이라 다른 워커/관리 명령의 갱신도 키에 반영 (카탈로그는 VERSION_CHECK_SEC 지연)
+- SERVICE 모드에서 대화 히스토리가 프롬프트에 들어가면 캐시 사용 안 함 (make_key → None)
+- 의도별 TTL, 의도별 hit/miss/bypass 카운터 (캐시/카운터는 프로세스 단위, stats에 pid 표시)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from django.core.cache import cache
+
+from finances.catalog import catalog_state
+from stocks.services.feature_cache import feature_version
+from stocks.services.reco_utils import resolve_best_as_of
+
+from .mode_classifier import normalize_query
+
+
+# 의도별 TTL(초): 주식/뉴스는 시세·뉴스가 자주 바뀌어 짧게, 예적금은 길게
+INTENT_TTLS = {
+    "CHAT": 60 * 60,
+    "STOCK": 10 * 60,
+    "NEWS": 5 * 60,
+    "PRODUCT": 6 * 60 * 60,
+}
+DEFAULT_TTL = 30 * 60
+
+_GEN_KEY = "chat_answer:gen"
+_PUNCT_RE = re.compile(r"[?!.~,…]+")
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "stores": 0, "skipped": 0, "bypassed": 0})
+
+
+def normalize_question(text: str) -> str:
+    """normalize_query + 문장부호 제거 ("예금 추천해줘?" == "예금  추천해줘")"""
+    return re.sub(r"\s+", " ", _PUNCT_RE.sub(" ", normalize_query(text or ""))).strip()
+
+
+def profile_fingerprint(user_profile: Dict[str, Any]) -> str:
+    """
+    프로필 → 지문 (get_user_profile_context 결과 전체의 해시)
+    - 프롬프트가 쓰는 필드를 빠짐없이 포함해야 하므로 구간으로 묶지 않고 값 그대로 사용
+    """
+    if not user_profile or not user_profile.get("has_profile"):
+        return "anon"
+    raw = json.dumps(user_profile, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _generation() -> int:
+    return int(cache.get(_GEN_KEY) or 0)
+
+
+def make_key(
+    user_message: str,
+    *,
+    mode: str,
+    question_analysis: Optional[Dict[str, Any]],
+    user_profile: Dict[str, Any],
+    has_history: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    캐시 키 정보 (key/intent/ttl)
+    - CHAT 모드는 프로필/데이터/히스토리와 무관 → 질문만으로 키
+    - SERVICE 모드 + 히스토리(_prepare_chat이 프롬프트에 넣음) → None (캐시 우회)
+    """
+    qa = question_analysis or {}
+    intent = "CHAT" if mode == "CHAT" else (qa.get("intent") or "UNKNOWN")
+    if mode != "CHAT" and has_history:
+        with _lock:
+            _stats[intent]["bypassed"] += 1
+        return None
+
+    parts: Dict[str, Any] = {"q": normalize_question(user_message), "mode": mode, "intent": intent}
+    if mode != "CHAT":
+        as_of = resolve_best_as_of()
+        parts.update({
+            "stocks": sorted(qa.get("stock_names") or []),
+            "product": qa.get("specific_product_name"),
+            "dates": sorted(str(d) for d in qa.get("dates") or []),
+            "news": sorted(qa.get("news_keywords") or []),
+            "profile": profile_fingerprint(user_profile),
+            "as_of": str(as_of),
+            "fv": feature_version(as_of) if as_of else 0,
+            "catalog": catalog_state()[0],
+        })
+    parts["gen"] = _generation()
+
+    digest = hashlib.sha1(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+    return {"key": f"chat_answer:{digest}", "intent": intent, "ttl": INTENT_TTLS.get(intent, DEFAULT_TTL)}
+
+
+def get_answer(key_info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if key_info is None:
+        return None
+    hit = cache.get(key_info["key"])
+    with _lock:
+        _stats[key_info["intent"]]["hits" if hit is not None else "misses"] += 1
+    return hit
+
+
+def put_answer(key_info: Optional[Dict[str, Any]], result: Dict[str, Any]) -> bool:
+    """
+    성공한 답변만 저장
+    - 컨텍스트 소스가 타임아웃/오류로 빠진(degraded) 답변은 저장하지 않음
+    - key_info가 None(캐시 우회)이면 저장하지 않음
+    """
+    if key_info is None:
+        return False
+    timings = result.get("context_timings") or {}
+    degraded = any(t.get("status") != "ok" for t in timings.values())
+    if not result.get("success") or degraded:
+        with _lock:
+            _stats[key_info["intent"]]["skipped"] += 1
+        return False
+
+    value = {
+        "success": True,
+        "response": result["response"],
+        "recommended_products": result.get("recommended_products"),
+    }
+    cache.set(key_info["key"], value, timeout=key_info["ttl"])
+    with _lock:
+        _stats[key_info["intent"]]["stores"] += 1
+    return True
+
+
+def invalidate_answer_cache() -> int:
+    """
+    이 프로세스의 세대 증가 → 기존 키 전부 무효 (벤치마크/테스트용)
+    - 다른 프로세스에는 전달되지 않음: 상품 동기화는 키의 카탈로그 버전으로 무효화
+    """
+    gen = _generation() + 1
+    cache.set(_GEN_KEY, gen, timeout=None)
+    return gen
+
+
+def cache_stats() -> Dict[str, Any]:
+    """
+    hit_rate: 캐시를 조회한 요청 중 hit 비율
+    bypass_rate: 전체 요청(조회 + 우회) 중 캐시를 아예 못 쓴 비율 (SERVICE + 대화 기록)
+    """
+    with _lock:
+        by_intent = {k: dict(v) for k, v in _stats.items()}
+    hits = sum(v["hits"] for v in by_intent.values())
+    misses = sum(v["misses"] for v in by_intent.values())
+    bypassed = sum(v["bypassed"] for v in by_intent.values())
+    for v in by_intent.values():
+        lookups = v["hits"] + v["misses"]
+        v["hit_rate"] = round(v["hits"] / lookups, 3) if lookups else 0.0
+        v["bypass_rate"] = round(v["bypassed"] / (lookups + v["bypassed"]), 3) if lookups + v["bypassed"] else 0.0
+    requests = hits + misses + bypassed
+    return {
+        "hits": hits,
+        "misses": misses,
+        "bypassed": bypassed,
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+        "bypass_rate": round(bypassed / requests, 3) if requests else 0.0,
+        "scope": "CHAT 모드는 전체 공유, SERVICE 모드는 같은 프로필 + 대화 기록 없는 요청만",
+        "pid": os.getpid(),
+        "generation": _generation(),
+        "catalog_version": catalog_state()[0],
+        "by_intent": by_intent,
+    }
@@ -0,0 +1,92 @@
+# chatbot/context_gather.py
+"""
+챗봇 SERVICE 모드 컨텍스트 병렬 수집
+- 서로 독립인 소스(상품/추천 종목/특정 종목 데이터/뉴스 수집)를 스레드 풀로 동시에 실행
+- 소스별 타임아웃: 시간 안에 못 끝나면 fallback 값으로 대체하고 답변 생성은 계속 진행
+  (느린 네이버 수집 하나가 전체 응답을 붙잡지 않도록)
+- 소스별 소요 시간/상태(ok/timeout/error)를 기록 → 어떤 소스가 critical path인지 확인
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+from django.db import connection
+
+
+# 소스별 기본 타임아웃(초)
+SOURCE_TIMEOUTS = {
+    "products": 10.0,
+    "stocks": 15.0,
+    "specific_data": 10.0,
+    "stock_news": 8.0,
+    "general_news": 8.0,
+}
+
+
+@dataclass
+class ContextSource:
+    fn: Callable[[], Any]
+    fallback: Any
+    timeout: float
+
+
+def _run_source(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    """워커 스레드에서 실행 + 소요 시간 측정 (스레드별 DB 연결은 끝나면 닫음)"""
+    t0 = time.perf_counter()
+    try:
+        return fn(), time.perf_counter() - t0
+    finally:
+        connection.close()
+
+
+def gather_context(sources: Dict[str, ContextSource]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    sources를 동시에 실행하고 (결과, 타이밍) 반환
+    - 결과: 소스명 -> 값 (타임아웃/오류면 fallback)
+    - 타이밍: 소스명 -> {"ms", "status"} (+ "error")
+    - 타임아웃은 수집 시작 시점 기준 (소스끼리 기다리는 시간이 누적되지 않음)
+    """
+    results: Dict[str, Any] = {}
+    timings: Dict[str, Dict[str, Any]] = {}
+    if not sources:
+        return results, timings
+
+    pool = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="chat-ctx")
+    t0 = time.perf_counter()
+    try:
+        futures = {name: pool.submit(_run_source, src.fn) for name, src in sources.items()}
+        for name, fut in futures.items():
+            src = sources[name]
+            remaining = max(0.0, src.timeout - (time.perf_counter() - t0))
+            try:
+                value, elapsed = fut.result(timeout=remaining)
+                results[name] = value
+                timings[name] = {"ms": round(elapsed * 1000, 1), "status": "ok"}
+            except FutureTimeout:
+                fut.cancel()
+                results[name] = src.fallback
+                timings[name] = {"ms": round(src.timeout * 1000, 1), "status": "timeout"}
+            except Exception as e:
+                results[name] = src.fallback
+                timings[name] = {
+                    "ms": round((time.perf_counter() - t0) * 1000, 1),
+                    "status": "error",
+                    "error": str(e),
+                }
+    finally:
+        # 타임아웃 난 소스는 백그라운드에서 끝나게 두고 기다리지 않음
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    timings["_total"] = {"ms": round((time.perf_counter() - t0) * 1000, 1), "status": "ok"}
+    return results, timings
+
+
+def format_timings(timings: Dict[str, Dict[str, Any]]) -> str:
+    parts = [
+        f"{name}={t['ms']:.0f}ms" + ("" if t["status"] == "ok" else f"({t['status']})")
+        for name, t in timings.items()
+    ]
+    return " ".join(parts)
@@ -0,0 +1,232 @@
+# chatbot/entity_matcher.py
+"""
+챗봇 엔티티(종목/상품명) 매칭용 Aho-Corasick 오토마톤
+- 종목명/종목코드, STOCK_ALIASES, 예금/적금 상품명을 한 번에 컴파일
+- 메시지 길이에 비례하는 1회 스캔으로 매칭 (종목/상품 테이블 전체 순회 없음)
+- 결과 순서는 기존 전체 순회와 동일하게 맞춤 (종목: code 순, 상품: id 순, alias: 사전 순)
+- 카탈로그가 바뀌면 재구축:
+  · 종목: sync_prices(별도 프로세스) → Stock 수/최신 updated_at 시그니처로 감지
+  · 상품: 동기화 코드에서 invalidate_entity_matcher() 호출 (+ 상품 수/최대 id + 카탈로그 최신 updated_at 시그니처)
+    상품 테이블에는 수정 시각이 없으므로 이름 변경(bulk_update)은 같은 동기화에서 다시 계산되는
+    ProductCatalog.updated_at으로 다른 프로세스에서도 감지
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from django.db.models import Count, Max
+
+from finances.models import DepositProducts, ProductCatalog, SavingProducts
+from stocks.models import Stock
+
+from .stock_alias import STOCK_ALIASES, normalize_stock_query
+
+
+# 카탈로그 시그니처 확인(집계 쿼리 4번) 최소 간격(초)
+VERSION_CHECK_SEC = 5.0
+
+
+class AhoCorasick:
+    """
+    다중 패턴 부분문자열 매칭 오토마톤
+    - add(pattern, value) 후 build() → find(text)는 매칭된 value 집합
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[Hashable, ...]] = [()]
+        self._pending: List[List[Hashable]] = [[]]
+
+    def add(self, pattern: str, value: Hashable) -> None:
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._pending.append([])
+            node = nxt
+        self._pending[node].append(value)
+
+    def build(self) -> "AhoCorasick":
+        """BFS로 실패 링크 계산 + 실패 경로의 출력 합치기"""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        self._out[0] = tuple(self._pending[0])
+
+        while queue:
+            node = queue.popleft()
+            self._out[node] = tuple(self._pending[node]) + self._out[self._fail[node]]
+            for ch, nxt in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                queue.append(nxt)
+
+        self._pending = []
+        return self
+
+    def find(self, text: str) -> set:
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+
+@dataclass(frozen=True)
+class ProductRef:
+    id: int
+    code: str
+    name: str
+    bank: str
+
+
+class EntityMatcher:
+    """
+    raw 오토마톤: 종목명/코드 ("stock", idx), 상품명 ("deposit"|"saving", idx)
+    alias 오토마톤: 정규화된 정식명/별칭 → STOCK_ALIASES 순번 (find_stock_by_alias와 동일 기준)
+    """
+
+    def __init__(
+        self,
+        stocks: List[Tuple[str, str]],
+        deposits: List[ProductRef],
+        savings: List[ProductRef],
+    ):
+        t0 = time.perf_counter()
+        self.stock_names = [name for _, name in stocks]
+        self.deposits = deposits
+        self.savings = savings
+
+        raw = AhoCorasick()
+        for i, (code, name) in enumerate(stocks):
+            raw.add(name, ("stock", i))
+            raw.add(code, ("stock", i))
+        for kind, refs in (("deposit", deposits), ("saving", savings)):
+            for i, ref in enumerate(refs):
+                raw.add(ref.name, (kind, i))
+        self._raw = raw.build()
+
+        # alias: 정식명 → DB 종목명 (기존 name__icontains(...).first()와 같은 code 순 첫 종목)
+        self.alias_names = list(STOCK_ALIASES)
+        lowered = [name.lower() for name in self.stock_names]
+        self.alias_resolved: List[Optional[str]] = []
+        for canonical in self.alias_names:
+            key = canonical.lower()
+            self.alias_resolved.append(next((self.stock_names[i] for i, n in enumerate(lowered) if key in n), None))
+
+        alias = AhoCorasick()
+        for i, canonical in enumerate(self.alias_names):
+            alias.add(normalize_stock_query(canonical), i)
+            for a in STOCK_ALIASES[canonical]:
+                alias.add(normalize_stock_query(a), i)
+        self._alias = alias.build()
+
+        self.build_sec = time.perf_counter() - t0
+
+    def _raw_hits(self, text: str) -> Dict[str, List[int]]:
+        hits: Dict[str, List[int]] = {"stock": [], "deposit": [], "saving": []}
+        for kind, idx in self._raw.find(text or ""):
+            hits[kind].append(idx)
+        for v in hits.values():
+            v.sort()
+        return hits
+
+    def find_alias_stocks(self, text: str) -> List[str]:
+        """별칭 매칭 → DB에 있는 종목명 (STOCK_ALIASES 순서)"""
+        idx = sorted(self._alias.find(normalize_stock_query(text or "")))
+        return [self.alias_resolved[i] for i in idx if self.alias_resolved[i]]
+
+    def find_stocks(self, text: str) -> List[str]:
+        """종목명 또는 코드가 포함된 종목명 (code 순)"""
+        return [self.stock_names[i] for i in self._raw_hits(text)["stock"]]
+
+    def find_products(self, text: str) -> Dict[str, List[ProductRef]]:
+        """상품명이 포함된 예금/적금 (각각 id 순)"""
+        hits = self._raw_hits(text)
+        return {
+            "deposit": [self.deposits[i] for i in hits["deposit"]],
+            "saving": [self.savings[i] for i in hits["saving"]],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "stocks": len(self.stock_names),
+            "deposits": len(self.deposits),
+            "savings": len(self.savings),
+            "aliases": len(self.alias_names),
+            "raw_states": len(self._raw),
+            "alias_states": len(self._alias),
+            "build_sec": round(self.build_sec, 4),
+        }
+
+
+def _product_refs(model) -> List[ProductRef]:
+    return [
+        ProductRef(pid, code, name, bank)
+        for pid, code, name, bank in model.objects.order_by("id").values_list("id", "fin_prdt_cd", "fin_prdt_nm", "kor_co_nm")
+    ]
+
+
+def build_entity_matcher() -> EntityMatcher:
+    stocks = list(Stock.objects.order_by("code").values_list("code", "name"))
+    return EntityMatcher(stocks, _product_refs(DepositProducts), _product_refs(SavingProducts))
+
+
+def catalog_signature() -> tuple:
+    s = Stock.objects.aggregate(n=Count("id"), m=Max("updated_at"))
+    d = DepositProducts.objects.aggregate(n=Count("id"), m=Max("id"))
+    v = SavingProducts.objects.aggregate(n=Count("id"), m=Max("id"))
+    c = ProductCatalog.objects.aggregate(m=Max("updated_at"))
+    return (s["n"], s["m"], d["n"], d["m"], v["n"], v["m"], c["m"])
+
+
+_lock = threading.Lock()
+_matcher: Optional[EntityMatcher] = None
+_signature: Optional[tuple] = None
+_checked_at = 0.0
+
+
+def get_entity_matcher() -> EntityMatcher:
+    """프로세스 공용 매처 (시그니처가 바뀌었거나 invalidate 후 첫 호출에 재구축)"""
+    global _matcher, _signature, _checked_at
+    with _lock:
+        now = time.monotonic()
+        if _matcher is not None and now - _checked_at < VERSION_CHECK_SEC:
+            return _matcher
+
+        sig = catalog_signature()
+        _checked_at = now
+        if _matcher is None or sig != _signature:
+            _matcher = build_entity_matcher()
+            _signature = sig
+        return _matcher
+
+
+def invalidate_entity_matcher() -> None:
+    global _matcher, _signature
+    with _lock:
+        _matcher = None
+        _signature = None
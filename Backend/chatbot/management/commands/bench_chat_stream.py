@@ -0,0 +1,166 @@
+# chatbot/management/commands/bench_chat_stream.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from chatbot.answer_cache import invalidate_answer_cache
+from chatbot.services import ChatbotService
+from stocks.services.llm_client import CompletionClient
+
+
+class StubCompletionServer:
+    """
+    OpenAI chat/completions 호환 로컬 가짜 서버
+    - 첫 토큰까지 first_token_delay초, 이후 토큰마다 token_delay초
+    - stream=true면 SSE(data: {...choices[0].delta.content} ... data: [DONE]), 아니면 한 번에 JSON
+    - 처음 fail_first건은 fail_status(기본 503)로 응답 (재시도/서킷 확인용)
+    - connections: 서로 다른 클라이언트 연결 수 (keep-alive 재사용 확인용)
+    """
+
+    def __init__(
+        self,
+        text: str,
+        first_token_delay: float = 1.0,
+        token_delay: float = 0.02,
+        fail_first: int = 0,
+        fail_status: int = 503,
+    ):
+        self.tokens = [text[i:i + 4] for i in range(0, len(text), 4)]
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.requests = 0
+        self.peers = set()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # keep-alive에서 헤더/본문 분할 전송 시 delayed ACK 지연 방지
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                stub.requests += 1
+                stub.peers.add(self.client_address)
+                if stub.requests <= stub.fail_first:
+                    payload = json.dumps({"error": "stub unavailable"}).encode("utf-8")
+                    self.send_response(stub.fail_status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                time.sleep(stub.first_token_delay)
+
+                if not body.get("stream"):
+                    time.sleep(stub.token_delay * len(stub.tokens))
+                    payload = json.dumps({
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(stub.tokens)}}],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": len(stub.tokens), "total_tokens": 10 + len(stub.tokens)},
+                    }, ensure_ascii=False).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+
+                # Content-Length 없이 보내고 연결 종료로 끝 표시
+                self.close_connection = True
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for i, tok in enumerate(stub.tokens):
+                    if i:
+                        time.sleep(stub.token_delay)
+                    chunk = {"choices": [{"index": 0, "delta": {"content": tok}}]}
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def connections(self) -> int:
+        return len(self.peers)
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class Command(BaseCommand):
+    help = "챗봇 응답 지연 벤치마크: chat()(일괄) vs chat_stream()(SSE) 첫 토큰까지 시간 (로컬 가짜 completion 서버)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--message", type=str, default="안녕하세요", help="사용자 메시지 (기본: CHAT 모드 인사)")
+        parser.add_argument("--first-token-delay", type=float, default=1.0)
+        parser.add_argument("--token-delay", type=float, default=0.02)
+        parser.add_argument("--chars", type=int, default=800, help="가짜 응답 길이(글자)")
+
+    def handle(self, *args, **opts):
+        text = ("안녕하세요! 금융 상품과 주식 정보를 도와드릴게요. " * 100)[: opts["chars"]]
+        user = get_user_model()(username="bench")  # 저장하지 않은 사용자 (프로필 없음)
+
+        with StubCompletionServer(text, opts["first_token_delay"], opts["token_delay"]) as stub:
+            svc = ChatbotService(user)
+            svc.llm = CompletionClient(url=stub.url, api_key="stub")
+
+            # 워밍업: 엔티티 매처/피처 캐시 구축, 뉴스 수집 쿨다운 등 첫 호출 비용을 측정에서 제외
+            svc._prepare_chat(opts["message"])
+
+            # 답변 캐시를 비워 두 경로 모두 실제 completion 호출을 측정
+            invalidate_answer_cache()
+            t0 = time.perf_counter()
+            blocking = svc.chat(opts["message"])
+            t_block = time.perf_counter() - t0
+
+            invalidate_answer_cache()
+            t0 = time.perf_counter()
+            ttft = None
+            tokens = 0
+            final = None
+            for kind, data in svc.chat_stream(opts["message"]):
+                if kind == "token":
+                    tokens += 1
+                    if ttft is None:
+                        ttft = time.perf_counter() - t0
+                else:
+                    final = data
+            t_stream = time.perf_counter() - t0
+
+        same = bool(final and final.get("success")) and final.get("response") == blocking.get("response")
+        self.stdout.write(self.style.NOTICE(
+            f"[bench_chat_stream] chars={len(text)} first_token_delay={opts['first_token_delay']}s "
+            f"token_delay={opts['token_delay']}s"
+        ))
+        self.stdout.write(f"  blocking chat : first byte {t_block * 1000:.0f}ms (= total)")
+        self.stdout.write(
+            f"  chat_stream   : ttft {(ttft or 0) * 1000:.0f}ms total {t_stream * 1000:.0f}ms tokens={tokens}"
+        )
+        style = self.style.SUCCESS if same else self.style.ERROR
+        self.stdout.write(style(f"  ttft speedup=x{t_block / max(ttft or t_stream, 1e-9):.1f} same_response={same}"))
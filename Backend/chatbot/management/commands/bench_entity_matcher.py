@@ -0,0 +1,90 @@
+# chatbot/management/commands/bench_entity_matcher.py
+from __future__ import annotations
+
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from chatbot.entity_matcher import build_entity_matcher
+from chatbot.stock_alias import find_stock_by_alias
+from finances.models import DepositProducts, SavingProducts
+from stocks.models import Stock
+
+
+FILLERS = [
+    "요즘 {x} 어때? 주가 전망 알려줘",
+    "{x} 최근 뉴스랑 시세 좀 보여줘",
+    "안정적인 예금 추천해줘. {x} 같은 상품도 괜찮아?",
+    "12월 17일 {x} 거래량이 왜 늘었어?",
+    "원금 보장되는 적금 중에 금리 높은 거 알려줘",
+    "삼전이랑 하이닉스 중에 뭐가 나아?",
+]
+
+
+def _legacy_extract(message: str) -> dict:
+    """기존 analyze_user_question / extract_recommended_products의 테이블 전체 순회 방식"""
+    stock_names = []
+    for canonical in find_stock_by_alias(message):
+        stock = Stock.objects.filter(name__icontains=canonical).first()
+        if stock:
+            stock_names.append(stock.name)
+    if not stock_names:
+        for stock in Stock.objects.all():
+            if stock.name in message or stock.code in message:
+                stock_names.append(stock.name)
+
+    deposits = [p.fin_prdt_cd for p in DepositProducts.objects.all() if p.fin_prdt_nm and p.fin_prdt_nm in message]
+    savings = [p.fin_prdt_cd for p in SavingProducts.objects.all() if p.fin_prdt_nm and p.fin_prdt_nm in message]
+    return {"stocks": stock_names, "deposits": deposits, "savings": savings}
+
+
+def _matcher_extract(matcher, message: str) -> dict:
+    stock_names = matcher.find_alias_stocks(message) or matcher.find_stocks(message)
+    products = matcher.find_products(message)
+    return {
+        "stocks": stock_names,
+        "deposits": [p.code for p in products["deposit"]],
+        "savings": [p.code for p in products["saving"]],
+    }
+
+
+class Command(BaseCommand):
+    help = "챗봇 엔티티 추출 벤치마크: 테이블 전체 순회 vs Aho-Corasick 매처 (메시지당 지연)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **opts):
+        rnd = random.Random(opts["seed"])
+        names = list(Stock.objects.values_list("name", flat=True)) + list(Stock.objects.values_list("code", flat=True))
+        names += list(DepositProducts.objects.values_list("fin_prdt_nm", flat=True))
+        names += list(SavingProducts.objects.values_list("fin_prdt_nm", flat=True))
+        names += ["삼전", "카뱅", "네이버", "없는종목"]
+
+        messages = [rnd.choice(FILLERS).format(x=rnd.choice(names) if names else "") for _ in range(opts["messages"])]
+
+        t0 = time.perf_counter()
+        matcher = build_entity_matcher()
+        t_build = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        legacy = [_legacy_extract(m) for m in messages]
+        t_legacy = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        fast = [_matcher_extract(matcher, m) for m in messages]
+        t_fast = time.perf_counter() - t0
+
+        mismatches = sum(1 for a, b in zip(legacy, fast) if a != b)
+        n = len(messages)
+        st = matcher.stats()
+        self.stdout.write(self.style.NOTICE(
+            f"[bench_entity_matcher] messages={n} stocks={st['stocks']} deposits={st['deposits']} "
+            f"savings={st['savings']} states={st['raw_states']}+{st['alias_states']} build={t_build * 1000:.1f}ms"
+        ))
+        self.stdout.write(f"  legacy scan : {t_legacy / n * 1000:.3f} ms/message")
+        self.stdout.write(f"  automaton   : {t_fast / n * 1000:.3f} ms/message")
+        style = self.style.SUCCESS if mismatches == 0 else self.style.ERROR
+        self.stdout.write(style(f"  speedup=x{t_legacy / max(t_fast, 1e-9):.0f} mismatches={mismatches}"))
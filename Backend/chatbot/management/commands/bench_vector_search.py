@@ -0,0 +1,126 @@
+# chatbot/management/commands/bench_vector_search.py
+from __future__ import annotations
+
+import random
+import tempfile
+import time
+
+import faiss
+from django.core.management.base import BaseCommand
+
+from chatbot.management.commands.bench_vector_store import BANKS, WORDS, _synthetic_items
+from chatbot.vector_store import ProductVectorStore
+
+
+def _fresh_store(base, tmp):
+    """같은 인덱스/어휘를 쓰는 캐시 빈 인스턴스"""
+    store = ProductVectorStore(cache_dir=tmp)
+    store.vectorizer, store.indexes = base.vectorizer, base.indexes
+    store.product_metadata, store.embedding_dim = base.product_metadata, base.embedding_dim
+    return store
+
+
+def _legacy_search(store, legacy_index, query, top_k, product_type):
+    """기존 search(): 매 호출 질의 transform + 전체 L2 인덱스에서 top_k*3 가져와 타입 필터"""
+    q = store._embed([query])
+    search_k = top_k * 3 if product_type else top_k
+    distances, indices = legacy_index.search(q, search_k)
+    results = []
+    for idx, distance in zip(indices[0], distances[0]):
+        if idx < 0:
+            continue
+        meta = store.product_metadata[int(idx)]
+        if product_type and meta["type"] != product_type:
+            continue
+        # 정규화 벡터의 L2 제곱거리 d → 코사인 1 - d/2 (새 방식 점수와 비교용)
+        results.append({**meta, "similarity_score": float(1 / (1 + distance)), "cosine": 1 - float(distance) / 2})
+        if len(results) >= top_k:
+            break
+    return results
+
+
+class Command(BaseCommand):
+    help = "벡터 검색 벤치마크: L2 + 과다조회 필터 vs 타입별 내적 인덱스 + LRU 캐시 + search_many"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=str, default="1000,100000", help="가짜 상품 수 (쉼표 구분)")
+        parser.add_argument("--queries", type=int, default=400)
+        parser.add_argument("--distinct", type=int, default=100, help="서로 다른 질의 수 (나머지는 반복)")
+        parser.add_argument("--top-k", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        rnd = random.Random(0)
+        distinct = [
+            f"{rnd.choice(BANKS)} {' '.join(rnd.sample(WORDS, 2))} {rnd.choice(['예금', '적금', '상품'])} 추천해줘"
+            for _ in range(opts["distinct"])
+        ]
+        queries = [rnd.choice(distinct) for _ in range(opts["queries"])]
+        types = [rnd.choice([None, "deposit", "saving"]) for _ in queries]
+        k = opts["top_k"]
+
+        for size in [int(x) for x in opts["sizes"].split(",") if x.strip()]:
+            with tempfile.TemporaryDirectory() as tmp:
+                self._bench_size(size, tmp, queries, types, k)
+
+    def _bench_size(self, size, tmp, queries, types, k):
+        items = _synthetic_items(size)
+        store = ProductVectorStore(cache_dir=tmp)
+        store.build_from_metadata(items, save=False)
+
+        # 기존 구조: 전체 상품 하나의 IndexFlatL2 (위치 = 메타데이터 순서)
+        legacy_index = faiss.IndexFlatL2(store.embedding_dim)
+        legacy_index.add(store._embed([it["text"] for it in items]))
+
+        n = len(queries)
+        t0 = time.perf_counter()
+        legacy = [_legacy_search(store, legacy_index, q, k, t) for q, t in zip(queries, types)]
+        t_legacy = time.perf_counter() - t0
+
+        # 캐시 없이: 서로 다른 질의만 (전부 miss)
+        cold_store = _fresh_store(store, tmp)
+        seen = set()
+        cold_pairs = [(q, t) for q, t in zip(queries, types) if not ((q, t) in seen or seen.add((q, t)))]
+        t0 = time.perf_counter()
+        for q, t in cold_pairs:
+            cold_store.search(q, k, t)
+        t_cold = time.perf_counter() - t0
+
+        # 실제 트래픽처럼 반복 포함 (빈 캐시에서 시작, 반복 질의는 LRU hit)
+        mixed_store = _fresh_store(store, tmp)
+        t0 = time.perf_counter()
+        fresh = [mixed_store.search(q, k, t) for q, t in zip(queries, types)]
+        t_warm = time.perf_counter() - t0
+
+        # search_many: 타입별로 묶어 한 번에 (캐시 빈 인스턴스)
+        batch_store = _fresh_store(store, tmp)
+        t0 = time.perf_counter()
+        for t in (None, "deposit", "saving"):
+            group = sorted({q for q, qt in cold_pairs if qt == t})
+            batch_store.search_many(group, k, t)
+        t_batch = time.perf_counter() - t0
+
+        # 가짜 상품은 같은 벡터가 많아 동점 순서가 갈림 → 1위 점수로 비교 (기존 방식이 빈 결과인 질의는 제외)
+        comparable = [(a, b) for a, b in zip(legacy, fresh) if a]
+        same_top1 = sum(1 for a, b in comparable if b and abs(a[0]["cosine"] - b[0]["similarity_score"]) < 1e-4)
+        legacy_empty = n - len(comparable)
+        underfilled_legacy = sum(1 for r in legacy if len(r) < k)
+        underfilled_new = sum(1 for r in fresh if len(r) < k)
+        type_ok = all(all(row["type"] == t for row in r) for r, t in zip(fresh, types) if t)
+
+        self.stdout.write(self.style.NOTICE(
+            f"[bench_vector_search] products={store.ntotal} dim={store.embedding_dim} "
+            f"queries={n} distinct={len(cold_pairs)} top_k={k}"
+        ))
+        self.stdout.write(f"  legacy L2 + top_k*3 filter : {t_legacy / n * 1000:.3f} ms/query underfilled={underfilled_legacy}")
+        self.stdout.write(f"  IP per-type (no cache)     : {t_cold / len(cold_pairs) * 1000:.3f} ms/query")
+        self.stdout.write(
+            f"  IP per-type + LRU (mixed)  : {t_warm / n * 1000:.3f} ms/query underfilled={underfilled_new} "
+            f"cache={mixed_store.cache_stats()['results']}"
+        )
+        self.stdout.write(f"  search_many (3 batches)    : {t_batch / len(cold_pairs) * 1000:.3f} ms/query")
+        ok = type_ok and same_top1 == len(comparable)
+        style = self.style.SUCCESS if ok else self.style.ERROR
+        self.stdout.write(style(
+            f"  speedup x{t_legacy / max(t_warm, 1e-9):.0f} (mixed), same_top1={same_top1}/{len(comparable)} "
+            f"legacy_empty={legacy_empty} type_filter_ok={type_ok}"
+        ))
@@ -0,0 +1,215 @@
+# chatbot/management/commands/bench_vector_store.py
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chatbot.vector_store import ProductMetadata, ProductVectorStore
+
+
+BANKS = ["국민은행", "신한은행", "우리은행", "하나은행", "농협은행", "카카오뱅크", "토스뱅크", "케이뱅크", "부산은행", "대구은행"]
+WORDS = ["정기", "자유", "적립", "우대", "청년", "급여", "디지털", "비대면", "스마트", "특판", "주거래", "첫거래", "월복리", "모바일"]
+WAYS = ["영업점", "인터넷", "스마트폰", "전화(텔레뱅킹)"]
+WORKER_HELP = "(내부용) 워커 프로세스 모드"
+
+
+def _synthetic_items(n: int, seed: int = 0) -> list:
+    """대규모 카탈로그 흉내용 가짜 상품"""
+    rnd = random.Random(seed)
+    items = []
+    for i in range(n):
+        product_type = "deposit" if i % 2 == 0 else "saving"
+        label = "예금" if product_type == "deposit" else "적금"
+        bank = rnd.choice(BANKS)
+        name = " ".join(rnd.sample(WORDS, 2)) + f" {label} {i}"
+        way = ",".join(rnd.sample(WAYS, 2))
+        cond = " ".join(rnd.sample(WORDS, 3)) + f" 시 {rnd.randint(1, 30) / 10}%p 우대"
+        items.append({
+            "type": product_type,
+            "fin_prdt_cd": f"SYN{i:07d}",
+            "kor_co_nm": bank,
+            "fin_prdt_nm": name,
+            "join_way": way,
+            "text": f"상품 타입: {label}\n은행: {bank}\n상품명: {name}\n가입 방법: {way}\n특별 조건: {cond}",
+        })
+    return items
+
+
+def _rss() -> dict:
+    """현재 프로세스 RSS (MB): 전체 / 익명(프로세스 전용) / 파일(페이지 캐시, 워커끼리 공유)"""
+    out = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssAnon", "RssFile"):
+                    out[key] = int(value.split()[0]) / 1024
+    except OSError:
+        pass
+    return out
+
+
+def _child(mode: str, path: str) -> dict:
+    """워커 한 개의 콜드 스타트: 캐시 로드 + 첫 검색"""
+    before = _rss()
+    t0 = time.perf_counter()
+    if mode == "pickle":
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        store = ProductVectorStore(cache_dir=tempfile.gettempdir())
+        store.indexes = data["indexes"]
+        store.product_metadata = ProductMetadata.from_items(data["metadata"], range(len(data["metadata"])))
+        store.vectorizer = data["vectorizer"]
+        store.embedding_dim = next(iter(store.indexes.values())).d
+    else:
+        store = ProductVectorStore(cache_dir=path)
+        if not store.load():
+            raise RuntimeError("load failed")
+    t_load = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    store.search("우대금리 높은 비대면 적금", top_k=5)
+    t_first = time.perf_counter() - t0
+    after = _rss()
+    return {
+        "load_ms": t_load * 1000,
+        "first_search_ms": t_first * 1000,
+        **{f"d_{k}": after.get(k, 0) - before.get(k, 0) for k in ("VmRSS", "RssAnon", "RssFile")},
+    }
+
+
+class Command(BaseCommand):
+    help = "벡터 스토어 콜드 스타트/워커당 RSS 벤치마크: pickle(vector_cache.pkl) vs write_index + mmap"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=0, help="0이면 DB 상품, 아니면 가짜 상품 N개")
+        parser.add_argument("--workers", type=int, default=3, help="콜드 스타트를 잴 워커 프로세스 수")
+        parser.add_argument("--changed", type=int, default=10, help="증분 갱신 측정용: 하루 동기화에서 바뀌는 상품 수")
+        parser.add_argument("--child", type=str, default=None, help=WORKER_HELP)
+        parser.add_argument("--path", type=str, default=None, help=WORKER_HELP)
+
+    def handle(self, *args, **opts):
+        if opts["child"]:
+            self.stdout.write(json.dumps(_child(opts["child"], opts["path"])))
+            return
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ProductVectorStore(cache_dir=os.path.join(tmp, "vector_index"))
+            os.makedirs(store.cache_dir)
+            items = _synthetic_items(opts["products"]) if opts["products"] else store._collect_products()
+
+            t0 = time.perf_counter()
+            store.build_from_metadata(items, save=False)
+            t_build = time.perf_counter() - t0
+
+            # 기존 형식: 인덱스/metadata/vectorizer/texts 전체 pickle
+            pkl_path = os.path.join(tmp, "vector_cache.pkl")
+            t0 = time.perf_counter()
+            with open(pkl_path, "wb") as f:
+                pickle.dump({
+                    "indexes": store.indexes,
+                    "metadata": list(store.product_metadata),
+                    "vectorizer": store.vectorizer,
+                    "texts": list(store.product_texts),
+                }, f)
+            t_pkl_save = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            store.save()
+            t_save = time.perf_counter() - t0
+
+            pkl_size = os.path.getsize(pkl_path)
+            version_dir = os.path.join(store.cache_dir, f"v{store.version}")
+            new_size = sum(os.path.getsize(os.path.join(version_dir, f)) for f in os.listdir(version_dir))
+
+            self.stdout.write(self.style.NOTICE(
+                f"[bench_vector_store] products={store.ntotal} dim={store.embedding_dim} "
+                f"build={t_build * 1000:.0f}ms workers={opts['workers']}"
+            ))
+            self.stdout.write(
+                f"  save  : pickle {t_pkl_save * 1000:.0f}ms {pkl_size / 1e6:.1f}MB | "
+                f"write_index+jsonl {t_save * 1000:.0f}ms {new_size / 1e6:.1f}MB"
+            )
+
+            summary = {}
+            for mode, path in (("pickle", pkl_path), ("mmap", store.cache_dir)):
+                runs = []
+                for _ in range(opts["workers"]):
+                    out = subprocess.run(
+                        [sys.executable, os.path.join(settings.BASE_DIR, "manage.py"), "bench_vector_store",
+                         "--child", mode, "--path", path],
+                        capture_output=True, text=True, check=True,
+                    ).stdout
+                    runs.append(json.loads(out.strip().splitlines()[-1]))
+                avg = {k: sum(r[k] for r in runs) / len(runs) for k in runs[0]}
+                summary[mode] = avg
+                self.stdout.write(
+                    f"  {mode:<6}: load {avg['load_ms']:.1f}ms first_search {avg['first_search_ms']:.1f}ms | "
+                    f"RSS +{avg['d_VmRSS']:.1f}MB (private +{avg['d_RssAnon']:.1f}MB, shared file +{avg['d_RssFile']:.1f}MB)"
+                )
+
+            self._bench_incremental(store, items, opts["changed"])
+
+        old, new = summary["pickle"], summary["mmap"]
+        self.stdout.write(self.style.SUCCESS(
+            f"  cold start x{(old['load_ms'] + old['first_search_ms']) / max(new['load_ms'] + new['first_search_ms'], 1e-9):.1f}, "
+            f"private RSS per worker {old['d_RssAnon']:.1f}MB -> {new['d_RssAnon']:.1f}MB"
+        ))
+
+    def _bench_incremental(self, store, items, n_changed):
+        """하루치 동기화(수정 절반 + 신규 절반 + 삭제 2개): 전체 재구축 vs 증분 갱신"""
+        rnd = random.Random(1)
+        modified = [
+            {**item, "text": item["text"] + f" 우대금리 {rnd.randint(1, 9) / 10}%p 추가"}
+            for item in rnd.sample(items, n_changed // 2)
+        ]
+        added = [
+            {**item, "fin_prdt_cd": f"NEW{i:05d}", "fin_prdt_nm": f"신규 {item['fin_prdt_nm']}"}
+            for i, item in enumerate(_synthetic_items(n_changed - len(modified), seed=7))
+        ]
+        modified_codes = {m["fin_prdt_cd"] for m in modified}
+        removed = [(it["type"], it["fin_prdt_cd"]) for it in items if it["fin_prdt_cd"] not in modified_codes][:2]
+        removed_keys = set(removed)
+        after_items = [
+            m for m in ([{**it} for it in items if (it["type"], it["fin_prdt_cd"]) not in removed_keys])
+        ]
+        by_code = {m["fin_prdt_cd"]: m for m in modified}
+        after_items = [by_code.get(it["fin_prdt_cd"], it) for it in after_items] + added
+
+        full = ProductVectorStore(cache_dir=store.cache_dir)
+        t0 = time.perf_counter()
+        full.build_from_metadata(after_items)
+        t_full = time.perf_counter() - t0
+
+        inc = ProductVectorStore(cache_dir=store.cache_dir)
+        t0 = time.perf_counter()
+        inc.load(writable=True)
+        stats = inc.apply_changes(modified + added, removed)
+        t_inc = time.perf_counter() - t0
+
+        probes = modified + added
+        hits = sum(
+            1 for item in probes
+            if (inc.search(item["text"], top_k=1) or [{}])[0].get("fin_prdt_cd") == item["fin_prdt_cd"]
+        )
+        gone = sum(1 for _, code in removed if any(m["fin_prdt_cd"] == code for m in inc.product_metadata))
+        ok = inc.ntotal == len(after_items) and hits == len(probes) and gone == 0
+
+        self.stdout.write(
+            f"  sync  : changed={n_changed} removed={len(removed)} | full rebuild {t_full * 1000:.0f}ms | "
+            f"incremental {t_inc * 1000:.1f}ms (apply {stats['ms']}ms, refit={stats['refit']})"
+        )
+        style = self.style.SUCCESS if ok else self.style.ERROR
+        self.stdout.write(style(
+            f"  sync  : x{t_full / max(t_inc, 1e-9):.0f} faster, ntotal={inc.ntotal}/{len(after_items)} "
+            f"self-hit={hits}/{len(probes)} removed_found={gone}"
+        ))
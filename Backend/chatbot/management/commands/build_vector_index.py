@@ -35,6 +35,7 @@ class Command(BaseCommand):
 
             self.stdout.write(self.style.SUCCESS('\n[SUCCESS] 벡터 인덱스 구축 완료!'))
             self.stdout.write(self.style.SUCCESS(f'   총 {len(vector_store.product_metadata)}개 상품이 인덱싱되었습니다.'))
+            self.stdout.write(self.style.SUCCESS(f'   버전: {vector_store.version} ({vector_store.cache_dir})'))
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'\n[ERROR] 오류 발생: {e}'))
@@ -1,15 +1,19 @@
-import requests
-import json
 import re
-from django.conf import settings
+import time
 from django.db.models import Max, Prefetch, Q
 from finances.models import DepositProducts, SavingProducts, DepositOptions, SavingOptions
+from finances.interest import deposit_interest, installment_interest
 from stocks.models import Stock, DailyPrice, StockNews, FeatureDaily
+from stocks.services.feature_cache import get_feature_row
+from stocks.services.llm_client import CircuitOpenError, CompletionError, CompletionTimeout, get_completion_client
 from datetime import datetime, timedelta
 from stocks.services.news_on_demand import ensure_stock_news
 from naversearch.utils import search_and_save_news
 from naversearch.models import News
-from .stock_alias import find_stock_by_alias, expand_stock_search_terms
+from .stock_alias import expand_stock_search_terms
+from .entity_matcher import get_entity_matcher
+from .context_gather import ContextSource, SOURCE_TIMEOUTS, format_timings, gather_context
+from .answer_cache import get_answer as get_cached_answer, make_key as make_answer_key, put_answer as put_cached_answer
 from .mode_classifier import classify_chat_mode
 from .vector_store import get_vector_store  # RAG 벡터 스토어
 
@@ -22,8 +26,8 @@ class ChatbotService:
 
     def __init__(self, user):
         self.user = user
-        self.api_url = "https://gms.ssafy.io/gmsapi/api.openai.com/v1/chat/completions"
-        self.api_key = settings.GMS_KEY
+        # 프로세스 공용 GMS 클라이언트 (keep-alive 연결 풀 / 재시도 / 서킷 브레이커)
+        self.llm = get_completion_client()
 
     def get_user_profile_context(self):
         """
@@ -89,7 +93,7 @@ class ChatbotService:
                         matching_option = period_match
 
                 # 예상 수익 계산 (10,000만원 기준)
-                expected_profit = self._calculate_deposit_profit(
+                expected_profit = deposit_interest(
                     10000, matching_option.save_trm, matching_option.intr_rate2
                 )
 
@@ -137,8 +141,9 @@ class ChatbotService:
                         matching_option = period_match
 
                 # 예상 수익 계산 (매월 100만원 납입 기준)
-                expected_profit = self._calculate_saving_profit(
-                    100, matching_option.save_trm, matching_option.intr_rate2
+                expected_profit = installment_interest(
+                    100, matching_option.save_trm, matching_option.intr_rate2,
+                    rate_type=matching_option.intr_rate_type, rsrv_type=matching_option.rsrv_type,
                 )
 
                 saving_data.append({
@@ -211,7 +216,7 @@ class ChatbotService:
                         best_option = product.options.order_by('-intr_rate2').first()
                         if best_option:
                             # 예상 수익 계산
-                            profit = self._calculate_deposit_profit(10000, best_option.save_trm, best_option.intr_rate2)
+                            profit = deposit_interest(10000, best_option.save_trm, best_option.intr_rate2)
 
                             context += f"{i}. [예금] {product.fin_prdt_nm}\n"
                             context += f"   은행: {product.kor_co_nm}\n"
@@ -228,7 +233,10 @@ class ChatbotService:
                         best_option = product.options.order_by('-intr_rate2').first()
                         if best_option:
                             # 예상 수익 계산
-                            profit = self._calculate_saving_profit(100, best_option.save_trm, best_option.intr_rate2)
+                            profit = installment_interest(
+                                100, best_option.save_trm, best_option.intr_rate2,
+                                rate_type=best_option.intr_rate_type, rsrv_type=best_option.rsrv_type,
+                            )
 
                             context += f"{i}. [적금] {product.fin_prdt_nm}\n"
                             context += f"   은행: {product.kor_co_nm}\n"
@@ -256,7 +264,7 @@ class ChatbotService:
     def get_personalized_products_context(self, top_k=5):
         """
         맞춤 추천 페이지와 동일한 로직으로 상품 추천 (최대 5개)
-        recommend_products 함수의 로직을 재사용하여 투자 성향 기반 가중치 적용
+        accounts.recommendation.recommend_products_for_profile을 직접 호출하여 투자 성향 기반 가중치 적용
 
         Args:
             top_k: 최대 추천 개수 (기본 5개)
@@ -265,24 +273,19 @@ class ChatbotService:
             dict: {'rag_context': str, 'recommendation_count': int}
         """
         try:
-            from accounts.views import recommend_products
-            from rest_framework.test import APIRequestFactory, force_authenticate
+            from accounts.models import InvestmentProfile
+            from accounts.recommendation import recommend_products_for_profile
 
-            # 가짜 API 요청 생성
-            factory = APIRequestFactory()
-            request = factory.get('/api/v1/accounts/recommend/')
-            force_authenticate(request, user=self.user)
-
-            # 맞춤 추천 API 호출
-            response = recommend_products(request)
-
-            if response.status_code != 200:
+            # 맞춤 추천 서비스 직접 호출 (프로필 버킷 캐시, 가짜 HTTP 요청 없음)
+            try:
+                profile = self.user.investment_profile
+            except InvestmentProfile.DoesNotExist:
                 return {
                     'rag_context': "추천 상품을 가져올 수 없습니다.",
                     'recommendation_count': 0
                 }
 
-            all_recommendations = response.data.get('recommendations', [])
+            all_recommendations = recommend_products_for_profile(profile).get('recommendations', [])
 
             # 최대 top_k개만 선택 (투자 성향 기반 가중치 점수순으로 이미 정렬됨)
             recommendations = all_recommendations[:top_k]
@@ -396,42 +399,6 @@ class ChatbotService:
 
         return True
 
-    def _calculate_deposit_profit(self, principal, months, annual_rate):
-        """
-        예금 예상 수익 계산 (단리)
-
-        Args:
-            principal: 원금 (만원)
-            months: 가입 기간 (개월)
-            annual_rate: 연 금리 (%)
-
-        Returns:
-            float: 예상 수익 (만원)
-        """
-        return principal * (annual_rate / 100) * (months / 12)
-
-    def _calculate_saving_profit(self, monthly_deposit, months, annual_rate):
-        """
-        적금 예상 수익 계산 (복리)
-
-        Args:
-            monthly_deposit: 월 납입액 (만원)
-            months: 가입 기간 (개월)
-            annual_rate: 연 금리 (%)
-
-        Returns:
-            float: 예상 수익 (만원)
-        """
-        monthly_rate = annual_rate / 100 / 12
-        total_principal = monthly_deposit * months
-
-        # 적금 복리 계산
-        future_value = 0
-        for i in range(months):
-            future_value += monthly_deposit * ((1 + monthly_rate) ** (months - i))
-
-        return future_value - total_principal
-
     def get_stock_context(self, user_profile, limit=15):
         """
         recommend_stocks API를 사용하여 주식 정보 가져오기
@@ -568,27 +535,24 @@ class ChatbotService:
             'specific_product_name': None,  # 특정 상품명이 언급된 경우
         }
 
+        matcher = get_entity_matcher()
+
         # ===== 1단계: Alias 기반 종목명 추출 =====
-        alias_matched_stocks = find_stock_by_alias(user_message)
+        # (오토마톤이 별칭 → DB 종목명까지 미리 매핑해 둠)
+        alias_matched_stocks = matcher.find_alias_stocks(user_message)
         if alias_matched_stocks:
             print(f"[DEBUG] Alias 매칭 성공: {alias_matched_stocks}")
-            # Alias로 찾은 종목명을 DB에서 검증
             for stock_name in alias_matched_stocks:
-                stock = Stock.objects.filter(name__icontains=stock_name).first()
-                if stock:
-                    result['stock_names'].append(stock.name)
-                    result['is_specific_query'] = True
-                    print(f"[DEBUG] DB 검증 완료: {stock.name}")
+                result['stock_names'].append(stock_name)
+                result['is_specific_query'] = True
+                print(f"[DEBUG] DB 검증 완료: {stock_name}")
 
-        # ===== 2단계: 추가 DB 전체 검색 (Alias에 없는 종목 대비) =====
+        # ===== 2단계: 종목명/코드 직접 매칭 (Alias에 없는 종목 대비) =====
         if not result['stock_names']:
-            stocks = Stock.objects.all()
-            for stock in stocks:
-                # 종목명 또는 코드가 정확히 포함되어 있는지 확인
-                if stock.name in user_message or stock.code in user_message:
-                    result['stock_names'].append(stock.name)
-                    result['is_specific_query'] = True
-                    print(f"[DEBUG] DB 직접 매칭: {stock.name}")
+            for stock_name in matcher.find_stocks(user_message):
+                result['stock_names'].append(stock_name)
+                result['is_specific_query'] = True
+                print(f"[DEBUG] DB 직접 매칭: {stock_name}")
 
         # 날짜 패턴 추출
         date_patterns = [
@@ -647,28 +611,16 @@ class ChatbotService:
                 break
 
         # ===== 특정 상품명 추출 (예금/적금) =====
-        # 사용자가 특정 상품명을 언급했는지 확인
-        from finances.models import DepositProducts, SavingProducts
-
-        # 예금 상품명 검사
-        all_deposits = DepositProducts.objects.all()
-        for product in all_deposits:
-            if product.fin_prdt_nm and product.fin_prdt_nm in user_message:
-                result['specific_product_name'] = product.fin_prdt_nm
+        # 사용자가 특정 상품명을 언급했는지 확인 (예금 우선, 각각 먼저 등록된 상품)
+        matched_products = matcher.find_products(user_message)
+        for kind, label in (('deposit', '예금'), ('saving', '적금')):
+            if matched_products[kind]:
+                product_name = matched_products[kind][0].name
+                result['specific_product_name'] = product_name
                 result['is_specific_query'] = True
-                print(f"[DEBUG] 특정 예금 상품 감지: {product.fin_prdt_nm}")
+                print(f"[DEBUG] 특정 {label} 상품 감지: {product_name}")
                 break
 
-        # 적금 상품명 검사 (예금에서 찾지 못한 경우)
-        if not result['specific_product_name']:
-            all_savings = SavingProducts.objects.all()
-            for product in all_savings:
-                if product.fin_prdt_nm and product.fin_prdt_nm in user_message:
-                    result['specific_product_name'] = product.fin_prdt_nm
-                    result['is_specific_query'] = True
-                    print(f"[DEBUG] 특정 적금 상품 감지: {product.fin_prdt_nm}")
-                    break
-
         # ===== 의도 분류 (INTENT CLASSIFICATION) - 개선된 점수 기반 시스템 =====
         # 핵심 주식 키워드 (명확하게 주식만을 의미)
         stock_core_keywords = ['주가', '시세', '종목', '주식', '매수', '매도', '차트', '상장', '코스피', '코스닥', '거래량']
@@ -781,7 +733,8 @@ class ChatbotService:
                         result_text += f"[{target_date}] 해당 날짜의 시세 데이터가 없습니다. (주말/휴장일 가능성)\n"
 
                 # 최근 수익률 정보
-                latest_feature = FeatureDaily.objects.filter(stock=stock).order_by('-date').first()
+                latest_feature_date = FeatureDaily.objects.filter(stock=stock).order_by('-date').values_list('date', flat=True).first()
+                latest_feature = get_feature_row(stock.code, latest_feature_date) if latest_feature_date else None
                 if latest_feature:
                     result_text += f"\n[최근 수익률 분석]\n"
                     if latest_feature.r5:
@@ -1205,230 +1158,353 @@ class ChatbotService:
 
         return system_prompt
 
-    def chat(self, user_message, chat_history=None):
+    def _build_context_sources(self, question_analysis, user_profile, intent):
         """
-        GMS API를 호출하여 AI 응답 생성
+        SERVICE 모드 컨텍스트 소스 구성 (gather_context로 동시 실행)
+        - 각 소스는 타임아웃/오류 시 fallback 값으로 대체됨
         """
-        try:
-            # 0. 챗봇 모드 분류 (최우선)
-            chat_mode = classify_chat_mode(user_message)
-            print(f"[MODE] 챗봇 모드: {chat_mode}")
-
-            # CHAT_MODE 가드: 단순 대화는 DB 조회 생략
-            if chat_mode == 'CHAT':
-                print(f"[MODE] CHAT 모드 - 간단한 대화 처리")
-
-                # 최소한의 프롬프트로 빠르게 응답
-                system_prompt = self.build_system_prompt(
-                    user_profile={'has_profile': False},
-                    products={'deposits': [], 'savings': []},
-                    stocks=[],
-                    mode="CHAT"
-                )
+        def _products():
+            # 맞춤 추천 시스템 사용: 투자 성향 기반 가중치 적용
+            if intent == 'PRODUCT':
+                print("[맞춤 추천] 투자 성향 기반 상품 선별 중...")
+                personalized_result = self.get_personalized_products_context(top_k=5)
+                # products를 문자열 형태로 저장 (기존 dict 형식 대신)
+                return {'rag_context': personalized_result['rag_context']}
+            # STOCK이나 다른 의도는 기존 방식 사용
+            return self.get_financial_products_context()
 
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ]
+        sources = {
+            'products': ContextSource(_products, {'deposits': [], 'savings': []}, SOURCE_TIMEOUTS['products']),
+            'stocks': ContextSource(lambda: self.get_stock_context(user_profile), [], SOURCE_TIMEOUTS['stocks']),
+        }
 
-                # GMS API 호출
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                }
+        stock_names = question_analysis['stock_names']
 
-                payload = {
-                    "model": "gpt-5-mini",
-                    "messages": messages,
-                    "max_completion_tokens": 1000,  # gpt-5-mini는 reasoning 토큰 포함
-                }
+        # 특정 종목/날짜 질문이면 동적 데이터 조회
+        if question_analysis['is_specific_query'] and stock_names:
+            print(f"특정 종목 조회: {stock_names}")
+            dates = question_analysis['dates'] if question_analysis['dates'] else None
+            sources['specific_data'] = ContextSource(
+                lambda: self.get_specific_stock_data(stock_names, dates), "", SOURCE_TIMEOUTS['specific_data'],
+            )
 
-                response = requests.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=30
-                )
+        # 종목명이 있으면 자동으로 종목 뉴스 수집 (뉴스 키워드 없어도 실행)
+        if stock_names:
+            print(f"[자동 뉴스 수집] 종목 감지: {stock_names}")
+            sources['stock_news'] = ContextSource(
+                lambda: self.fetch_stock_news_on_demand(stock_names), [], SOURCE_TIMEOUTS['stock_news'],
+            )
+        # 뉴스 키워드가 있으면 일반 뉴스 수집 (종목 없이 뉴스만 요청한 경우)
+        elif question_analysis['is_news_query'] and question_analysis['news_keywords']:
+            keywords = question_analysis['news_keywords']
+            print(f"[자동 뉴스 수집] 일반 뉴스 검색: {keywords}")
+            sources['general_news'] = ContextSource(
+                lambda: self.fetch_general_news_on_demand(keywords), [], SOURCE_TIMEOUTS['general_news'],
+            )
 
-                response.raise_for_status()
-                result = response.json()
-                ai_response = result['choices'][0]['message']['content']
+        return sources
 
-                # CHAT 모드 후처리
-                ai_response = self.post_process_response(ai_response, mode='CHAT')
+    def _format_stock_news(self, stock_news):
+        if not stock_news:
+            return ""
+        text = "\n=== [최신 수집] 종목별 뉴스 ===\n"
+        for stock_data in stock_news:
+            text += f"\n[{stock_data['stock_name']} ({stock_data['stock_code']})] - {stock_data['fetch_info'].get('reason', '수집 완료')}\n"
+            for i, news in enumerate(stock_data['news'], 1):
+                text += f"{i}. [{news['published']}] {news['title']}\n"
+                if news.get('description'):
+                    text += f"   {news['description']}\n"
+            text += "\n"
+        return text
 
-                return {
-                    'success': True,
-                    'response': ai_response,
-                    'recommended_products': None,  # CHAT 모드는 추천 없음
-                }
+    def _format_general_news(self, general_news):
+        if not general_news:
+            return ""
+        text = "\n=== [최신 수집] 검색 뉴스 ===\n"
+        for keyword_data in general_news:
+            text += f"\n['{keyword_data['keyword']}' 검색 결과] - {keyword_data['saved_count']}건 새로 저장됨\n"
+            for i, news in enumerate(keyword_data['news'], 1):
+                text += f"{i}. [{news['published']}] {news['title']}\n"
+                if news.get('description'):
+                    text += f"   {news['description']}\n"
+            text += "\n"
+        return text
 
-            # ===== SERVICE 모드: 기존 로직 =====
-            # 1. 사용자 질문 분석
-            question_analysis = self.analyze_user_question(user_message)
-            print(f"질문 분석: {question_analysis}")  # 디버깅
+    def _analyze_chat(self, user_message):
+        """
+        모드 분류 + (SERVICE) 질문 분석/프로필 로드 → 답변 캐시 키와 컨텍스트 수집에 같이 사용
+        """
+        # 0. 챗봇 모드 분류 (최우선)
+        chat_mode = classify_chat_mode(user_message)
+        print(f"[MODE] 챗봇 모드: {chat_mode}")
 
-            # 2. 사용자 프로필 및 기본 상품 정보 가져오기
-            user_profile = self.get_user_profile_context()
+        if chat_mode == 'CHAT':
+            return {'mode': 'CHAT', 'question_analysis': None, 'user_profile': {'has_profile': False}, 'profile_ms': 0.0}
 
-            # 맞춤 추천 시스템 사용: 투자 성향 기반 가중치 적용
-            intent = question_analysis.get('intent', 'GENERAL')
-            if intent == 'PRODUCT':
-                print("[맞춤 추천] 투자 성향 기반 상품 선별 중...")
-                personalized_result = self.get_personalized_products_context(top_k=5)
-                # products를 문자열 형태로 저장 (기존 dict 형식 대신)
-                products = {'rag_context': personalized_result['rag_context']}
-                print(f"[맞춤 추천] 선별 완료: {personalized_result['recommendation_count']}개 상품")
-            else:
-                # STOCK이나 다른 의도는 기존 방식 사용
-                products = self.get_financial_products_context()
-                print(f"예금 상품: {len(products['deposits'])}개, 적금 상품: {len(products['savings'])}개")
-
-            stocks = self.get_stock_context(user_profile)
-
-            print(f"프로필 로드 성공: {user_profile.get('has_profile')}")  # 디버깅
-            print(f"주식 종목: {len(stocks)}개")
-
-            # 3. 특정 종목/날짜 질문이면 동적 데이터 조회
-            specific_data = ""
-            if question_analysis['is_specific_query'] and question_analysis['stock_names']:
-                print(f"특정 종목 조회: {question_analysis['stock_names']}")
-                specific_data = self.get_specific_stock_data(
-                    question_analysis['stock_names'],
-                    question_analysis['dates'] if question_analysis['dates'] else None
-                )
+        # ===== SERVICE 모드 =====
+        # 1. 사용자 질문 분석
+        question_analysis = self.analyze_user_question(user_message)
+        print(f"질문 분석: {question_analysis}")  # 디버깅
 
-            # 4. 뉴스 자동 수집 (뉴스 키워드 또는 주식 종목명이 있으면 자동 실행)
-            fresh_news_data = ""
-
-            # 종목명이 있으면 자동으로 종목 뉴스 수집 (뉴스 키워드 없어도 실행)
-            if question_analysis['stock_names']:
-                print(f"[자동 뉴스 수집] 종목 감지: {question_analysis['stock_names']}")
-                stock_news = self.fetch_stock_news_on_demand(question_analysis['stock_names'])
-                if stock_news:
-                    fresh_news_data += "\n=== [최신 수집] 종목별 뉴스 ===\n"
-                    for stock_data in stock_news:
-                        fresh_news_data += f"\n[{stock_data['stock_name']} ({stock_data['stock_code']})] - {stock_data['fetch_info'].get('reason', '수집 완료')}\n"
-                        for i, news in enumerate(stock_data['news'], 1):
-                            fresh_news_data += f"{i}. [{news['published']}] {news['title']}\n"
-                            if news.get('description'):
-                                fresh_news_data += f"   {news['description']}\n"
-                        fresh_news_data += "\n"
-
-            # 뉴스 키워드가 있으면 일반 뉴스 수집 (종목 없이 뉴스만 요청한 경우)
-            elif question_analysis['is_news_query'] and question_analysis['news_keywords']:
-                print(f"[자동 뉴스 수집] 일반 뉴스 검색: {question_analysis['news_keywords']}")
-                general_news = self.fetch_general_news_on_demand(question_analysis['news_keywords'])
-                if general_news:
-                    fresh_news_data += "\n=== [최신 수집] 검색 뉴스 ===\n"
-                    for keyword_data in general_news:
-                        fresh_news_data += f"\n['{keyword_data['keyword']}' 검색 결과] - {keyword_data['saved_count']}건 새로 저장됨\n"
-                        for i, news in enumerate(keyword_data['news'], 1):
-                            fresh_news_data += f"{i}. [{news['published']}] {news['title']}\n"
-                            if news.get('description'):
-                                fresh_news_data += f"   {news['description']}\n"
-                        fresh_news_data += "\n"
-
-            # 5. 시스템 프롬프트 생성 (동적 데이터 + 최신 뉴스 + 의도 + 모드 + 질문 분석 포함)
-            system_prompt = self.build_system_prompt(
-                user_profile,
-                products,
-                stocks,
-                specific_data,
-                fresh_news_data,
-                intent=question_analysis.get('intent', 'GENERAL'),
-                mode="SERVICE",
-                question_analysis=question_analysis
-            )
+        # 2. 사용자 프로필 (추천 종목 컨텍스트가 프로필을 쓰므로 먼저 로드)
+        t_profile = time.perf_counter()
+        user_profile = self.get_user_profile_context()
+        profile_ms = round((time.perf_counter() - t_profile) * 1000, 1)
+        print(f"프로필 로드 성공: {user_profile.get('has_profile')}")  # 디버깅
 
-            # 메시지 구성
-            messages = [
-                {"role": "system", "content": system_prompt},
-            ]
+        return {
+            'mode': 'SERVICE',
+            'question_analysis': question_analysis,
+            'user_profile': user_profile,
+            'profile_ms': profile_ms,
+        }
 
-            # 대화 히스토리 추가 (선택사항)
-            if chat_history:
-                # QuerySet을 리스트로 변환한 후 최근 3개만 사용
-                history_list = list(chat_history)
-                for msg in history_list[:3]:  # 이미 역순으로 정렬되어 있으므로 처음 3개가 최근 3개
-                    messages.append({"role": "user", "content": msg.user_message})
-                    messages.append({"role": "assistant", "content": msg.ai_response})
-
-            # 현재 사용자 메시지 추가
-            messages.append({"role": "user", "content": user_message})
-
-            # GMS API 호출
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
+    def _prepare_chat(self, user_message, chat_history=None, analysis=None):
+        """
+        LLM 호출 전 단계: (SERVICE) 컨텍스트 수집 → 메시지 구성
+        chat()과 chat_stream()이 같이 사용
+        """
+        analysis = analysis or self._analyze_chat(user_message)
+        chat_mode = analysis['mode']
+
+        # CHAT_MODE 가드: 단순 대화는 DB 조회 생략
+        if chat_mode == 'CHAT':
+            print(f"[MODE] CHAT 모드 - 간단한 대화 처리")
 
-            payload = {
-                "model": "gpt-5-mini",
-                "messages": messages,
-                "max_completion_tokens": 5000,  # gpt-5-mini는 reasoning에 많은 토큰을 사용하므로 넉넉하게
+            # 최소한의 프롬프트로 빠르게 응답
+            system_prompt = self.build_system_prompt(
+                user_profile={'has_profile': False},
+                products={'deposits': [], 'savings': []},
+                stocks=[],
+                mode="CHAT"
+            )
+
+            return {
+                'mode': 'CHAT',
+                'messages': [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                'max_completion_tokens': 1000,  # gpt-5-mini는 reasoning 토큰 포함
+                'timeout': 30,
+                'products': None,
+                'stocks': None,
+                'context_timings': None,
             }
 
-            print(f"GMS API 호출 시작...")  # 디버깅
+        # ===== SERVICE 모드 =====
+        question_analysis = analysis['question_analysis']
+        user_profile = analysis['user_profile']
+        profile_ms = analysis['profile_ms']
+
+        # 3. 서로 독립인 컨텍스트 소스를 병렬 수집 (소스별 타임아웃 → 늦으면 빈 값으로 대체)
+        intent = question_analysis.get('intent', 'GENERAL')
+        sources = self._build_context_sources(question_analysis, user_profile, intent)
+        gathered, context_timings = gather_context(sources)
+        context_timings = {'profile': {'ms': profile_ms, 'status': 'ok'}, **context_timings}
+        print(f"[CONTEXT] {format_timings(context_timings)}")
+
+        products = gathered['products']
+        stocks = gathered['stocks']
+        specific_data = gathered.get('specific_data', "")
+        if 'rag_context' in products:
+            print(f"[맞춤 추천] 선별 완료")
+        else:
+            print(f"예금 상품: {len(products['deposits'])}개, 적금 상품: {len(products['savings'])}개")
+        print(f"주식 종목: {len(stocks)}개")
+
+        # 4. 뉴스 자동 수집 결과 (종목명이 있으면 종목 뉴스, 없으면 뉴스 키워드 검색)
+        fresh_news_data = ""
+        if 'stock_news' in gathered:
+            fresh_news_data = self._format_stock_news(gathered['stock_news'])
+        elif 'general_news' in gathered:
+            fresh_news_data = self._format_general_news(gathered['general_news'])
+
+        # 5. 시스템 프롬프트 생성 (동적 데이터 + 최신 뉴스 + 의도 + 모드 + 질문 분석 포함)
+        system_prompt = self.build_system_prompt(
+            user_profile,
+            products,
+            stocks,
+            specific_data,
+            fresh_news_data,
+            intent=intent,
+            mode="SERVICE",
+            question_analysis=question_analysis
+        )
 
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
+        # 메시지 구성
+        messages = [
+            {"role": "system", "content": system_prompt},
+        ]
 
-            print(f"GMS API 응답 상태: {response.status_code}")  # 디버깅
+        # 대화 히스토리 추가 (선택사항)
+        if chat_history:
+            # QuerySet을 리스트로 변환한 후 최근 3개만 사용
+            history_list = list(chat_history)
+            for msg in history_list[:3]:  # 이미 역순으로 정렬되어 있으므로 처음 3개가 최근 3개
+                messages.append({"role": "user", "content": msg.user_message})
+                messages.append({"role": "assistant", "content": msg.ai_response})
 
-            response.raise_for_status()
+        # 현재 사용자 메시지 추가
+        messages.append({"role": "user", "content": user_message})
 
-            result = response.json()
-            ai_response = result['choices'][0]['message']['content']
+        return {
+            'mode': 'SERVICE',
+            'messages': messages,
+            'max_completion_tokens': 5000,  # gpt-5-mini는 reasoning에 많은 토큰을 사용하므로 넉넉하게
+            'timeout': 60,
+            'products': products,
+            'stocks': stocks,
+            'context_timings': context_timings,
+        }
 
-            print(f"AI 응답 생성 완료")  # 디버깅
+    def _completion_request(self, plan, stream=False):
+        """
+        GMS chat/completions 호출 (공용 클라이언트)
+        - stream=False: 응답 텍스트 / stream=True: 텍스트 조각 iterator
+        - plan['timeout']은 재시도/스트리밍까지 포함한 전체 deadline
+        """
+        print(f"GMS API 호출 시작... (stream={stream})")  # 디버깅
 
-            # ===== 응답 후처리: 내부 문구 제거 + SERVICE 모드 포맷팅 =====
-            ai_response = self.post_process_response(ai_response, mode='SERVICE')
+        kwargs = {
+            'deadline': plan['timeout'],
+            'max_completion_tokens': plan['max_completion_tokens'],
+        }
+        if stream:
+            return self.llm.stream(plan['messages'], **kwargs)
 
-            # 추천 상품 파싱 (응답에서 상품 코드 추출)
-            recommended_products = self.extract_recommended_products(ai_response, products, stocks)
+        result = self.llm.complete(plan['messages'], **kwargs)
+        print(f"GMS API 응답 완료 (usage={result.get('usage')})")  # 디버깅
+        return result['choices'][0]['message']['content']
 
+    def _finish_chat(self, plan, ai_response):
+        """LLM 응답 후처리 + 추천 상품 파싱 → chat() 결과 dict"""
+        if plan['mode'] == 'CHAT':
+            # CHAT 모드 후처리
             return {
                 'success': True,
-                'response': ai_response,
-                'recommended_products': recommended_products,
+                'response': self.post_process_response(ai_response, mode='CHAT'),
+                'recommended_products': None,  # CHAT 모드는 추천 없음
             }
 
-        except requests.exceptions.Timeout:
-            print("GMS API 타임아웃")
+        # ===== 응답 후처리: 내부 문구 제거 + SERVICE 모드 포맷팅 =====
+        ai_response = self.post_process_response(ai_response, mode='SERVICE')
+
+        # 추천 상품 파싱 (응답에서 상품 코드 추출)
+        recommended_products = self.extract_recommended_products(ai_response, plan['products'], plan['stocks'])
+
+        return {
+            'success': True,
+            'response': ai_response,
+            'recommended_products': recommended_products,
+            'context_timings': plan['context_timings'],
+        }
+
+    def _error_result(self, e):
+        """chat()/chat_stream() 공통 예외 → 실패 결과 dict"""
+        if isinstance(e, CompletionTimeout):
+            print(f"GMS API 타임아웃: {e}")
             return {
                 'success': False,
                 'error': 'GMS API 타임아웃',
                 'response': '죄송합니다. 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.',
             }
-        except requests.exceptions.RequestException as e:
-            error_msg = f'GMS API 호출 실패: {str(e)}'
-            print(error_msg)
-            # 응답 본문도 출력
-            try:
-                print(f"응답 내용: {e.response.text if hasattr(e, 'response') else 'N/A'}")
-            except:
-                pass
+        if isinstance(e, CircuitOpenError):
+            print(f"GMS API 서킷 열림: {e}")
             return {
                 'success': False,
-                'error': error_msg,
-                'response': '죄송합니다. 일시적인 오류가 발생했습니다. 잠시 후 다시 시도해주세요.',
+                'error': 'GMS API 일시 중단 (circuit open)',
+                'response': '죄송합니다. 현재 AI 응답 서비스가 원활하지 않습니다. 잠시 후 다시 시도해주세요.',
             }
-        except Exception as e:
-            error_msg = f'알 수 없는 오류: {str(e)}'
+        if isinstance(e, CompletionError):
+            error_msg = f'GMS API 호출 실패: {str(e)}'
             print(error_msg)
-            import traceback
-            traceback.print_exc()
             return {
                 'success': False,
                 'error': error_msg,
-                'response': '죄송합니다. 요청을 처리할 수 없습니다.',
+                'response': '죄송합니다. 일시적인 오류가 발생했습니다. 잠시 후 다시 시도해주세요.',
             }
+        error_msg = f'알 수 없는 오류: {str(e)}'
+        print(error_msg)
+        import traceback
+        traceback.print_exc()
+        return {
+            'success': False,
+            'error': error_msg,
+            'response': '죄송합니다. 요청을 처리할 수 없습니다.',
+        }
+
+    def chat(self, user_message, chat_history=None):
+        """
+        GMS API를 호출하여 AI 응답 생성
+        """
+        try:
+            analysis = self._analyze_chat(user_message)
+
+            # 답변 캐시: 같은 질문/의도/엔티티/as_of + (SERVICE) 같은 프로필이면 LLM 호출 생략
+            # SERVICE + 대화 기록은 우회 → 실질적으로 CHAT 모드와 첫 질문만 재사용 (answer_cache 참고)
+            cache_key = make_answer_key(
+                user_message,
+                mode=analysis['mode'],
+                question_analysis=analysis['question_analysis'],
+                user_profile=analysis['user_profile'],
+                has_history=bool(chat_history),
+            )
+            cached = get_cached_answer(cache_key)
+            if cached is not None:
+                print(f"[ANSWER_CACHE] hit ({cache_key['intent']})")
+                return {**cached, 'cached': True}
+
+            plan = self._prepare_chat(user_message, chat_history, analysis=analysis)
+
+            ai_response = self._completion_request(plan)
+
+            print(f"AI 응답 생성 완료")  # 디버깅
+
+            result = self._finish_chat(plan, ai_response)
+            put_cached_answer(cache_key, result)
+            return result
+
+        except Exception as e:
+            return self._error_result(e)
+
+    def chat_stream(self, user_message, chat_history=None):
+        """
+        chat()의 스트리밍 버전 (GMS API stream=true, SSE 청크 파싱)
+        yield ("token", 텍스트 조각) ... → 마지막에 ("done", chat() 결과 dict) 또는 ("error", 실패 dict)
+        - 후처리(post_process_response)는 전체 응답이 모인 뒤 한 번 적용 → done 결과의 response가 최종본
+        """
+        try:
+            analysis = self._analyze_chat(user_message)
+
+            # 답변 캐시 hit이면 저장된 최종 응답을 토큰 1개로 바로 전달
+            cache_key = make_answer_key(
+                user_message,
+                mode=analysis['mode'],
+                question_analysis=analysis['question_analysis'],
+                user_profile=analysis['user_profile'],
+                has_history=bool(chat_history),
+            )
+            cached = get_cached_answer(cache_key)
+            if cached is not None:
+                print(f"[ANSWER_CACHE] hit ({cache_key['intent']})")
+                yield ("token", cached['response'])
+                yield ("done", {**cached, 'cached': True})
+                return
+
+            plan = self._prepare_chat(user_message, chat_history, analysis=analysis)
+            chunks = []
+            for text in self._completion_request(plan, stream=True):
+                chunks.append(text)
+                yield ("token", text)
+
+            print(f"AI 응답 생성 완료 (stream)")  # 디버깅
+            result = self._finish_chat(plan, "".join(chunks))
+            put_cached_answer(cache_key, result)
+            yield ("done", result)
+
+        except Exception as e:
+            yield ("error", self._error_result(e))
 
     def format_response_by_mode(self, ai_response, mode):
         """
@@ -1692,32 +1768,16 @@ class ChatbotService:
 
         # RAG 모드인 경우: 상품 정보를 DB에서 직접 조회
         if 'rag_context' in products:
-            # AI 응답에서 상품명 추출하여 DB 조회
-            from finances.models import DepositProducts, SavingProducts
-
-            # 예금 상품 확인
-            deposits = DepositProducts.objects.all()
-            for deposit in deposits:
-                if deposit.fin_prdt_nm in ai_response:
-                    best_option = deposit.options.order_by('-intr_rate2').first()
-                    recommended.append({
-                        'type': 'deposit',
-                        'code': deposit.fin_prdt_cd,
-                        'name': deposit.fin_prdt_nm,
-                        'bank': deposit.kor_co_nm,
-                        'rate': f"{best_option.intr_rate2:.2f}%" if best_option else '',
-                    })
-
-            # 적금 상품 확인
-            savings = SavingProducts.objects.all()
-            for saving in savings:
-                if saving.fin_prdt_nm in ai_response:
-                    best_option = saving.options.order_by('-intr_rate2').first()
+            # AI 응답에서 상품명 추출 (오토마톤 1회 스캔) → 매칭된 상품만 최고 금리 옵션 조회
+            matched = get_entity_matcher().find_products(ai_response)
+            for kind, option_model in (('deposit', DepositOptions), ('saving', SavingOptions)):
+                for ref in matched[kind]:
+                    best_option = option_model.objects.filter(product_id=ref.id).order_by('-intr_rate2').first()
                     recommended.append({
-                        'type': 'saving',
-                        'code': saving.fin_prdt_cd,
-                        'name': saving.fin_prdt_nm,
-                        'bank': saving.kor_co_nm,
+                        'type': kind,
+                        'code': ref.code,
+                        'name': ref.name,
+                        'bank': ref.bank,
                         'rate': f"{best_option.intr_rate2:.2f}%" if best_option else '',
                     })
 
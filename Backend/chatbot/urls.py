@@ -6,6 +6,7 @@ app_name = 'chatbot'
 urlpatterns = [
     # 챗봇 대화
     path('chat/', views.chat, name='chat'),
+    path('chat/stream/', views.chat_stream, name='chat_stream'),
 
     # 대화 히스토리 조회 및 삭제 (GET: 조회, DELETE: 삭제)
     path('history/', views.chat_history_handler, name='chat_history_handler'),
@@ -13,6 +14,9 @@ urlpatterns = [
     # 특정 메시지 삭제
     path('messages/<int:message_id>/', views.delete_single_message, name='delete_single_message'),
 
+    # 답변 캐시 통계 (관리자)
+    path('cache/stats/', views.get_answer_cache_stats, name='get_answer_cache_stats'),
+
     # 챗봇 아바타 조회
     path('avatar/', views.get_chatbot_avatar, name='get_chatbot_avatar'),
 ]
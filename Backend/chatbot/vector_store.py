@@ -2,33 +2,230 @@
 RAG 시스템용 벡터 스토어
 - TF-IDF 기반 로컬 임베딩으로 예금/적금 상품 벡터화
 - FAISS로 유사도 검색
+
+디스크 캐시 (chatbot/vector_index/)
+- manifest.json            : 현재 버전 + 파일 위치/개수/차원 (마지막에 원자적으로 교체)
+- v<버전>/index.faiss      : faiss.write_index → mmap으로 로드 (워커끼리 페이지 캐시 공유, 복사 없음)
+- v<버전>/vectorizer.json  : TF-IDF 파라미터 + vocabulary + idf (pickle 없이 복원)
+- v<버전>/metadata.jsonl   : 컬럼형 - 첫 줄 필드 목록, 이후 필드당 한 줄 (상품 순서대로 값 배열)
+- 다른 프로세스(build_vector_index)가 다시 만들면 manifest 버전이 바뀜
+  → get_vector_store()가 VERSION_CHECK_SEC 간격으로 확인해 재시작 없이 새 버전으로 교체
+
+증분 갱신 (상품 동기화 → update_products_index)
+- 인덱스는 IndexIDMap2: 상품마다 고정 id → (type, fin_prdt_cd) 단위로 추가/수정/삭제
+- 새 텍스트는 기존 TF-IDF 어휘로 임베딩
+- 마지막 re-fit 이후 바뀐 상품 비율 또는 어휘 밖(OOV) 토큰 비율이 임계값을 넘으면 전체 re-fit
+
+검색
+- 정규화 벡터의 내적(IndexFlatIP) = 코사인 유사도
+- 상품 타입별 하위 인덱스(index_deposit/index_saving) → 타입 필터 검색에서 top_k*3 과다 조회 안 함
+- 정규화 질의 기준 LRU 캐시 (질의 임베딩 / 검색 결과) - 인스턴스(버전)별이라 새 버전 로드 시 자연히 비워짐
+- search_many: 여러 질의를 하위 인덱스당 FAISS 호출 1번으로 처리
 """
+import json
 import os
-import pickle
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
 import numpy as np
-import faiss
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import normalize
 from django.conf import settings
 from finances.models import DepositProducts, SavingProducts
 
+
+INDEX_FORMAT = 3
+VERSION_CHECK_SEC = 5.0
+KEEP_VERSIONS = 2  # 이전 버전을 mmap 중인 워커가 있을 수 있어 하나 더 남김
+
+# 전체 re-fit 기준 (어휘 drift)
+REFIT_CHANGED_RATIO = 0.3  # 마지막 re-fit 이후 추가/수정/삭제된 상품 비율
+REFIT_OOV_MARGIN = 0.10  # 새 텍스트의 OOV 토큰 비율이 fit 당시 평균보다 이만큼 높으면
+OOV_SAMPLE = 2000  # fit 당시 평균 OOV 비율 계산에 쓸 최대 텍스트 수
+
+PRODUCT_TYPES = ('deposit', 'saving')
+QUERY_CACHE_SIZE = 1024  # 질의 임베딩 / 검색 결과 LRU 크기
+
+META_FIELDS = ('type', 'fin_prdt_cd', 'kor_co_nm', 'fin_prdt_nm', 'join_way', 'text')
+VECTORIZER_PARAMS = {
+    'max_features': 512,  # 벡터 차원
+    'ngram_range': (1, 2),  # 단어와 2-gram 사용
+    'min_df': 1,
+}
+
+# faiss / sklearn은 첫 사용 시 import (URL 로딩만 하는 관리 명령·워커 시작에서 ~0.8초 절약)
+
+
+def _faiss():
+    import faiss
+    return faiss
+
+
+def _mmap_flag():
+    # IndexFlat 계열은 IO_FLAG_MMAP_IFC여야 벡터를 메모리로 복사하지 않고 파일을 그대로 매핑
+    faiss = _faiss()
+    return getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP)
+
+
+def _tfidf_vectorizer(**params):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(**params)
+
+
+def _l2_normalize(matrix):
+    from sklearn.preprocessing import normalize
+    return normalize(matrix, norm='l2')
+
+
+def default_cache_dir():
+    return os.path.join(settings.BASE_DIR, 'chatbot', 'vector_index')
+
+
+def normalize_query(query):
+    return re.sub(r"\s+", " ", (query or "").strip().lower())
+
+
+class _LRU:
+    """스레드 안전 LRU (hit/miss 카운트)"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+def _new_index(dim):
+    # 정규화 벡터의 내적 = 코사인 유사도, 상품별 고정 id로 증분 갱신 가능하게 IDMap으로 감쌈
+    faiss = _faiss()
+    return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+
+def _write_json_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class ProductMetadata:
+    """
+    상품 메타데이터 (필드별 컬럼 리스트 + FAISS id 컬럼)
+    - 상품마다 dict를 들고 있지 않고, 검색 결과로 나갈 위치만 dict로 만듦
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns or {k: [] for k in ('id',) + META_FIELDS}
+        self._pos_by_id = None
+
+    @classmethod
+    def from_items(cls, items, ids):
+        columns = {'id': [int(i) for i in ids]}
+        columns.update({k: [item.get(k) for item in items] for k in META_FIELDS})
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def __getitem__(self, i):
+        return {k: self.columns[k][i] for k in META_FIELDS}
+
+    def position(self, faiss_id):
+        """FAISS id → 컬럼 위치 (없으면 None)"""
+        if self._pos_by_id is None:
+            self._pos_by_id = {fid: pos for pos, fid in enumerate(self.columns['id'])}
+        return self._pos_by_id.get(int(faiss_id))
+
+    def key_positions(self):
+        """(type, fin_prdt_cd) → 컬럼 위치"""
+        return {key: pos for pos, key in enumerate(zip(self.columns['type'], self.columns['fin_prdt_cd']))}
+
+    def drop(self, positions):
+        if not positions:
+            return
+        keep = [i for i in range(len(self)) if i not in positions]
+        self.columns = {k: [col[i] for i in keep] for k, col in self.columns.items()}
+        self._pos_by_id = None
+
+    def extend(self, items, ids):
+        self.columns['id'].extend(int(i) for i in ids)
+        for k in META_FIELDS:
+            self.columns[k].extend(item.get(k) for item in items)
+        self._pos_by_id = None
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'fields': list(self.columns)}) + "\n")
+            for col in self.columns.values():
+                f.write(json.dumps(col, ensure_ascii=False) + "\n")
+
+    @classmethod
+    def read(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            fields = json.loads(f.readline())['fields']
+            return cls({k: json.loads(f.readline()) for k in fields})
+
+
 class ProductVectorStore:
     """예금/적금 상품 벡터 검색 시스템"""
 
-    def __init__(self):
+    def __init__(self, cache_dir=None):
         # TF-IDF 벡터라이저 (로컬 임베딩)
-        self.vectorizer = TfidfVectorizer(
-            max_features=512,  # 벡터 차원
-            ngram_range=(1, 2),  # 단어와 2-gram 사용
-            min_df=1
-        )
-        self.embedding_dim = 512  # TF-IDF 벡터 차원
-        self.index = None
-        self.product_metadata = []  # 상품 정보 저장
-        self.product_texts = []  # 상품 텍스트 저장 (재검색용)
-        self.cache_file = os.path.join(settings.BASE_DIR, 'chatbot', 'vector_cache.pkl')
-
-    def _create_product_text(self, product, product_type):
+        self.vectorizer = _tfidf_vectorizer(**VECTORIZER_PARAMS)
+        self.embedding_dim = VECTORIZER_PARAMS['max_features']  # TF-IDF 벡터 차원 (어휘가 적으면 더 작아짐)
+        self.indexes = {}  # 상품 타입 → FAISS 인덱스
+        self.product_metadata = ProductMetadata()  # 상품 정보 저장
+        self.version = None  # 로드/저장한 manifest 버전
+        self.next_id = 0  # 다음에 붙일 FAISS id
+        self.drift = {}  # 마지막 re-fit 이후 변경 누적 (baseline_oov/changed/upserted/oov_sum)
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.manifest_file = os.path.join(self.cache_dir, 'manifest.json')
+        self._embedding_cache = _LRU(QUERY_CACHE_SIZE)
+        self._result_cache = _LRU(QUERY_CACHE_SIZE)
+
+    @property
+    def ntotal(self):
+        return sum(index.ntotal for index in self.indexes.values())
+
+    @property
+    def product_texts(self):
+        """상품 텍스트 (재검색용) - 메타데이터의 text와 같은 값"""
+        return self.product_metadata.columns['text']
+
+    @staticmethod
+    def _create_product_text(product, product_type):
         """상품 정보를 텍스트로 변환 (임베딩용)"""
         # spcl_cnd (특별 조건) 필드 사용
         special_condition = getattr(product, 'spcl_cnd', None)
@@ -47,110 +244,332 @@ class ProductVectorStore:
         주의: build_index() 후에만 사용 가능 (vectorizer가 fit되어야 함)
         """
         try:
-            vector = self.vectorizer.transform([text]).toarray()[0]
-            # L2 정규화
-            vector = vector / (np.linalg.norm(vector) + 1e-10)
-            return vector.astype(np.float32)
+            return self._embed([text])[0]
         except Exception as e:
             print(f"[ERROR] 임베딩 생성 실패: {e}")
             # 실패 시 제로 벡터 반환
             return np.zeros(self.embedding_dim, dtype=np.float32)
 
+    def _embed(self, texts):
+        """텍스트 여러 개 → L2 정규화된 float32 행렬 (현재 어휘 기준, 정규화는 희소 행렬 상태에서)"""
+        return _l2_normalize(self.vectorizer.transform(texts)).toarray().astype(np.float32)
+
+    def _query_embeddings(self, queries):
+        """정규화 질의 목록 → 임베딩 행렬 (LRU에 없는 질의만 한 번에 transform)"""
+        vectors = [self._embedding_cache.get(q) for q in queries]
+        missing = sorted({q for q, v in zip(queries, vectors) if v is None})
+        if missing:
+            try:
+                fresh = dict(zip(missing, self._embed(missing)))
+            except Exception as e:
+                print(f"[ERROR] 임베딩 생성 실패: {e}")
+                fresh = {q: np.zeros(self.embedding_dim, dtype=np.float32) for q in missing}
+            for q, v in fresh.items():
+                self._embedding_cache.put(q, v)
+            vectors = [v if v is not None else fresh[q] for q, v in zip(queries, vectors)]
+        return np.vstack(vectors).astype(np.float32)
+
+    def _oov_rate(self, texts):
+        """텍스트 토큰(1~2gram) 중 현재 어휘에 없는 비율의 평균"""
+        if not texts:
+            return 0.0
+        analyzer = self.vectorizer.build_analyzer()
+        vocab = self.vectorizer.vocabulary_
+        rates = []
+        for text in texts:
+            tokens = analyzer(text)
+            if tokens:
+                rates.append(sum(1 for t in tokens if t not in vocab) / len(tokens))
+        return float(sum(rates) / len(rates)) if rates else 0.0
+
+    # -------------------------
+    # 디스크 캐시
+    # -------------------------
+    def read_manifest(self):
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('format') != INDEX_FORMAT:
+            return None
+        return manifest
+
+    def load(self, manifest=None, writable=False):
+        """
+        manifest가 가리키는 버전을 로드 (인덱스는 mmap)
+        - writable=True: 증분 갱신용으로 메모리에 복사해서 로드 (mmap 인덱스는 읽기 전용)
+        - 파일이 없거나 개수가 안 맞으면 False
+        """
+        manifest = manifest or self.read_manifest()
+        if manifest is None:
+            return False
+
+        version_dir = os.path.join(self.cache_dir, manifest['dir'])
+        try:
+            indexes = {
+                t: _faiss().read_index(os.path.join(version_dir, f'index_{t}.faiss'), 0 if writable else _mmap_flag())
+                for t in PRODUCT_TYPES
+            }
+
+            with open(os.path.join(version_dir, 'vectorizer.json'), 'r', encoding='utf-8') as f:
+                vec = json.load(f)
+            vectorizer = _tfidf_vectorizer(**{**vec['params'], 'ngram_range': tuple(vec['params']['ngram_range'])})
+            vectorizer.vocabulary_ = vec['vocabulary']
+            vectorizer.idf_ = np.asarray(vec['idf'], dtype=np.float64)
+
+            metadata = ProductMetadata.read(os.path.join(version_dir, 'metadata.jsonl'))
+        except Exception as e:
+            print(f"[WARNING] 벡터 인덱스 로드 실패 ({manifest.get('dir')}): {e}")
+            return False
+
+        ntotal = sum(index.ntotal for index in indexes.values())
+        if ntotal != len(metadata) or ntotal != manifest['count']:
+            print(f"[WARNING] 벡터 인덱스 개수 불일치: index={ntotal} metadata={len(metadata)}")
+            return False
+
+        self.indexes = indexes
+        self.vectorizer = vectorizer
+        self.embedding_dim = manifest['dim']
+        self.product_metadata = metadata
+        self.version = manifest['version']
+        self.next_id = manifest['next_id']
+        self.drift = manifest['drift']
+        return True
+
+    def save(self):
+        """
+        새 버전 디렉터리에 쓰고 manifest를 마지막에 교체
+        - 동시에 다른 프로세스가 저장해도 디렉터리가 겹치지 않음 (버전 = 시각 + pid)
+        """
+        version = f"{int(time.time() * 1000)}-{os.getpid()}"
+        dirname = f"v{version}"
+        version_dir = os.path.join(self.cache_dir, dirname)
+        os.makedirs(version_dir, exist_ok=True)
+
+        for t, index in self.indexes.items():
+            _faiss().write_index(index, os.path.join(version_dir, f'index_{t}.faiss'))
+
+        _write_json_atomic(os.path.join(version_dir, 'vectorizer.json'), {
+            'params': VECTORIZER_PARAMS,
+            'vocabulary': {term: int(i) for term, i in self.vectorizer.vocabulary_.items()},
+            'idf': [float(x) for x in self.vectorizer.idf_],
+        })
+
+        self.product_metadata.write(os.path.join(version_dir, 'metadata.jsonl'))
+
+        _write_json_atomic(self.manifest_file, {
+            'format': INDEX_FORMAT,
+            'version': version,
+            'dir': dirname,
+            'count': int(self.ntotal),
+            'dim': int(self.embedding_dim),
+            'next_id': int(self.next_id),
+            'drift': self.drift,
+            'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        })
+        self.version = version
+        self._prune_versions(keep=dirname)
+
+    def _prune_versions(self, keep):
+        dirs = sorted(
+            (d for d in os.listdir(self.cache_dir) if d.startswith('v') and d != keep),
+            key=lambda d: os.path.getmtime(os.path.join(self.cache_dir, d)),
+            reverse=True,
+        )
+        for d in dirs[KEEP_VERSIONS - 1:]:
+            # Windows에서는 mmap 중인 파일이 지워지지 않을 수 있음 → 다음 저장 때 다시 시도
+            shutil.rmtree(os.path.join(self.cache_dir, d), ignore_errors=True)
+
+    # -------------------------
+    # 구축
+    # -------------------------
+    def _collect_products(self):
+        """DB의 예금/적금 → 메타데이터 리스트"""
+        return product_items('deposit') + product_items('saving')
+
+    def build_from_metadata(self, items, save=True):
+        """메타데이터 리스트로 TF-IDF 학습 + FAISS 인덱스 생성 (+ 디스크 저장)"""
+        print(f"[INFO] 총 {len(items)}개 상품 벡터화 중...")
+
+        # TF-IDF 벡터라이저 학습
+        print("[INFO] TF-IDF 벡터라이저 학습 중...")
+        vectorizer = _tfidf_vectorizer(**VECTORIZER_PARAMS)
+        tfidf_matrix = vectorizer.fit_transform([item['text'] for item in items])
+
+        # L2 정규화
+        embeddings_array = _l2_normalize(tfidf_matrix).toarray().astype(np.float32)
+        print(f"[INFO] 임베딩 생성 완료: {embeddings_array.shape}")
+
+        # 상품 타입별 내적(코사인) 인덱스
+        ids = np.arange(len(items), dtype=np.int64)
+        types = np.asarray([item['type'] for item in items])
+        dim = embeddings_array.shape[1]
+        indexes = {}
+        for t in PRODUCT_TYPES:
+            mask = types == t
+            indexes[t] = _new_index(dim)
+            if mask.any():
+                indexes[t].add_with_ids(embeddings_array[mask], ids[mask])
+
+        self.vectorizer = vectorizer
+        self.indexes = indexes
+        self.embedding_dim = dim
+        self.product_metadata = ProductMetadata.from_items(items, ids)
+        self.next_id = len(items)
+        self.drift = {
+            'baseline_oov': round(self._oov_rate([item['text'] for item in items[:OOV_SAMPLE]]), 4),
+            'changed': 0,
+            'upserted': 0,
+            'oov_sum': 0.0,
+        }
+        print(f"[INFO] FAISS 인덱스 구축 완료: {self.ntotal}개 벡터 ({', '.join(f'{t}={i.ntotal}' for t, i in indexes.items())})")
+
+        if save:
+            try:
+                self.save()
+                print(f"[INFO] 캐시 저장 완료: {self.cache_dir} (version={self.version})")
+            except Exception as e:
+                print(f"[WARNING] 캐시 저장 실패: {e}")
+
     def build_index(self, force_rebuild=False):
         """
         벡터 인덱스 구축 (초기화 또는 재구축)
         - force_rebuild=True: 캐시 무시하고 재구축
         - force_rebuild=False: 캐시 있으면 로드
         """
-        # 캐시 확인
-        if not force_rebuild and os.path.exists(self.cache_file):
-            print("[INFO] 캐시된 벡터 인덱스 로드 중...")
-            try:
-                with open(self.cache_file, 'rb') as f:
-                    cache_data = pickle.load(f)
-                    self.index = cache_data['index']
-                    self.product_metadata = cache_data['metadata']
-                    self.vectorizer = cache_data['vectorizer']  # vectorizer도 로드
-                    self.product_texts = cache_data.get('texts', [])
-                print(f"[INFO] 캐시 로드 완료: {len(self.product_metadata)}개 상품")
+        if not force_rebuild:
+            if self.load():
+                print(f"[INFO] 캐시 로드 완료: {len(self.product_metadata)}개 상품 (version={self.version})")
                 return
-            except Exception as e:
-                print(f"[WARNING] 캐시 로드 실패: {e}. 재구축합니다.")
 
         print("[INFO] 벡터 인덱스 구축 시작...")
-
-        # 1. 모든 상품 가져오기
-        deposits = DepositProducts.objects.all()
-        savings = SavingProducts.objects.all()
-
-        all_products = []
-
-        # 예금 추가
-        for deposit in deposits:
-            all_products.append({
-                'type': 'deposit',
-                'product': deposit,
-                'text': self._create_product_text(deposit, '예금')
-            })
-
-        # 적금 추가
-        for saving in savings:
-            all_products.append({
-                'type': 'saving',
-                'product': saving,
-                'text': self._create_product_text(saving, '적금')
-            })
-
-        if not all_products:
+        items = self._collect_products()
+        if not items:
             print("[WARNING] 상품 데이터가 없습니다.")
             return
 
-        print(f"[INFO] 총 {len(all_products)}개 상품 벡터화 중...")
+        self.build_from_metadata(items)
 
-        # 2. TF-IDF 벡터라이저 학습
-        texts = [item['text'] for item in all_products]
-        self.product_texts = texts  # 저장
+    def _needs_refit(self):
+        total = max(len(self.product_metadata), 1)
+        if self.drift['changed'] / total >= REFIT_CHANGED_RATIO:
+            return True
+        if self.drift['upserted']:
+            oov = self.drift['oov_sum'] / self.drift['upserted']
+            return oov - self.drift['baseline_oov'] >= REFIT_OOV_MARGIN
+        return False
 
-        print("[INFO] TF-IDF 벡터라이저 학습 중...")
-        tfidf_matrix = self.vectorizer.fit_transform(texts)
-
-        # L2 정규화
-        embeddings_array = normalize(tfidf_matrix, norm='l2').toarray().astype(np.float32)
-        print(f"[INFO] 임베딩 생성 완료: {embeddings_array.shape}")
+    def apply_changes(self, upserts, removed=(), save=True):
+        """
+        증분 갱신 (writable 로드 또는 build 직후 인스턴스에서만)
+        - upserts: 추가/수정할 상품 메타데이터 리스트 (기존 (type, fin_prdt_cd)면 교체)
+        - removed: 삭제할 (type, fin_prdt_cd) 목록
+        - 어휘 drift가 임계값을 넘으면 현재 메타데이터 전체로 re-fit
+        """
+        t0 = time.perf_counter()
+        if not self.indexes:
+            self.build_from_metadata(list(upserts), save=save)
+            return {'added': len(upserts), 'updated': 0, 'removed': 0, 'refit': True,
+                    'ms': round((time.perf_counter() - t0) * 1000, 1)}
+
+        key_pos = self.product_metadata.key_positions()
+        upsert_keys = {(item['type'], item['fin_prdt_cd']) for item in upserts}
+        removed_keys = set(removed) - upsert_keys
+        drop = {key_pos[k] for k in upsert_keys | removed_keys if k in key_pos}
+
+        updated = sum(1 for k in upsert_keys if k in key_pos)
+        stats = {
+            'added': len(upsert_keys) - updated,
+            'updated': updated,
+            'removed': sum(1 for k in removed_keys if k in key_pos),
+        }
+
+        if drop:
+            columns = self.product_metadata.columns
+            for t in PRODUCT_TYPES:
+                drop_ids = [columns['id'][p] for p in drop if columns['type'][p] == t]
+                if drop_ids:
+                    self.indexes[t].remove_ids(np.asarray(drop_ids, dtype=np.int64))
+            self.product_metadata.drop(drop)
+
+        if upserts:
+            texts = [item['text'] for item in upserts]
+            ids = np.arange(self.next_id, self.next_id + len(upserts), dtype=np.int64)
+            embeddings = self._embed(texts)
+            types = np.asarray([item['type'] for item in upserts])
+            for t in PRODUCT_TYPES:
+                mask = types == t
+                if mask.any():
+                    self.indexes[t].add_with_ids(embeddings[mask], ids[mask])
+            self.product_metadata.extend(upserts, ids)
+            self.next_id += len(upserts)
+            self.drift['upserted'] += len(upserts)
+            self.drift['oov_sum'] += self._oov_rate(texts) * len(upserts)
+        self.drift['changed'] += stats['added'] + stats['updated'] + stats['removed']
+
+        stats['refit'] = self._needs_refit()
+        if stats['refit']:
+            print(f"[INFO] 어휘 drift 임계값 초과 → 전체 re-fit ({self.drift})")
+            self.build_from_metadata(list(self.product_metadata), save=False)
+
+        if save:
+            self.save()
+        stats['ms'] = round((time.perf_counter() - t0) * 1000, 1)
+        return stats
+
+    def _search_embeddings(self, embeddings, top_k, product_type=None):
+        """
+        임베딩 행렬(질의 n개) → 질의별 결과 리스트
+        - product_type이 있으면 그 타입 인덱스만, 없으면 타입별 top_k를 합쳐 다시 top_k
+        """
+        types = [product_type] if product_type else list(PRODUCT_TYPES)
+        merged = [[] for _ in range(len(embeddings))]
+        for t in types:
+            index = self.indexes.get(t)
+            if index is None or index.ntotal == 0:
+                continue
+            scores, ids = index.search(embeddings, min(top_k, index.ntotal))
+            for row, (row_scores, row_ids) in enumerate(zip(scores, ids)):
+                merged[row].extend((float(sc), int(fid)) for sc, fid in zip(row_scores, row_ids) if fid >= 0)
 
-        # 3. 메타데이터 저장
-        self.product_metadata = []
-        for item in all_products:
-            product = item['product']
-            self.product_metadata.append({
-                'type': item['type'],
-                'fin_prdt_cd': product.fin_prdt_cd,
-                'kor_co_nm': product.kor_co_nm,
-                'fin_prdt_nm': product.fin_prdt_nm,
-                'join_way': product.join_way,
-                'text': item['text']
-            })
+        results = []
+        for hits in merged:
+            hits.sort(key=lambda h: -h[0])
+            rows = []
+            for score, faiss_id in hits[:top_k]:
+                pos = self.product_metadata.position(faiss_id)
+                if pos is None:
+                    continue
+                rows.append({
+                    **self.product_metadata[pos],
+                    'similarity_score': max(score, 0.0),  # 코사인 유사도
+                })
+            results.append(rows)
+        return results
 
-        # 4. FAISS 인덱스 생성
+    def search_many(self, queries, top_k=5, product_type=None):
+        """
+        여러 질의를 한 번에 검색 (질의 임베딩은 한 번에 transform, 하위 인덱스당 FAISS 호출 1번)
 
-        # L2 거리 기반 인덱스 (유사도 검색)
-        self.index = faiss.IndexFlatL2(self.embedding_dim)
-        self.index.add(embeddings_array)
+        Returns:
+            list: 질의 순서대로 search()와 같은 결과 리스트
+        """
+        if not self.indexes or not self.product_metadata:
+            print("[WARNING] 벡터 인덱스가 없습니다. build_index()를 먼저 호출하세요.")
+            return [[] for _ in queries]
 
-        print(f"[INFO] FAISS 인덱스 구축 완료: {self.index.ntotal}개 벡터")
+        keys = [(normalize_query(q), top_k, product_type) for q in queries]
+        results = [self._result_cache.get(key) for key in keys]
+        todo = sorted({key[0] for key, r in zip(keys, results) if r is None})
+        if todo:
+            fresh = dict(zip(todo, self._search_embeddings(self._query_embeddings(todo), top_k, product_type)))
+            for q, rows in fresh.items():
+                self._result_cache.put((q, top_k, product_type), rows)
+            results = [r if r is not None else fresh[key[0]] for key, r in zip(keys, results)]
 
-        # 5. 캐시 저장
-        try:
-            with open(self.cache_file, 'wb') as f:
-                pickle.dump({
-                    'index': self.index,
-                    'metadata': self.product_metadata,
-                    'vectorizer': self.vectorizer,  # vectorizer 저장
-                    'texts': self.product_texts
-                }, f)
-            print(f"[INFO] 캐시 저장 완료: {self.cache_file}")
-        except Exception as e:
-            print(f"[WARNING] 캐시 저장 실패: {e}")
+        # 캐시된 리스트를 호출자가 고쳐도 안전하도록 복사본 반환
+        return [[dict(row) for row in rows] for rows in results]
 
     def search(self, query, top_k=5, product_type=None):
         """
@@ -164,39 +583,14 @@ class ProductVectorStore:
         Returns:
             list: 유사 상품 메타데이터 리스트
         """
-        if self.index is None or not self.product_metadata:
-            print("[WARNING] 벡터 인덱스가 없습니다. build_index()를 먼저 호출하세요.")
-            return []
-
-        # 1. 쿼리 임베딩
-        query_embedding = self._get_embedding(query)
-        query_embedding = query_embedding.reshape(1, -1)
+        return self.search_many([query], top_k, product_type)[0]
 
-        # 2. 검색 (상품 타입 필터링 고려하여 더 많이 가져오기)
-        search_k = top_k * 3 if product_type else top_k
-        distances, indices = self.index.search(query_embedding, search_k)
-
-        # 3. 결과 수집
-        results = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx >= len(self.product_metadata):
-                continue
-
-            metadata = self.product_metadata[idx]
-
-            # 상품 타입 필터링
-            if product_type and metadata['type'] != product_type:
-                continue
-
-            results.append({
-                **metadata,
-                'similarity_score': float(1 / (1 + distance))  # 거리를 유사도로 변환
-            })
-
-            if len(results) >= top_k:
-                break
-
-        return results
+    def cache_stats(self):
+        return {
+            'version': self.version,
+            'embeddings': self._embedding_cache.stats(),
+            'results': self._result_cache.stats(),
+        }
 
     def get_context_string(self, query, top_k=5, product_type=None):
         """
@@ -227,14 +621,95 @@ class ProductVectorStore:
         return context.strip()
 
 
+def product_items(product_type, queryset=None):
+    """예금/적금 모델 → 벡터 스토어 메타데이터 리스트"""
+    model, label = (DepositProducts, '예금') if product_type == 'deposit' else (SavingProducts, '적금')
+    qs = queryset if queryset is not None else model.objects.all()
+    return [
+        {
+            'type': product_type,
+            'fin_prdt_cd': product.fin_prdt_cd,
+            'kor_co_nm': product.kor_co_nm,
+            'fin_prdt_nm': product.fin_prdt_nm,
+            'join_way': product.join_way,
+            'text': ProductVectorStore._create_product_text(product, label),
+        }
+        for product in qs.only('fin_prdt_cd', 'kor_co_nm', 'fin_prdt_nm', 'join_way', 'spcl_cnd')
+    ]
+
+
 # 전역 인스턴스 (싱글톤)
+_lock = threading.Lock()
+_update_lock = threading.Lock()
 _vector_store = None
+_checked_at = 0.0
+
 
 def get_vector_store():
-    """벡터 스토어 싱글톤 인스턴스 가져오기"""
-    global _vector_store
-    if _vector_store is None:
-        _vector_store = ProductVectorStore()
-        # 초기화 시 인덱스 로드 또는 구축
-        _vector_store.build_index(force_rebuild=False)
-    return _vector_store
+    """
+    벡터 스토어 싱글톤 인스턴스 가져오기
+    - VERSION_CHECK_SEC 간격으로 manifest 버전 확인 → 바뀌었으면 새 버전을 로드해 교체
+      (검색 중인 요청은 이전 인스턴스를 그대로 씀)
+    """
+    global _vector_store, _checked_at
+    with _lock:
+        now = time.monotonic()
+        if _vector_store is None:
+            store = ProductVectorStore()
+            # 초기화 시 인덱스 로드 또는 구축
+            store.build_index(force_rebuild=False)
+            _vector_store = store
+            _checked_at = now
+        elif now - _checked_at >= VERSION_CHECK_SEC:
+            _checked_at = now
+            manifest = _vector_store.read_manifest()
+            if manifest is not None and manifest['version'] != _vector_store.version:
+                store = ProductVectorStore(cache_dir=_vector_store.cache_dir)
+                if store.load(manifest):
+                    print(f"[INFO] 벡터 인덱스 새 버전 로드: {store.version}")
+                    _vector_store = store
+        return _vector_store
+
+
+def apply_product_changes(upserts, removed=()):
+    """
+    최신 버전을 메모리로 복사해 증분 갱신 → 새 버전 저장 → 이 프로세스 싱글톤 교체
+    (다른 워커는 manifest 버전 확인으로 따라옴)
+    """
+    global _vector_store, _checked_at
+    with _update_lock:
+        store = ProductVectorStore()
+        if store.load(writable=True):
+            stats = store.apply_changes(upserts, removed)
+        else:
+            # 캐시가 없으면 DB 전체로 구축 (DB는 이미 동기화된 상태)
+            t0 = time.perf_counter()
+            store.build_index(force_rebuild=True)
+            stats = {'added': len(upserts), 'updated': 0, 'removed': len(removed), 'refit': True,
+                     'ms': round((time.perf_counter() - t0) * 1000, 1)}
+
+        # 검색용으로는 방금 저장한 버전을 mmap으로 다시 올림
+        fresh = ProductVectorStore(cache_dir=store.cache_dir)
+        if not fresh.load():
+            fresh = store
+    with _lock:
+        _vector_store = fresh
+        _checked_at = time.monotonic()
+    return stats
+
+
+def update_products_index(product_type, changes):
+    """
+    상품 동기화 후 호출: finances.product_sync.ChangeSet 기준으로
+    새로 생긴/상품 필드가 바뀐 상품은 다시 임베딩, 사라진 상품은 제거 (옵션만 바뀐 상품은 텍스트가 같으므로 건너뜀)
+    """
+    model = DepositProducts if product_type == 'deposit' else SavingProducts
+    codes = list(changes.added) + list(changes.fields_changed)
+    removed = [(product_type, code) for code in changes.removed]
+    if not codes and not removed:
+        return {'added': 0, 'updated': 0, 'removed': 0, 'refit': False, 'ms': 0.0}
+
+    upserts = product_items(product_type, model.objects.filter(fin_prdt_cd__in=codes))
+    stats = apply_product_changes(upserts, removed)
+    print(f"[INFO] 벡터 인덱스 증분 갱신 ({product_type}): {stats}")
+    return stats
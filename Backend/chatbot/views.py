@@ -1,10 +1,16 @@
+import json
+import time
+
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 from .models import ChatMessage, ChatSession
 from .serializers import ChatMessageSerializer, ChatRequestSerializer, ChatSessionSerializer
 from .services import ChatbotService
+from .answer_cache import cache_stats as answer_cache_stats
 
 
 @api_view(['POST'])
@@ -60,6 +66,89 @@ def chat(request):
         )
 
 
+def _sse(event, data):
+    """Server-Sent Events 한 건 (event + JSON data)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Accept: text/event-stream 협상용 (EventSource / fetch-event-source가 보내는 헤더 → 없으면 406)
+    - 정상 응답은 StreamingHttpResponse라 렌더러를 거치지 않음
+    - 400/401 같은 DRF Response만 여기로 옴 → error 이벤트 한 건으로
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return _sse('error', data).encode(self.charset)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def chat_stream(request):
+    """
+    챗봇과 대화하기 (스트리밍)
+    POST /chatbot/chat/stream/
+    Body: { "message": "예금 상품 추천해주세요" }
+    Response: text/event-stream
+      - event: token  data: {"text": "..."}          (LLM 토큰 조각, 후처리 전)
+      - event: done   data: ChatMessage + ttft_ms/total_ms (후처리된 최종 응답, DB 저장 완료)
+      - event: error  data: {"error", "ai_response"}
+    """
+    serializer = ChatRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    user = request.user
+    user_message = serializer.validated_data['message']
+    chatbot = ChatbotService(user)
+    chat_history = ChatMessage.objects.filter(user=user).order_by('-created_at')[:5]
+    started = time.perf_counter()
+
+    def event_stream():
+        ttft_ms = None
+        try:
+            for kind, data in chatbot.chat_stream(user_message, chat_history):
+                if kind == 'token':
+                    if ttft_ms is None:
+                        ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+                    yield _sse('token', {'text': data})
+                    continue
+
+                if kind == 'error' or not data.get('success'):
+                    print(f"챗봇 AI 응답 실패: {data.get('error')}")
+                    yield _sse('error', {
+                        'error': data.get('error', '알 수 없는 오류'),
+                        'ai_response': data.get('response', '죄송합니다. 일시적인 오류가 발생했습니다.'),
+                    })
+                    return
+
+                # 스트림이 끝나면 최종(후처리된) 응답을 DB에 저장
+                chat_message = ChatMessage.objects.create(
+                    user=user,
+                    user_message=user_message,
+                    ai_response=data['response'],
+                    recommended_products=data.get('recommended_products'),
+                )
+                payload = dict(ChatMessageSerializer(chat_message).data)
+                payload['ttft_ms'] = ttft_ms
+                payload['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+                yield _sse('done', payload)
+        except Exception as e:
+            print(f"챗봇 스트리밍 중 예외 발생: {str(e)}")
+            yield _sse('error', {'error': f'서버 오류: {str(e)}', 'ai_response': '죄송합니다. 요청을 처리할 수 없습니다.'})
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 버퍼링 끄기
+    return response
+
+
 @api_view(['GET', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def chat_history_handler(request):
@@ -130,3 +219,14 @@ def get_chatbot_avatar(request):
             'risk_type': None,
             'risk_score': None,
         }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_answer_cache_stats(request):
+    """
+    챗봇 답변 캐시 hit/miss/bypass 통계 (현재 프로세스 기준, 의도별)
+    - SERVICE 모드는 같은 프로필 + 대화 기록 없는 요청만 캐시 대상 → bypass_rate 같이 확인
+    GET /chatbot/cache/stats/
+    """
+    return Response(answer_cache_stats(), status=status.HTTP_200_OK)
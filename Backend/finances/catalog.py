@@ -0,0 +1,249 @@
+# finances/catalog.py
+"""
+추천용 상품 카탈로그(ProductCatalog) 갱신
+- 예/적금 동기화(sync_deposits/sync_savings, 서버 시작 자동 동기화) 직후 refresh_product_catalog() 호출
+- 상품/옵션을 타입별 2번의 쿼리로 읽어 메모리에서 계산 → 한 트랜잭션으로 교체
+- recommend_products는 카탈로그만 읽으므로 요청마다 옵션 쿼리/정규식 파싱이 없음
+- catalog_state(): 카탈로그 버전(행 수 + 마지막 갱신 시각) + 나이 경계값, 프로세스 memo
+  (VERSION_CHECK_SEC 간격으로만 DB 확인, 같은 프로세스의 refresh는 즉시 반영)
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import DepositProducts, ProductCatalog, SavingProducts
+
+
+PRODUCT_MODELS = {
+    "deposit": DepositProducts,
+    "saving": SavingProducts,
+}
+
+# "만18세이상", "만65세미만" 등 (기존 _is_eligible_for_product와 같은 패턴, 각 패턴의 첫 매칭만 사용)
+MIN_AGE_PATTERNS = [r'만(\d+)세\s*이상', r'(\d+)세\s*이상']
+MAX_AGE_PATTERNS = [r'만(\d+)세\s*미만', r'(\d+)세\s*미만']
+
+# catalog_state() memo를 DB와 다시 맞추는 간격(초) (다른 프로세스의 동기화 반영 지연 상한)
+VERSION_CHECK_SEC = 5.0
+
+# 부분 재계산(codes) 상한: 넘으면 타입 전체 재계산 (SQLite IN 절 변수 수 제한)
+PARTIAL_REFRESH_MAX = 500
+
+CATALOG_FIELDS = [
+    "product_id", "kor_co_nm", "fin_prdt_nm", "join_way", "join_member", "spcl_cnd",
+    "excludes_male", "excludes_female", "min_age", "max_age",
+    "condition_complexity", "join_convenience", "max_rate", "options", "updated_at",
+]
+
+
+def parse_join_member(join_member: Optional[str]) -> Dict:
+    """
+    가입 대상 문자열 → 성별/나이 제한 컬럼
+    - 여러 패턴이 걸리면 전부 만족해야 하므로 이상은 최댓값, 미만은 최솟값
+    """
+    parsed = {"excludes_male": False, "excludes_female": False, "min_age": None, "max_age": None}
+    if not join_member or join_member == "제한없음":
+        return parsed
+
+    parsed["excludes_male"] = "여성" in join_member
+    parsed["excludes_female"] = "남성" in join_member
+
+    mins = [int(m.group(1)) for m in (re.search(p, join_member) for p in MIN_AGE_PATTERNS) if m]
+    maxs = [int(m.group(1)) for m in (re.search(p, join_member) for p in MAX_AGE_PATTERNS) if m]
+    parsed["min_age"] = max(mins) if mins else None
+    parsed["max_age"] = min(maxs) if maxs else None
+    return parsed
+
+
+def evaluate_condition_complexity(spcl_cnd):
+    """
+    우대조건 복잡도 평가
+
+    Args:
+        spcl_cnd: 특별 조건 문자열
+
+    Returns:
+        str: 'low' (조건 1~2개), 'medium' (3~4개), 'high' (5개 이상)
+    """
+    if not spcl_cnd or len(spcl_cnd.strip()) < 10:
+        return 'low'
+
+    # 조건 개수 파악 (줄바꿈, 숫자+점, 하이픈 등으로 구분)
+    condition_markers = ['\n', '1.', '2.', '3.', '4.', '5.', '-', '•']
+    condition_count = sum(spcl_cnd.count(marker) for marker in condition_markers)
+
+    if condition_count <= 2:
+        return 'low'
+    elif condition_count <= 4:
+        return 'medium'
+    else:
+        return 'high'
+
+
+def evaluate_join_convenience(join_way):
+    """
+    가입 방법 편의성 평가
+
+    Args:
+        join_way: 가입 방법 문자열
+
+    Returns:
+        int: 편의성 점수 (0~10점)
+    """
+    if not join_way:
+        return 0
+
+    join_way_lower = join_way.lower()
+    score = 0
+
+    # 인터넷/모바일 가입 가능 → 가장 편리
+    if '인터넷' in join_way or '모바일' in join_way or '스마트폰' in join_way or 'app' in join_way_lower:
+        score += 10
+    # 영업점만 가능 → 불편
+    elif '영업점' in join_way or '창구' in join_way:
+        score += 3
+    else:
+        score += 5
+
+    return min(score, 10)
+
+
+def _rate_sort_key(opt: Dict):
+    """우대금리 내림차순(None은 맨 뒤), 같으면 id 오름차순"""
+    rate = opt["intr_rate2"]
+    return (rate is None, -(rate or 0), opt["id"])
+
+
+def best_options(options: Iterable) -> List[Dict]:
+    """가입 기간별 최고 우대금리 옵션만 남겨 _rate_sort_key 순으로 정렬"""
+    by_term: Dict[int, Dict] = {}
+    for o in options:
+        opt = {
+            "id": o.id, "save_trm": o.save_trm, "intr_rate": o.intr_rate, "intr_rate2": o.intr_rate2,
+            # 적금만 있는 필드 (예상 수익 계산: 단리/월복리, 정액/자유)
+            "intr_rate_type": getattr(o, "intr_rate_type", None), "rsrv_type": o.rsrv_type,
+        }
+        cur = by_term.get(o.save_trm)
+        if cur is None or _rate_sort_key(opt) < _rate_sort_key(cur):
+            by_term[o.save_trm] = opt
+    return sorted(by_term.values(), key=_rate_sort_key)
+
+
+def catalog_row(product_type: str, product) -> ProductCatalog:
+    """상품(+prefetch된 options) → 저장 전 ProductCatalog"""
+    options = best_options(product.options.all())
+    rates = [o["intr_rate2"] for o in options if o["intr_rate2"] is not None]
+    return ProductCatalog(
+        product_type=product_type,
+        product_id=product.id,
+        fin_prdt_cd=product.fin_prdt_cd,
+        kor_co_nm=product.kor_co_nm,
+        fin_prdt_nm=product.fin_prdt_nm,
+        join_way=product.join_way,
+        join_member=product.join_member,
+        spcl_cnd=product.spcl_cnd,
+        condition_complexity=evaluate_condition_complexity(product.spcl_cnd),
+        join_convenience=evaluate_join_convenience(product.join_way),
+        max_rate=max(rates) if rates else None,
+        options=options,
+        **parse_join_member(product.join_member),
+    )
+
+
+def refresh_product_catalog(product_type: Optional[str] = None, codes: Optional[Iterable[str]] = None) -> Dict:
+    """
+    카탈로그 재계산 (product_type 지정 시 해당 타입만)
+    - 상품/옵션 2쿼리 + bulk upsert + 사라진 상품 삭제, 한 트랜잭션
+    - codes: 이 상품 코드들만 다시 계산 (동기화 ChangeSet의 추가/변경/삭제 코드, product_type 필수)
+    반환: {"deposit": {"rows", "removed"}, ..., "ms"}
+    """
+    t0 = time.perf_counter()
+    types = [product_type] if product_type else list(PRODUCT_MODELS)
+    targets = sorted(set(codes)) if codes is not None else None
+    if targets is not None and not product_type:
+        raise ValueError("codes는 product_type과 함께 지정해야 합니다.")
+    if targets is not None and len(targets) > PARTIAL_REFRESH_MAX:
+        targets = None  # 대부분 바뀌었으면 IN 절 대신 타입 전체 재계산
+    result: Dict = {}
+
+    with transaction.atomic():
+        for ptype in types:
+            products = PRODUCT_MODELS[ptype].objects.prefetch_related("options").order_by("id")
+            existing = ProductCatalog.objects.filter(product_type=ptype)
+            if targets is not None:
+                products = products.filter(fin_prdt_cd__in=targets)
+                existing = existing.filter(fin_prdt_cd__in=targets)
+            rows = [catalog_row(ptype, p) for p in products]
+            live = {r.fin_prdt_cd for r in rows}
+
+            # 사라진 상품 삭제 (IN 절 변수 수 제한 때문에 batch로)
+            stale = sorted(set(existing.values_list("fin_prdt_cd", flat=True)) - live)
+            for i in range(0, len(stale), 500):
+                ProductCatalog.objects.filter(product_type=ptype, fin_prdt_cd__in=stale[i:i + 500]).delete()
+            ProductCatalog.objects.bulk_create(
+                rows,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["product_type", "fin_prdt_cd"],
+                update_fields=CATALOG_FIELDS,
+            )
+            result[ptype] = {"rows": len(rows), "removed": len(stale)}
+
+    invalidate_catalog_state()
+    result["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+# -------------------------
+# 카탈로그 버전 (추천 캐시 키)
+# -------------------------
+_state_lock = threading.Lock()
+_state: Dict = {"version": None, "age_bounds": (), "checked_at": 0.0}
+
+
+def _load_state() -> Tuple[str, Tuple[int, ...]]:
+    agg = ProductCatalog.objects.aggregate(n=Count("id"), ts=Max("updated_at"))
+    version = f"{agg['n']}:{agg['ts'].isoformat() if agg['ts'] else '-'}"
+    bounds = set()
+    # Meta.ordering 컬럼이 DISTINCT에 섞이지 않도록 order_by() 비움
+    for lo, hi in ProductCatalog.objects.order_by().values_list("min_age", "max_age").distinct():
+        bounds.update(v for v in (lo, hi) if v is not None)
+    return version, tuple(sorted(bounds))
+
+
+def catalog_state() -> Tuple[str, Tuple[int, ...]]:
+    """
+    (카탈로그 버전, 가입 나이 경계값 정렬 튜플)
+    - 나이 경계값 사이 구간 안에서는 가입 가능 여부가 같음 → 추천 캐시가 나이를 구간으로 묶을 때 사용
+    """
+    now = time.monotonic()
+    with _state_lock:
+        if _state["version"] is not None and now - _state["checked_at"] < VERSION_CHECK_SEC:
+            return _state["version"], _state["age_bounds"]
+
+    version, bounds = _load_state()
+    with _state_lock:
+        _state.update(version=version, age_bounds=bounds, checked_at=now)
+    return version, bounds
+
+
+def invalidate_catalog_state() -> None:
+    """다음 catalog_state() 호출 때 DB에서 다시 확인"""
+    with _state_lock:
+        _state["version"] = None
+
+
+def ensure_product_catalog() -> bool:
+    """카탈로그가 비어 있는데 상품은 있으면 (마이그레이션 직후 등) 한 번 채움, 채웠으면 True"""
+    if ProductCatalog.objects.exists():
+        return False
+    if not (DepositProducts.objects.exists() or SavingProducts.objects.exists()):
+        return False
+    refresh_product_catalog()
+    return True
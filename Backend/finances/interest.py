@@ -0,0 +1,124 @@
+# finances/interest.py
+"""
+예/적금 이자 계산 (닫힌 식 + NumPy 배치)
+- 금액 단위는 호출 쪽 그대로 (화면/추천은 만원), 금리는 연 %, 기간은 개월
+- 금리 유형 intr_rate_type: 'S' 단리 / 'M' 월복리 (SavingOptions, FSS 코드 그대로)
+- 적립 유형 rsrv_type: 'S' 정액적립식 / 'F' 자유적립식
+  · 자유적립식은 납입액이 정해져 있지 않으므로 "매달 같은 금액 납입"으로 가정 → 정액과 같은 식
+- 예금 이자(원금 A, 월이율 j = 연이율/1200, n개월)
+  · 단리: A·j·n  (코드는 기존 계산과 같은 순서 A·(r/100)·(n/12) → 절사 결과까지 동일)
+  · 월복리: A·((1+j)^n − 1)
+- 적금 이자(월 납입 A, 매월 초 납입 → k번째 납입은 n−k+1개월 운용)
+  · 단리: A·j·n(n+1)/2
+  · 월복리: A·(1+j)·((1+j)^n − 1)/j − A·n   (기존 월별 루프 Σ A(1+j)^(n−i) − A·n 과 같은 값)
+- project_interest(): 옵션 N개 × 금액 M개 이자 행렬을 한 번에 계산 (비교 그리드 API)
+"""
+from __future__ import annotations
+
+import math
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+
+SIMPLE = "S"     # 단리
+COMPOUND = "M"   # 월복리
+FIXED = "S"      # 정액적립식
+FREE = "F"       # 자유적립식
+
+INTEREST_TAX_RATE = 0.154  # 이자소득세 14% + 지방소득세 1.4%
+
+
+def _growth_minus_one(j: float, n: float) -> float:
+    """(1+j)^n − 1 (작은 금리에서도 정확하게 expm1/log1p, 스칼라는 math가 numpy보다 훨씬 빠름)"""
+    return math.expm1(n * math.log1p(j))
+
+
+def deposit_interest(principal, months, annual_rate, rate_type: Optional[str] = SIMPLE) -> float:
+    """
+    예금 만기 이자 (세전)
+
+    Args:
+        principal: 원금
+        months: 가입 기간 (개월)
+        annual_rate: 연 금리 (%)
+        rate_type: 'S' 단리(기본) / 'M' 월복리
+
+    Returns:
+        float: 이자 (원금과 같은 단위)
+    """
+    rate = annual_rate or 0
+    if rate_type == COMPOUND:
+        return principal * _growth_minus_one(rate / 1200, months)
+    return principal * (rate / 100) * (months / 12)
+
+
+def installment_interest(
+    monthly_deposit, months, annual_rate, rate_type: Optional[str] = COMPOUND, rsrv_type: Optional[str] = FIXED
+) -> float:
+    """
+    적금 만기 이자 (세전, 매월 초 납입)
+
+    Args:
+        monthly_deposit: 월 납입액
+        months: 가입 기간 (개월)
+        annual_rate: 연 금리 (%)
+        rate_type: 'S' 단리 / 'M' 월복리(기본, 기존 계산과 동일)
+        rsrv_type: 'S' 정액 / 'F' 자유 (자유적립식도 매달 같은 금액 가정)
+
+    Returns:
+        float: 이자 (납입액과 같은 단위)
+    """
+    j = (annual_rate or 0) / 1200
+    if rate_type == SIMPLE:
+        return monthly_deposit * j * months * (months + 1) / 2
+    if j == 0:
+        return 0.0
+    return monthly_deposit * ((1 + j) * _growth_minus_one(j, months) / j - months)
+
+
+def project_interest(
+    product_type: str,
+    rates: Sequence[float],
+    terms: Sequence[int],
+    amounts: Iterable[float],
+    rate_types: Optional[Sequence[Optional[str]]] = None,
+) -> np.ndarray:
+    """
+    옵션 N개 × 금액 M개 세전 이자 행렬 (N, M)
+
+    Args:
+        product_type: 'deposit'(amounts = 원금) / 'saving'(amounts = 월 납입액)
+        rates: 옵션별 연 금리 (%), None/음수는 0으로
+        terms: 옵션별 가입 기간 (개월)
+        amounts: 비교할 금액들
+        rate_types: 옵션별 'S'/'M' (None이면 예금 단리, 적금 월복리)
+    """
+    r = np.asarray([x if x is not None and x > 0 else 0.0 for x in rates], dtype=np.float64)
+    n = np.asarray(terms, dtype=np.float64)
+    a = np.asarray(list(amounts), dtype=np.float64)
+    j = r / 1200
+
+    default = SIMPLE if product_type == "deposit" else COMPOUND
+    kinds = [t or default for t in rate_types] if rate_types is not None else [default] * len(r)
+    compound = np.asarray([t == COMPOUND for t in kinds], dtype=bool)
+
+    growth = np.expm1(n * np.log1p(j))
+    if product_type == "deposit":
+        per_unit = np.where(compound, growth, j * n)
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            compound_unit = np.where(j > 0, (1 + j) * growth / np.where(j > 0, j, 1) - n, 0.0)
+        per_unit = np.where(compound, compound_unit, j * n * (n + 1) / 2)
+
+    # 이자는 금액에 비례 → 옵션별 단위 이자 × 금액 (외적)
+    return np.outer(per_unit, a)
+
+
+def principal_total(product_type: str, terms: Sequence[int], amounts: Iterable[float]) -> np.ndarray:
+    """project_interest와 같은 모양의 납입 원금 합계 (예금: 원금 / 적금: 월 납입액 × 기간)"""
+    a = np.asarray(list(amounts), dtype=np.float64)
+    n = np.asarray(terms, dtype=np.float64)
+    if product_type == "deposit":
+        return np.broadcast_to(a, (len(n), len(a))).copy()
+    return np.outer(n, a)
@@ -0,0 +1,93 @@
+# finances/management/commands/bench_interest.py
+from __future__ import annotations
+
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from finances.interest import COMPOUND, SIMPLE, deposit_interest, installment_interest, project_interest
+from finances.models import SavingOptions
+
+
+def _legacy_saving_profit(monthly_deposit, months, annual_rate):
+    """기존 _calculate_saving_profit: 월별 루프 복리 (int 변환 전 값)"""
+    monthly_rate = annual_rate / 100 / 12
+    total_principal = monthly_deposit * months
+    future_value = 0
+    for i in range(months):
+        future_value += monthly_deposit * ((1 + monthly_rate) ** (months - i))
+    return future_value - total_principal
+
+
+def _legacy_simple_saving(monthly_deposit, months, annual_rate):
+    """단리 적금 월별 합 (닫힌 식 검증용): k번째 납입은 months-k+1개월 운용"""
+    return sum(monthly_deposit * annual_rate / 1200 * (months - k) for k in range(months))
+
+
+class Command(BaseCommand):
+    help = "이자 계산 벤치마크: 월별 루프 vs 닫힌 식 vs NumPy 배치 (적금 옵션 × 납입액 그리드)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--options", type=int, default=0, help="0이면 DB 적금 옵션, 아니면 가짜 옵션 N개")
+        parser.add_argument("--amounts", type=str, default="10,30,50,100,200,300")
+
+    def handle(self, *args, **opts):
+        amounts = [float(x) for x in opts["amounts"].split(",") if x.strip()]
+        if opts["options"]:
+            rnd = random.Random(0)
+            rows = [
+                (round(rnd.uniform(1.0, 6.0), 2), rnd.choice([6, 12, 24, 36, 60]), rnd.choice([SIMPLE, COMPOUND]))
+                for _ in range(opts["options"])
+            ]
+        else:
+            rows = [
+                (r or 0.0, t, k or COMPOUND)
+                for r, t, k in SavingOptions.objects.filter(save_trm__gt=0).values_list("intr_rate2", "save_trm", "intr_rate_type")
+            ]
+        rates, terms, kinds = zip(*rows)
+        cells = len(rows) * len(amounts)
+        self.stdout.write(self.style.NOTICE(
+            f"[bench_interest] options={len(rows)} amounts={len(amounts)} cells={cells}"
+        ))
+
+        # 1) 기존: 옵션 × 금액마다 월별 루프 (기존 코드는 금리 유형 무시하고 전부 복리)
+        t0 = time.perf_counter()
+        legacy = [[_legacy_saving_profit(a, t, r) for a in amounts] for r, t, _ in rows]
+        t_legacy = time.perf_counter() - t0
+
+        # 2) 닫힌 식 (스칼라, 같은 복리 가정)
+        t0 = time.perf_counter()
+        closed = [[installment_interest(a, t, r) for a in amounts] for r, t, _ in rows]
+        t_closed = time.perf_counter() - t0
+
+        # 3) NumPy 배치 (옵션 금리 유형 반영)
+        t0 = time.perf_counter()
+        grid = project_interest("saving", rates, terms, amounts, rate_types=kinds)
+        t_batch = time.perf_counter() - t0
+
+        # 검증: 닫힌 식 == 루프, 배치 == 스칼라(유형 반영), 단리 닫힌 식 == 월별 합
+        err_closed = float(np.max(np.abs(np.asarray(closed) - np.asarray(legacy))))
+        typed = np.asarray([[installment_interest(a, t, r, rate_type=k) for a in amounts] for r, t, k in rows])
+        err_batch = float(np.max(np.abs(grid - typed)))
+        sample = rows[:200]
+        err_simple = max(
+            abs(installment_interest(a, t, r, rate_type=SIMPLE) - _legacy_simple_saving(a, t, r))
+            for r, t, _ in sample for a in amounts
+        )
+        err_deposit = float(np.max(np.abs(
+            project_interest("deposit", rates, terms, amounts)
+            - np.asarray([[deposit_interest(a, t, r) for a in amounts] for r, t, _ in rows])
+        )))
+
+        self.stdout.write(f"  monthly loop  : {t_legacy * 1000:.1f} ms ({t_legacy / cells * 1e6:.2f} us/cell)")
+        self.stdout.write(f"  closed form   : {t_closed * 1000:.1f} ms ({t_closed / cells * 1e6:.2f} us/cell)")
+        self.stdout.write(f"  numpy batch   : {t_batch * 1000:.2f} ms ({t_batch / cells * 1e6:.3f} us/cell)")
+        tol = 1e-6 * max(amounts)
+        ok = max(err_closed, err_batch, err_simple, err_deposit) < tol
+        style = self.style.SUCCESS if ok else self.style.ERROR
+        self.stdout.write(style(
+            f"  speedup x{t_legacy / max(t_closed, 1e-9):.1f} (closed), x{t_legacy / max(t_batch, 1e-9):.0f} (batch) | "
+            f"max err closed={err_closed:.2e} batch={err_batch:.2e} simple={err_simple:.2e} deposit={err_deposit:.2e}"
+        ))
@@ -0,0 +1,178 @@
+# finances/management/commands/bench_product_sync.py
+from __future__ import annotations
+
+import copy
+import functools
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from finances.management.commands.bench_recommend_products import _QueryCounter
+from finances.product_sync import SPECS, normalize_payload, sync_products
+
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / "fixtures"
+
+
+def _load_fixture(name):
+    # dumpdata로 만든 파일이라 UTF-8 BOM이 붙어 있음
+    with open(FIXTURE_DIR / name, encoding="utf-8-sig") as f:
+        return json.load(f)
+
+
+def fixture_payload(product_type, scale=1):
+    """fixtures → FSS 응답 형태 {"baseList", "optionList"} (scale > 1이면 코드에 접미사를 붙여 복제)"""
+    products = _load_fixture(f"{product_type}_products.json")
+    options = _load_fixture(f"{product_type}_options.json")
+    code_by_pk = {p["pk"]: p["fields"]["fin_prdt_cd"] for p in products}
+
+    base, opts = [], []
+    for k in range(scale):
+        suffix = f"-{k}" if k else ""
+        for p in products:
+            base.append(dict(p["fields"], fin_prdt_cd=p["fields"]["fin_prdt_cd"] + suffix))
+        for o in options:
+            fields = {f: v for f, v in o["fields"].items() if f != "product"}
+            opts.append(dict(fields, fin_prdt_cd=code_by_pk[o["fields"]["product"]] + suffix))
+    return {"baseList": base, "optionList": opts}
+
+
+def modified_payload(payload):
+    """
+    다음 날 응답 흉내: 옵션 금리 10%를 0.1%p 인상, 상품 5% 이름 변경,
+    상품 3% 제거(옵션 포함), 새 상품 3% 추가
+    """
+    data = copy.deepcopy(payload)
+    for i, opt in enumerate(data["optionList"]):
+        if i % 10 == 0 and opt.get("intr_rate2") is not None:
+            opt["intr_rate2"] = round(opt["intr_rate2"] + 0.1, 2)
+    base = data["baseList"]
+    for i, prod in enumerate(base):
+        if i % 20 == 1:
+            prod["fin_prdt_nm"] = prod["fin_prdt_nm"] + " (개편)"
+    dropped = {p["fin_prdt_cd"] for i, p in enumerate(base) if i % 33 == 2}
+    extra = [dict(p, fin_prdt_cd=p["fin_prdt_cd"] + "-NEW") for i, p in enumerate(base) if i % 33 == 3]
+    extra_opts = [dict(o, fin_prdt_cd=o["fin_prdt_cd"] + "-NEW") for o in data["optionList"]
+                  if o["fin_prdt_cd"] in {p["fin_prdt_cd"][:-4] for p in extra}]
+    data["baseList"] = [p for p in base if p["fin_prdt_cd"] not in dropped] + extra
+    data["optionList"] = [o for o in data["optionList"] if o["fin_prdt_cd"] not in dropped] + extra_opts
+    return data
+
+
+def _to_float_or_none(v):
+    if v is None or v == "":
+        return None
+    return float(v)
+
+
+def legacy_sync(product_type, data):
+    """기존 sync_deposits/sync_savings: 상품/옵션마다 update_or_create + 옵션마다 상품 조회 (삭제 없음)"""
+    spec = SPECS[product_type]
+    Product, Option = spec.product_model, spec.option_model
+    for prod in data.get("baseList", []):
+        defaults = {f: prod.get(f) for f in spec.product_fields}
+        defaults.update(kor_co_nm=prod.get("kor_co_nm", ""), fin_prdt_nm=prod.get("fin_prdt_nm", ""),
+                        join_deny=prod.get("join_deny", 1))
+        Product.objects.update_or_create(fin_prdt_cd=prod["fin_prdt_cd"], defaults=defaults)
+    for opt in data.get("optionList", []):
+        product = Product.objects.filter(fin_prdt_cd=opt["fin_prdt_cd"]).first()
+        if not product:
+            continue
+        lookup = {k: opt.get(k) for k in spec.option_keys}
+        lookup["save_trm"] = int(opt.get("save_trm", 0) or 0)
+        defaults = {f: opt.get(f) for f in spec.option_fields}
+        defaults.update(intr_rate=_to_float_or_none(opt.get("intr_rate")),
+                        intr_rate2=_to_float_or_none(opt.get("intr_rate2")))
+        Option.objects.update_or_create(product=product, **lookup, defaults=defaults)
+
+
+def db_state(product_type):
+    """DB → normalize_payload와 같은 모양 (검증용)"""
+    spec = SPECS[product_type]
+    products = {
+        row.pop("fin_prdt_cd"): row
+        for row in spec.product_model.objects.values("fin_prdt_cd", *spec.product_fields)
+    }
+    options = {code: {} for code in products}
+    for row in spec.option_model.objects.values("product__fin_prdt_cd", *spec.option_keys, *spec.option_fields):
+        code = row.pop("product__fin_prdt_cd")
+        key = tuple(row.pop(k) for k in spec.option_keys)
+        options[code][key] = row
+    return products, options
+
+
+def _clear(product_type):
+    spec = SPECS[product_type]
+    spec.option_model.objects.all().delete()
+    spec.product_model.objects.all().delete()
+
+
+class Command(BaseCommand):
+    help = "예/적금 동기화 벤치마크: 기존 update_or_create 루프 vs bulk diff 동기화 (fixtures 기반, DB는 롤백)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", choices=list(SPECS), default=None, help="생략하면 예금/적금 모두")
+        parser.add_argument("--scale", type=int, default=1, help="fixtures 상품을 N배로 복제")
+        parser.add_argument("--delete-missing", action="store_true", help="응답에 없는 상품 삭제 (sync_products delete_missing)")
+
+    def _measure(self, fn, *args):
+        counter = _QueryCounter()
+        t0 = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            result = fn(*args)
+        return result, (time.perf_counter() - t0) * 1000, counter.count
+
+    def handle(self, *args, **opts):
+        types = [opts["type"]] if opts["type"] else list(SPECS)
+        sync = functools.partial(sync_products, delete_missing=opts["delete_missing"])
+        all_ok = True
+        for product_type in types:
+            base = fixture_payload(product_type, max(opts["scale"], 1))
+            nxt = modified_payload(base)
+            self.stdout.write(self.style.NOTICE(
+                f"[bench_product_sync] {product_type}: products={len(base['baseList'])} "
+                f"options={len(base['optionList'])} (scale={opts['scale']})"
+            ))
+
+            with transaction.atomic():
+                rows = []
+                for label, payload in (("initial", base), ("resync", base), ("modified", nxt)):
+                    # 같은 시작 상태에서 비교: 기존 방식 측정 후 되돌리고 새 방식 측정
+                    sid = transaction.savepoint()
+                    if label == "initial":
+                        _clear(product_type)
+                    _, t_old, q_old = self._measure(legacy_sync, product_type, payload)
+                    transaction.savepoint_rollback(sid)
+
+                    if label == "initial":
+                        _clear(product_type)
+                    changes, t_new, q_new = self._measure(sync, product_type, payload)
+                    rows.append((label, t_old, q_old, t_new, q_new, changes))
+
+                    # 검증: 동기화 후 DB == 정규화된 응답 (+ 삭제하지 않은 missing 상품은 그대로 남아 있어야 함)
+                    expected_products, expected_options = normalize_payload(product_type, payload)[:2]
+                    products, options = db_state(product_type)
+                    kept = set(changes.missing) - set(changes.removed)
+                    ok = kept <= set(products) and (
+                        {c: v for c, v in products.items() if c not in kept},
+                        {c: v for c, v in options.items() if c not in kept},
+                    ) == (expected_products, expected_options)
+                    all_ok &= ok
+                    if not ok:
+                        self.stdout.write(self.style.ERROR(f"  {label}: DB 상태가 응답과 다름"))
+                transaction.set_rollback(True)
+
+            for label, t_old, q_old, t_new, q_new, changes in rows:
+                self.stdout.write(
+                    f"  {label:<9}: legacy {t_old:8.1f} ms / {q_old:5d} queries | "
+                    f"bulk {t_new:7.1f} ms / {q_new:3d} queries (x{t_old / max(t_new, 1e-6):.1f}) | "
+                    f"{changes.summary().rsplit(' (', 1)[0]}"
+                )
+            resync = rows[1][5]
+            all_ok &= not resync.has_changes
+
+        style = self.style.SUCCESS if all_ok else self.style.ERROR
+        self.stdout.write(style(f"[bench_product_sync] DB 상태 일치 + 재동기화 무변경: {'OK' if all_ok else 'FAIL'}"))
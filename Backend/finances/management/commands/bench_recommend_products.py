@@ -0,0 +1,286 @@
+# finances/management/commands/bench_recommend_products.py
+from __future__ import annotations
+
+import random
+import re
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import InvestmentProfile
+from accounts.recommendation import (
+    _calculate_product_ratio,
+    _calculate_risk_adjusted_score,
+    build_product_recommendations,
+    invalidate_recommendation_cache,
+    recommend_products_for_profile,
+    recommendation_cache_stats,
+)
+from accounts.views import recommend_products
+from finances.catalog import catalog_state, refresh_product_catalog
+from finances.interest import deposit_interest, installment_interest
+from finances.models import DepositOptions, DepositProducts, SavingOptions, SavingProducts
+
+
+SAMPLE_PROFILES = [
+    {"risk_type": "timid_male", "gender": "M", "age": 25, "savings": 500, "investment_goal": "비상금", "investment_period": 6},
+    {"risk_type": "normal_female", "gender": "F", "age": 34, "savings": 3000, "investment_goal": "주택구매", "investment_period": 24},
+    {"risk_type": "speculative_male", "gender": "M", "age": 17, "savings": 8000, "investment_goal": "노후준비", "investment_period": 36},
+    {"risk_type": "timid_female", "gender": "F", "age": 67, "savings": None, "investment_goal": None, "investment_period": None},
+    {"risk_type": "normal_male", "gender": None, "age": None, "savings": 1500, "investment_goal": "결혼", "investment_period": 12},
+]
+JOIN_MEMBERS = [None, "제한없음", "실명의 개인", "만18세이상 개인", "만19세 이상 만34세 이하 청년", "만65세미만 개인",
+                "여성 고객", "만60세이상 남성", "만17세이상 만39세미만 개인"]
+TERMS = [1, 3, 6, 12, 24, 36]
+
+
+class _QueryCounter:
+    """실행된 SQL 수 (CaptureQueriesContext는 9000개에서 잘려 대규모 레거시 측정에 못 씀)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _legacy_eligible(join_member, user_gender, user_age):
+    """기존 _is_eligible_for_product (요청마다 정규식 파싱)"""
+    if not join_member or join_member == "제한없음":
+        return True
+    if user_gender:
+        if '여성' in join_member and user_gender == 'M':
+            return False
+        if '남성' in join_member and user_gender == 'F':
+            return False
+    if user_age:
+        age_patterns = [
+            (r'만(\d+)세\s*이상', lambda match: user_age >= int(match.group(1))),
+            (r'만(\d+)세\s*미만', lambda match: user_age < int(match.group(1))),
+            (r'(\d+)세\s*이상', lambda match: user_age >= int(match.group(1))),
+            (r'(\d+)세\s*미만', lambda match: user_age < int(match.group(1))),
+        ]
+        for pattern, check_func in age_patterns:
+            match = re.search(pattern, join_member)
+            if match and not check_func(match):
+                return False
+    return True
+
+
+def _legacy_candidates(profile):
+    """기존 recommend_products 후보 계산: annotate + 상품마다 옵션 쿼리 1~2번"""
+    user_period = profile.investment_period
+    principal_amount = int(profile.savings) if profile.savings else 1000
+    out = {}
+    for ptype, model in (("deposit", DepositProducts), ("saving", SavingProducts)):
+        products = model.objects.annotate(
+            max_rate=Max('options__intr_rate2')
+        ).prefetch_related('options').filter(max_rate__isnull=False).order_by('-max_rate', 'id')
+        rows = []
+        for p in products:
+            if not _legacy_eligible(p.join_member, profile.gender, profile.age):
+                continue
+            period_match = None
+            if user_period:
+                period_match = p.options.filter(
+                    save_trm__gte=user_period - 6, save_trm__lte=user_period + 6
+                ).order_by('-intr_rate2', 'id').first()
+            option = period_match or p.options.order_by('-intr_rate2', 'id').first()
+            if not option:
+                continue
+            rate = float(option.intr_rate2) if option.intr_rate2 else 0
+            if ptype == "deposit":
+                profit = int(deposit_interest(principal_amount, option.save_trm, rate))
+            else:
+                profit = int(installment_interest(100, option.save_trm, rate, rate_type=option.intr_rate_type))
+            rows.append({
+                "type": ptype,
+                "fin_prdt_cd": p.fin_prdt_cd,
+                "save_trm": option.save_trm,
+                "intr_rate2": rate,
+                "expected_profit": profit,
+                "risk_adjusted_score": _calculate_risk_adjusted_score(profile, p, option),
+            })
+        out[ptype] = rows
+
+    deposit_count, saving_count = _calculate_product_ratio(
+        savings_amount=int(profile.savings) if profile.savings else 0,
+        investment_period=user_period or 12,
+        investment_goal=profile.investment_goal or "",
+    )
+    selected = out["deposit"][:deposit_count] + out["saving"][:saving_count]
+    selected.sort(key=lambda x: x["risk_adjusted_score"], reverse=True)
+    return selected, len(out["deposit"]), len(out["saving"])
+
+
+def _brief(rec):
+    return {
+        "type": rec["type"],
+        "fin_prdt_cd": rec["product"]["fin_prdt_cd"],
+        "save_trm": rec["option"]["save_trm"],
+        "intr_rate2": rec["option"]["intr_rate2"],
+        "expected_profit": rec["expected_profit"],
+        "risk_adjusted_score": rec["risk_adjusted_score"],
+    }
+
+
+def _add_synthetic_products(n: int, seed: int = 0):
+    """대규모 카탈로그 흉내: 예금/적금 각 n개, 상품당 옵션 3~6개"""
+    rnd = random.Random(seed)
+    for ptype, product_model, option_model in (
+        ("deposit", DepositProducts, DepositOptions),
+        ("saving", SavingProducts, SavingOptions),
+    ):
+        products = product_model.objects.bulk_create([
+            product_model(
+                fin_prdt_cd=f"SYN-{ptype}-{i:06d}",
+                kor_co_nm=f"가짜은행{i % 20}",
+                fin_prdt_nm=f"합성 {ptype} {i}",
+                join_way=rnd.choice(["인터넷,스마트폰", "영업점", "영업점,인터넷", "전화(텔레뱅킹)"]),
+                join_member=rnd.choice(JOIN_MEMBERS),
+                spcl_cnd="\n".join(f"{k}. 우대조건 {k}" for k in range(1, rnd.randint(1, 6) + 1)),
+            )
+            for i in range(n)
+        ], batch_size=1000)
+        option_model.objects.bulk_create([
+            option_model(
+                product=p,
+                save_trm=term,
+                intr_rate=round(rnd.uniform(1.5, 3.5), 2),
+                intr_rate2=round(rnd.uniform(2.0, 5.0), 2),
+            )
+            for p in products
+            for term in rnd.sample(TERMS, rnd.randint(3, 6))
+        ], batch_size=2000)
+
+
+class Command(BaseCommand):
+    help = (
+        "예/적금 추천 벤치마크: 상품별 옵션 쿼리 + 정규식 파싱 vs 미리 계산된 ProductCatalog 한 번 조회 "
+        "vs 프로필 버킷 캐시 (쿼리 수/지연/결과 일치)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=0, help="추가할 가짜 예금/적금 수(각각), 0이면 DB 상품만")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        # 가짜 사용자/상품은 전부 롤백
+        with transaction.atomic():
+            self._run(opts)
+            transaction.set_rollback(True)
+
+    def _run(self, opts):
+        if opts["products"]:
+            _add_synthetic_products(opts["products"])
+
+        t0 = time.perf_counter()
+        refreshed = refresh_product_catalog()
+        t_refresh = time.perf_counter() - t0
+
+        User = get_user_model()
+        factory = APIRequestFactory()
+        self.stdout.write(self.style.NOTICE(
+            f"[bench_recommend_products] deposits={refreshed['deposit']['rows']} savings={refreshed['saving']['rows']} "
+            f"profiles={len(SAMPLE_PROFILES)} repeat={opts['repeat']} catalog_refresh={t_refresh * 1000:.0f}ms"
+        ))
+
+        catalog_state()  # 카탈로그 버전/나이 경계값 memo 채움 (요청마다 다시 읽지 않음)
+        t_legacy = t_new = t_view_hit = t_hit = 0.0
+        q_legacy, q_new, q_view_hit, q_hit, same = [], [], [], [], 0
+        variants_hit = variants_same = n_variants = 0
+        for i, fields in enumerate(SAMPLE_PROFILES):
+            user = User.objects.create_user(username=f"bench_reco_{i}", password="x")
+            InvestmentProfile.objects.create(user=user, **fields)
+
+            for _ in range(opts["repeat"]):
+                profile = InvestmentProfile.objects.get(user=user)
+                counter = _QueryCounter()
+                with connection.execute_wrapper(counter):
+                    t0 = time.perf_counter()
+                    legacy, n_dep, n_sav = _legacy_candidates(profile)
+                    t_legacy += time.perf_counter() - t0
+                q_legacy.append(counter.count)
+
+                # 카탈로그 경로 (캐시 비운 상태)
+                invalidate_recommendation_cache()
+                data, t, q = self._call_view(factory, User, user)
+                t_new += t
+                q_new.append(q)
+
+                # 같은 사용자 재요청 (버킷 hit: 프로필 조회 1쿼리만)
+                _, t, q = self._call_view(factory, User, user)
+                t_view_hit += t
+                q_view_hit.append(q)
+
+                # 챗봇처럼 서비스 직접 호출 (프로필 이미 있음)
+                counter = _QueryCounter()
+                with connection.execute_wrapper(counter):
+                    t0 = time.perf_counter()
+                    recommend_products_for_profile(profile)
+                    t_hit += time.perf_counter() - t0
+                q_hit.append(counter.count)
+
+            fresh = [_brief(r) for r in data["recommendations"]]
+            ok = (
+                fresh == legacy
+                and data["total_deposits_available"] == n_dep
+                and data["total_savings_available"] == n_sav
+            )
+            same += ok
+
+            # 같은 버킷으로 묶이는 변형 프로필: 캐시 결과가 새로 계산한 결과와 같아야 함
+            for change in ({"age": (fields["age"] or 0) + 1}, {"investment_goal": f"{fields['investment_goal'] or ''} 계획"}):
+                variant = InvestmentProfile(**{**fields, **change})
+                before = recommendation_cache_stats()["hits"]
+                cached = recommend_products_for_profile(variant)
+                variants_hit += recommendation_cache_stats()["hits"] - before
+                body = build_product_recommendations(variant)
+                variants_same += all(cached[k] == v for k, v in body.items())
+                n_variants += 1
+
+            self.stdout.write(
+                f"  {fields['risk_type']:<18} age={fields['age']} period={fields['investment_period']} "
+                f"available={n_dep}+{n_sav} same={ok}"
+            )
+
+        calls = len(SAMPLE_PROFILES) * opts["repeat"]
+        self.stdout.write(
+            f"  legacy       : {t_legacy / calls * 1000:.1f} ms/request queries={min(q_legacy)}~{max(q_legacy)}"
+        )
+        self.stdout.write(
+            f"  catalog      : {t_new / calls * 1000:.2f} ms/request queries={min(q_new)}~{max(q_new)} (profile + catalog)"
+        )
+        self.stdout.write(
+            f"  cached view  : {t_view_hit / calls * 1000:.2f} ms/request queries={max(q_view_hit)} (profile)"
+        )
+        self.stdout.write(
+            f"  service hit  : {t_hit / calls * 1000:.3f} ms/call queries={max(q_hit)} | "
+            f"variants hit={variants_hit}/{n_variants} same={variants_same}/{n_variants}"
+        )
+        self.stdout.write(f"  cache stats  : {recommendation_cache_stats()}")
+        ok = (
+            same == len(SAMPLE_PROFILES) and max(q_new) <= 2 and max(q_hit) == 0
+            and variants_same == n_variants
+        )
+        style = self.style.SUCCESS if ok else self.style.ERROR
+        self.stdout.write(style(
+            f"  speedup x{t_legacy / max(t_new, 1e-9):.1f} (catalog), x{t_legacy / max(t_hit, 1e-9):.0f} (cache hit), "
+            f"same_result={same}/{len(SAMPLE_PROFILES)}, constant_queries={max(q_new) <= 2}"
+        ))
+        invalidate_recommendation_cache()
+
+    def _call_view(self, factory, User, user):
+        request = factory.get("/accounts/recommendations/")
+        force_authenticate(request, user=User.objects.get(pk=user.pk))
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            t0 = time.perf_counter()
+            data = recommend_products(request).data
+            elapsed = time.perf_counter() - t0
+        return data, elapsed, counter.count
@@ -0,0 +1,148 @@
+# finances/management/commands/bench_startup.py
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# 시작 경로(django.setup + URLConf)에서 import되면 안 되는 무거운 라이브러리 (첫 사용 시 lazy import)
+HEAVY_LIBS = ["yfinance", "pandas", "faiss", "sklearn", "scipy", "FinanceDataReader", "numpy"]
+FORBIDDEN_DEFAULT = "yfinance,pandas,faiss,sklearn,FinanceDataReader"
+
+# 새 인터프리터에서 실행: runserver/워커가 첫 요청 전에 하는 일 = 앱 로드(ready 포함) + URLConf(views) import
+_PROBE = """
+import importlib, json, time
+t0 = time.perf_counter()
+import django
+django.setup()
+t1 = time.perf_counter()
+if {urls!r}:
+    from django.conf import settings
+    importlib.import_module(settings.ROOT_URLCONF)
+t2 = time.perf_counter()
+print(json.dumps({{"setup_ms": (t1 - t0) * 1000, "urls_ms": (t2 - t1) * 1000}}))
+"""
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime 출력 → [(모듈, 누적 us, 부모 모듈 or None)]
+    출력은 후위 순회(자식이 먼저, 들여쓰기 2칸 = 깊이 1)라 스택으로 부모를 찾음
+    """
+    rows, stack = [], []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        name = name.strip()
+        idx = len(rows)
+        rows.append([name, int(cum), None])
+        while stack and stack[-1][0] > depth:
+            rows[stack.pop()[1]][2] = name
+        stack.append((depth, idx))
+    return [tuple(r) for r in rows]
+
+
+def group_times(rows):
+    """
+    최상위 패키지별 포함(inclusive) import 시간(ms)
+    - 다른 패키지에서 처음 import된 모듈의 누적 시간을 더함 → 앱이 끌어온 라이브러리 시간까지 포함
+      (그래서 chatbot에 sklearn이 포함되면 sklearn 줄에도 따로 나옴, 합계는 중복)
+    """
+    totals = defaultdict(float)
+    for name, cum, parent in rows:
+        top = name.split(".")[0]
+        if parent is None or parent.split(".")[0] != top:
+            totals[top] += cum / 1000
+    return totals
+
+
+class Command(BaseCommand):
+    help = "서버 시작 벤치마크: 새 프로세스에서 django.setup() + URLConf import 시간, 앱/라이브러리별 import 시간"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="반복 횟수 (중앙값 보고)")
+        parser.add_argument("--setup-only", action="store_true", help="URLConf(views) import 제외 (관리 명령 시작 경로)")
+        parser.add_argument("--top", type=int, default=8, help="앱 외 패키지 상위 N개 표시")
+        parser.add_argument("--forbid", type=str, default=FORBIDDEN_DEFAULT,
+                            help="시작 경로에서 import되면 실패로 표시할 라이브러리 (쉼표 구분, 빈 값이면 검사 안 함)")
+
+    def _probe(self, urls):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "Finflow.settings"))
+        env.pop("RUN_MAIN", None)  # runserver 자식 프로세스 흉내 X (FINANCES_SYNC_ON_STARTUP 스레드 방지)
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE.format(urls=urls)],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=False,
+        )
+        wall_ms = (time.perf_counter() - t0) * 1000
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr[-2000:])
+        timings = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings["wall_ms"] = wall_ms
+        return timings, parse_importtime(proc.stderr)
+
+    def handle(self, *args, **opts):
+        runs = max(opts["runs"], 1)
+        urls = not opts["setup_only"]
+        base = Path(settings.BASE_DIR).resolve()
+        local_apps = [
+            cfg.name.split(".")[0] for cfg in apps.get_app_configs()
+            if Path(cfg.path).resolve().is_relative_to(base)
+        ]
+        self.stdout.write(self.style.NOTICE(
+            f"[bench_startup] runs={runs} path={'setup+urls' if urls else 'setup'} apps={','.join(local_apps)}"
+        ))
+
+        timings, groups, loaded = defaultdict(list), defaultdict(list), set()
+        for _ in range(runs):
+            t, rows = self._probe(urls)
+            for k, v in t.items():
+                timings[k].append(v)
+            totals = group_times(rows)
+            for k in set(totals) | set(local_apps):
+                groups[k].append(totals.get(k, 0.0))
+            loaded |= {name for name, _, _ in rows}
+
+        med = {k: statistics.median(v) for k, v in groups.items()}
+        self.stdout.write(
+            f"  process wall {statistics.median(timings['wall_ms']):7.1f} ms | django.setup {statistics.median(timings['setup_ms']):7.1f} ms"
+            + (f" | urls {statistics.median(timings['urls_ms']):7.1f} ms" if urls else "")
+        )
+
+        self.stdout.write("  apps (inclusive import ms):")
+        for name in sorted(local_apps, key=lambda n: -med.get(n, 0.0)):
+            self.stdout.write(f"    {name:<14} {med.get(name, 0.0):8.1f}")
+
+        others = sorted(
+            (k for k in med if k not in local_apps and k not in HEAVY_LIBS),
+            key=lambda n: -med[n],
+        )[:opts["top"]]
+        self.stdout.write("  other packages:")
+        for name in others:
+            self.stdout.write(f"    {name:<20} {med[name]:8.1f}")
+
+        self.stdout.write("  heavy libraries:")
+        for name in HEAVY_LIBS:
+            state = f"{med[name]:8.1f} ms" if name in loaded else "  not loaded"
+            self.stdout.write(f"    {name:<20} {state}")
+
+        forbidden = [x.strip() for x in opts["forbid"].split(",") if x.strip()]
+        eager = [x for x in forbidden if x in loaded]
+        if eager:
+            self.stdout.write(self.style.ERROR(f"[bench_startup] 시작 경로에서 import됨: {', '.join(eager)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"[bench_startup] OK: {', '.join(forbidden) or '-'} 모두 첫 사용 시 import"
+            ))
@@ -0,0 +1,26 @@
+"""
+추천용 상품 카탈로그(ProductCatalog) 재계산 Django 관리 명령
+
+사용법:
+    python manage.py build_product_catalog
+    python manage.py build_product_catalog --type deposit
+"""
+from django.core.management.base import BaseCommand
+
+from finances.catalog import PRODUCT_MODELS, refresh_product_catalog
+
+
+class Command(BaseCommand):
+    help = '예/적금 추천용 카탈로그(최고 옵션, 가입 대상 파싱, 조건 복잡도) 재계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', choices=list(PRODUCT_MODELS), default=None, help='지정 시 해당 타입만')
+
+    def handle(self, *args, **options):
+        result = refresh_product_catalog(options['type'])
+        for ptype in PRODUCT_MODELS:
+            if ptype in result:
+                self.stdout.write(self.style.SUCCESS(
+                    f"[build_product_catalog] {ptype}: rows={result[ptype]['rows']} removed={result[ptype]['removed']}"
+                ))
+        self.stdout.write(self.style.SUCCESS(f"[build_product_catalog] done in {result['ms']}ms"))
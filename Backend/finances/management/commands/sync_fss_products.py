@@ -0,0 +1,57 @@
+"""
+금융감독원 예/적금 상품 동기화 Django 관리 명령 (예전 서버 시작 자동 동기화 대체)
+
+사용법:
+    python manage.py sync_fss_products
+    python manage.py sync_fss_products --type saving
+    python manage.py sync_fss_products --if-empty      # 비어 있는 타입만 (배포/초기 세팅용)
+    python manage.py sync_fss_products --delete-missing  # 응답에 없는 상품 삭제 (북마크/추천 기록도 삭제됨)
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from finances.catalog import ensure_product_catalog
+from finances.product_sync import SPECS, sync_from_fss
+
+
+class Command(BaseCommand):
+    help = '금융감독원 API에서 예/적금 상품을 받아 DB/추천 카탈로그/벡터 인덱스에 반영'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', choices=list(SPECS), default=None, help='지정 시 해당 타입만')
+        parser.add_argument('--if-empty', action='store_true', help='상품이 이미 있는 타입은 건너뜀')
+        parser.add_argument('--delete-missing', action='store_true',
+                            help='응답에 없는 기존 상품 삭제 (기본은 유지하고 개수만 보고, 옵션/추천 기록 cascade)')
+        parser.add_argument('--allow-mass-delete', action='store_true',
+                            help='--delete-missing에서 기존 상품 절반 넘게 빠져도 삭제 (기본은 삭제 보류)')
+
+    def handle(self, *args, **options):
+        types = [options['type']] if options['type'] else list(SPECS)
+        failed = False
+        for product_type in types:
+            spec = SPECS[product_type]
+            if options['if_empty'] and spec.product_model.objects.exists():
+                self.stdout.write(self.style.NOTICE(
+                    f"[sync_fss_products] {product_type}: 이미 {spec.product_model.objects.count()}개 상품 → 건너뜀"
+                ))
+                continue
+
+            changes = sync_from_fss(
+                product_type,
+                delete_missing=options['delete_missing'],
+                allow_mass_delete=options['allow_mass_delete'],
+            )
+            if changes is None:
+                failed = True
+                self.stdout.write(self.style.ERROR(f"[sync_fss_products] {product_type}: API 호출 실패"))
+                continue
+            if changes.removal_skipped:
+                self.stdout.write(self.style.NOTICE(
+                    f"[sync_fss_products] {product_type}: 응답에 없는 상품이 너무 많아 삭제 보류 (--allow-mass-delete)"
+                ))
+            self.stdout.write(self.style.SUCCESS(f"[sync_fss_products] {product_type}: {changes.summary()}"))
+
+        if ensure_product_catalog():
+            self.stdout.write(self.style.SUCCESS("[sync_fss_products] 추천용 카탈로그 생성"))
+        if failed:
+            # 종료 코드 1 → 배포 스크립트/cron에서 실패 감지
+            raise CommandError("[sync_fss_products] 일부 타입 동기화 실패")
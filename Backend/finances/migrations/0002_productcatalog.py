@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductCatalog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_type', models.CharField(choices=[('deposit', '예금'), ('saving', '적금')], max_length=10)),
+                ('product_id', models.BigIntegerField()),
+                ('fin_prdt_cd', models.CharField(max_length=50)),
+                ('kor_co_nm', models.CharField(max_length=100)),
+                ('fin_prdt_nm', models.CharField(max_length=200)),
+                ('join_way', models.CharField(blank=True, max_length=200, null=True)),
+                ('join_member', models.CharField(blank=True, max_length=200, null=True)),
+                ('spcl_cnd', models.TextField(blank=True, null=True)),
+                ('excludes_male', models.BooleanField(default=False)),
+                ('excludes_female', models.BooleanField(default=False)),
+                ('min_age', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('max_age', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('condition_complexity', models.CharField(default='low', max_length=8)),
+                ('join_convenience', models.PositiveSmallIntegerField(default=0)),
+                ('max_rate', models.FloatField(blank=True, null=True)),
+                ('options', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['product_type', '-max_rate', 'product_id'],
+                'indexes': [models.Index(fields=['product_type', '-max_rate', 'product_id'], name='idx_catalog_type_rate')],
+                'constraints': [models.UniqueConstraint(fields=('product_type', 'fin_prdt_cd'), name='uniq_catalog_type_code')],
+            },
+        ),
+    ]
@@ -59,3 +59,76 @@ class SavingOptions(models.Model):
 
     def __str__(self):
         return f"{self.product.fin_prdt_nm} - {self.save_trm}개월"
+
+
+class ProductCatalog(models.Model):
+    """
+    추천용 예/적금 비정규화 카탈로그 (상품 1개 = 1행)
+    - 상품 동기화 때 finances.catalog.refresh_product_catalog()로 다시 계산
+    - join_member 파싱 결과(성별/나이), 우대조건 복잡도, 가입 편의성을 미리 저장
+    - options: 가입 기간(save_trm)별 최고 우대금리 옵션 [{id, save_trm, intr_rate, intr_rate2, intr_rate_type, rsrv_type}, ...]
+    """
+    TYPE_CHOICES = [
+        ("deposit", "예금"),
+        ("saving", "적금"),
+    ]
+
+    product_type = models.CharField(max_length=10, choices=TYPE_CHOICES)
+    product_id = models.BigIntegerField()  # DepositProducts/SavingProducts pk
+    fin_prdt_cd = models.CharField(max_length=50)
+    kor_co_nm = models.CharField(max_length=100)
+    fin_prdt_nm = models.CharField(max_length=200)
+    join_way = models.CharField(max_length=200, null=True, blank=True)
+    join_member = models.CharField(max_length=200, null=True, blank=True)
+    spcl_cnd = models.TextField(null=True, blank=True)
+
+    # join_member 파싱 결과
+    excludes_male = models.BooleanField(default=False)    # "여성" 전용
+    excludes_female = models.BooleanField(default=False)  # "남성" 전용
+    min_age = models.PositiveSmallIntegerField(null=True, blank=True)  # 만 N세 이상
+    max_age = models.PositiveSmallIntegerField(null=True, blank=True)  # 만 N세 미만 (N 미포함)
+
+    condition_complexity = models.CharField(max_length=8, default="low")  # low / medium / high
+    join_convenience = models.PositiveSmallIntegerField(default=0)        # 0~10
+
+    max_rate = models.FloatField(null=True, blank=True)  # 옵션 중 최고 우대금리
+    options = models.JSONField(default=list)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["product_type", "-max_rate", "product_id"]
+        constraints = [
+            models.UniqueConstraint(fields=["product_type", "fin_prdt_cd"], name="uniq_catalog_type_code"),
+        ]
+        indexes = [
+            models.Index(fields=["product_type", "-max_rate", "product_id"], name="idx_catalog_type_rate"),
+        ]
+
+    def is_eligible(self, gender, age) -> bool:
+        """사용자(성별 'M'/'F', 나이)가 가입 대상인지 (미리 파싱한 컬럼만 비교)"""
+        if gender:
+            if self.excludes_male and gender == "M":
+                return False
+            if self.excludes_female and gender == "F":
+                return False
+        if age:
+            if self.min_age is not None and age < self.min_age:
+                return False
+            if self.max_age is not None and age >= self.max_age:
+                return False
+        return True
+
+    def pick_option(self, period=None):
+        """
+        투자 기간 ±6개월 안에서 우대금리가 가장 높은 옵션, 없으면 전체 최고 옵션
+        - options는 refresh 때 (우대금리 내림차순, id 오름차순)으로 정렬해 둠 → 앞에서부터 첫 매칭
+        """
+        if period:
+            for opt in self.options:
+                if period - 6 <= opt["save_trm"] <= period + 6:
+                    return opt
+        return self.options[0] if self.options else None
+
+    def __str__(self):
+        return f"[{self.product_type}] {self.fin_prdt_nm} (max {self.max_rate})"
@@ -0,0 +1,326 @@
+# finances/product_sync.py
+"""
+예/적금 상품 동기화 공용 서비스 (sync_deposits / sync_savings / 서버 시작 자동 동기화)
+- FSS 응답(baseList/optionList)을 메모리 dict로 정규화
+- 기존 상품/옵션을 한 번씩만 읽어 비교 → bulk_create / bulk_update / 삭제를 한 트랜잭션으로
+  (행 단위 update_or_create, 옵션마다 상품 get 없음)
+- 응답에 없는 기존 상품은 기본적으로 유지하고 ChangeSet.missing으로 보고만 함
+  (FSS 조회는 1페이지만 받고, 상품 삭제는 옵션/추천 기록/북마크까지 cascade → delete_missing=True일 때만 삭제)
+- 결과 ChangeSet(added/changed/removed 상품 코드)으로 카탈로그/벡터 인덱스/챗봇 캐시만 필요한 만큼 갱신
+- sync_from_fss(): API 호출 + 반영 (sync_fss_products 명령, 개발 서버 시작 백그라운드 동기화)
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import connections, transaction
+
+from .models import DepositOptions, DepositProducts, SavingOptions, SavingProducts
+from .utils import fetch_deposit_products, fetch_saving_products
+
+
+BATCH_SIZE = 500
+
+# delete_missing=True여도 응답이 잘려 온 경우(페이지 누락 등) 대량 삭제되지 않도록: 기존 상품의 절반 넘게 사라지면 삭제 보류
+MAX_REMOVE_RATIO = 0.5
+
+
+@dataclass(frozen=True)
+class SyncSpec:
+    product_model: Any
+    option_model: Any
+    product_fields: Tuple[str, ...]
+    option_keys: Tuple[str, ...]    # 상품 안에서 옵션을 구분하는 필드 (기존 update_or_create 조회 조건)
+    option_fields: Tuple[str, ...]  # 갱신 대상 값
+
+
+FETCHERS = {
+    "deposit": fetch_deposit_products,
+    "saving": fetch_saving_products,
+}
+
+SPECS: Dict[str, SyncSpec] = {
+    "deposit": SyncSpec(
+        product_model=DepositProducts,
+        option_model=DepositOptions,
+        product_fields=("kor_co_nm", "fin_prdt_nm", "join_way", "join_deny", "join_member", "spcl_cnd"),
+        option_keys=("save_trm", "rsrv_type"),
+        option_fields=("intr_rate", "intr_rate2"),
+    ),
+    "saving": SyncSpec(
+        product_model=SavingProducts,
+        option_model=SavingOptions,
+        product_fields=("kor_co_nm", "fin_prdt_nm", "join_way", "join_deny", "join_member", "spcl_cnd", "mtrt_int"),
+        option_keys=("save_trm", "rsrv_type", "intr_rate_type"),
+        option_fields=("intr_rate", "intr_rate2", "rsrv_type_nm", "intr_rate_type_nm"),
+    ),
+}
+
+
+@dataclass
+class ChangeSet:
+    """
+    동기화 결과
+    - added / changed / removed: 상품 코드 (changed = 상품 필드나 옵션이 바뀐 기존 상품, removed = 실제 삭제한 상품)
+    - missing: 응답에 없는 기존 상품 코드 (delete_missing=False면 DB에 그대로 남음)
+    - fields_changed: changed 중 상품 필드(이름/가입 방법/우대조건 등)가 바뀐 코드 → 벡터 인덱스 재임베딩 대상
+    - options: 옵션 행 단위 {"added", "updated", "removed"}
+    """
+    product_type: str
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    fields_changed: List[str] = field(default_factory=list)
+    options: Dict[str, int] = field(default_factory=lambda: {"added": 0, "updated": 0, "removed": 0})
+    orphan_options: int = 0        # 응답에 상품이 없는 옵션 (건너뜀)
+    removal_skipped: bool = False  # delete_missing인데 MAX_REMOVE_RATIO 초과로 삭제 보류
+    ms: float = 0.0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    @property
+    def touched(self) -> List[str]:
+        """카탈로그를 다시 계산할 상품 코드 (추가 + 변경 + 삭제)"""
+        return self.added + self.changed + self.removed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        kept = len(self.missing) - len(self.removed)
+        return (
+            f"상품 +{len(self.added)} ~{len(self.changed)} -{len(self.removed)}"
+            + (f" (응답에 없음 {kept}개 유지)" if kept else "")
+            + f", 옵션 +{self.options['added']} ~{self.options['updated']} -{self.options['removed']} ({self.ms}ms)"
+        )
+
+
+def _to_float_or_none(v):
+    # None/"" -> None  ※ 기존 -1 저장은 최고금리 계산에 악영향 가능
+    if v is None or v == "":
+        return None
+    return float(v)
+
+
+def _to_int(v, default):
+    if v is None or v == "":
+        return default
+    return int(v)
+
+
+def normalize_payload(product_type: str, data: Dict[str, Any]) -> Tuple[Dict[str, Dict], Dict[str, Dict], int]:
+    """
+    FSS 응답 → ({code: 상품 필드}, {code: {옵션 키: 옵션 필드}}, 상품 없는 옵션 수)
+    - 같은 코드/옵션 키가 여러 번 오면 마지막 값 사용 (기존 update_or_create 순차 저장과 같은 결과)
+    """
+    spec = SPECS[product_type]
+    products: Dict[str, Dict] = {}
+    for prod in data.get("baseList", []) or []:
+        row = {f: prod.get(f) for f in spec.product_fields}
+        row["kor_co_nm"] = prod.get("kor_co_nm", "")
+        row["fin_prdt_nm"] = prod.get("fin_prdt_nm", "")
+        row["join_deny"] = _to_int(prod.get("join_deny"), 1)
+        products[prod["fin_prdt_cd"]] = row
+
+    options: Dict[str, Dict] = {code: {} for code in products}
+    orphans = 0
+    for opt in data.get("optionList", []) or []:
+        code = opt.get("fin_prdt_cd")
+        if code not in products:
+            orphans += 1
+            continue
+        key = tuple(
+            _to_int(opt.get(k), 0) if k == "save_trm" else opt.get(k)
+            for k in spec.option_keys
+        )
+        values = {f: opt.get(f) for f in spec.option_fields}
+        values["intr_rate"] = _to_float_or_none(opt.get("intr_rate"))
+        values["intr_rate2"] = _to_float_or_none(opt.get("intr_rate2"))
+        options[code][key] = values
+    return products, options, orphans
+
+
+def sync_products(
+    product_type: str,
+    data: Dict[str, Any],
+    *,
+    delete_missing: bool = False,
+    allow_mass_delete: bool = False,
+) -> ChangeSet:
+    """
+    FSS 응답을 DB에 반영하고 ChangeSet 반환
+    - 조회: 상품 1번 + 옵션 1번 (+ 새 상품 id 1번), 나머지는 bulk 쿼리
+    - 응답에 없는 상품: changes.missing으로 보고, delete_missing=True일 때만 삭제 (옵션/추천 기록 cascade)
+    - 응답 상품의 옵션 중 응답에 없는 것은 삭제
+    """
+    t0 = time.perf_counter()
+    spec = SPECS[product_type]
+    Product, Option = spec.product_model, spec.option_model
+    incoming, incoming_options, orphans = normalize_payload(product_type, data)
+    changes = ChangeSet(product_type=product_type, orphan_options=orphans)
+
+    with transaction.atomic():
+        existing = {
+            row["fin_prdt_cd"]: row
+            for row in Product.objects.values("id", "fin_prdt_cd", *spec.product_fields)
+        }
+
+        # ----- 상품 -----
+        to_create, to_update = [], []
+        for code, values in incoming.items():
+            row = existing.get(code)
+            if row is None:
+                to_create.append(Product(fin_prdt_cd=code, **values))
+                changes.added.append(code)
+            elif any(row[f] != values[f] for f in spec.product_fields):
+                to_update.append(Product(id=row["id"], fin_prdt_cd=code, **values))
+                changes.fields_changed.append(code)
+
+        changes.missing = sorted(code for code in existing if code not in incoming)
+        removed = list(changes.missing) if delete_missing else []
+        if removed and not allow_mass_delete and len(removed) > len(existing) * MAX_REMOVE_RATIO:
+            print(f"⚠️  [{product_type}] 기존 상품 {len(existing)}개 중 {len(removed)}개가 응답에 없음 → 삭제 보류")
+            changes.removal_skipped = True
+            removed = []
+
+        Product.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        Product.objects.bulk_update(to_update, list(spec.product_fields), batch_size=BATCH_SIZE)
+
+        ids = {code: row["id"] for code, row in existing.items()}
+        if to_create:
+            ids.update(
+                Product.objects.filter(fin_prdt_cd__in=changes.added).values_list("fin_prdt_cd", "id")
+            )
+
+        # ----- 옵션 -----
+        code_by_id = {pk: code for code, pk in ids.items()}
+        current: Dict[str, Dict[tuple, Dict]] = {}
+        duplicate_ids = []
+        for row in Option.objects.values("id", "product_id", *spec.option_keys, *spec.option_fields):
+            code = code_by_id.get(row["product_id"])
+            if code is None or code not in incoming:
+                continue  # 응답에 없는 상품의 옵션 (유지 또는 cascade 삭제)
+            key = tuple(row[k] for k in spec.option_keys)
+            bucket = current.setdefault(code, {})
+            if key in bucket:
+                duplicate_ids.append(row["id"])  # 예전 데이터의 중복 옵션 정리
+                continue
+            bucket[key] = row
+
+        opt_create, opt_update, opt_delete = [], [], list(duplicate_ids)
+        options_changed = set()
+        for code, wanted in incoming_options.items():
+            have = current.get(code, {})
+            for key, values in wanted.items():
+                row = have.get(key)
+                if row is None:
+                    opt_create.append(Option(product_id=ids[code], **dict(zip(spec.option_keys, key)), **values))
+                    options_changed.add(code)
+                elif any(row[f] != values[f] for f in spec.option_fields):
+                    opt_update.append(Option(id=row["id"], **values))
+                    options_changed.add(code)
+            for key, row in have.items():
+                if key not in wanted:
+                    opt_delete.append(row["id"])
+                    options_changed.add(code)
+
+        Option.objects.bulk_create(opt_create, batch_size=BATCH_SIZE)
+        Option.objects.bulk_update(opt_update, list(spec.option_fields), batch_size=BATCH_SIZE)
+        for i in range(0, len(opt_delete), BATCH_SIZE):
+            Option.objects.filter(id__in=opt_delete[i:i + BATCH_SIZE]).delete()
+
+        # 상품 삭제 (옵션/추천 기록 cascade)
+        for i in range(0, len(removed), BATCH_SIZE):
+            Product.objects.filter(fin_prdt_cd__in=removed[i:i + BATCH_SIZE]).delete()
+
+    added = set(changes.added)
+    changes.changed = sorted((set(changes.fields_changed) | options_changed) - added)
+    changes.removed = sorted(removed)
+    changes.options = {
+        "added": len(opt_create),
+        "updated": len(opt_update),
+        "removed": len(opt_delete) - len(duplicate_ids),
+    }
+    changes.ms = round((time.perf_counter() - t0) * 1000, 1)
+    return changes
+
+
+def propagate_changes(changes: ChangeSet) -> Dict[str, Any]:
+    """
+    동기화 결과를 하위 캐시에 반영 (바뀐 게 없으면 아무것도 안 함 → 추천/답변 캐시 유지)
+    - 챗봇 엔티티 매처 재구축 + 답변 캐시 무효화
+    - 추천 카탈로그: 바뀐 상품만 다시 계산
+    - 벡터 인덱스: 추가/필드 변경/삭제 상품만 증분 반영 (실패해도 동기화 자체는 성공 처리)
+    """
+    if not changes.has_changes:
+        return {"catalog": None, "vector_index": None}
+
+    from chatbot.answer_cache import invalidate_answer_cache
+    from chatbot.entity_matcher import invalidate_entity_matcher
+    from chatbot.vector_store import update_products_index
+
+    from .catalog import refresh_product_catalog
+
+    invalidate_entity_matcher()
+    invalidate_answer_cache()
+
+    catalog = refresh_product_catalog(changes.product_type, codes=changes.touched)
+
+    vector_index: Optional[Dict] = None
+    try:
+        vector_index = update_products_index(changes.product_type, changes)
+    except Exception as e:
+        print(f"⚠️  벡터 인덱스 갱신 실패: {e}")
+
+    return {"catalog": catalog, "vector_index": vector_index}
+
+
+def sync_from_fss(
+    product_type: str,
+    *,
+    if_empty: bool = False,
+    delete_missing: bool = False,
+    allow_mass_delete: bool = False,
+) -> Optional[ChangeSet]:
+    """
+    금융감독원 API 호출 → sync_products → propagate_changes
+    - if_empty=True: 해당 타입 상품이 이미 있으면 API를 부르지 않음 (예전 서버 시작 자동 동기화 동작)
+    - delete_missing / allow_mass_delete: sync_products 참고
+    - 건너뛰었거나 API 호출이 실패하면 None
+    """
+    if if_empty and SPECS[product_type].product_model.objects.exists():
+        return None
+    data = FETCHERS[product_type]()
+    if not data:
+        return None
+    changes = sync_products(product_type, data, delete_missing=delete_missing, allow_mass_delete=allow_mass_delete)
+    propagate_changes(changes)
+    return changes
+
+
+def sync_on_startup() -> None:
+    """
+    FINANCES_SYNC_ON_STARTUP=True일 때 개발 서버 시작 후 백그라운드 스레드에서 실행
+    (비어 있는 타입만 채우고, 상품은 있는데 카탈로그가 비어 있으면 카탈로그 생성)
+    """
+    from .catalog import ensure_product_catalog
+
+    labels = {"deposit": "예금", "saving": "적금"}
+    try:
+        for product_type, label in labels.items():
+            changes = sync_from_fss(product_type, if_empty=True)
+            if changes is not None:
+                print(f"[{label}] 동기화 완료: {changes.summary()}")
+        if ensure_product_catalog():
+            print("[카탈로그] 추천용 상품 카탈로그 생성 완료")
+    except Exception as e:
+        import traceback
+        print(f"[오류] 자동 동기화 중 오류 발생: {e}")
+        traceback.print_exc()
+    finally:
+        connections.close_all()
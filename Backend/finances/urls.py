@@ -16,4 +16,7 @@ urlpatterns = [
     path("savings/banks/", views.saving_bank_list, name="saving_bank_list"),
     path("savings/", views.saving_list, name="saving_list"),
     path("savings/<str:fin_prdt_cd>/", views.saving_detail, name="saving_detail"),  
+
+    # 금리/기간/금액 비교 그리드 (?type=deposit|saving&amounts=..&terms=..&rate=max|basic&bank=..&limit=..)
+    path("compare/", views.interest_grid, name="interest_grid"),
 ]
\ No newline at end of file
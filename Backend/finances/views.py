@@ -1,4 +1,7 @@
 # finances/views.py
+import math
+
+import numpy as np
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
@@ -13,6 +16,8 @@ from .serializers import (
     SavingProductDetailSerializer,
 )
 from .utils import fetch_deposit_products, fetch_saving_products
+from .product_sync import propagate_changes, sync_products
+from .interest import COMPOUND, INTEREST_TAX_RATE, SIMPLE, principal_total, project_interest
 
 
 # ============================================
@@ -33,65 +38,21 @@ def sync_deposits(request):
         if not data:
             return Response({"error": "API 호출 실패"}, status=status.HTTP_502_BAD_GATEWAY)
 
-        saved_products = 0
-        saved_options = 0
-
-        # 상품 저장
-        for prod in data.get("baseList", []):
-            _, created = DepositProducts.objects.update_or_create(
-                fin_prdt_cd=prod["fin_prdt_cd"],
-                defaults={
-                    "kor_co_nm": prod.get("kor_co_nm", ""),
-                    "fin_prdt_nm": prod.get("fin_prdt_nm", ""),
-                    "join_way": prod.get("join_way"),
-                    "join_deny": prod.get("join_deny", 1),
-                    "join_member": prod.get("join_member"),
-                    "spcl_cnd": prod.get("spcl_cnd"),
-                },
-            )
-            if created:
-                saved_products += 1
-
-        # 옵션 저장
-        for opt in data.get("optionList", []):
-            try:
-                product = DepositProducts.objects.get(fin_prdt_cd=opt["fin_prdt_cd"])
-
-                intr_rate = opt.get("intr_rate")
-                intr_rate2 = opt.get("intr_rate2")
-
-                # None/"" -> None (권장)  ※ 기존 -1 저장은 최고금리 계산에 악영향 가능
-                def to_float_or_none(v):
-                    if v is None or v == "":
-                        return None
-                    return float(v)
-
-                option, created = DepositOptions.objects.update_or_create(
-                    product=product,
-                    save_trm=int(opt.get("save_trm", 0) or 0),
-                    rsrv_type=opt.get("rsrv_type"),
-                    defaults={
-                        "intr_rate": to_float_or_none(intr_rate),
-                        "intr_rate2": to_float_or_none(intr_rate2),
-                    },
-                )
-                if created:
-                    saved_options += 1
-
-            except DepositProducts.DoesNotExist:
-                print(f"⚠️  상품 없음: {opt.get('fin_prdt_cd')}")
-                continue
-            except Exception as e:
-                print(f"❌ 옵션 저장 실패: {e}")
-                continue
-
-        print(f"✅ 저장 완료: 상품 {saved_products}개, 옵션 {saved_options}개")
+        # 기존 상품/옵션과 비교해 바뀐 것만 bulk 반영 (한 트랜잭션)
+        changes = sync_products("deposit", data)
+        print(f"✅ 저장 완료: {changes.summary()}")
+
+        # 바뀐 상품만 챗봇 캐시/추천 카탈로그/벡터 인덱스에 반영 (변경 없으면 캐시 유지)
+        downstream = propagate_changes(changes)
 
         return Response(
             {
                 "message": "동기화 완료",
-                "saved_products": saved_products,
-                "saved_options": saved_options,
+                "saved_products": len(changes.added),
+                "saved_options": changes.options["added"],
+                "changes": changes.to_dict(),
+                "vector_index": downstream["vector_index"],
+                "catalog": downstream["catalog"],
                 "total_products": DepositProducts.objects.count(),
                 "total_options": DepositOptions.objects.count(),
             }
@@ -166,62 +127,21 @@ def sync_savings(request):
         if not data:
             return Response({"error": "API 호출 실패"}, status=status.HTTP_400_BAD_REQUEST)
 
-        saved_products = 0
-        saved_options = 0
-
-        # 상품 저장
-        for prod in data.get("baseList", []):
-            _, created = SavingProducts.objects.update_or_create(
-                fin_prdt_cd=prod["fin_prdt_cd"],
-                defaults={
-                    "kor_co_nm": prod.get("kor_co_nm", ""),
-                    "fin_prdt_nm": prod.get("fin_prdt_nm", ""),
-                    "join_way": prod.get("join_way"),
-                    "join_deny": prod.get("join_deny", 1),
-                    "join_member": prod.get("join_member"),
-                    "spcl_cnd": prod.get("spcl_cnd"),
-                    "mtrt_int": prod.get("mtrt_int"),
-                },
-            )
-            if created:
-                saved_products += 1
-
-        def to_float_or_none(v):
-            if v is None or v == "":
-                return None
-            return float(v)
-
-        # 옵션 저장
-        for opt in data.get("optionList", []):
-            product = SavingProducts.objects.filter(fin_prdt_cd=opt["fin_prdt_cd"]).first()
-            if not product:
-                continue
-
-            intr_rate = opt.get("intr_rate")
-            intr_rate2 = opt.get("intr_rate2")
-
-            option, created = SavingOptions.objects.update_or_create(
-                product=product,
-                save_trm=int(opt.get("save_trm", 0) or 0),
-                rsrv_type=opt.get("rsrv_type"),
-                intr_rate_type=opt.get("intr_rate_type"),
-                defaults={
-                    "intr_rate": to_float_or_none(intr_rate),
-                    "intr_rate2": to_float_or_none(intr_rate2),
-                    "rsrv_type_nm": opt.get("rsrv_type_nm"),
-                    "intr_rate_type_nm": opt.get("intr_rate_type_nm"),
-                },
-            )
-            if created:
-                saved_options += 1
-
-        print(f"✅ 저장 완료: 상품 {saved_products}개, 옵션 {saved_options}개")
+        # 기존 상품/옵션과 비교해 바뀐 것만 bulk 반영 (한 트랜잭션)
+        changes = sync_products("saving", data)
+        print(f"✅ 저장 완료: {changes.summary()}")
+
+        # 바뀐 상품만 챗봇 캐시/추천 카탈로그/벡터 인덱스에 반영 (변경 없으면 캐시 유지)
+        downstream = propagate_changes(changes)
 
         return Response(
             {
                 "message": "적금 동기화 완료",
-                "saved_products": saved_products,
-                "saved_options": saved_options,
+                "saved_products": len(changes.added),
+                "saved_options": changes.options["added"],
+                "changes": changes.to_dict(),
+                "vector_index": downstream["vector_index"],
+                "catalog": downstream["catalog"],
                 "total_products": SavingProducts.objects.count(),
                 "total_options": SavingOptions.objects.count(),
             }
@@ -276,3 +196,112 @@ def saving_detail(request, fin_prdt_cd):
     )
     serializer = SavingProductDetailSerializer(product)
     return Response(serializer.data)
+
+
+# ============================================
+# 금리/기간/금액 비교 그리드
+# ============================================
+
+GRID_DEFAULT_AMOUNTS = {
+    "deposit": [1000, 3000, 5000],  # 원금 (만원)
+    "saving": [30, 50, 100],        # 월 납입액 (만원)
+}
+GRID_MAX_AMOUNTS = 20
+GRID_MAX_AMOUNT = 1_000_000  # 금액 1개 상한 (만원 = 100억원)
+
+
+def _parse_numbers(raw, cast):
+    """'1,2,3' → [1, 2, 3] (빈 값이면 None, 형식 오류/nan/inf는 ValueError)"""
+    if not raw:
+        return None
+    values = [cast(x) for x in raw.split(",") if x.strip()]
+    if any(not math.isfinite(v) for v in values):
+        raise ValueError("non-finite number")
+    return values
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def interest_grid(request):
+    """
+    예/적금 옵션 × 금액 이자 비교 그리드 (전체 옵션을 NumPy로 한 번에 계산)
+    GET /finances/compare/?type=saving&amounts=30,50,100&terms=12,24&rate=max&bank=국민은행&limit=50
+
+    - type: deposit(amounts = 원금) / saving(amounts = 월 납입액), 단위 만원
+    - rate: max(우대 포함 최고금리, 기본) / basic(기본금리)
+    - 적금은 옵션의 금리 유형(단리/월복리)대로 계산, 자유적립식은 매달 같은 금액 납입 가정
+    - 이자는 금액에 비례하므로 정렬(세전 이자 내림차순)은 모든 금액에서 같음
+    """
+    product_type = request.GET.get("type", "deposit")
+    if product_type not in GRID_DEFAULT_AMOUNTS:
+        return Response({"error": "type은 deposit 또는 saving"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        amounts = _parse_numbers(request.GET.get("amounts"), float) or GRID_DEFAULT_AMOUNTS[product_type]
+        terms = _parse_numbers(request.GET.get("terms"), int)
+        limit = int(request.GET["limit"]) if request.GET.get("limit") else None
+    except ValueError:
+        return Response({"error": "amounts/terms/limit는 쉼표로 구분한 숫자"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(amounts) > GRID_MAX_AMOUNTS or any(not 0 < a <= GRID_MAX_AMOUNT for a in amounts):
+        return Response(
+            {"error": f"amounts는 0 초과 {GRID_MAX_AMOUNT:,} 이하 숫자 {GRID_MAX_AMOUNTS}개 이하"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    rate_field = "intr_rate" if request.GET.get("rate") == "basic" else "intr_rate2"
+
+    option_model = DepositOptions if product_type == "deposit" else SavingOptions
+    fields = ["product__fin_prdt_cd", "product__kor_co_nm", "product__fin_prdt_nm",
+              "save_trm", "intr_rate", "intr_rate2", "rsrv_type"]
+    if product_type == "saving":
+        fields += ["intr_rate_type", "rsrv_type_nm"]
+
+    qs = option_model.objects.filter(save_trm__gt=0)
+    if terms:
+        qs = qs.filter(save_trm__in=terms)
+    if request.GET.get("bank"):
+        qs = qs.filter(product__kor_co_nm=request.GET["bank"])
+    rows = list(qs.values(*fields))  # 쿼리 1번
+
+    rates = [r[rate_field] if r[rate_field] is not None else r["intr_rate"] for r in rows]
+    save_trms = [r["save_trm"] for r in rows]
+    interest = project_interest(
+        product_type, rates, save_trms, amounts,
+        rate_types=[r.get("intr_rate_type") for r in rows] if product_type == "saving" else None,
+    )
+    after_tax = interest * (1 - INTEREST_TAX_RATE)
+    maturity = principal_total(product_type, save_trms, amounts) + after_tax
+
+    order = np.argsort(-interest[:, 0], kind="stable") if rows else []
+    if limit is not None:
+        order = order[:max(limit, 0)]
+
+    interest, after_tax, maturity = interest.round(2), after_tax.round(2), maturity.round(2)
+    grid = []
+    for i in order:
+        r = rows[i]
+        grid.append({
+            "fin_prdt_cd": r["product__fin_prdt_cd"],
+            "kor_co_nm": r["product__kor_co_nm"],
+            "fin_prdt_nm": r["product__fin_prdt_nm"],
+            "save_trm": r["save_trm"],
+            "intr_rate": r["intr_rate"],
+            "intr_rate2": r["intr_rate2"],
+            "applied_rate": rates[i],
+            "intr_rate_type": r.get("intr_rate_type") or (SIMPLE if product_type == "deposit" else COMPOUND),
+            "rsrv_type": r["rsrv_type"],
+            "rsrv_type_nm": r.get("rsrv_type_nm"),
+            "interest": interest[i].tolist(),
+            "after_tax_interest": after_tax[i].tolist(),
+            "maturity_amount": maturity[i].tolist(),
+        })
+
+    return Response({
+        "type": product_type,
+        "amounts": amounts,
+        "amount_unit": "원금(만원)" if product_type == "deposit" else "월 납입액(만원)",
+        "rate": "basic" if rate_field == "intr_rate" else "max",
+        "tax_rate": INTEREST_TAX_RATE,
+        "total_options": len(rows),
+        "count": len(grid),
+        "grid": grid,
+    })
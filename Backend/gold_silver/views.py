@@ -1,4 +1,3 @@
-import pandas as pd
 from django.http import JsonResponse
 from django.shortcuts import render
 
@@ -14,6 +13,8 @@ def get_price_data(request):
         else:
             return JsonResponse({'status': 'error', 'message': '자산 유형이 올바르지 않습니다.'}, status=400)
         
+        import pandas as pd  # 첫 요청 때 import (서버 시작 속도)
+
         price_data = pd.read_excel(file_path)
 
         # 요청 파라미터로 날짜를 받기
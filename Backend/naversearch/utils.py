@@ -4,11 +4,11 @@ import re
 import requests
 import html 
 from django.conf import settings
+from stocks.services.llm_client import CompletionError, get_completion_client
 from .models import News
 
 NAVER_CLIENT_ID = os.environ.get("NAVER_CLIENT_ID") or getattr(settings, "NAVER_CLIENT_ID", None)
 NAVER_CLIENT_SECRET = os.environ.get("NAVER_CLIENT_SECRET") or getattr(settings, "NAVER_CLIENT_SECRET", None)
-GMS_OPENAI_URL = "https://gms.ssafy.io/gmsapi/api.openai.com/v1/chat/completions"
 BASE_URL = "https://openapi.naver.com/v1/search/news.json"
 
 
@@ -86,37 +86,26 @@ def summarize_news_text(title: str, description: str, link: str | None = None) -
         f"제목: {title}\n\n본문:\n{base_text}"
     )
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {settings.GMS_KEY}",
-    }
-
-    # ★ SSAFY에서 제공한 curl 포맷과 최대한 동일하게
-    data = {
-        "model": "gpt-5-mini",
-        "messages": [
-            {
-                "role": "developer",
-                "content": "Answer in Korean",
-            },
-            {
-                "role": "user",
-                "content": prompt,
-            },
-        ],
-        # temperature, max_tokens 등은 혹시 모를 검증 오류를 피하기 위해 일단 생략
-    }
-
-    resp = requests.post(GMS_OPENAI_URL, headers=headers, json=data, timeout=30)
-
-    # 200 이 아니면 GMS의 에러 메시지를 그대로 확인할 수 있게 예외 발생
-    if resp.status_code != 200:
+    # ★ SSAFY에서 제공한 curl 포맷과 최대한 동일하게 (model + messages만)
+    messages = [
+        {
+            "role": "developer",
+            "content": "Answer in Korean",
+        },
+        {
+            "role": "user",
+            "content": prompt,
+        },
+    ]
+    # temperature, max_tokens 등은 혹시 모를 검증 오류를 피하기 위해 일단 생략
+
+    # 공용 클라이언트: keep-alive 연결 재사용 + 일시 오류 재시도 (deadline 30초)
+    try:
+        summary = get_completion_client().complete_text(messages, deadline=30)
+    except CompletionError as e:
         # 디버깅용: 서버 콘솔 + 프론트 응답 둘 다에서 에러 내용을 볼 수 있게
         raise RuntimeError(
-            f"GMS 호출 실패 (status={resp.status_code}): {resp.text}"
-        )
+            f"GMS 호출 실패 (status={e.status}): {e.detail if e.detail is not None else e}"
+        ) from e
 
-    payload = resp.json()
-    # OpenAI ChatCompletions 응답 형식에 맞게 요약 추출
-    summary = payload["choices"][0]["message"]["content"].strip()
     return summary
\ No newline at end of file
@@ -2,6 +2,7 @@ from django.contrib import admin
 from .models import Stock, DailyPrice
 from .models import FeatureDaily  # 추가
 from .models import UpdateLog
+from .models import RecommendationCache
 
 
 @admin.register(Stock)
@@ -29,4 +30,9 @@ class FeatureDailyAdmin(admin.ModelAdmin):
 class UpdateLogAdmin(admin.ModelAdmin):
     list_display = ("as_of", "status", "attempt", "prices_count", "features_count", "started_at", "finished_at")
     list_filter = ("status", "as_of")
-    search_fields = ("as_of",)
\ No newline at end of file
+    search_fields = ("as_of",)
+
+@admin.register(RecommendationCache)
+class RecommendationCacheAdmin(admin.ModelAdmin):
+    list_display = ("as_of", "risk", "horizon", "effort", "include_news", "feature_version", "size", "updated_at")
+    list_filter = ("as_of", "risk", "horizon", "effort", "include_news")
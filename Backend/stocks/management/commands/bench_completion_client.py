@@ -0,0 +1,123 @@
+# stocks/management/commands/bench_completion_client.py
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+
+import requests
+from django.core.management.base import BaseCommand
+
+from chatbot.management.commands.bench_chat_stream import StubCompletionServer
+from stocks.services.llm_client import CircuitBreaker, CompletionClient, CompletionError
+
+
+MESSAGES = [{"role": "user", "content": "안녕하세요"}]
+
+
+def _legacy_call(url: str) -> str:
+    """기존 방식: 호출마다 requests.post (연결 풀 없음)"""
+    resp = requests.post(
+        url,
+        headers={"Content-Type": "application/json", "Authorization": "Bearer stub"},
+        json={"model": "gpt-5-mini", "messages": MESSAGES},
+        timeout=30,
+    )
+    resp.raise_for_status()
+    return resp.json()["choices"][0]["message"]["content"]
+
+
+def _dead_url() -> str:
+    """아무도 listen하지 않는 로컬 포트 (업스트림 장애 흉내)"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1/chat/completions"
+
+
+class Command(BaseCommand):
+    help = "GMS 공용 클라이언트 벤치마크: 연결 재사용 / 재시도 / 서킷 브레이커 / async 동시 호출 (로컬 가짜 서버)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--calls", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+
+    def handle(self, *args, **opts):
+        n = opts["calls"]
+        self.stdout.write(self.style.NOTICE(f"[bench_completion_client] calls={n} concurrency={opts['concurrency']}"))
+
+        # 1) 순차 호출: 호출마다 새 연결 vs keep-alive 풀
+        with StubCompletionServer("ok", first_token_delay=0, token_delay=0) as stub:
+            t0 = time.perf_counter()
+            for _ in range(n):
+                _legacy_call(stub.url)
+            t_legacy = time.perf_counter() - t0
+            legacy_conns = stub.connections
+
+        with StubCompletionServer("ok", first_token_delay=0, token_delay=0) as stub:
+            client = CompletionClient(url=stub.url, api_key="stub")
+            t0 = time.perf_counter()
+            for _ in range(n):
+                client.complete_text(MESSAGES, deadline=30)
+            t_pooled = time.perf_counter() - t0
+            pooled_conns = stub.connections
+            st = client.stats()
+            client.close()
+
+        self.stdout.write(f"  requests.post : {t_legacy / n * 1000:.2f} ms/call connections={legacy_conns}")
+        self.stdout.write(
+            f"  pooled client : {t_pooled / n * 1000:.2f} ms/call connections={pooled_conns} "
+            f"p50={st['latency_ms']['p50']}ms p95={st['latency_ms']['p95']}ms tokens={st['total_tokens']}"
+        )
+
+        # 2) 일시 오류(503) 재시도
+        with StubCompletionServer("ok", first_token_delay=0, token_delay=0, fail_first=2) as stub:
+            client = CompletionClient(url=stub.url, api_key="stub", backoff=0.05)
+            text = client.complete_text(MESSAGES, deadline=10)
+            st = client.stats()
+            client.close()
+        self.stdout.write(f"  retry 503x2   : result={text!r} retries={st['retries']} upstream_requests={stub.requests}")
+
+        # 3) 업스트림 장애: 연속 실패 후 서킷이 열리면 바로 실패
+        client = CompletionClient(
+            url=_dead_url(), api_key="stub", max_retries=0, breaker=CircuitBreaker(threshold=5, cooldown=30)
+        )
+        per_call = []
+        for _ in range(20):
+            t0 = time.perf_counter()
+            try:
+                client.complete(MESSAGES, deadline=5)
+            except CompletionError as e:
+                per_call.append((time.perf_counter() - t0, type(e).__name__))
+        st = client.stats()
+        client.close()
+        kinds = {}
+        for _, kind in per_call:
+            kinds[kind] = kinds.get(kind, 0) + 1
+        open_ms = [t * 1000 for t, kind in per_call if kind == "CircuitOpenError"]
+        self.stdout.write(
+            f"  upstream down : {kinds} breaker={st['breaker']} "
+            f"fail-fast {sum(open_ms) / max(len(open_ms), 1):.3f} ms/call"
+        )
+
+        # 4) async 동시 호출 (루프별 공용 AsyncClient)
+        with StubCompletionServer("ok", first_token_delay=0.2, token_delay=0) as stub:
+            client = CompletionClient(url=stub.url, api_key="stub")
+
+            async def _burst():
+                return await asyncio.gather(*[
+                    client.acomplete(MESSAGES, deadline=30) for _ in range(opts["concurrency"])
+                ])
+
+            t0 = time.perf_counter()
+            results = asyncio.run(_burst())
+            t_async = time.perf_counter() - t0
+            st = client.stats()
+
+        ok = len(results) == opts["concurrency"] and st["failures"] == 0
+        style = self.style.SUCCESS if ok else self.style.ERROR
+        self.stdout.write(style(
+            f"  async burst   : {opts['concurrency']} calls x 200ms in {t_async * 1000:.0f}ms "
+            f"connections={stub.connections} failures={st['failures']}"
+        ))
+        self.stdout.write(self.style.SUCCESS(f"  speedup(sequential)=x{t_legacy / max(t_pooled, 1e-9):.1f}"))
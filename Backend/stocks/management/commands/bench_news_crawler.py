@@ -0,0 +1,159 @@
+# stocks/management/commands/bench_news_crawler.py
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from stocks.models import Stock, StockNews
+from stocks.services.naver_news_client import NaverNewsClient
+from stocks.services.news_crawler import crawl_stock_news
+
+
+class StubNaverNewsServer:
+    """
+    네이버 뉴스 검색 API(items/pubDate) 흉내 로컬 서버
+    - 요청마다 latency초 지연, 검색어별로 고유 link의 기사 display건 반환
+    - limit_every > 0이면 n번째 요청마다 429 + Retry-After (한도 초과 재시도 확인용)
+    """
+
+    def __init__(self, latency: float = 0.1, limit_every: int = 0):
+        self.latency = latency
+        self.limit_every = limit_every
+        self.requests = 0
+        self.limited = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/search/news.json"
+
+    def __enter__(self):
+        stub = self
+        now = datetime.now(dt_timezone.utc)
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):
+                q = parse_qs(urlparse(self.path).query)
+                query = q.get("query", [""])[0]
+                display = int(q.get("display", ["20"])[0])
+
+                with stub._lock:
+                    stub.requests += 1
+                    n = stub.requests
+                time.sleep(stub.latency)
+
+                if stub.limit_every and n % stub.limit_every == 0:
+                    with stub._lock:
+                        stub.limited += 1
+                    self._send(429, b'{"errorCode":"012"}', {"Retry-After": "0"})
+                    return
+
+                key = abs(hash(query)) % 10**8
+                items = [
+                    {
+                        "title": f"<b>{query}</b> 기사 {i}",
+                        "description": f"{query} 관련 &quot;테스트&quot; 기사",
+                        "link": f"https://stub.news/{key}/{i}",
+                        "originallink": f"https://origin.stub/{key}/{i}",
+                        "pubDate": format_datetime(now - timedelta(hours=6 * i)),
+                    }
+                    for i in range(display)
+                ]
+                body = {"total": len(items), "start": 1, "display": len(items), "items": items}
+                self._send(200, json.dumps(body, ensure_ascii=False).encode("utf-8"))
+
+            def _send(self, status, payload, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class Command(BaseCommand):
+    help = "crawl_stock_news 벤치마크: 순차(workers=1) vs 동시 검색 (로컬 네이버 stub, DB 저장은 롤백)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stocks", type=int, default=100, help="수집 종목 수 (기본 100)")
+        parser.add_argument("--display", type=int, default=20)
+        parser.add_argument("--latency", type=float, default=0.1, help="stub 응답 지연(초)")
+        parser.add_argument("--sleep", type=float, default=0.05, help="순차 모드 요청 간 sleep(초)")
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--qps", type=float, default=50.0, help="토큰 버킷 초당 한도")
+        parser.add_argument("--limit-every", type=int, default=0, help="n번째 요청마다 429 (재시도 확인)")
+
+    def handle(self, *args, **opts):
+        stocks = list(Stock.objects.order_by("code")[: opts["stocks"]])
+        if not stocks:
+            self.stdout.write(self.style.ERROR("[bench_news_crawler] Stock 데이터가 없습니다."))
+            return
+
+        os.environ.setdefault("NAVER_CLIENT_ID", "stub")
+        os.environ.setdefault("NAVER_CLIENT_SECRET", "stub")
+        cutoff = datetime.now().date() - timedelta(days=30)
+
+        results = {}
+        with StubNaverNewsServer(opts["latency"], opts["limit_every"]) as stub:
+            for label, workers in (("sequential", 1), ("concurrent", opts["workers"])):
+                client = NaverNewsClient(base_url=stub.url, qps=opts["qps"], backoff=0.05)
+                before = stub.requests
+                with transaction.atomic():
+                    stats = crawl_stock_news(
+                        stocks,
+                        client=client,
+                        display=opts["display"],
+                        cutoff=cutoff,
+                        workers=workers,
+                        sleep=opts["sleep"],
+                    )
+                    stored = StockNews.objects.filter(link__startswith="https://stub.news/").count()
+                    transaction.set_rollback(True)
+                results[label] = (stats, stub.requests - before, stored)
+            limited = stub.limited
+
+        self.stdout.write(self.style.NOTICE(
+            f"[bench_news_crawler] stocks={len(stocks)} display={opts['display']} latency={opts['latency']}s "
+            f"qps={opts['qps']} workers={opts['workers']}"
+        ))
+        for label, (stats, reqs, stored) in results.items():
+            self.stdout.write(
+                f"  {label:<10}: articles={stats['fetched']} saved={stats['saved']} stored={stored} "
+                f"failed={stats['failed']} {stats['elapsed']:.2f}s "
+                f"({stats['articles_per_sec']:.0f} articles/s, requests={reqs})"
+            )
+
+        seq, conc = results["sequential"][0], results["concurrent"][0]
+        same = seq["saved"] == conc["saved"] and seq["failed"] == conc["failed"] == 0
+        style = self.style.SUCCESS if same else self.style.ERROR
+        self.stdout.write(style(
+            f"  speedup=x{seq['elapsed'] / conc['elapsed']:.1f} same_saved={same} rate_limited={limited}"
+        ))
@@ -0,0 +1,107 @@
+# stocks/management/commands/bench_recommender.py
+from __future__ import annotations
+
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from stocks.services.feature_cache import FEATURE_COLUMNS, FeatureMatrix
+from stocks.services.recommender import _recommend_rows_reference, rank_feature_matrix
+
+
+SAMPLE_PROFILES = [
+    None,
+    {"age": 28, "investment_goal": "단기 수익", "income": 3000, "savings": 2000},
+    {"age": 61, "investment_goal": "노후 준비", "income": 6000, "savings": 8000},
+    {"age": 45, "investment_goal": "자녀 교육", "income": 12000, "savings": 3000},
+]
+
+
+def _synthetic(n: int, seed: int):
+    """
+    FeatureDaily 분포를 흉내 낸 합성 데이터 (행 단위 객체 리스트 + FeatureMatrix)
+    """
+    rng = np.random.default_rng(seed)
+    cols = {
+        "r1": rng.normal(0, 0.02, n), "r5": rng.normal(0, 0.05, n),
+        "r20": rng.normal(0, 0.10, n), "r60": rng.normal(0, 0.20, n),
+        "vol10": rng.gamma(2, 0.01, n), "vol20": rng.gamma(2, 0.01, n), "vol60": rng.gamma(2, 0.01, n),
+        "mdd10": rng.beta(1.5, 8, n), "mdd20": rng.beta(1.5, 6, n), "mdd60": rng.beta(1.5, 4, n),
+        "news3": rng.poisson(0.5, n).astype(float), "news7": rng.poisson(1.0, n).astype(float),
+        "news30": rng.poisson(3.0, n).astype(float),
+        "vz5": rng.normal(0, 1, n), "vz20": rng.normal(0, 1, n),
+    }
+    # 동점/결측 케이스 섞기
+    cols["news7"][: n // 3] = 0.0
+    cols["mdd20"][: n // 50] = 0.0
+
+    codes = [f"{i:06d}" for i in range(n)]
+    names = [f"종목{i}" for i in range(n)]
+    markets = ["KOSPI" if i % 3 else "KOSDAQ" for i in range(n)]
+    matrix = FeatureMatrix(
+        as_of=date.today(), codes=codes, names=names, markets=markets,
+        columns={k: cols[k] for k in FEATURE_COLUMNS},
+    )
+
+    rows = []
+    for i in range(n):
+        fd = SimpleNamespace(stock=SimpleNamespace(code=codes[i], name=names[i]))
+        for k in FEATURE_COLUMNS:
+            setattr(fd, k, float(cols[k][i]))
+        rows.append(fd)
+    return rows, matrix
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+class Command(BaseCommand):
+    help = "추천 엔진 벤치마크: 행 단위 엔진 vs NumPy 컬럼 엔진 (합성 데이터, 결과 일치 검증 포함)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[3000, 30000], help="종목 수 목록 (기본 3000 30000)")
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **opts):
+        top_n = int(opts["top"])
+        repeat = int(opts["repeat"])
+
+        for n in opts["sizes"]:
+            rows, matrix = _synthetic(n, int(opts["seed"]))
+
+            # 1) 결과 일치 검증 (risk x horizon x effort x include_news x profile)
+            mismatches = 0
+            for risk in ("LOW", "MID", "HIGH"):
+                for horizon in ("SHORT", "MID", "LONG"):
+                    for effort in ("SIMPLE", "OPTIMIZE"):
+                        for include_news in (True, False):
+                            for profile in SAMPLE_PROFILES:
+                                kw = dict(risk=risk, horizon=horizon, effort=effort, top_n=top_n,
+                                          include_news=include_news, user_profile=profile)
+                                ref = _recommend_rows_reference(rows, as_of=matrix.as_of, **kw)
+                                new = rank_feature_matrix(matrix, **kw)
+                                if ref != new:
+                                    mismatches += 1
+
+            # 2) 지연 시간
+            kw = dict(risk="MID", horizon="MID", effort="OPTIMIZE", top_n=top_n, include_news=True,
+                      user_profile=SAMPLE_PROFILES[1])
+            t_ref = _best_of(lambda: _recommend_rows_reference(rows, as_of=matrix.as_of, **kw), repeat)
+            t_new = _best_of(lambda: rank_feature_matrix(matrix, **kw), repeat)
+
+            style = self.style.SUCCESS if mismatches == 0 else self.style.ERROR
+            self.stdout.write(style(
+                f"[bench_recommender] n={n:>6} rows={t_ref * 1000:8.2f}ms numpy={t_new * 1000:7.2f}ms "
+                f"speedup=x{t_ref / t_new:5.1f} mismatches={mismatches}"
+            ))
@@ -0,0 +1,156 @@
+# stocks/management/commands/bench_stock_api.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand
+
+from stocks.services.stock_api_client import StockPriceAPIClient
+
+
+def _stub_item(i: int, bas_dt: str) -> dict:
+    close = 10000 + (i * 37) % 5000
+    return {
+        "basDt": bas_dt,
+        "srtnCd": f"{i:06d}",
+        "itmsNm": f"종목{i}",
+        "mrktCtg": "KOSPI" if i % 3 else "KOSDAQ",
+        "clpr": str(close),
+        "mkp": str(close - 10),
+        "hipr": str(close + 50),
+        "lopr": str(close - 50),
+        "trqu": str(1000 + i),
+        "trPrc": str((1000 + i) * close),
+        "mrktTotAmt": str(close * 1_000_000),
+        "lstgStCnt": "1000000",
+    }
+
+
+class StubStockPriceServer:
+    """
+    data.go.kr 주식시세 API(response/body/items) 흉내 로컬 서버
+    - 요청마다 latency초 지연, total_rows건을 numOfRows 단위로 페이지 분할
+    - fail_every > 0이면 n번째 요청마다 503 (재시도 확인용)
+    """
+
+    def __init__(self, total_rows: int = 3000, latency: float = 0.15, fail_every: int = 0):
+        self.total_rows = total_rows
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/getStockPriceInfo"
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):
+                q = parse_qs(urlparse(self.path).query)
+                page_no = int(q.get("pageNo", ["1"])[0])
+                rows = int(q.get("numOfRows", ["1000"])[0])
+                bas_dt = q.get("basDt", [date.today().strftime("%Y%m%d")])[0]
+
+                with stub._lock:
+                    stub.requests += 1
+                    n = stub.requests
+                time.sleep(stub.latency)
+
+                if stub.fail_every and n % stub.fail_every == 0:
+                    self._send(503, b"{}")
+                    return
+
+                lo = (page_no - 1) * rows
+                hi = min(stub.total_rows, lo + rows)
+                items = [_stub_item(i, bas_dt) for i in range(lo, hi)]
+                body = {
+                    "response": {
+                        "header": {"resultCode": "00"},
+                        "body": {
+                            "numOfRows": rows,
+                            "pageNo": page_no,
+                            "totalCount": stub.total_rows,
+                            "items": {"item": items},
+                        },
+                    }
+                }
+                self._send(200, json.dumps(body).encode("utf-8"))
+
+            def _send(self, status, payload):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class Command(BaseCommand):
+    help = "StockPriceAPIClient.fetch_by_date 벤치마크: 순차 vs 동시 페이지 요청 (로컬 stub 서버)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows-total", type=int, default=3000, help="하루치 종목 수 (기본 3000)")
+        parser.add_argument("--page-rows", type=int, default=100, help="페이지당 row 수 (기본 100)")
+        parser.add_argument("--latency", type=float, default=0.15, help="stub 응답 지연(초)")
+        parser.add_argument("--sleep", type=float, default=0.1, help="순차 모드 페이지 간 sleep(초)")
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--max-rps", type=float, default=None, help="동시 모드 초당 요청 제한")
+        parser.add_argument("--fail-every", type=int, default=0, help="n번째 요청마다 503 (재시도 확인)")
+
+    def handle(self, *args, **opts):
+        bas_dt = date.today().strftime("%Y%m%d")
+        rows = opts["page_rows"]
+
+        with StubStockPriceServer(opts["rows_total"], opts["latency"], opts["fail_every"]) as stub:
+            client = StockPriceAPIClient(
+                base_url=stub.url,
+                service_key="stub",
+                max_rps=opts["max_rps"],
+                backoff=0.05,
+                pool_size=opts["workers"],
+            )
+
+            t0 = time.perf_counter()
+            seq = client.fetch_by_date(bas_dt, rows=rows, sleep_sec=opts["sleep"])
+            t_seq = time.perf_counter() - t0
+            req_seq = stub.requests
+
+            t0 = time.perf_counter()
+            conc = client.fetch_by_date(bas_dt, rows=rows, workers=opts["workers"])
+            t_conc = time.perf_counter() - t0
+            req_conc = stub.requests - req_seq
+
+        same = [it["code"] for it in seq] == [it["code"] for it in conc]
+        pages = -(-opts["rows_total"] // rows)
+        self.stdout.write(self.style.NOTICE(
+            f"[bench_stock_api] rows={opts['rows_total']} pages={pages} latency={opts['latency']}s workers={opts['workers']}"
+        ))
+        self.stdout.write(f"  sequential : {len(seq)}건 {t_seq:.2f}s (requests={req_seq})")
+        self.stdout.write(f"  concurrent : {len(conc)}건 {t_conc:.2f}s (requests={req_conc})")
+        style = self.style.SUCCESS if same else self.style.ERROR
+        self.stdout.write(style(f"  speedup=x{t_seq / t_conc:.1f} same_result={same}"))
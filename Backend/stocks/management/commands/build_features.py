@@ -1,11 +1,19 @@
 import math
+import os
+import time
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
-from django.core.management.base import BaseCommand
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.db.models import Max
 
-from stocks.models import DailyPrice, FeatureDaily
+from stocks.models import DailyPrice, FeatureDaily, FeatureState
+from stocks.services.feature_cache import bump_feature_version, bump_feature_versions
+from stocks.services.feature_backfill import compute_chunk, history_start, split_chunks
+from stocks.services.feature_rolling import FEATURE_FIELDS, FLAT_SD_RATIO, NEED, RollingState
 
 
 def _stddev(vals):
@@ -42,130 +50,408 @@ def _return_k(closes, k):
     return closes[-1] / closes[-1 - k] - 1.0
 
 
-def _volume_z(volumes, w):
+def _volume_z(volumes, w, flat_ratio=0.0):
     """
     log(volume+1) 기준 z-score, 마지막 값이 얼마나 튀는지
+    - flat_ratio=0(전체 재계산 기본): 기존대로 sd == 0일 때만 0
+    - 증분/백필 결과와 비교할 때는 FLAT_SD_RATIO를 넘겨 같은 기준으로 계산
+      (누적합 방식은 거래량이 일정한 구간에서 sd가 0이 아닌 아주 작은 값으로 남을 수 있음)
     """
     if len(volumes) < w:
         return None
     xs = [math.log(v + 1) for v in volumes[-w:]]
     mean = sum(xs) / len(xs)
     sd = _stddev(xs)
-    if sd == 0:
+    if sd <= flat_ratio * abs(mean):
         return 0.0
     return (xs[-1] - mean) / sd
 
 
+def _features_from_rows(rows, flat_ratio=0.0):
+    """
+    rows: 최근 NEED개 (date, close, volume) → 피처 dict (전체 재계산 방식)
+    flat_ratio: _volume_z 참고 (검증용)
+    """
+    closes = [float(r[1]) for r in rows]
+    volumes = [int(r[2]) for r in rows]
+
+    # daily returns for vol
+    daily_rets = [(closes[i] / closes[i - 1] - 1.0) for i in range(1, len(closes))]
+
+    return {
+        # returns
+        "r1": _return_k(closes, 1),
+        "r5": _return_k(closes, 5),
+        "r20": _return_k(closes, 20),
+        "r60": _return_k(closes, 60),
+        "vol10": _stddev(daily_rets[-10:]) if len(daily_rets) >= 10 else None,
+        "vol20": _stddev(daily_rets[-20:]) if len(daily_rets) >= 20 else None,
+        "vol60": _stddev(daily_rets[-60:]) if len(daily_rets) >= 60 else None,
+        # mdd
+        "mdd10": _mdd(closes[-10:]) if len(closes) >= 10 else None,
+        "mdd20": _mdd(closes[-20:]) if len(closes) >= 20 else None,
+        "mdd60": _mdd(closes[-60:]) if len(closes) >= 60 else None,
+        # volume z
+        "vz5": _volume_z(volumes, 5, flat_ratio),
+        "vz20": _volume_z(volumes, 20, flat_ratio),
+    }
+
+
+def _load_series(as_of, start_date, stock_ids, chunk):
+    """(stock_id -> 최근 NEED개 (date, close, volume))"""
+    series = defaultdict(lambda: deque(maxlen=NEED))
+
+    qs = (
+        DailyPrice.objects
+        .filter(date__gte=start_date, date__lte=as_of, stock_id__in=stock_ids)
+        .order_by("stock_id", "date")
+        .values_list("stock_id", "date", "close", "volume")
+    )
+
+    for stock_id, d, close, volume in qs.iterator(chunk_size=chunk):
+        series[stock_id].append((d, close, volume))
+    return series
+
+
+def _close_enough(a, b, tol=1e-9):
+    if a is None or b is None:
+        return a is None and b is None
+    return abs(a - b) <= tol * max(1.0, abs(a), abs(b))
+
+
 class Command(BaseCommand):
     help = "DailyPrice로부터 FeatureDaily(수익률/변동성/MDD/거래량z)를 계산해 저장합니다."
 
     def add_arguments(self, parser):
-        parser.add_argument("--date", type=str, required=True, help="기준일(YYYYMMDD)")
+        parser.add_argument("--date", type=str, help="기준일(YYYYMMDD)")
+        parser.add_argument("--start", type=str, help="백필 시작일(YYYYMMDD), --end와 함께 사용")
+        parser.add_argument("--end", type=str, help="백필 종료일(YYYYMMDD)")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="백필 프로세스 수")
+        parser.add_argument("--batch-size", type=int, default=5000, help="백필 bulk_create 묶음 크기")
         parser.add_argument("--lookback-days", type=int, default=400, help="DB에서 조회할 과거 캘린더 일수(기본 400)")
         parser.add_argument("--dry-run", action="store_true", help="DB 저장 없이 계산만")
         parser.add_argument("--chunk", type=int, default=20000, help="DB iterator chunk size")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="FeatureState(종목별 롤링 상태)에 기준일 1일만 반영해 계산 (상태가 없거나 끊긴 종목만 전체 계산)",
+        )
+        parser.add_argument("--verify", action="store_true", help="증분 결과를 전체 재계산 결과와 비교")
 
     def handle(self, *args, **options):
+        if options["start"] or options["end"]:
+            if not (options["start"] and options["end"]):
+                raise CommandError("--start와 --end는 함께 지정해야 합니다.")
+            return self._backfill(options)
+        if not options["date"]:
+            raise CommandError("--date 또는 --start/--end가 필요합니다.")
+
         as_of = datetime.strptime(options["date"], "%Y%m%d").date()
         lookback_days = options["lookback_days"]
         dry_run = options["dry_run"]
         chunk = options["chunk"]
+        incremental = options["incremental"]
 
         # 최대 윈도우가 60이므로 최소 61개 종가 필요
-        NEED = 61
         start_date = as_of - timedelta(days=lookback_days)
 
-        self.stdout.write(self.style.NOTICE(f"[features] as_of={as_of} start={start_date} NEED={NEED}"))
+        self.stdout.write(self.style.NOTICE(
+            f"[features] as_of={as_of} start={start_date} NEED={NEED} mode={'incremental' if incremental else 'full'}"
+        ))
+
+        t0 = time.perf_counter()
 
         # 기준일에 실제로 데이터 있는 종목만 계산(추천 기준일과 맞추기)
-        asof_stock_ids = set(
-            DailyPrice.objects.filter(date=as_of).values_list("stock_id", flat=True)
-        )
-        if not asof_stock_ids:
+        today = {
+            stock_id: (close, volume)
+            for stock_id, close, volume in DailyPrice.objects.filter(date=as_of).values_list("stock_id", "close", "volume")
+        }
+        if not today:
             self.stdout.write(self.style.ERROR(
                 f"[features] {as_of} DailyPrice가 0건입니다. sync_prices를 먼저 저장 모드로 실행했는지 확인!"
             ))
             return
 
-        # (stock_id -> 최근 NEED개)만 유지
-        series = defaultdict(lambda: deque(maxlen=NEED))
+        if incremental:
+            states = self._incremental_states(as_of, start_date, today, chunk)
+        else:
+            series = _load_series(as_of, start_date, today.keys(), chunk)
+            self.stdout.write(self.style.SUCCESS(f"[features] 시계열 수집 완료: {len(series)}종목"))
+            states = None
 
-        qs = (
-            DailyPrice.objects
-            .filter(date__gte=start_date, date__lte=as_of, stock_id__in=asof_stock_ids)
-            .order_by("stock_id", "date")
-            .values_list("stock_id", "date", "close", "volume")
-        )
+        to_create = []
+        skipped = 0
 
-        for stock_id, d, close, volume in qs.iterator(chunk_size=chunk):
-            series[stock_id].append((d, close, volume))
+        if incremental:
+            for stock_id, st in states.items():
+                # 기준일 데이터가 마지막이고, 창 전체가 lookback 안에 있어야 함(전체 계산과 동일 조건)
+                if len(st.closes) < NEED or st.last_date != as_of or st.dates[0] < start_date:
+                    skipped += 1
+                    continue
+                to_create.append(FeatureDaily(stock_id=stock_id, date=as_of, **st.features()))
+        else:
+            for stock_id, rows in series.items():
+                if len(rows) < NEED:
+                    skipped += 1
+                    continue
+
+                # 기준일 데이터가 마지막이어야 함
+                if rows[-1][0] != as_of:
+                    skipped += 1
+                    continue
+
+                to_create.append(FeatureDaily(stock_id=stock_id, date=as_of, **_features_from_rows(rows)))
+
+        elapsed = time.perf_counter() - t0
+        rate = len(to_create) / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(self.style.NOTICE(
+            f"[features] 생성 대상={len(to_create)} / 스킵={skipped} ({elapsed:.2f}s, {rate:,.0f} rows/s)"
+        ))
+
+        if options["verify"]:
+            self._verify(as_of, start_date, today, chunk, to_create)
 
-        self.stdout.write(self.style.SUCCESS(f"[features] 시계열 수집 완료: {len(series)}종목"))
+        if dry_run:
+            if to_create:
+                sample = to_create[0]
+                self.stdout.write(self.style.WARNING(
+                    f"[dry-run] sample stock_id={sample.stock_id} r5={sample.r5} vol20={sample.vol20} mdd20={sample.mdd20} vz20={sample.vz20}"
+                ))
+            return
 
         # 기존 피처 삭제 후 재생성(기준일 기준 idempotent)
-        if not dry_run:
+        with transaction.atomic():
             FeatureDaily.objects.filter(date=as_of).delete()
+            FeatureDaily.objects.bulk_create(to_create, batch_size=2000)
 
-        to_create = []
-        skipped = 0
-
-        for stock_id, rows in series.items():
-            if len(rows) < NEED:
-                skipped += 1
-                continue
+        # 다음 거래일 증분 계산을 위한 롤링 상태 저장
+        if states is None:
+            states = {stock_id: RollingState.from_rows(rows) for stock_id, rows in series.items()}
+        self._save_states(states)
 
-            # 기준일 데이터가 마지막이어야 함
-            if rows[-1][0] != as_of:
-                skipped += 1
-                continue
+        bump_feature_version(as_of)
 
-            closes = [float(r[1]) for r in rows]
-            volumes = [int(r[2]) for r in rows]
+        self.stdout.write(self.style.SUCCESS(f"[features] 저장 완료: FeatureDaily {len(to_create)}건 (date={as_of})"))
 
-            # returns
-            r1 = _return_k(closes, 1)
-            r5 = _return_k(closes, 5)
-            r20 = _return_k(closes, 20)
-            r60 = _return_k(closes, 60)
+    # -------------------------
+    # incremental
+    # -------------------------
+    def _incremental_states(self, as_of, start_date, today, chunk):
+        """
+        - 직전 거래일까지 반영된 상태(warm): 기준일 1행만 push
+        - 상태가 없거나/끊겼거나/재실행(last_date=as_of)인 종목(cold): 시계열로 상태 재생성
+        """
+        prev_day = (
+            DailyPrice.objects
+            .filter(date__lt=as_of, stock_id__in=today.keys())
+            .aggregate(d=Max("date"))["d"]
+        )
 
-            # daily returns for vol
-            daily_rets = [(closes[i] / closes[i - 1] - 1.0) for i in range(1, len(closes))]
+        states = {}
+        for stock_id, last_date, payload in (
+            FeatureState.objects.filter(stock_id__in=today.keys()).values_list("stock_id", "last_date", "payload")
+        ):
+            if prev_day is not None and last_date == prev_day:
+                states[stock_id] = RollingState.from_payload(payload)
+        cold = [sid for sid in today if sid not in states]
+
+        for stock_id, st in states.items():
+            close, volume = today[stock_id]
+            st.push(as_of, close, volume)
+        warm = len(states)
+
+        if cold:
+            series = _load_series(as_of, start_date, cold, chunk)
+            for stock_id, rows in series.items():
+                states[stock_id] = RollingState.from_rows(rows)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"[features] 롤링 상태: warm={warm} cold={len(cold)} (prev_day={prev_day})"
+        ))
+        return states
+
+    def _save_states(self, states):
+        """
+        롤링 상태 upsert
+        - 저장된 상태가 더 최근(last_date가 더 늦음)인 종목은 건너뜀
+          → 과거 날짜 재계산/백필이 최신 상태를 덮어써 다음 증분 실행이 전부 cold가 되는 것 방지
+        """
+        stored = dict(FeatureState.objects.values_list("stock_id", "last_date"))
+        objs = [
+            FeatureState(stock_id=stock_id, last_date=st.last_date, payload=st.to_payload())
+            for stock_id, st in states.items()
+            if st.last_date is not None
+            and (stored.get(stock_id) is None or stored[stock_id] <= st.last_date)
+        ]
+        kept = sum(1 for st in states.values() if st.last_date is not None) - len(objs)
+        if kept:
+            self.stdout.write(self.style.NOTICE(f"[features] 롤링 상태: 더 최근 상태가 있는 {kept}종목은 유지"))
+        FeatureState.objects.bulk_create(
+            objs,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["stock"],
+            update_fields=["last_date", "payload", "updated_at"],
+        )
 
-            vol10 = _stddev(daily_rets[-10:]) if len(daily_rets) >= 10 else None
-            vol20 = _stddev(daily_rets[-20:]) if len(daily_rets) >= 20 else None
-            vol60 = _stddev(daily_rets[-60:]) if len(daily_rets) >= 60 else None
+    def _verify(self, as_of, start_date, today, chunk, to_create):
+        """전체 재계산과 비교 (상대오차 1e-9 이내면 일치)"""
+        series = _load_series(as_of, start_date, today.keys(), chunk)
+        expected = {
+            stock_id: _features_from_rows(rows, FLAT_SD_RATIO)
+            for stock_id, rows in series.items()
+            if len(rows) >= NEED and rows[-1][0] == as_of
+        }
+
+        got = {fd.stock_id: fd for fd in to_create}
+        mismatches = 0
+        max_diff = 0.0
+        for stock_id in set(expected) | set(got):
+            exp = expected.get(stock_id)
+            fd = got.get(stock_id)
+            if exp is None or fd is None:
+                mismatches += 1
+                continue
+            for f in FEATURE_FIELDS:
+                a, b = getattr(fd, f), exp[f]
+                if a is not None and b is not None:
+                    max_diff = max(max_diff, abs(a - b))
+                if not _close_enough(a, b):
+                    mismatches += 1
+                    break
+
+        style = self.style.SUCCESS if mismatches == 0 else self.style.ERROR
+        self.stdout.write(style(
+            f"[features] verify: {len(expected)}종목 전체 재계산과 비교 mismatches={mismatches} max_abs_diff={max_diff:.3e}"
+        ))
+
+    # -------------------------
+    # backfill (--start/--end)
+    # -------------------------
+    def _backfill(self, options):
+        """
+        기간 백필: 종목별 가격 시계열을 한 번만 읽고, 모든 거래일 피처를 벡터화 계산
+        - 종목 묶음을 ProcessPoolExecutor로 병렬 처리
+        - 결과는 batch_size 단위 bulk_create (기간 내 기존 피처는 먼저 삭제)
+        """
+        start = datetime.strptime(options["start"], "%Y%m%d").date()
+        end = datetime.strptime(options["end"], "%Y%m%d").date()
+        if start > end:
+            raise CommandError(f"start({start})가 end({end})보다 늦습니다.")
 
-            # mdd
-            mdd10 = _mdd(closes[-10:]) if len(closes) >= 10 else None
-            mdd20 = _mdd(closes[-20:]) if len(closes) >= 20 else None
-            mdd60 = _mdd(closes[-60:]) if len(closes) >= 60 else None
+        lookback_days = options["lookback_days"]
+        dry_run = options["dry_run"]
+        chunk = options["chunk"]
+        workers = max(1, int(options["workers"]))
+        batch_size = max(1, int(options["batch_size"]))
 
-            # volume z
-            vz5 = _volume_z(volumes, 5)
-            vz20 = _volume_z(volumes, 20)
+        t0 = time.perf_counter()
+        hist_start = history_start(start, lookback_days)
+        self.stdout.write(self.style.NOTICE(
+            f"[features] backfill start={start} end={end} history_from={hist_start} workers={workers}"
+        ))
 
-            to_create.append(
-                FeatureDaily(
-                    stock_id=stock_id,
-                    date=as_of,
-                    r1=r1, r5=r5, r20=r20, r60=r60,
-                    vol10=vol10, vol20=vol20, vol60=vol60,
-                    mdd10=mdd10, mdd20=mdd20, mdd60=mdd60,
-                    vz5=vz5, vz20=vz20,
-                )
-            )
+        # 1) 종목별 시계열 1회 로드
+        raw = defaultdict(list)
+        qs = (
+            DailyPrice.objects
+            .filter(date__gte=hist_start, date__lte=end)
+            .order_by("stock_id", "date")
+            .values_list("stock_id", "date", "close", "volume")
+        )
+        for stock_id, d, close, volume in qs.iterator(chunk_size=chunk):
+            raw[stock_id].append((d, close, volume))
 
-        self.stdout.write(self.style.NOTICE(f"[features] 생성 대상={len(to_create)} / 스킵={skipped}"))
+        items = []
+        for stock_id, rows in raw.items():
+            if len(rows) < NEED:
+                continue
+            ds, cs, vs = zip(*rows)
+            items.append((
+                stock_id,
+                np.array(ds, dtype="datetime64[D]"),
+                np.asarray(cs, dtype=np.float64),
+                np.asarray(vs, dtype=np.float64),
+            ))
+        t_load = time.perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(
+            f"[features] 시계열 수집 완료: {len(raw)}종목 (계산 대상 {len(items)}종목, {t_load:.2f}s)"
+        ))
+
+        # 2) 병렬 계산
+        t1 = time.perf_counter()
+        chunks = split_chunks(items, workers * 4)
+        results = []
+        if workers == 1 or len(chunks) <= 1:
+            for c in chunks:
+                results.extend(compute_chunk(c, start, end, lookback_days))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(compute_chunk, c, start, end, lookback_days) for c in chunks]
+                for f in futures:
+                    results.extend(f.result())
+        t_calc = time.perf_counter() - t1
+        rate = len(results) / t_calc if t_calc > 0 else 0.0
+        self.stdout.write(self.style.NOTICE(
+            f"[features] 계산 완료: {len(results)}행 ({t_calc:.2f}s, {rate:,.0f} rows/s)"
+        ))
+
+        if options["verify"]:
+            self._verify_backfill(raw, results, lookback_days)
 
         if dry_run:
-            if to_create:
-                sample = to_create[0]
+            if results:
+                stock_id, d, vals = results[0]
+                sample = dict(zip(FEATURE_FIELDS, vals))
                 self.stdout.write(self.style.WARNING(
-                    f"[dry-run] sample stock_id={sample.stock_id} r5={sample.r5} vol20={sample.vol20} mdd20={sample.mdd20} vz20={sample.vz20}"
+                    f"[dry-run] sample stock_id={stock_id} date={d} r5={sample['r5']} vol20={sample['vol20']} mdd20={sample['mdd20']} vz20={sample['vz20']}"
                 ))
             return
 
+        # 3) 저장: 기간 삭제 + batch_size 단위 bulk_create + 롤링 상태 + 버전 bump를 한 트랜잭션으로
+        #    (중간에 실패하면 기존 FeatureDaily 그대로 → 기간이 비거나 일부만 남지 않음)
+        t2 = time.perf_counter()
         with transaction.atomic():
-            FeatureDaily.objects.bulk_create(to_create, batch_size=2000)
-
-        self.stdout.write(self.style.SUCCESS(f"[features] 저장 완료: FeatureDaily {len(to_create)}건 (date={as_of})"))
+            FeatureDaily.objects.filter(date__gte=start, date__lte=end).delete()
+            for i in range(0, len(results), batch_size):
+                FeatureDaily.objects.bulk_create([
+                    FeatureDaily(stock_id=stock_id, date=d, **dict(zip(FEATURE_FIELDS, vals)))
+                    for stock_id, d, vals in results[i:i + batch_size]
+                ], batch_size=2000)
+
+            # 종료일까지 반영된 롤링 상태 저장 → 이후 증분 모드로 이어서 계산 (더 최근 상태는 유지)
+            self._save_states({
+                stock_id: RollingState.from_rows(rows)
+                for stock_id, rows in raw.items()
+            })
+
+            bump_feature_versions(start, end)
+        t_save = time.perf_counter() - t2
+
+        total = time.perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(
+            f"[features] 백필 저장 완료: FeatureDaily {len(results)}건 ({start}~{end}) "
+            f"load={t_load:.1f}s calc={t_calc:.1f}s save={t_save:.1f}s total={total:.1f}s"
+        ))
+
+    def _verify_backfill(self, raw, results, lookback_days, max_stocks=50):
+        """백필 결과 일부 종목을 단일일 전체 계산(_features_from_rows)과 비교"""
+        by_stock = defaultdict(list)
+        for stock_id, d, vals in results:
+            by_stock[stock_id].append((d, vals))
+
+        checked = 0
+        mismatches = 0
+        for stock_id in list(by_stock)[:max_stocks]:
+            rows = raw[stock_id]
+            index = {r[0]: i for i, r in enumerate(rows)}
+            for d, vals in by_stock[stock_id]:
+                i = index[d]
+                window = [r for r in rows[max(0, i - NEED + 1):i + 1] if r[0] >= d - timedelta(days=lookback_days)]
+                exp = _features_from_rows(window, FLAT_SD_RATIO)
+                checked += 1
+                if not all(_close_enough(v, exp[f]) for f, v in zip(FEATURE_FIELDS, vals)):
+                    mismatches += 1
+
+        style = self.style.SUCCESS if mismatches == 0 else self.style.ERROR
+        self.stdout.write(style(f"[features] verify: {checked}행 단일일 계산과 비교 mismatches={mismatches}"))
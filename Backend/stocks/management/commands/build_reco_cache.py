@@ -0,0 +1,31 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from stocks.services.reco_cache import GRID_SIZE, materialize_base_rankings
+
+
+class Command(BaseCommand):
+    help = "기준일의 기본 추천 랭킹(risk×horizon×effort×include_news 36개)을 RecommendationCache에 미리 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=str, required=True, help="기준일(YYYYMMDD)")
+        parser.add_argument("--dry-run", action="store_true", help="DB 저장 없이 계산만")
+
+    def handle(self, *args, **options):
+        as_of = datetime.strptime(options["date"], "%Y%m%d").date()
+        dry_run = options["dry_run"]
+
+        t0 = time.perf_counter()
+        count = materialize_base_rankings(as_of, dry_run=dry_run)
+        elapsed = time.perf_counter() - t0
+
+        if count == 0:
+            self.stdout.write(self.style.WARNING(f"[reco_cache] FeatureDaily 없음: date={as_of} (skip)"))
+            return
+
+        label = "계산 완료(dry-run)" if dry_run else "저장 완료"
+        self.stdout.write(self.style.SUCCESS(
+            f"[reco_cache] {label}: {count}/{GRID_SIZE}개 랭킹 (date={as_of}, {elapsed * 1000:.0f}ms)"
+        ))
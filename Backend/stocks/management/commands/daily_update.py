@@ -7,6 +7,7 @@ from django.core.management import call_command
 from django.utils import timezone
 
 from stocks.models import UpdateLog
+from stocks.services.feature_cache import bump_feature_version
 
 
 def _parse_yyyymmdd(s: str):
@@ -86,9 +87,9 @@ class Command(BaseCommand):
             self.stdout.write(self.style.NOTICE(f"[daily_update] sync_prices as_of={as_of} dry_run={dry_run}"))
             call_command("sync_prices", date=as_of.strftime("%Y%m%d"), dry_run=dry_run)
 
-            # 2) 피처 생성
+            # 2) 피처 생성 (롤링 상태로 증분 계산, 상태 없는 종목은 자동으로 전체 계산)
             self.stdout.write(self.style.NOTICE(f"[daily_update] build_features as_of={as_of} dry_run={dry_run}"))
-            call_command("build_features", date=as_of.strftime("%Y%m%d"), dry_run=dry_run)
+            call_command("build_features", date=as_of.strftime("%Y%m%d"), dry_run=dry_run, incremental=True)
 
             # 3) 뉴스(선택) - 실패해도 전체는 SUCCESS 유지(경고만)
             if run_news:
@@ -106,6 +107,18 @@ class Command(BaseCommand):
                 except Exception as e:
                     warnings = (warnings + "\n" if warnings else "") + f"sync_stock_news failed: {e}"
 
+            # 피처 캐시 무효화 스탬프 (추천/시장 요약 프로세스 캐시가 새로 로드하도록)
+            if not dry_run:
+                version = bump_feature_version(as_of)
+                self.stdout.write(self.style.NOTICE(f"[daily_update] feature_version={version}"))
+
+            # 4) 기본 추천 랭킹 36개 미리 계산 - 실패해도 요청 시 계산되므로 경고만
+            try:
+                self.stdout.write(self.style.NOTICE(f"[daily_update] build_reco_cache as_of={as_of} dry_run={dry_run}"))
+                call_command("build_reco_cache", date=as_of.strftime("%Y%m%d"), dry_run=dry_run)
+            except Exception as e:
+                warnings = (warnings + "\n" if warnings else "") + f"build_reco_cache failed: {e}"
+
             _set_fields(
                 log,
                 status=_status_value("SUCCESS"),
@@ -3,10 +3,10 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 from django.core.management.base import BaseCommand
-from django.db import transaction
 from django.utils import timezone
 
 from stocks.models import FxRateDaily
+from stocks.services.bulk_upsert import format_counts, last_stored_date, upsert_frame
 
 
 class Command(BaseCommand):
@@ -21,6 +21,11 @@ class Command(BaseCommand):
         )
         parser.add_argument("--start", default=None, help="YYYY-MM-DD (기본: 오늘-14일)")
         parser.add_argument("--end", default=None, help="YYYY-MM-DD (기본: 오늘)")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="pair별 마지막 저장일부터만 받아옴 (저장된 데이터가 없으면 --start부터)",
+        )
 
     def handle(self, *args, **opts):
         try:
@@ -36,8 +41,14 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f"[sync_fx_rates] {pairs} {start} ~ {end}"))
 
         for pair in pairs:
+            pair_start = start
+            if opts["incremental"]:
+                last = last_stored_date(FxRateDaily, {"pair": pair})
+                if last:
+                    pair_start = max(start, last.strftime("%Y-%m-%d"))
+
             try:
-                df = fdr.DataReader(pair, start, end)
+                df = fdr.DataReader(pair, pair_start, end)
             except Exception as e:
                 self.stdout.write(self.style.WARNING(f"  - {pair}: fetch 실패 ({e})"))
                 continue
@@ -48,23 +59,6 @@ class Command(BaseCommand):
 
             close_col = "Close" if "Close" in df.columns else df.columns[0]
 
-            saved_new = 0
-            updated = 0
-
-            with transaction.atomic():
-                for idx, row in df.iterrows():
-                    d = idx.date() if hasattr(idx, "date") else idx
-                    close = row.get(close_col)
-                    close = float(close) if close is not None else None
-
-                    obj, created = FxRateDaily.objects.update_or_create(
-                        pair=pair,
-                        date=d,
-                        defaults={"close": close},
-                    )
-                    if created:
-                        saved_new += 1
-                    else:
-                        updated += 1
+            counts = upsert_frame(FxRateDaily, df, key={"pair": pair}, columns={"close": close_col})
 
-            self.stdout.write(self.style.SUCCESS(f"  - {pair}: rows={len(df)} new={saved_new} updated={updated}"))
+            self.stdout.write(self.style.SUCCESS(f"  - {pair}: {pair_start}~ rows={len(df)} {format_counts(counts)}"))
@@ -3,9 +3,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from django.core.management.base import BaseCommand
-from django.db import transaction
 
 from stocks.models import MarketIndex, MarketIndexDaily
+from stocks.services.bulk_upsert import format_counts, last_stored_date, upsert_frame
 
 class Command(BaseCommand):
     help = "FinanceDataReader로 지수(예: KS11, KQ11, KS200...) 일봉을 받아 DB에 저장합니다."
@@ -19,6 +19,11 @@ class Command(BaseCommand):
         )
         parser.add_argument("--start", default="2015-01-01", help="YYYY-MM-DD")
         parser.add_argument("--end", default=None, help="YYYY-MM-DD (기본: 오늘)")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="심볼별 마지막 저장일부터만 받아옴 (저장된 데이터가 없으면 --start부터)",
+        )
 
     def handle(self, *args, **opts):
         import FinanceDataReader as fdr
@@ -30,28 +35,27 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f"[sync_index_prices] {symbols} {start} ~ {end}"))
 
         for sym in symbols:
-            df = fdr.DataReader(sym, start, end)  # columns: Open High Low Close Volume
+            idx_obj, _ = MarketIndex.objects.get_or_create(symbol=sym, defaults={"name": sym})
+
+            sym_start = start
+            if opts["incremental"]:
+                # 마지막 저장일도 다시 받아 장중 값이었으면 확정 종가로 갱신
+                last = last_stored_date(MarketIndexDaily, {"index": idx_obj})
+                if last:
+                    sym_start = max(start, last.strftime("%Y-%m-%d"))
+
+            df = fdr.DataReader(sym, sym_start, end)  # columns: Open High Low Close Volume
             if df is None or df.empty:
                 self.stdout.write(self.style.WARNING(f"  - {sym}: no data"))
                 continue
 
-            idx_obj, _ = MarketIndex.objects.get_or_create(symbol=sym, defaults={"name": sym})
+            counts = upsert_frame(
+                MarketIndexDaily,
+                df,
+                key={"index": idx_obj},
+                columns={"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"},
+                casts={"volume": int},
+                required=("close",),
+            )
 
-            saved = 0
-            with transaction.atomic():
-                for dt, row in df.iterrows():
-                    d = dt.date() if hasattr(dt, "date") else dt
-                    defaults = {
-                        "open": float(row.get("Open")) if row.get("Open") is not None else None,
-                        "high": float(row.get("High")) if row.get("High") is not None else None,
-                        "low": float(row.get("Low")) if row.get("Low") is not None else None,
-                        "close": float(row.get("Close")),
-                        "volume": int(row.get("Volume")) if row.get("Volume") is not None else None,
-                    }
-                    _, created = MarketIndexDaily.objects.update_or_create(
-                        index=idx_obj, date=d, defaults=defaults
-                    )
-                    if created:
-                        saved += 1
-
-            self.stdout.write(self.style.SUCCESS(f"  - {sym}: rows={len(df)} saved_new={saved}"))
+            self.stdout.write(self.style.SUCCESS(f"  - {sym}: {sym_start}~ rows={len(df)} {format_counts(counts)}"))
@@ -1,11 +1,29 @@
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.utils import timezone
 
 from stocks.models import Stock, DailyPrice
+from stocks.services.krx_calendar import trading_days
 from stocks.services.stock_api_client import StockPriceAPIClient
 
 
+# DailyPrice 값 컬럼 (upsert 시 비교/갱신 대상)
+PRICE_FIELDS = ("open", "high", "low", "close", "volume", "amount", "market_cap", "listed_shares")
+
+
+def _format_counts(counts: dict, elapsed: float) -> str:
+    written = counts["inserted"] + counts["updated"]
+    total = written + counts["unchanged"]
+    rate = total / elapsed if elapsed > 0 else 0.0
+    return (
+        f"inserted={counts['inserted']} updated={counts['updated']} unchanged={counts['unchanged']} "
+        f"({elapsed:.2f}s, {rate:,.0f} rows/s)"
+    )
+
+
 class Command(BaseCommand):
     help = "주식시세정보 API로 DailyPrice(일봉) 데이터를 적재합니다."
 
@@ -15,15 +33,24 @@ class Command(BaseCommand):
         parser.add_argument("--end", type=str, help="종료 날짜(YYYYMMDD)")
         parser.add_argument("--rows", type=int, default=1000, help="페이지당 row 수 (기본 1000)")
         parser.add_argument("--sleep", type=float, default=0.1, help="페이지 요청 간 sleep (초)")
+        parser.add_argument("--workers", type=int, default=1, help="페이지 동시 요청 수 (1이면 순차 + sleep)")
+        parser.add_argument("--max-rps", type=float, default=None, help="초당 요청 제한 (기본: STOCK_PRICE_API_MAX_RPS)")
+        parser.add_argument("--date-workers", type=int, default=4, help="범위 모드: 날짜 동시 수집 수")
+        parser.add_argument("--commit-rows", type=int, default=20000, help="범위 모드: 한 트랜잭션에 모아 저장할 row 수")
+        parser.add_argument("--resume", action="store_true", help="범위 모드: 이미 DailyPrice가 있는 날짜는 건너뜀")
         parser.add_argument("--dry-run", action="store_true", help="DB 저장 없이 호출/파싱만")
 
     def handle(self, *args, **options):
-        client = StockPriceAPIClient()
-
         date_str = options.get("date")
         start = options.get("start")
         end = options.get("end")
 
+        # 세션 커넥션 풀 = 동시에 나갈 수 있는 최대 요청 수 (범위 모드는 날짜 스레드마다 페이지 workers개)
+        concurrency = max(1, options["workers"])
+        if not date_str and start and end:
+            concurrency *= max(1, options["date_workers"])
+        client = StockPriceAPIClient(max_rps=options["max_rps"], pool_size=concurrency)
+
         if date_str:
             self._sync_one_date(client, date_str, options)
             return
@@ -35,16 +62,131 @@ class Command(BaseCommand):
         raise ValueError("옵션이 필요합니다. 예) --date 20251217 또는 --start 20251001 --end 20251217")
 
     def _sync_range(self, client, start: str, end: str, options):
+        """
+        범위 모드
+        - KRX 휴장일/주말은 호출하지 않음 (krx_calendar)
+        - 날짜 단위로 date_workers개 동시 수집 → 메인 스레드 writer 하나가 commit_rows 단위로 모아 저장
+          (제출은 2 * date_workers개 창 단위 → 끝났는데 저장 안 된 결과가 메모리에 무한정 쌓이지 않음)
+        - 저장이 실패하면 대기 중인 수집은 취소하고 바로 예외 (남은 날짜 API 호출을 기다리지 않음)
+        - 날짜는 통째로 한 트랜잭션에 들어가므로 중단 후 --resume 으로 남은 날짜만 이어서 실행 가능
+        """
         start_dt = datetime.strptime(start, "%Y%m%d").date()
         end_dt = datetime.strptime(end, "%Y%m%d").date()
         if start_dt > end_dt:
             raise ValueError("start는 end보다 클 수 없습니다.")
 
-        cur = start_dt
-        while cur <= end_dt:
-            yyyymmdd = cur.strftime("%Y%m%d")
-            self._sync_one_date(client, yyyymmdd, options)
-            cur += timedelta(days=1)
+        dry_run = options["dry_run"]
+        date_workers = max(1, options["date_workers"])
+        commit_rows = max(1, options["commit_rows"])
+
+        days = trading_days(start_dt, end_dt)
+        calendar_days = (end_dt - start_dt).days + 1
+
+        resumed = 0
+        if options["resume"] and not dry_run:
+            done = set(
+                DailyPrice.objects.filter(date__gte=start_dt, date__lte=end_dt)
+                .values_list("date", flat=True)
+                .distinct()
+            )
+            resumed = sum(1 for d in days if d in done)
+            days = [d for d in days if d not in done]
+
+        self.stdout.write(self.style.NOTICE(
+            f"[sync] range {start_dt}~{end_dt}: 거래일 {len(days)}일 "
+            f"(휴장/주말 {calendar_days - len(days) - resumed}일 제외, resume 스킵 {resumed}일) date_workers={date_workers}"
+        ))
+
+        t0 = time.perf_counter()
+        pending = []
+        pending_rows = 0
+        saved_days = saved_rows = 0
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0}
+        write_sec = 0.0
+        empty_days = []
+        failed_days = []
+
+        def _fetch(d):
+            return client.fetch_by_date(
+                d.strftime("%Y%m%d"),
+                rows=options["rows"],
+                sleep_sec=options["sleep"],
+                workers=options["workers"],
+            )
+
+        def _flush():
+            nonlocal pending, pending_rows, saved_days, saved_rows, write_sec
+            if not pending:
+                return
+            if not dry_run:
+                tw = time.perf_counter()
+                counts = self._write_batch(pending)
+                write_sec += time.perf_counter() - tw
+                for k in totals:
+                    totals[k] += counts[k]
+            saved_days += len(pending)
+            saved_rows += pending_rows
+            elapsed = time.perf_counter() - t0
+            self.stdout.write(self.style.SUCCESS(
+                f"[sync] 저장 {saved_days}/{len(days)}일, {saved_rows}건 ({saved_rows / elapsed:,.0f} rows/s)"
+            ))
+            pending = []
+            pending_rows = 0
+
+        day_iter = iter(days)
+        futures = {}
+        pool = ThreadPoolExecutor(max_workers=date_workers)
+
+        def _submit_next():
+            d = next(day_iter, None)
+            if d is not None:
+                futures[pool.submit(_fetch, d)] = d
+
+        try:
+            for _ in range(2 * date_workers):
+                _submit_next()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    d = futures.pop(fut)
+                    _submit_next()
+                    try:
+                        items = fut.result()
+                    except Exception as e:
+                        failed_days.append(d)
+                        self.stdout.write(self.style.ERROR(f"[sync] {d:%Y%m%d} 수집 실패: {e}"))
+                        continue
+
+                    if not items:
+                        empty_days.append(d)
+                        self.stdout.write(self.style.WARNING(f"[sync] {d:%Y%m%d} 데이터 없음(휴장/파라미터/URL 확인 필요)"))
+                        continue
+
+                    pending.append(items)
+                    pending_rows += len(items)
+                    if pending_rows >= commit_rows:
+                        _flush()
+        except BaseException:
+            # writer(DB) 오류/중단: 아직 시작 안 한 수집은 취소, 실행 중인 것도 기다리지 않음
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+
+        _flush()
+
+        elapsed = time.perf_counter() - t0
+        label = "수집 완료(dry-run)" if dry_run else "DB 저장 완료"
+        self.stdout.write(self.style.SUCCESS(
+            f"[sync] range {label}: {saved_days}일 {saved_rows}건, {elapsed:.1f}s "
+            f"(데이터 없음 {len(empty_days)}일, 실패 {len(failed_days)}일)"
+        ))
+        if not dry_run:
+            self.stdout.write(self.style.SUCCESS(f"[sync] DailyPrice {_format_counts(totals, write_sec)}"))
+        if failed_days:
+            self.stdout.write(self.style.WARNING(
+                "[sync] 실패한 날짜: " + ", ".join(d.strftime("%Y%m%d") for d in sorted(failed_days))
+                + " → 같은 범위로 --resume 재실행"
+            ))
 
     def _sync_one_date(self, client, yyyymmdd: str, options):
         rows = options["rows"]
@@ -53,7 +195,7 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.NOTICE(f"[sync] {yyyymmdd} 호출 시작"))
 
-        items = client.fetch_by_date(yyyymmdd, rows=rows, sleep_sec=sleep_sec)
+        items = client.fetch_by_date(yyyymmdd, rows=rows, sleep_sec=sleep_sec, workers=options["workers"])
 
         if not items:
             self.stdout.write(self.style.WARNING(f"[sync] {yyyymmdd} 데이터 없음(휴장/파라미터/URL 확인 필요)"))
@@ -66,14 +208,35 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING(f"[dry-run] sample: {sample}"))
             return
 
+        t0 = time.perf_counter()
+        counts = self._write_batch([items])
+        elapsed = time.perf_counter() - t0
+
+        self.stdout.write(self.style.SUCCESS(
+            f"[sync] {yyyymmdd} DB 저장 완료 (DailyPrice {_format_counts(counts, elapsed)})"
+        ))
+
+    def _write_batch(self, batches) -> dict:
+        """
+        여러 날짜의 수집 결과를 한 트랜잭션으로 저장
+        batches: [items(하루치), ...]
+        반환: {"inserted", "updated", "unchanged"} 건수
+        """
+        # 날짜 오름차순으로 처리 → 이름/시장은 가장 최근 날짜 값이 남음
+        batches = sorted(batches, key=lambda items: items[0]["date"])
+
+        latest = {}
+        for items in batches:
+            for it in items:
+                latest[it["code"]] = it
+        codes = list(latest)
+
         # 1) Stock upsert(생성 위주)
-        codes = [it["code"] for it in items]
         existing = Stock.objects.filter(code__in=codes).in_bulk(field_name="code")
 
         to_create = []
         to_update = []
-        for it in items:
-            code = it["code"]
+        for code, it in latest.items():
             name = it["name"]
             market = it.get("market", "") or ""
 
@@ -90,43 +253,57 @@ class Command(BaseCommand):
                     s.market = market
                     changed = True
                 if changed:
+                    # bulk_update는 auto_now를 안 채움 → 종목 카탈로그 변경 감지(챗봇 엔티티 매처)용으로 직접 갱신
+                    s.updated_at = timezone.now()
                     to_update.append(s)
 
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
         with transaction.atomic():
             if to_create:
                 Stock.objects.bulk_create(to_create, batch_size=1000)
             if to_update:
-                Stock.objects.bulk_update(to_update, ["name", "market"], batch_size=1000)
+                Stock.objects.bulk_update(to_update, ["name", "market", "updated_at"], batch_size=1000)
 
             # 새로 만든 것까지 포함해서 다시 맵 로딩
             stock_map = Stock.objects.filter(code__in=codes).in_bulk(field_name="code")
 
-            # 2) DailyPrice는 해당 날짜/해당 종목들만 "삭제 후 재삽입" (가장 단순+빠른 업서트)
-            date_obj = datetime.strptime(yyyymmdd, "%Y%m%d").date()
-            stock_ids = [stock_map[c].id for c in codes if c in stock_map]
+            # 2) DailyPrice: 기존 값과 비교해서 바뀐 행만 upsert (같으면 쓰지 않음)
+            incoming = {}
+            for items in batches:
+                for it in items:
+                    s = stock_map.get(it["code"])
+                    if not s:
+                        continue
+                    incoming[(s.id, it["date"])] = tuple(it.get(f) for f in PRICE_FIELDS)
 
-            DailyPrice.objects.filter(date=date_obj, stock_id__in=stock_ids).delete()
+            dates = sorted({d for _, d in incoming})
+            stock_ids = sorted({sid for sid, _ in incoming})
+            existing_prices = {
+                (row[0], row[1]): row[2:]
+                for row in DailyPrice.objects
+                .filter(date__in=dates, stock_id__in=stock_ids)
+                .values_list("stock_id", "date", *PRICE_FIELDS)
+                .iterator(chunk_size=5000)
+            }
 
             dp_objs = []
-            for it in items:
-                s = stock_map.get(it["code"])
-                if not s:
+            for (stock_id, d), values in incoming.items():
+                old = existing_prices.get((stock_id, d))
+                if old is None:
+                    counts["inserted"] += 1
+                elif tuple(old) == values:
+                    counts["unchanged"] += 1
                     continue
-                dp_objs.append(
-                    DailyPrice(
-                        stock_id=s.id,
-                        date=it["date"],
-                        open=it["open"],
-                        high=it["high"],
-                        low=it["low"],
-                        close=it["close"],
-                        volume=it["volume"],
-                        amount=it.get("amount"),
-                        market_cap=it.get("market_cap"),
-                        listed_shares=it.get("listed_shares"),
-                    )
-                )
-
-            DailyPrice.objects.bulk_create(dp_objs, batch_size=2000)
-
-        self.stdout.write(self.style.SUCCESS(f"[sync] {yyyymmdd} DB 저장 완료 (DailyPrice {len(dp_objs)}건)"))
+                else:
+                    counts["updated"] += 1
+                dp_objs.append(DailyPrice(stock_id=stock_id, date=d, **dict(zip(PRICE_FIELDS, values))))
+
+            DailyPrice.objects.bulk_create(
+                dp_objs,
+                batch_size=2000,
+                update_conflicts=True,
+                unique_fields=["stock", "date"],
+                update_fields=list(PRICE_FIELDS),
+            )
+
+        return counts
@@ -1,29 +1,13 @@
-import math
-import time
 from datetime import datetime, timedelta
 
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
-from stocks.models import Stock, StockNews, FeatureDaily
+from stocks.models import Stock
 from stocks.services.naver_news_client import NaverNewsClient
+from stocks.services.news_crawler import crawl_stock_news
 from stocks.services.recommender import recommend_stocks  # 네가 이미 쓰는 추천 함수
-
-
-def news_score(stock: Stock, as_of_date, window_days: int, tau: float) -> float:
-    tz = timezone.get_current_timezone()
-    start_dt = datetime.combine(as_of_date - timedelta(days=window_days), datetime.min.time()).replace(tzinfo=tz)
-    end_dt = datetime.combine(as_of_date + timedelta(days=1), datetime.min.time()).replace(tzinfo=tz)
-
-    qs = StockNews.objects.filter(stock=stock, published_at__gte=start_dt, published_at__lt=end_dt)
-
-    s = 0.0
-    for n in qs:
-        delta = (as_of_date - n.published_at.date()).days
-        if delta < 0:
-            continue
-        s += math.exp(-delta / tau)
-    return float(s)
+from stocks.services.feature_cache import bump_feature_version
+from stocks.services.news_scores import update_news_scores
 
 
 class Command(BaseCommand):
@@ -34,7 +18,9 @@ class Command(BaseCommand):
         parser.add_argument("--max-stocks", type=int, default=200, help="TopK(기본 200)")
         parser.add_argument("--display", type=int, default=20, help="종목당 뉴스 개수(기본 20)")
         parser.add_argument("--lookback-days", type=int, default=30, help="이보다 오래된 뉴스는 저장 제외")
-        parser.add_argument("--sleep", type=float, default=0.05, help="요청 간 sleep")
+        parser.add_argument("--sleep", type=float, default=0.05, help="요청 간 sleep (--workers 1일 때만)")
+        parser.add_argument("--workers", type=int, default=8, help="동시 검색 수")
+        parser.add_argument("--qps", type=float, default=None, help="초당 검색 한도 (기본: NAVER_NEWS_QPS 또는 10)")
         parser.add_argument("--suffix", type=str, default="주가", help="검색어 뒤 키워드")
         parser.add_argument("--dry-run", action="store_true")
 
@@ -48,8 +34,9 @@ class Command(BaseCommand):
         sleep = float(opts["sleep"])
         suffix = str(opts["suffix"])
         dry_run = bool(opts["dry_run"])
+        workers = max(1, int(opts["workers"]))
 
-        client = NaverNewsClient()
+        client = NaverNewsClient(qps=opts["qps"])
         cutoff = as_of - timedelta(days=lookback_days)
 
         # ✅ 1) “뉴스 제외” 상태로 먼저 TopK 후보만 뽑기
@@ -63,60 +50,30 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING(f"[dry-run] first10={codes[:10]}"))
             return
 
-        saved = 0
-        skipped_old = 0
-
-        # ✅ 2) 후보 종목만 뉴스 수집
-        for code in codes:
-            stock = Stock.objects.filter(code=code).first()
-            if not stock:
-                continue
-
-            query = f"{stock.name} {suffix}".strip()
-            items = client.search(query=query, display=display, sort="date")
-
-            for it in items:
-                pub = it.get("published_at")
-                if not pub:
-                    continue
-                if pub.date() < cutoff:
-                    skipped_old += 1
-                    continue
-
-                link = it.get("link") or ""
-                if not link:
-                    continue
-
-                obj, created = StockNews.objects.get_or_create(
-                    link=link,
-                    defaults={
-                        "stock": stock,
-                        "published_at": pub,
-                        "title": it.get("title", "")[:500],
-                        "description": it.get("description", ""),
-                        "originallink": it.get("originallink", ""),
-                        "source": "NAVER",
-                        "query_used": query[:200],
-                    },
-                )
-                if created:
-                    saved += 1
-
-            time.sleep(sleep)
-
-        # ✅ 3) news 점수 계산 → FeatureDaily 반영
-        for code in codes:
-            stock = Stock.objects.filter(code=code).first()
-            if not stock:
-                continue
-
-            fd = FeatureDaily.objects.filter(stock=stock, date=as_of).first()
-            if not fd:
-                continue
-
-            fd.news3 = news_score(stock, as_of, window_days=3, tau=1.5)
-            fd.news7 = news_score(stock, as_of, window_days=7, tau=3.0)
-            fd.news30 = news_score(stock, as_of, window_days=30, tau=10.0)
-            fd.save(update_fields=["news3", "news7", "news30"])
-
-        self.stdout.write(self.style.SUCCESS(f"[sync_stock_news] done. saved={saved}, skipped_old={skipped_old}"))
+        stock_map = Stock.objects.filter(code__in=codes).in_bulk(field_name="code")
+        stocks = [stock_map[c] for c in codes if c in stock_map]
+
+        # ✅ 2) 후보 종목만 뉴스 수집 (동시 검색 + 토큰 버킷 한도, bulk 저장)
+        stats = crawl_stock_news(
+            stocks,
+            client=client,
+            display=display,
+            suffix=suffix,
+            cutoff=cutoff,
+            workers=workers,
+            sleep=sleep,
+            log=lambda msg: self.stdout.write(self.style.WARNING(f"[sync_stock_news] {msg}")),
+        )
+        saved = stats["saved"]
+        skipped_old = stats["skipped_old"]
+        self.stdout.write(self.style.NOTICE(
+            f"[sync_stock_news] crawl: stocks={stats['stocks']} articles={stats['fetched']} failed={stats['failed']} "
+            f"({stats['elapsed']:.1f}s, {stats['articles_per_sec']:.1f} articles/s, workers={workers})"
+        ))
+
+        # ✅ 3) news 점수 계산 → FeatureDaily 반영 (쿼리 1번 + bulk_update)
+        updated = update_news_scores([s.id for s in stocks], as_of)
+
+        bump_feature_version(as_of)
+
+        self.stdout.write(self.style.SUCCESS(f"[sync_stock_news] done. saved={saved}, skipped_old={skipped_old}, scored={updated}"))
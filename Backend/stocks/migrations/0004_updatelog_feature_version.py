@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0003_fxratedaily'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='updatelog',
+            name='feature_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0004_updatelog_feature_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField(db_index=True)),
+                ('risk', models.CharField(max_length=8)),
+                ('horizon', models.CharField(max_length=8)),
+                ('effort', models.CharField(max_length=12)),
+                ('include_news', models.BooleanField(default=True)),
+                ('feature_version', models.PositiveIntegerField(default=0)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('payload', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-as_of'],
+                'constraints': [models.UniqueConstraint(fields=('as_of', 'risk', 'horizon', 'effort', 'include_news'), name='uniq_reco_cache_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0005_recommendationcache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_date', models.DateField(db_index=True)),
+                ('payload', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='feature_state', to='stocks.stock')),
+            ],
+        ),
+    ]
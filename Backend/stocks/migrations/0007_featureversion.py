@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:29
+
+from django.db import migrations, models
+
+
+def copy_versions(apps, schema_editor):
+    UpdateLog = apps.get_model("stocks", "UpdateLog")
+    FeatureVersion = apps.get_model("stocks", "FeatureVersion")
+    FeatureVersion.objects.bulk_create([
+        FeatureVersion(as_of=as_of, version=version)
+        for as_of, version in UpdateLog.objects.filter(feature_version__gt=0).values_list("as_of", "feature_version")
+    ])
+
+
+def restore_versions(apps, schema_editor):
+    UpdateLog = apps.get_model("stocks", "UpdateLog")
+    FeatureVersion = apps.get_model("stocks", "FeatureVersion")
+    for as_of, version in FeatureVersion.objects.values_list("as_of", "version"):
+        UpdateLog.objects.filter(as_of=as_of).update(feature_version=version)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0006_featurestate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField(unique=True)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(copy_versions, restore_versions),
+        migrations.RemoveField(
+            model_name='updatelog',
+            name='feature_version',
+        ),
+    ]
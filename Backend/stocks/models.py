@@ -106,6 +106,22 @@ class FeatureDaily(models.Model):
         return f"{self.stock.code} {self.date} r5={self.r5}"
     
 
+class FeatureState(models.Model):
+    """
+    build_features 증분 모드용 종목별 롤링 상태 (services.feature_rolling.RollingState)
+    - last_date: 상태에 마지막으로 반영된 거래일
+    - payload: 최근 61개 종가/거래량 창 + 누적합/MDD 상태
+    """
+    stock = models.OneToOneField(Stock, on_delete=models.CASCADE, related_name="feature_state")
+    last_date = models.DateField(db_index=True)
+    payload = models.JSONField(default=dict)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.stock_id} last_date={self.last_date}"
+
+
 class StockNews(models.Model):
     stock = models.ForeignKey("stocks.Stock", on_delete=models.CASCADE, related_name="stock_news")
     published_at = models.DateTimeField(db_index=True)
@@ -189,6 +205,19 @@ class UpdateLog(models.Model):
         return f"{self.as_of} {self.status} (prices={self.prices_count}, features={self.features_count})"
     
 
+class FeatureVersion(models.Model):
+    """
+    FeatureDaily(as_of) 변경 스탬프: 피처/뉴스 점수가 바뀔 때마다 증가 → 프로세스 캐시 무효화
+    - UpdateLog와 분리: build_features 단독 실행/백필처럼 daily_update 로그가 없는 날짜도 bump되도록
+    """
+    as_of = models.DateField(unique=True)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.as_of} v{self.version}"
+
+
 class RecommendationLog(models.Model):
     user = models.ForeignKey("accounts.User", on_delete=models.CASCADE, related_name="reco_logs")
     as_of = models.DateField(db_index=True)  # 추천 기준일(거래일)
@@ -212,6 +241,38 @@ class RecommendationLog(models.Model):
         return f"{self.user_id} {self.as_of} {self.risk}/{self.horizon}"
 
 
+class RecommendationCache(models.Model):
+    """
+    기준일별 기본 추천 랭킹 캐시 (risk × horizon × effort × include_news = 36개/일)
+    - daily_update 마지막 단계(build_reco_cache)에서 미리 생성
+    - feature_version이 FeatureVersion과 다르면(뉴스 재채점 등) 오래된 것으로 보고 다시 계산
+    - payload: 프로필 배수 적용 전 후보 전체(BaseRanking.to_payload)
+    """
+    as_of = models.DateField(db_index=True)
+    risk = models.CharField(max_length=8)
+    horizon = models.CharField(max_length=8)
+    effort = models.CharField(max_length=12)
+    include_news = models.BooleanField(default=True)
+
+    feature_version = models.PositiveIntegerField(default=0)
+    size = models.PositiveIntegerField(default=0)  # 후보 종목 수
+    payload = models.JSONField(default=dict)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-as_of"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["as_of", "risk", "horizon", "effort", "include_news"],
+                name="uniq_reco_cache_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.as_of} {self.risk}/{self.horizon}/{self.effort} news={self.include_news} v{self.feature_version}"
+
+
 
 # 메인 차트
 
@@ -0,0 +1,107 @@
+# stocks/services/bulk_upsert.py
+"""
+DataFrame(날짜 index) → 일별 시계열 모델 bulk upsert 공용 헬퍼
+- sync_index_prices(MarketIndexDaily), sync_fx_rates(FxRateDaily)에서 사용
+- 기존 (key, date) 값을 한 번에 읽어 비교 → 새 행/바뀐 행만
+  bulk_create(update_conflicts=True)로 batch 저장 (iterrows/행 단위 쿼리 없음)
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.db.models import Max, Model
+
+
+def _column_values(df: pd.DataFrame, col: str, cast: Callable[[Any], Any]) -> List[Any]:
+    """DataFrame 컬럼 → 파이썬 값 리스트 (결측/없는 컬럼은 None)"""
+    if col not in df.columns:
+        return [None] * len(df)
+    arr = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+    return [None if np.isnan(v) else cast(v) for v in arr.tolist()]
+
+
+def _index_dates(df: pd.DataFrame) -> List[date]:
+    return [ts.date() for ts in pd.DatetimeIndex(df.index)]
+
+
+def last_stored_date(model: type[Model], key: Dict[str, Any]) -> Optional[date]:
+    """key(예: {"index": idx_obj})로 저장된 마지막 날짜 (증분 수집 시작점)"""
+    return model.objects.filter(**key).aggregate(d=Max("date"))["d"]
+
+
+def upsert_frame(
+    model: type[Model],
+    df: pd.DataFrame,
+    *,
+    key: Dict[str, Any],
+    columns: Dict[str, str],
+    casts: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    required: tuple = (),
+    batch_size: int = 2000,
+) -> Dict[str, int]:
+    """
+    df(날짜 index)를 model의 (key..., date) 행으로 upsert
+    - columns: 모델 필드 → df 컬럼명
+    - casts: 필드별 변환 (기본 float, 예: volume은 int)
+    - required: 값이 None이면 건너뛸 필드 (예: close NOT NULL)
+    반환: {"inserted", "updated", "unchanged", "skipped"}
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    if df is None or df.empty:
+        return counts
+
+    casts = casts or {}
+    fields = list(columns)
+    dates = _index_dates(df)
+    values = list(zip(*[_column_values(df, columns[f], casts.get(f, float)) for f in fields]))
+
+    # 같은 날짜가 여러 번 오면 마지막 값 사용
+    incoming: Dict[date, tuple] = {}
+    for d, row in zip(dates, values):
+        incoming[d] = row
+
+    req_idx = [fields.index(f) for f in required]
+
+    existing = {
+        row[0]: row[1:]
+        for row in model.objects
+        .filter(**key, date__gte=min(incoming), date__lte=max(incoming))
+        .values_list("date", *fields)
+    }
+
+    objs = []
+    for d, row in incoming.items():
+        if any(row[i] is None for i in req_idx):
+            counts["skipped"] += 1
+            continue
+        old = existing.get(d)
+        if old is None:
+            counts["inserted"] += 1
+        elif tuple(old) == row:
+            counts["unchanged"] += 1
+            continue
+        else:
+            counts["updated"] += 1
+        objs.append(model(**key, date=d, **dict(zip(fields, row))))
+
+    auto_now = [f.name for f in model._meta.concrete_fields if getattr(f, "auto_now", False)]
+    key_fields = [model._meta.get_field(k).name for k in key]
+
+    with transaction.atomic():
+        for i in range(0, len(objs), batch_size):
+            model.objects.bulk_create(
+                objs[i:i + batch_size],
+                update_conflicts=True,
+                unique_fields=[*key_fields, "date"],
+                update_fields=fields + auto_now,
+            )
+
+    return counts
+
+
+def format_counts(counts: Dict[str, int]) -> str:
+    return " ".join(f"{k}={v}" for k, v in counts.items())
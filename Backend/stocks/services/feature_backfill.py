@@ -0,0 +1,129 @@
+# stocks/services/feature_backfill.py
+"""
+build_features --start/--end 백필용 벡터화 피처 계산
+- 종목별 가격 시계열을 한 번만 읽고, 기간 내 모든 거래일 피처를 sliding window(NumPy)로 한 번에 계산
+- 종목 묶음 단위로 ProcessPoolExecutor 워커에서 실행 (Django/DB 접근 없이 배열만 주고받음)
+- 정의는 build_features 단일일 계산과 동일 (최근 61개 행이 lookback 안에 있어야 계산)
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stocks.services.feature_rolling import (
+    FEATURE_FIELDS,
+    FLAT_SD_RATIO,
+    MDD_WINDOWS,
+    NEED,
+    RET_KS,
+    VOL_WINDOWS,
+    VZ_WINDOWS,
+)
+
+# (stock_id, dates[datetime64[D]], closes[float64], volumes[float64])
+StockSeries = Tuple[int, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _tail_windows(x: np.ndarray, w: int, ends: np.ndarray) -> np.ndarray:
+    """ends[i]에서 끝나는 길이 w 창들 (shape: len(ends) × w)"""
+    return sliding_window_view(x, w)[ends - w + 1]
+
+
+def compute_stock_features(
+    dates: np.ndarray,
+    closes: np.ndarray,
+    volumes: np.ndarray,
+    *,
+    start: date,
+    end: date,
+    lookback_days: int,
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    종목 1개의 [start, end] 거래일별 피처
+    반환: (대상 행 위치 배열, 피처명 -> 값 배열)
+    """
+    n = closes.shape[0]
+    if n < NEED:
+        return np.empty(0, dtype=np.int64), {}
+
+    # 대상 행: 기간 안 + 앞쪽 60개 포함 61개 행이 있고 + 그 첫 행이 lookback 안
+    pos = np.arange(NEED - 1, n)
+    t = dates[pos]
+    first = dates[pos - (NEED - 1)]
+    lookback = np.timedelta64(lookback_days, "D")
+    ok = (t >= np.datetime64(start)) & (t <= np.datetime64(end)) & (first >= t - lookback)
+    pos = pos[ok]
+    if pos.size == 0:
+        return pos, {}
+
+    out: Dict[str, np.ndarray] = {}
+
+    for k in RET_KS:
+        out[f"r{k}"] = closes[pos] / closes[pos - k] - 1.0
+
+    # 일간 수익률: rets[i] = closes[i+1] / closes[i] - 1 (행 i+1에서 끝남)
+    rets = closes[1:] / closes[:-1] - 1.0
+    for w in VOL_WINDOWS:
+        win = _tail_windows(rets, w, pos - 1)
+        out[f"vol{w}"] = win.std(axis=1, ddof=1)
+
+    for w in MDD_WINDOWS:
+        win = _tail_windows(closes, w, pos)
+        peak = np.maximum.accumulate(win, axis=1)
+        out[f"mdd{w}"] = np.abs(win / peak - 1.0).max(axis=1)
+
+    log_vols = np.log(volumes + 1.0)
+    for w in VZ_WINDOWS:
+        win = _tail_windows(log_vols, w, pos)
+        mean = win.mean(axis=1)
+        sd = win.std(axis=1, ddof=1)
+        flat = sd <= FLAT_SD_RATIO * np.abs(mean)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (log_vols[pos] - mean) / sd
+        out[f"vz{w}"] = np.where(flat, 0.0, z)
+
+    return pos, out
+
+
+def compute_chunk(
+    items: List[StockSeries],
+    start: date,
+    end: date,
+    lookback_days: int,
+) -> List[Tuple[int, date, tuple]]:
+    """
+    워커 1개가 처리하는 종목 묶음
+    반환: [(stock_id, date, (FEATURE_FIELDS 순서 값...)), ...]
+    """
+    rows: List[Tuple[int, date, tuple]] = []
+    for stock_id, dates, closes, volumes in items:
+        pos, feats = compute_stock_features(
+            dates, closes, volumes, start=start, end=end, lookback_days=lookback_days
+        )
+        if pos.size == 0:
+            continue
+        cols = [feats[f].tolist() for f in FEATURE_FIELDS]
+        out_dates = dates[pos].astype(object).tolist()
+        for j, d in enumerate(out_dates):
+            rows.append((stock_id, d, tuple(col[j] for col in cols)))
+    return rows
+
+
+def split_chunks(items: List[StockSeries], n_chunks: int) -> List[List[StockSeries]]:
+    """행 수가 비슷하도록 종목을 n_chunks개 묶음으로 나눔 (큰 종목부터 가장 가벼운 묶음에 배정)"""
+    n_chunks = max(1, min(n_chunks, len(items)))
+    chunks: List[List[StockSeries]] = [[] for _ in range(n_chunks)]
+    loads = [0] * n_chunks
+    for item in sorted(items, key=lambda x: -x[2].shape[0]):
+        i = loads.index(min(loads))
+        chunks[i].append(item)
+        loads[i] += item[2].shape[0]
+    return [c for c in chunks if c]
+
+
+def history_start(start: date, lookback_days: int) -> date:
+    """백필 시작일의 피처 계산에 필요한 가장 이른 가격 날짜"""
+    return start - timedelta(days=lookback_days)
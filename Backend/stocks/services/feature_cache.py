@@ -0,0 +1,270 @@
+# stocks/services/feature_cache.py
+"""
+기준일(as_of)별 FeatureDaily 매트릭스 프로세스 캐시
+- 첫 사용 시 values_list 한 번으로 읽어 FeatureMatrix(struct-of-arrays)로 보관
+- FeatureVersion(as_of).version으로 무효화 (daily_update / build_features / 뉴스 재채점 시 증가)
+- 추천/시장 요약/종목 상세 등은 이 캐시를 통해 피처를 읽음
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from stocks.models import FeatureDaily, FeatureVersion
+
+
+# FeatureDaily에서 컬럼 단위로 읽어오는 수치 피처
+FEATURE_COLUMNS = (
+    "r1", "r5", "r20", "r60",
+    "vol10", "vol20", "vol60",
+    "mdd10", "mdd20", "mdd60",
+    "news3", "news7", "news30",
+    "vz5", "vz20",
+)
+
+# 버전 확인(FeatureVersion 1건 조회) 최소 간격(초)
+VERSION_CHECK_SEC = 5.0
+
+# 동시에 들고 있을 기준일 수 (최근 사용 순 LRU)
+MAX_ENTRIES = 4
+
+
+@dataclass
+class FeatureMatrix:
+    """
+    FeatureDaily(date=as_of) 한 날짜분을 컬럼 단위(struct-of-arrays)로 보관
+    - codes/names/markets: 종목 순서대로의 리스트
+    - columns: 피처명 -> float64 배열 (None은 NaN)
+    - version: 읽을 당시 FeatureVersion(as_of) (get_feature_matrix가 설정, 파생 캐시 스탬프용)
+    """
+    as_of: date
+    codes: List[str]
+    names: List[str]
+    markets: List[str]
+    columns: Dict[str, np.ndarray]
+    version: int = 0
+    _filled: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+    _row_of: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def has(self, name: str) -> bool:
+        return bool(name) and name in self.columns
+
+    def raw(self, name: str) -> np.ndarray:
+        """결측(NaN)을 그대로 둔 컬럼"""
+        col = self.columns.get(name) if name else None
+        if col is None:
+            return np.full(len(self), np.nan, dtype=np.float64)
+        return col
+
+    def get(self, name: str) -> np.ndarray:
+        """결측을 0.0으로 채운 컬럼 (추천 엔진용)"""
+        col = self._filled.get(name)
+        if col is None:
+            col = np.nan_to_num(self.raw(name), nan=0.0)
+            col.flags.writeable = False
+            self._filled[name] = col
+        return col
+
+    def market_index(self, market: str) -> np.ndarray:
+        """market(KOSPI/KOSDAQ...)에 속한 행 인덱스, ALL이면 전체"""
+        if market == "ALL":
+            return np.arange(len(self))
+        markets = self._filled.get("__markets__")
+        if markets is None:
+            markets = np.asarray(self.markets, dtype=object)
+            self._filled["__markets__"] = markets
+        return np.nonzero(markets == market)[0]
+
+    def row_of(self, code: str) -> Optional[int]:
+        if not self._row_of and self.codes:
+            self._row_of.update((c, i) for i, c in enumerate(self.codes))
+        return self._row_of.get(code)
+
+    def row_values(self, code: str) -> Optional[Dict[str, Optional[float]]]:
+        """종목 1개의 피처 값 (결측은 None)"""
+        i = self.row_of(code)
+        if i is None:
+            return None
+        out: Dict[str, Optional[float]] = {}
+        for name, col in self.columns.items():
+            v = float(col[i])
+            out[name] = None if np.isnan(v) else v
+        return out
+
+
+def _to_float_array(values, n: int) -> np.ndarray:
+    return np.fromiter((np.nan if v is None else float(v) for v in values), dtype=np.float64, count=n)
+
+
+def load_feature_matrix(as_of: date) -> Optional[FeatureMatrix]:
+    """
+    FeatureDaily(date=as_of)를 values_list 한 번으로 읽어 FeatureMatrix로 변환
+    (ORM 객체/select_related 없이 필요한 컬럼만)
+    """
+    rows = list(
+        FeatureDaily.objects
+        .filter(date=as_of)
+        .values_list("stock__code", "stock__name", "stock__market", *FEATURE_COLUMNS)
+    )
+    if not rows:
+        return None
+
+    n = len(rows)
+    cols = list(zip(*rows))
+    columns = {}
+    for i, name in enumerate(FEATURE_COLUMNS):
+        col = _to_float_array(cols[3 + i], n)
+        col.flags.writeable = False
+        columns[name] = col
+
+    return FeatureMatrix(
+        as_of=as_of,
+        codes=[c or "" for c in cols[0]],
+        names=[nm or "" for nm in cols[1]],
+        markets=[m or "" for m in cols[2]],
+        columns=columns,
+    )
+
+
+# -------------------------
+# version stamp
+# -------------------------
+def feature_version(as_of: date) -> int:
+    """FeatureVersion(as_of).version (한 번도 bump되지 않았으면 0)"""
+    v = FeatureVersion.objects.filter(as_of=as_of).values_list("version", flat=True).first()
+    return int(v or 0)
+
+
+def _bump_dates(dates: List[date]) -> None:
+    """dates의 버전을 1씩 올림 (행이 없으면 version=1로 생성)"""
+    with transaction.atomic():
+        for i in range(0, len(dates), 500):
+            batch = dates[i:i + 500]
+            FeatureVersion.objects.filter(as_of__in=batch).update(
+                version=F("version") + 1, updated_at=timezone.now()
+            )
+            existing = set(FeatureVersion.objects.filter(as_of__in=batch).values_list("as_of", flat=True))
+            # 동시에 다른 프로세스가 만든 행은 그대로 둠 (그 생성 자체가 bump)
+            FeatureVersion.objects.bulk_create(
+                [FeatureVersion(as_of=d, version=1) for d in batch if d not in existing],
+                ignore_conflicts=True,
+            )
+
+
+def bump_feature_version(as_of: date) -> int:
+    """
+    FeatureDaily(as_of)가 바뀌었음을 알림
+    - FeatureVersion(as_of) += 1 (없으면 생성 → 다른 프로세스 캐시 무효화)
+    - 현재 프로세스 캐시는 즉시 비움
+    """
+    _bump_dates([as_of])
+    invalidate(as_of)
+    return feature_version(as_of)
+
+
+def bump_feature_versions(start: date, end: date) -> int:
+    """[start, end] 기간 중 FeatureDaily가 있는 날짜 전체 bump (build_features 백필용), 반환: bump한 날짜 수"""
+    dates = sorted(
+        FeatureDaily.objects.filter(date__gte=start, date__lte=end).values_list("date", flat=True).distinct()
+    )
+    _bump_dates(dates)
+    invalidate()
+    return len(dates)
+
+
+# -------------------------
+# process cache
+# -------------------------
+@dataclass
+class _Entry:
+    version: int
+    checked_at: float
+    matrix: FeatureMatrix
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[date, _Entry]" = OrderedDict()
+_stats = {"hits": 0, "loads": 0, "version_checks": 0}
+
+
+def get_feature_matrix(as_of: date, *, recheck: bool = False) -> Optional[FeatureMatrix]:
+    """
+    as_of 기준 FeatureMatrix (없으면 None), matrix.version = 읽을 당시 버전
+    - 캐시가 있으면 VERSION_CHECK_SEC 간격으로만 버전 확인, 같으면 DB를 읽지 않음
+    - recheck=True: 간격과 상관없이 버전 확인 (결과를 버전 스탬프와 함께 저장하는 쪽에서 사용)
+    - 데이터가 없는 날짜는 캐시하지 않음 (build_features 후 바로 보이도록)
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(as_of)
+        if not recheck and entry is not None and now - entry.checked_at < VERSION_CHECK_SEC:
+            _entries.move_to_end(as_of)
+            _stats["hits"] += 1
+            return entry.matrix
+
+    version = feature_version(as_of)
+    with _lock:
+        _stats["version_checks"] += 1
+        entry = _entries.get(as_of)
+        if entry is not None and entry.version == version:
+            entry.checked_at = now
+            _entries.move_to_end(as_of)
+            _stats["hits"] += 1
+            return entry.matrix
+
+    matrix = load_feature_matrix(as_of)
+    with _lock:
+        _stats["loads"] += 1
+        if matrix is None:
+            _entries.pop(as_of, None)
+            return None
+        matrix.version = version
+        _entries[as_of] = _Entry(version=version, checked_at=now, matrix=matrix)
+        _entries.move_to_end(as_of)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return matrix
+
+
+def invalidate(as_of: Optional[date] = None) -> None:
+    """현재 프로세스 캐시 비우기 (as_of=None이면 전체)"""
+    with _lock:
+        if as_of is None:
+            _entries.clear()
+        else:
+            _entries.pop(as_of, None)
+
+
+def cache_stats() -> Dict[str, Any]:
+    with _lock:
+        return {
+            **_stats,
+            "entries": {str(d): {"version": e.version, "rows": len(e.matrix)} for d, e in _entries.items()},
+        }
+
+
+def get_feature_row(code: str, as_of: date) -> Optional[SimpleNamespace]:
+    """
+    종목 1개의 피처를 캐시에서 조회
+    - FeatureDaily 객체처럼 .date / .r5 / .vol20 ... 속성으로 접근 (결측은 None)
+    """
+    matrix = get_feature_matrix(as_of)
+    if matrix is None:
+        return None
+    values = matrix.row_values(code)
+    if values is None:
+        return None
+    return SimpleNamespace(date=matrix.as_of, **values)
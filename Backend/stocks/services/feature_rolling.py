@@ -0,0 +1,251 @@
+# stocks/services/feature_rolling.py
+"""
+build_features 증분 모드용 종목별 롤링 상태
+- 최근 NEED(61)개 종가/거래량 창 + 윈도우별 누적합/제곱합(변동성, 거래량 z)
+- MDD는 윈도우별 최대값 단조 deque + (최대낙폭, 그 peak 위치) 상태로 갱신
+  (peak가 창 밖으로 나갈 때만 해당 윈도우를 다시 계산)
+- 새 거래일 1개 반영이 종목당 O(1) (amortized) → 전체 O(종목 수)
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from datetime import date
+from typing import Any, Deque, Dict, List, Optional
+
+NEED = 61  # 최대 윈도우 60 + r60 계산용 1
+
+RET_KS = (1, 5, 20, 60)
+VOL_WINDOWS = (10, 20, 60)
+MDD_WINDOWS = (10, 20, 60)
+VZ_WINDOWS = (5, 20)
+
+# 누적합 오차가 쌓이지 않도록 이 횟수마다 창에서 합계를 다시 계산
+RESYNC_EVERY = 64
+
+FEATURE_FIELDS = (
+    "r1", "r5", "r20", "r60",
+    "vol10", "vol20", "vol60",
+    "mdd10", "mdd20", "mdd60",
+    "vz5", "vz20",
+)
+
+
+# 값이 모두 같은 창은 반올림 오차로 아주 작은 표준편차가 남을 수 있음 → |평균| 대비 이 비율 이하는 0으로 취급
+FLAT_SD_RATIO = 1e-6
+
+
+def _sample_std(total: float, total_sq: float, n: int) -> float:
+    """누적합/제곱합으로 표본표준편차 (음수 분산은 0으로)"""
+    if n < 2:
+        return 0.0
+    var = (total_sq - total * total / n) / (n - 1)
+    return math.sqrt(var) if var > 0 else 0.0
+
+
+class RollingState:
+    """
+    종목 1개의 롤링 상태
+    - seq: 지금까지 push한 행 수(절대 인덱스), 창의 k번째 원소 = seq - len(closes) + k
+    """
+
+    def __init__(self):
+        self.seq = 0
+        self.dates: Deque[date] = deque(maxlen=NEED)
+        self.closes: Deque[float] = deque(maxlen=NEED)
+        self.volumes: Deque[int] = deque(maxlen=NEED)
+
+        # 일간 수익률 / log(volume+1): 빠질 원소를 보기 위해 윈도우+1개 유지
+        self.rets: Deque[float] = deque(maxlen=max(VOL_WINDOWS) + 1)
+        self.log_vols: Deque[float] = deque(maxlen=max(VZ_WINDOWS) + 1)
+
+        self.ret_sum = {w: 0.0 for w in VOL_WINDOWS}
+        self.ret_sq = {w: 0.0 for w in VOL_WINDOWS}
+        self.lv_sum = {w: 0.0 for w in VZ_WINDOWS}
+        self.lv_sq = {w: 0.0 for w in VZ_WINDOWS}
+
+        # MDD: 윈도우별 최대값 후보(절대 인덱스, 종가 내림차순)와 현재 최대낙폭 상태
+        self.max_q: Dict[int, Deque[int]] = {w: deque() for w in MDD_WINDOWS}
+        self.mdd: Dict[int, Dict[str, Any]] = {w: {"value": 0.0, "peak": 0} for w in MDD_WINDOWS}
+
+        self.since_resync = 0
+
+    # -------------------------
+    # helpers
+    # -------------------------
+    @property
+    def last_date(self) -> Optional[date]:
+        return self.dates[-1] if self.dates else None
+
+    def _close_at(self, abs_idx: int) -> float:
+        return self.closes[abs_idx - (self.seq - len(self.closes))]
+
+    def _window_start(self, w: int) -> int:
+        return max(self.seq - w, self.seq - len(self.closes))
+
+    def _recompute_mdd(self, w: int) -> None:
+        """창 전체를 다시 훑어 (peak, 최대낙폭) 계산 - _mdd()와 같은 방식"""
+        start = self._window_start(w)
+        peak_idx = start
+        peak = self._close_at(start)
+        best = 0.0
+        best_peak = start
+        for i in range(start, self.seq):
+            p = self._close_at(i)
+            if p > peak:
+                peak = p
+                peak_idx = i
+            dd = abs(p / peak - 1.0)
+            if dd > best:
+                best = dd
+                best_peak = peak_idx
+        self.mdd[w] = {"value": best, "peak": best_peak}
+
+    def _resync_sums(self) -> None:
+        rets = list(self.rets)
+        for w in VOL_WINDOWS:
+            xs = rets[-w:]
+            self.ret_sum[w] = sum(xs)
+            self.ret_sq[w] = sum(x * x for x in xs)
+        lvs = list(self.log_vols)
+        for w in VZ_WINDOWS:
+            xs = lvs[-w:]
+            self.lv_sum[w] = sum(xs)
+            self.lv_sq[w] = sum(x * x for x in xs)
+        self.since_resync = 0
+
+    # -------------------------
+    # update
+    # -------------------------
+    def push(self, d: date, close: float, volume: int) -> None:
+        """거래일 1개 반영 (날짜 오름차순으로 호출)"""
+        close = float(close)
+        volume = int(volume)
+
+        if self.closes:
+            r = close / self.closes[-1] - 1.0
+            self.rets.append(r)
+            n = len(self.rets)
+            for w in VOL_WINDOWS:
+                self.ret_sum[w] += r
+                self.ret_sq[w] += r * r
+                if n > w:
+                    old = self.rets[-1 - w]
+                    self.ret_sum[w] -= old
+                    self.ret_sq[w] -= old * old
+
+        lv = math.log(volume + 1)
+        self.log_vols.append(lv)
+        n = len(self.log_vols)
+        for w in VZ_WINDOWS:
+            self.lv_sum[w] += lv
+            self.lv_sq[w] += lv * lv
+            if n > w:
+                old = self.log_vols[-1 - w]
+                self.lv_sum[w] -= old
+                self.lv_sq[w] -= old * old
+
+        idx = self.seq
+        self.dates.append(d)
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.seq += 1
+
+        for w in MDD_WINDOWS:
+            start = self._window_start(w)
+            q = self.max_q[w]
+            while q and self._close_at(q[-1]) <= close:
+                q.pop()
+            q.append(idx)
+            while q[0] < start:
+                q.popleft()
+
+            state = self.mdd[w]
+            if state["peak"] < start:
+                # 최대낙폭의 peak가 창 밖으로 나감 → 이 윈도우만 다시 계산
+                self._recompute_mdd(w)
+                continue
+
+            dd = abs(close / self._close_at(q[0]) - 1.0)
+            if dd > state["value"]:
+                state["value"] = dd
+                state["peak"] = q[0]
+
+        self.since_resync += 1
+        if self.since_resync >= RESYNC_EVERY:
+            self._resync_sums()
+
+    # -------------------------
+    # features
+    # -------------------------
+    def features(self) -> Dict[str, Optional[float]]:
+        """현재 창 기준 피처 (build_features 전체 계산과 같은 정의)"""
+        closes = self.closes
+        out: Dict[str, Optional[float]] = {}
+
+        for k in RET_KS:
+            out[f"r{k}"] = (closes[-1] / closes[-1 - k] - 1.0) if len(closes) > k else None
+
+        n_rets = len(self.rets)
+        for w in VOL_WINDOWS:
+            out[f"vol{w}"] = _sample_std(self.ret_sum[w], self.ret_sq[w], w) if n_rets >= w else None
+
+        for w in MDD_WINDOWS:
+            out[f"mdd{w}"] = self.mdd[w]["value"] if len(closes) >= w else None
+
+        n_lv = len(self.log_vols)
+        for w in VZ_WINDOWS:
+            if n_lv < w:
+                out[f"vz{w}"] = None
+                continue
+            mean = self.lv_sum[w] / w
+            sd = _sample_std(self.lv_sum[w], self.lv_sq[w], w)
+            out[f"vz{w}"] = 0.0 if sd <= FLAT_SD_RATIO * abs(mean) else (self.log_vols[-1] - mean) / sd
+
+        return out
+
+    # -------------------------
+    # (de)serialize - FeatureState.payload(JSONField)
+    # -------------------------
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "dates": [d.isoformat() for d in self.dates],
+            "closes": list(self.closes),
+            "volumes": list(self.volumes),
+            "rets": list(self.rets),
+            "log_vols": list(self.log_vols),
+            "ret_sum": {str(w): v for w, v in self.ret_sum.items()},
+            "ret_sq": {str(w): v for w, v in self.ret_sq.items()},
+            "lv_sum": {str(w): v for w, v in self.lv_sum.items()},
+            "lv_sq": {str(w): v for w, v in self.lv_sq.items()},
+            "max_q": {str(w): list(q) for w, q in self.max_q.items()},
+            "mdd": {str(w): dict(v) for w, v in self.mdd.items()},
+            "since_resync": self.since_resync,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "RollingState":
+        st = cls()
+        st.seq = int(payload["seq"])
+        st.dates.extend(date.fromisoformat(d) for d in payload["dates"])
+        st.closes.extend(payload["closes"])
+        st.volumes.extend(payload["volumes"])
+        st.rets.extend(payload["rets"])
+        st.log_vols.extend(payload["log_vols"])
+        st.ret_sum = {int(w): v for w, v in payload["ret_sum"].items()}
+        st.ret_sq = {int(w): v for w, v in payload["ret_sq"].items()}
+        st.lv_sum = {int(w): v for w, v in payload["lv_sum"].items()}
+        st.lv_sq = {int(w): v for w, v in payload["lv_sq"].items()}
+        st.max_q = {int(w): deque(q) for w, q in payload["max_q"].items()}
+        st.mdd = {int(w): dict(v) for w, v in payload["mdd"].items()}
+        st.since_resync = int(payload.get("since_resync", 0))
+        return st
+
+    @classmethod
+    def from_rows(cls, rows: List[tuple]) -> "RollingState":
+        """(date, close, volume) 시계열(날짜 오름차순)로 상태 생성 - 최근 NEED개만 사용"""
+        st = cls()
+        for d, close, volume in list(rows)[-NEED:]:
+            st.push(d, close, volume)
+        return st
@@ -0,0 +1,70 @@
+# stocks/services/http_retry.py
+"""
+외부 API 클라이언트 공용 HTTP 유틸 (stock_api_client / naver_news_client)
+- pooled_session(): keep-alive 커넥션 풀 세션
+- get_with_retry(): rate limit 대기 + 429/5xx/연결 오류 재시도 (지수 backoff, Retry-After 우선)
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# 재시도 대상 HTTP 상태 (rate limit / 서버 일시 오류)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def pooled_session(pool_size: int = 32) -> requests.Session:
+    """스레드 여러 개가 같이 써도 되는 keep-alive 세션 (호스트당 커넥션 pool_size개)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, int(pool_size)))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Retry-After 헤더(초 단위 정수만, HTTP-date는 무시)"""
+    value = (response.headers.get("Retry-After") or "").strip()
+    return float(value) if value.isdigit() else None
+
+
+def get_with_retry(
+    session: requests.Session,
+    url: str,
+    *,
+    max_retries: int,
+    backoff: float,
+    timeout: float,
+    before_request: Optional[Callable[[], None]] = None,
+    **kwargs,
+) -> requests.Response:
+    """
+    GET + 재시도
+    - before_request: 매 시도 전에 호출 (토큰 버킷/rate limiter 대기)
+    - 재시도 대상이 아니거나 횟수를 다 쓰면 raise_for_status() 후 반환
+    """
+    attempt = 0
+    while True:
+        if before_request is not None:
+            before_request()
+        try:
+            r = session.get(url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= max_retries:
+                raise
+            wait = backoff * (2 ** attempt)
+        else:
+            if r.status_code not in RETRY_STATUS or attempt >= max_retries:
+                r.raise_for_status()
+                return r
+            wait = backoff * (2 ** attempt)
+            retry_after = _retry_after(r)
+            if retry_after is not None:
+                wait = max(wait, retry_after)
+
+        attempt += 1
+        time.sleep(wait)
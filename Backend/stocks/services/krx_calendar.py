@@ -0,0 +1,110 @@
+# stocks/services/krx_calendar.py
+"""
+KRX(유가증권/코스닥) 휴장일 캘린더 (로컬)
+- 주말 + 아래 휴장일 목록이면 비거래일
+- 목록에 없는 연도는 주말만 거름 → 매년 KRX 휴장일 공지를 보고 추가
+- 임시 휴장일은 KRX_EXTRA_HOLIDAYS 환경변수(YYYYMMDD 콤마 구분)로 보충 가능
+"""
+from __future__ import annotations
+
+import os
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import FrozenSet, List
+
+
+_HOLIDAYS = {
+    2022: [
+        "20220131", "20220201", "20220202",  # 설날
+        "20220301",
+        "20220309",  # 대통령 선거
+        "20220505",
+        "20220601",  # 지방선거
+        "20220606", "20220815",
+        "20220909", "20220912",  # 추석(+대체)
+        "20221003", "20221010",
+        "20221230",  # 연말 휴장
+    ],
+    2023: [
+        "20230123", "20230124",  # 설날 대체
+        "20230301",
+        "20230501",  # 근로자의 날
+        "20230505",
+        "20230529",  # 부처님오신날 대체
+        "20230606", "20230815",
+        "20230928", "20230929",  # 추석
+        "20231002",  # 임시공휴일
+        "20231003", "20231009", "20231225",
+        "20231229",  # 연말 휴장
+    ],
+    2024: [
+        "20240101",
+        "20240209", "20240212",  # 설날(+대체)
+        "20240301",
+        "20240410",  # 국회의원 선거
+        "20240501",
+        "20240506",  # 어린이날 대체
+        "20240515",  # 부처님오신날
+        "20240606", "20240815",
+        "20240916", "20240917", "20240918",  # 추석
+        "20241001",  # 국군의 날(임시공휴일)
+        "20241003", "20241009", "20241225",
+        "20241231",  # 연말 휴장
+    ],
+    2025: [
+        "20250101",
+        "20250127",  # 임시공휴일
+        "20250128", "20250129", "20250130",  # 설날
+        "20250303",  # 삼일절 대체
+        "20250501",
+        "20250505", "20250506",  # 어린이날/부처님오신날(+대체)
+        "20250603",  # 대통령 선거
+        "20250606", "20250815",
+        "20251003",
+        "20251006", "20251007", "20251008",  # 추석(+대체)
+        "20251009", "20251225",
+        "20251231",  # 연말 휴장
+    ],
+    2026: [
+        "20260101",
+        "20260216", "20260217", "20260218",  # 설날
+        "20260302",  # 삼일절 대체
+        "20260501", "20260505",
+        "20260525",  # 부처님오신날 대체
+        "20260603",  # 지방선거
+        "20260817",  # 광복절 대체
+        "20260924", "20260925",  # 추석
+        "20261005",  # 개천절 대체
+        "20261009", "20261225",
+        "20261231",  # 연말 휴장
+    ],
+}
+
+
+def _parse(s: str) -> date:
+    return date(int(s[:4]), int(s[4:6]), int(s[6:8]))
+
+
+@lru_cache(maxsize=1)
+def holidays() -> FrozenSet[date]:
+    days = {_parse(s) for year in _HOLIDAYS.values() for s in year}
+    for s in os.getenv("KRX_EXTRA_HOLIDAYS", "").split(","):
+        s = s.strip()
+        if len(s) == 8 and s.isdigit():
+            days.add(_parse(s))
+    return frozenset(days)
+
+
+def is_trading_day(d: date) -> bool:
+    return d.weekday() < 5 and d not in holidays()
+
+
+def trading_days(start: date, end: date) -> List[date]:
+    """[start, end] 구간의 거래일 목록 (오름차순)"""
+    out = []
+    cur = start
+    while cur <= end:
+        if is_trading_day(cur):
+            out.append(cur)
+        cur += timedelta(days=1)
+    return out
@@ -1,40 +1,555 @@
 # stocks/services/llm_client.py
+"""
+GMS(OpenAI 호환) chat/completions 공용 클라이언트
+- 프로세스 공용 keep-alive 연결 풀(httpx) → 메시지마다 TLS 핸드셰이크 안 함
+- 동기(complete/stream) + 비동기(acomplete/astream) 진입점
+- 호출별 deadline(초): 재시도/스트리밍을 포함한 전체 시간 상한
+- 일시 오류(연결 실패, 429/5xx) 재시도 (지수 backoff, Retry-After 우선, deadline 안에서만)
+- 서킷 브레이커: 연속 실패가 쌓이면 cooldown 동안 바로 실패 (업스트림 장애 시 60초씩 기다리지 않음)
+- 지연/토큰 사용량 카운터 (stats())
+
+챗봇(ChatbotService), 뉴스 요약(naversearch), 종목 설명(gms_chat)이 같이 씀
+"""
 from __future__ import annotations
 
-import requests
+import asyncio
+import json
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
 from django.conf import settings
 
-GMS_OPENAI_URL = "https://gms.ssafy.io/gmsapi/api.openai.com/v1/chat/completions"
 
-def gms_chat(
-    *,
-    messages: list[dict],
-    model: str = "gpt-5-mini",
-    timeout: int | tuple[int, int] = (10, 120),  # (connect, read)
-) -> str:
-    if not getattr(settings, "GMS_KEY", None):
-        raise RuntimeError("GMS_KEY 가 설정되어 있지 않습니다. (.env / settings.py 확인)")
+RETRY_STATUS = (429, 500, 502, 503, 504)
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.PoolTimeout)
+# 재시도 밖에서 새어 나오는 전송/응답 파싱 오류 → CompletionError로 감싸서 서킷/카운터에 반영
+WRAPPED_EXCEPTIONS = (httpx.HTTPError, httpx.StreamError, ValueError)
+
+
+class CompletionError(RuntimeError):
+    """업스트림 오류 (status가 있으면 HTTP 오류, detail은 응답 본문)"""
+
+    def __init__(self, message: str, *, status: Optional[int] = None, detail: Any = None):
+        super().__init__(message)
+        self.status = status
+        self.detail = detail
+
+
+class CompletionTimeout(CompletionError):
+    """deadline 초과"""
+
+
+class CircuitOpenError(CompletionError):
+    """서킷 열림: 업스트림 장애로 판단되어 호출하지 않고 바로 실패"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 threshold회 → open (cooldown초 동안 즉시 실패)
+    cooldown 후 half-open: 시험 호출 1건만 허용, 성공하면 close / 실패하면 다시 open
+    시험 호출이 결과 없이 끝나면(스트림 중단 등) release_trial()로 다음 시험 호출 허용
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def admit(self) -> Optional[str]:
+        """호출 허용 여부: None(차단) / "call" / "trial"(half-open 시험 호출)"""
+        with self._lock:
+            if self.opened_at is None:
+                return "call"
+            if time.monotonic() - self.opened_at < self.cooldown or self._trial:
+                return None
+            self._trial = True
+            return "trial"
+
+    def allow(self) -> bool:
+        return self.admit() is not None
+
+    def release_trial(self) -> None:
+        """시험 호출이 성공/실패 기록 없이 끝남 (중립) → 상태는 그대로, 다음 시험 호출 허용"""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+class CompletionClient:
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        *,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        connect_timeout: float = 5.0,
+        max_connections: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.url = url or settings.GMS_API_URL
+        self.api_key = api_key if api_key is not None else getattr(settings, "GMS_KEY", None)
+        self.max_retries = max(0, int(max_retries))
+        self.backoff = backoff
+        self.connect_timeout = connect_timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60.0,
+        )
+        self.breaker = breaker or CircuitBreaker()
+
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+        self._latencies: deque = deque(maxlen=1000)
+        self._counters = {
+            "requests": 0,
+            "success": 0,
+            "failures": 0,
+            "retries": 0,
+            "short_circuited": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+        }
+
+    # -------------------------
+    # 연결 풀
+    # -------------------------
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(limits=self.limits)
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # AsyncClient는 이벤트 루프에 묶이므로 루프별로 하나씩
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            ac = self._async_clients.get(loop)
+            if ac is None:
+                ac = httpx.AsyncClient(limits=self.limits)
+                self._async_clients[loop] = ac
+            return ac
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    # -------------------------
+    # 공통
+    # -------------------------
+    def _headers(self) -> Dict[str, str]:
+        if not self.api_key:
+            raise CompletionError("GMS_KEY 가 설정되어 있지 않습니다. (.env / settings.py 확인)")
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {settings.GMS_KEY}",
-    }
+    def _payload(self, messages: List[dict], model: str, stream: bool, extra: Dict[str, Any]) -> Dict[str, Any]:
+        # GMS 프록시가 엄격할 수 있어서 model+messages(+명시한 값)만 보냄
+        payload = {"model": model, "messages": messages, **{k: v for k, v in extra.items() if v is not None}}
+        if stream:
+            payload["stream"] = True
+        return payload
 
-    # ✅ GMS 프록시가 엄격할 수 있어서 model+messages만 보냄
-    data = {
-        "model": model,
-        "messages": messages,
-    }
+    def _timeout(self, remaining: float) -> httpx.Timeout:
+        return httpx.Timeout(remaining, connect=min(self.connect_timeout, remaining))
 
-    resp = requests.post(GMS_OPENAI_URL, headers=headers, json=data, timeout=timeout)
+    def _check_breaker(self) -> bool:
+        """서킷 확인 (열려 있으면 CircuitOpenError), half-open 시험 호출이면 True"""
+        admitted = self.breaker.admit()
+        if admitted is None:
+            with self._lock:
+                self._counters["short_circuited"] += 1
+            raise CircuitOpenError("GMS 업스트림 장애로 잠시 호출을 중단했습니다. (circuit open)")
+        return admitted == "trial"
 
-    # ✅ 400/401/403일 때 “왜 틀렸는지” 본문을 반드시 노출
-    if resp.status_code != 200:
+    @staticmethod
+    def _wrap_error(e: Exception) -> CompletionError:
+        return CompletionError(f"GMS 응답 처리 실패: {type(e).__name__}: {e}")
+
+    def _retry_wait(self, attempt: int, response: Optional[httpx.Response], remaining: float) -> Optional[float]:
+        """재시도 대기 시간 (재시도 불가면 None)"""
+        if attempt >= self.max_retries:
+            return None
+        wait = self.backoff * (2 ** attempt)
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                wait = max(wait, float(retry_after))
+        if wait >= remaining:
+            return None
+        with self._lock:
+            self._counters["retries"] += 1
+        return wait
+
+    def _http_error(self, response: httpx.Response) -> CompletionError:
         try:
-            detail = resp.json()
+            detail = response.json()
         except Exception:
-            detail = resp.text
-        raise RuntimeError(f"GMS_HTTP_{resp.status_code}: {detail}")
+            detail = response.text
+        return CompletionError(f"GMS_HTTP_{response.status_code}: {detail}", status=response.status_code, detail=detail)
+
+    def _record(self, ok: bool, started: float, usage: Optional[dict] = None, upstream_failure: bool = True) -> None:
+        # 4xx 같은 요청 오류는 업스트림이 살아있다는 뜻 → 서킷에는 성공으로 반영
+        if ok or not upstream_failure:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["success" if ok else "failures"] += 1
+            self._latencies.append((time.perf_counter() - started) * 1000)
+            for k in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                self._counters[k] += int((usage or {}).get(k) or 0)
+
+    @staticmethod
+    def _is_upstream_failure(e: Exception) -> bool:
+        """서킷 브레이커에 실패로 셀 오류 (4xx 요청 오류는 업스트림 장애가 아님)"""
+        if isinstance(e, CompletionError) and e.status is not None:
+            return e.status in RETRY_STATUS
+        return True
+
+    @staticmethod
+    def _parse_sse_line(line: str):
+        """SSE 한 줄 → (텍스트 조각, usage) / 끝이면 None"""
+        if not line.startswith("data:"):
+            return "", None
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return None
+        event = json.loads(data)
+        text = "".join(
+            (choice.get("delta") or {}).get("content") or ""
+            for choice in event.get("choices") or []
+        )
+        return text, event.get("usage")
+
+    # -------------------------
+    # 동기
+    # -------------------------
+    def complete(
+        self,
+        messages: List[dict],
+        *,
+        model: str = "gpt-5-mini",
+        deadline: float = 60.0,
+        **extra: Any,
+    ) -> Dict[str, Any]:
+        """chat/completions 호출 → 응답 JSON (deadline초 안에 재시도 포함 완료)"""
+        headers = self._headers()
+        payload = self._payload(messages, model, False, extra)
+        trial = self._check_breaker()
+        started = time.perf_counter()
+        end = time.monotonic() + deadline
+        attempt = 0
+        try:
+            while True:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    raise CompletionTimeout(f"GMS 응답 시간 초과 ({deadline:.0f}s)")
+                response = None
+                try:
+                    response = self.client.post(self.url, headers=headers, json=payload, timeout=self._timeout(remaining))
+                except httpx.TimeoutException as e:
+                    if not isinstance(e, RETRY_EXCEPTIONS):
+                        raise CompletionTimeout(f"GMS 응답 시간 초과 ({deadline:.0f}s)") from e
+                    wait = self._retry_wait(attempt, None, end - time.monotonic())
+                    if wait is None:
+                        raise CompletionTimeout(f"GMS 연결 시간 초과: {e}") from e
+                except RETRY_EXCEPTIONS as e:
+                    wait = self._retry_wait(attempt, None, end - time.monotonic())
+                    if wait is None:
+                        raise CompletionError(f"GMS 연결 실패: {e}") from e
+                else:
+                    if response.status_code == 200:
+                        result = response.json()
+                        self._record(True, started, result.get("usage"))
+                        return result
+                    if response.status_code not in RETRY_STATUS:
+                        raise self._http_error(response)
+                    wait = self._retry_wait(attempt, response, end - time.monotonic())
+                    if wait is None:
+                        raise self._http_error(response)
+
+                attempt += 1
+                time.sleep(wait)
+        except CompletionError as e:
+            self._record(False, started, upstream_failure=self._is_upstream_failure(e))
+            raise
+        except WRAPPED_EXCEPTIONS as e:
+            self._record(False, started)
+            raise self._wrap_error(e) from e
+        finally:
+            # 기록 없이 끝난 시험 호출(GeneratorExit, 예상 밖 예외)은 중립 → 서킷이 half-open에 갇히지 않게
+            if trial:
+                self.breaker.release_trial()
 
-    payload = resp.json()
-    return payload["choices"][0]["message"]["content"].strip()
+    def complete_text(self, messages: List[dict], **kwargs: Any) -> str:
+        payload = self.complete(messages, **kwargs)
+        return (payload["choices"][0]["message"]["content"] or "").strip()
+
+    def stream(
+        self,
+        messages: List[dict],
+        *,
+        model: str = "gpt-5-mini",
+        deadline: float = 60.0,
+        **extra: Any,
+    ) -> Iterator[str]:
+        """
+        stream=true 호출 → 텍스트 조각을 차례로 yield
+        - 첫 응답 전 일시 오류는 재시도, 스트리밍 시작 후에는 재시도 안 함
+        - deadline을 넘기면 CompletionTimeout
+        """
+        headers = self._headers()
+        payload = self._payload(messages, model, True, extra)
+        trial = self._check_breaker()
+        started = time.perf_counter()
+        end = time.monotonic() + deadline
+        attempt = 0
+        usage = None
+        try:
+            while True:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    raise CompletionTimeout(f"GMS 응답 시간 초과 ({deadline:.0f}s)")
+                try:
+                    with self.client.stream(
+                        "POST", self.url, headers=headers, json=payload, timeout=self._timeout(remaining)
+                    ) as response:
+                        if response.status_code != 200:
+                            response.read()
+                            if response.status_code not in RETRY_STATUS:
+                                raise self._http_error(response)
+                            wait = self._retry_wait(attempt, response, end - time.monotonic())
+                            if wait is None:
+                                raise self._http_error(response)
+                        else:
+                            for line in response.iter_lines():
+                                if time.monotonic() > end:
+                                    raise CompletionTimeout(f"GMS 스트리밍 시간 초과 ({deadline:.0f}s)")
+                                parsed = self._parse_sse_line(line)
+                                if parsed is None:
+                                    break
+                                text, chunk_usage = parsed
+                                usage = chunk_usage or usage
+                                if text:
+                                    yield text
+                            self._record(True, started, usage)
+                            return
+                except httpx.TimeoutException as e:
+                    if not isinstance(e, RETRY_EXCEPTIONS):
+                        raise CompletionTimeout(f"GMS 응답 시간 초과 ({deadline:.0f}s)") from e
+                    wait = self._retry_wait(attempt, None, end - time.monotonic())
+                    if wait is None:
+                        raise CompletionTimeout(f"GMS 연결 시간 초과: {e}") from e
+                except RETRY_EXCEPTIONS as e:
+                    wait = self._retry_wait(attempt, None, end - time.monotonic())
+                    if wait is None:
+                        raise CompletionError(f"GMS 연결 실패: {e}") from e
+
+                attempt += 1
+                time.sleep(wait)
+        except CompletionError as e:
+            self._record(False, started, upstream_failure=self._is_upstream_failure(e))
+            raise
+        except WRAPPED_EXCEPTIONS as e:
+            self._record(False, started)
+            raise self._wrap_error(e) from e
+        finally:
+            # 기록 없이 끝난 시험 호출(GeneratorExit, 예상 밖 예외)은 중립 → 서킷이 half-open에 갇히지 않게
+            if trial:
+                self.breaker.release_trial()
+
+    # -------------------------
+    # 비동기
+    # -------------------------
+    async def acomplete(
+        self,
+        messages: List[dict],
+        *,
+        model: str = "gpt-5-mini",
+        deadline: float = 60.0,
+        **extra: Any,
+    ) -> Dict[str, Any]:
+        """complete()의 async 버전 (루프별 공용 AsyncClient)"""
+        headers = self._headers()
+        payload = self._payload(messages, model, False, extra)
+        client = self._async_client()
+        trial = self._check_breaker()
+        started = time.perf_counter()
+        end = time.monotonic() + deadline
+        attempt = 0
+        try:
+            while True:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    raise CompletionTimeout(f"GMS 응답 시간 초과 ({deadline:.0f}s)")
+                try:
+                    response = await client.post(self.url, headers=headers, json=payload, timeout=self._timeout(remaining))
+                except httpx.TimeoutException as e:
+                    if not isinstance(e, RETRY_EXCEPTIONS):
+                        raise CompletionTimeout(f"GMS 응답 시간 초과 ({deadline:.0f}s)") from e
+                    wait = self._retry_wait(attempt, None, end - time.monotonic())
+                    if wait is None:
+                        raise CompletionTimeout(f"GMS 연결 시간 초과: {e}") from e
+                except RETRY_EXCEPTIONS as e:
+                    wait = self._retry_wait(attempt, None, end - time.monotonic())
+                    if wait is None:
+                        raise CompletionError(f"GMS 연결 실패: {e}") from e
+                else:
+                    if response.status_code == 200:
+                        result = response.json()
+                        self._record(True, started, result.get("usage"))
+                        return result
+                    if response.status_code not in RETRY_STATUS:
+                        raise self._http_error(response)
+                    wait = self._retry_wait(attempt, response, end - time.monotonic())
+                    if wait is None:
+                        raise self._http_error(response)
+
+                attempt += 1
+                await asyncio.sleep(wait)
+        except CompletionError as e:
+            self._record(False, started, upstream_failure=self._is_upstream_failure(e))
+            raise
+        except WRAPPED_EXCEPTIONS as e:
+            self._record(False, started)
+            raise self._wrap_error(e) from e
+        finally:
+            # 기록 없이 끝난 시험 호출(GeneratorExit, 예상 밖 예외)은 중립 → 서킷이 half-open에 갇히지 않게
+            if trial:
+                self.breaker.release_trial()
+
+    async def astream(
+        self,
+        messages: List[dict],
+        *,
+        model: str = "gpt-5-mini",
+        deadline: float = 60.0,
+        **extra: Any,
+    ) -> AsyncIterator[str]:
+        """stream()의 async 버전 (첫 응답 전 오류는 재시도하지 않고 바로 실패)"""
+        headers = self._headers()
+        payload = self._payload(messages, model, True, extra)
+        client = self._async_client()
+        trial = self._check_breaker()
+        started = time.perf_counter()
+        end = time.monotonic() + deadline
+        usage = None
+        try:
+            try:
+                async with client.stream(
+                    "POST", self.url, headers=headers, json=payload, timeout=self._timeout(deadline)
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        raise self._http_error(response)
+                    async for line in response.aiter_lines():
+                        if time.monotonic() > end:
+                            raise CompletionTimeout(f"GMS 스트리밍 시간 초과 ({deadline:.0f}s)")
+                        parsed = self._parse_sse_line(line)
+                        if parsed is None:
+                            break
+                        text, chunk_usage = parsed
+                        usage = chunk_usage or usage
+                        if text:
+                            yield text
+            except httpx.TimeoutException as e:
+                raise CompletionTimeout(f"GMS 응답 시간 초과 ({deadline:.0f}s)") from e
+            except httpx.TransportError as e:
+                raise CompletionError(f"GMS 연결 실패: {e}") from e
+            self._record(True, started, usage)
+        except CompletionError as e:
+            self._record(False, started, upstream_failure=self._is_upstream_failure(e))
+            raise
+        except WRAPPED_EXCEPTIONS as e:
+            self._record(False, started)
+            raise self._wrap_error(e) from e
+        finally:
+            # 기록 없이 끝난 시험 호출(GeneratorExit, 예상 밖 예외)은 중립 → 서킷이 half-open에 갇히지 않게
+            if trial:
+                self.breaker.release_trial()
+
+    # -------------------------
+    # 지표
+    # -------------------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            lat = sorted(self._latencies)
+
+        def _pct(p: float) -> float:
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))], 1) if lat else 0.0
+
+        return {
+            **counters,
+            "breaker": self.breaker.state,
+            "latency_ms": {
+                "count": len(lat),
+                "mean": round(sum(lat) / len(lat), 1) if lat else 0.0,
+                "p50": _pct(0.50),
+                "p95": _pct(0.95),
+                "max": round(lat[-1], 1) if lat else 0.0,
+            },
+        }
+
+
+_shared_lock = threading.Lock()
+_shared_client: Optional[CompletionClient] = None
+
+
+def get_completion_client() -> CompletionClient:
+    """프로세스 공용 클라이언트 (연결 풀/서킷/카운터 공유)"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = CompletionClient()
+        return _shared_client
+
+
+def gms_chat(
+    *,
+    messages: list[dict],
+    model: str = "gpt-5-mini",
+    timeout: int | tuple[int, int] = (10, 120),  # (connect, read)
+) -> str:
+    # 기존 (connect, read) 튜플은 read 값을 전체 deadline으로 사용
+    deadline = float(timeout[1] if isinstance(timeout, tuple) else timeout)
+    return get_completion_client().complete_text(messages, model=model, deadline=deadline)
@@ -1,26 +1,113 @@
 import os
 import re
 import html
+import threading
+import time
 import requests
 from email.utils import parsedate_to_datetime
+from typing import Optional
+
 from django.conf import settings
 
+from stocks.services.http_retry import get_with_retry, pooled_session
+
 BASE_URL = "https://openapi.naver.com/v1/search/news.json"
 TAG_RE = re.compile(r"<[^>]*>")
 
+# 네이버 검색 API 초당 호출 한도(애플리케이션 키 기준) - NAVER_NEWS_QPS로 조정
+DEFAULT_QPS = 10.0
+
+
 def clean_html(raw_text: str) -> str:
     if not raw_text:
         return ""
     text = TAG_RE.sub("", raw_text)
     return html.unescape(text).strip()
 
+
+class TokenBucket:
+    """
+    스레드 공유 토큰 버킷: 초당 rate개 충전, 최대 capacity개까지 몰아서 사용 가능
+    - acquire()는 토큰이 생길 때까지 대기
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# 프로세스 공용 keep-alive 세션 / 한도 버킷 (같은 키로 여러 스레드·요청이 호출)
+_shared_lock = threading.Lock()
+_shared_session: Optional[requests.Session] = None
+_shared_bucket: Optional[TokenBucket] = None
+
+
+def _get_shared_session() -> requests.Session:
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = pooled_session(32)
+        return _shared_session
+
+
+def _get_shared_bucket() -> TokenBucket:
+    global _shared_bucket
+    with _shared_lock:
+        if _shared_bucket is None:
+            qps = float(os.environ.get("NAVER_NEWS_QPS") or getattr(settings, "NAVER_NEWS_QPS", DEFAULT_QPS))
+            _shared_bucket = TokenBucket(qps)
+        return _shared_bucket
+
+
 class NaverNewsClient:
-    def __init__(self):
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        qps: Optional[float] = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10,
+    ):
         self.client_id = os.environ.get("NAVER_CLIENT_ID") or getattr(settings, "NAVER_CLIENT_ID", None)
         self.client_secret = os.environ.get("NAVER_CLIENT_SECRET") or getattr(settings, "NAVER_CLIENT_SECRET", None)
         if not self.client_id or not self.client_secret:
             raise RuntimeError("NAVER_CLIENT_ID / NAVER_CLIENT_SECRET 설정이 필요합니다.")
 
+        self.base_url = base_url or os.environ.get("NAVER_NEWS_API_URL") or BASE_URL
+        self.max_retries = max(0, int(max_retries))
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.session = _get_shared_session()
+        # qps를 직접 주면 이 클라이언트 전용 버킷, 아니면 프로세스 공용 버킷
+        self.bucket = TokenBucket(qps) if qps is not None else _get_shared_bucket()
+
+    def _get(self, headers: dict, params: dict) -> requests.Response:
+        """토큰 버킷 대기 + 429/5xx/연결 오류 재시도(지수 backoff, Retry-After 우선)"""
+        return get_with_retry(
+            self.session, self.base_url,
+            max_retries=self.max_retries, backoff=self.backoff, timeout=self.timeout,
+            before_request=self.bucket.acquire, headers=headers, params=params,
+        )
+
     def search(self, query: str, display: int = 20, start: int = 1, sort: str = "date") -> list[dict]:
         headers = {
             "X-Naver-Client-Id": self.client_id,
@@ -33,8 +120,7 @@ class NaverNewsClient:
             "sort": sort,
         }
 
-        r = requests.get(BASE_URL, headers=headers, params=params, timeout=10)
-        r.raise_for_status()
+        r = self._get(headers, params)
         data = r.json()
         items = data.get("items", []) or []
 
@@ -1,24 +1,103 @@
 # stocks/services/news_bundle.py
+"""
+종목별 최근 뉴스 Top K 조회 + 짧은 TTL 캐시
+- 종목 여러 개의 Top K를 ROW_NUMBER() OVER (PARTITION BY stock_id ORDER BY published_at DESC)
+  윈도우로 DB에서 바로 잘라 values()로만 읽음 (ORM 객체/버리는 행 없음)
+- (종목, as_of) 캐시를 추천(attach_news_topk) / stock_news / stock_explain이 같이 씀
+  · 항목: 조회한 창(days) 안의 최신 depth건 → 더 짧은 창/더 작은 k 요청은 잘라서 재사용
+  · 뉴스 저장(save_news) 시 해당 종목 캐시 삭제
+"""
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Any
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List
 
+from django.core.cache import cache
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.utils import timezone
 
 from stocks.models import Stock, StockNews
 
 
-def _get_datetime_field() -> str | None:
+NEWS_CACHE_TTL = 60  # 초
+NEWS_VALUE_FIELDS = ("title", "description", "link", "originallink", "source", "published_at")
+
+
+def _cache_key(stock_id: int, as_of) -> str:
+    return f"news_topk:{stock_id}:{as_of}"
+
+
+def _serialize(row: Dict[str, Any]) -> Dict[str, Any]:
+    item = {f: row.get(f) for f in NEWS_VALUE_FIELDS}
+    dt_val = item["published_at"]
+    item["published_at"] = dt_val.isoformat() if dt_val else None
+    return item
+
+
+def _query_topk(stock_ids: List[int], since, k: int) -> Dict[int, List[Dict[str, Any]]]:
+    """stock별 since 이후 최신 k건 (쿼리 1번)"""
+    qs = (
+        StockNews.objects
+        .filter(stock_id__in=stock_ids, published_at__gte=since)
+        .annotate(rn=Window(
+            expression=RowNumber(),
+            partition_by=[F("stock_id")],
+            order_by=[F("published_at").desc(), F("id").desc()],
+        ))
+        .filter(rn__lte=k)
+        .order_by("stock_id", "rn")
+        .values("stock_id", *NEWS_VALUE_FIELDS)
+    )
+    out: Dict[int, List[Dict[str, Any]]] = {sid: [] for sid in stock_ids}
+    for row in qs:
+        out[row["stock_id"]].append(_serialize(row))
+    return out
+
+
+def news_topk_by_stock(stock_ids: Iterable[int], *, days: int = 7, k: int = 3) -> Dict[int, List[Dict[str, Any]]]:
     """
-    StockNews의 날짜 필드명이 프로젝트마다 다를 수 있어서 안전하게 선택
+    stock_id -> 최근 days일 뉴스 최신순 최대 k건 (published_at은 isoformat 문자열)
+    - 캐시에 (더 긴 창, 더 깊은 k)로 받아둔 항목이 있으면 그걸 잘라 씀
+    - 없는 종목만 윈도우 쿼리 1번으로 채움
     """
-    if hasattr(StockNews, "published_at"):
-        return "published_at"
-    if hasattr(StockNews, "pub_date"):
-        return "pub_date"
-    return None
+    ids = list(dict.fromkeys(int(i) for i in stock_ids))
+    if not ids:
+        return {}
+
+    now = timezone.now()
+    since = now - timedelta(days=days)
+    since_iso = since.isoformat()
+    as_of = timezone.localdate(now)
+
+    keys = {sid: _cache_key(sid, as_of) for sid in ids}
+    cached = cache.get_many(list(keys.values()))
+
+    out: Dict[int, List[Dict[str, Any]]] = {}
+    missing = []
+    for sid in ids:
+        entry = cached.get(keys[sid])
+        if entry and entry["days"] >= days and (entry["depth"] >= k or len(entry["items"]) < entry["depth"]):
+            # isoformat(UTC) 문자열 비교 = 시각 비교
+            items = [it for it in entry["items"] if it["published_at"] and it["published_at"] >= since_iso]
+            out[sid] = items[:k]
+        else:
+            missing.append(sid)
+
+    if missing:
+        fresh = _query_topk(missing, since, k)
+        cache.set_many(
+            {keys[sid]: {"days": days, "depth": k, "items": items} for sid, items in fresh.items()},
+            timeout=NEWS_CACHE_TTL,
+        )
+        out.update(fresh)
+    return out
+
+
+def invalidate_news_cache(stock_ids: Iterable[int]) -> None:
+    """뉴스 저장 후 해당 종목 캐시 삭제 (오늘 as_of 기준)"""
+    as_of = timezone.localdate()
+    cache.delete_many([_cache_key(int(sid), as_of) for sid in set(stock_ids)])
 
 
 def attach_news_topk(reco_result: dict[str, Any], *, days: int = 7, k: int = 3) -> dict[str, Any]:
@@ -33,49 +112,15 @@ def attach_news_topk(reco_result: dict[str, Any], *, days: int = 7, k: int = 3)
     if not codes:
         return reco_result
 
-    stocks = list(Stock.objects.filter(code__in=codes).values("id", "code"))
-    code_to_id = {s["code"]: s["id"] for s in stocks}
-    ids = list(code_to_id.values())
-    if not ids:
+    code_to_id = dict(Stock.objects.filter(code__in=codes).values_list("code", "id"))
+    if not code_to_id:
         return reco_result
 
-    dt_field = _get_datetime_field()
-
-    qs = StockNews.objects.filter(stock_id__in=ids).order_by("-id")
-    # 날짜 필드가 있으면 최근 n일로 자름
-    if dt_field:
-        since = timezone.now() - timedelta(days=days)
-        qs = qs.filter(**{f"{dt_field}__gte": since}).order_by(f"-{dt_field}")
-
-    # 1번 쿼리로 다 긁고, 파이썬에서 stock별 Top K만 골라 담기
-    bucket: dict[int, list[dict[str, Any]]] = defaultdict(list)
-
-    for n in qs:
-        sid = n.stock_id
-        if len(bucket[sid]) >= k:
-            continue
-
-        item = {
-            "title": getattr(n, "title", None),
-            "description": getattr(n, "description", None),
-            "link": getattr(n, "link", None),
-            "originallink": getattr(n, "originallink", None),
-            "source": getattr(n, "source", None),
-        }
-
-        if dt_field:
-            dt_val = getattr(n, dt_field, None)
-            try:
-                item["published_at"] = dt_val.isoformat() if dt_val else None
-            except Exception:
-                item["published_at"] = str(dt_val) if dt_val else None
-
-        bucket[sid].append(item)
+    bucket = news_topk_by_stock(code_to_id.values(), days=days, k=k)
 
     # 추천 결과에 붙이기
     for r in recos:
-        code = r.get("code")
-        sid = code_to_id.get(code)
+        sid = code_to_id.get(r.get("code"))
         r["news_top3"] = bucket.get(sid, [])
 
     reco_result["news_window_days"] = days
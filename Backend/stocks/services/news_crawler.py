@@ -0,0 +1,140 @@
+# stocks/services/news_crawler.py
+"""
+종목 뉴스 수집/저장 공용 로직
+- build_news_objects / save_news: 검색 결과 → StockNews bulk_create(ignore_conflicts) (link unique)
+  저장된 종목은 news_bundle 캐시 삭제
+- crawl_stock_news: 여러 종목 검색을 bounded 스레드 풀로 동시에 실행
+  (NaverNewsClient의 공용 keep-alive 세션 + 토큰 버킷 한도를 같이 씀)
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from stocks.models import Stock, StockNews
+from stocks.services.naver_news_client import NaverNewsClient
+from stocks.services.news_bundle import invalidate_news_cache
+
+
+def build_news_objects(
+    stock: Stock,
+    items: Iterable[Dict[str, Any]],
+    *,
+    query: str,
+    keep: Optional[Callable[[Any], bool]] = None,
+) -> List[StockNews]:
+    """
+    NaverNewsClient.search 결과 → StockNews 객체 (저장 전)
+    - published_at/link 없는 항목 제외, keep(published_at)이 False면 제외(오래된 뉴스 컷)
+    """
+    objs = []
+    for it in items:
+        pub = it.get("published_at")
+        link = (it.get("link") or "").strip()
+        if not pub or not link:
+            continue
+        if keep is not None and not keep(pub):
+            continue
+        objs.append(StockNews(
+            stock=stock,
+            published_at=pub,
+            title=(it.get("title") or "")[:500],
+            description=it.get("description") or "",
+            link=link,
+            originallink=it.get("originallink") or "",
+            source="NAVER",
+            query_used=query[:200],
+        ))
+    return objs
+
+
+def save_news(objs: List[StockNews], batch_size: int = 500) -> int:
+    """
+    link 기준 중복 제외 후 bulk_create(ignore_conflicts=True)
+    반환: 새로 저장된 건수 (이미 있는 link는 기존 종목/내용 유지 - get_or_create와 동일)
+    """
+    unique: Dict[str, StockNews] = {}
+    for o in objs:
+        unique.setdefault(o.link, o)
+    if not unique:
+        return 0
+
+    existing = set()
+    links = list(unique)
+    for i in range(0, len(links), 900):
+        existing.update(
+            StockNews.objects.filter(link__in=links[i:i + 900]).values_list("link", flat=True)
+        )
+
+    new_objs = [o for link, o in unique.items() if link not in existing]
+    StockNews.objects.bulk_create(new_objs, batch_size=batch_size, ignore_conflicts=True)
+    if new_objs:
+        invalidate_news_cache({o.stock_id for o in new_objs})
+    return len(new_objs)
+
+
+def crawl_stock_news(
+    stocks: List[Stock],
+    *,
+    client: Optional[NaverNewsClient] = None,
+    display: int = 20,
+    suffix: str = "주가",
+    cutoff: Optional[date] = None,
+    workers: int = 8,
+    sleep: float = 0.0,
+    flush_every: int = 2000,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    종목별 "{종목명} {suffix}" 검색을 workers개 스레드로 동시에 실행하고 메인 스레드에서 모아 저장
+    - 한도는 client의 토큰 버킷이 조절 (workers는 동시 연결 수 상한)
+    - cutoff(date)보다 오래된 뉴스는 저장 제외
+    - sleep: workers=1일 때 요청 간 추가 대기(기존 순차 방식 호환)
+    반환: stocks/fetched/saved/skipped_old/failed/elapsed/articles_per_sec
+    """
+    client = client or NaverNewsClient()
+    workers = max(1, int(workers))
+
+    stats: Dict[str, Any] = {"stocks": len(stocks), "fetched": 0, "saved": 0, "skipped_old": 0, "failed": 0}
+    pending: List[StockNews] = []
+
+    def _search(stock: Stock):
+        query = f"{stock.name} {suffix}".strip()
+        items = client.search(query=query, display=display, sort="date")
+        if workers == 1 and sleep:
+            time.sleep(sleep)
+        return query, items
+
+    def _keep(pub) -> bool:
+        if cutoff is not None and pub.date() < cutoff:
+            stats["skipped_old"] += 1
+            return False
+        return True
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_search, s): s for s in stocks}
+        for fut in as_completed(futures):
+            stock = futures.pop(fut)
+            try:
+                query, items = fut.result()
+            except Exception as e:
+                stats["failed"] += 1
+                if log:
+                    log(f"{stock.code} {stock.name}: 검색 실패 ({e})")
+                continue
+
+            stats["fetched"] += len(items)
+            pending.extend(build_news_objects(stock, items, query=query, keep=_keep))
+            if len(pending) >= flush_every:
+                stats["saved"] += save_news(pending)
+                pending = []
+
+    stats["saved"] += save_news(pending)
+
+    elapsed = time.perf_counter() - t0
+    stats["elapsed"] = elapsed
+    stats["articles_per_sec"] = stats["fetched"] / elapsed if elapsed > 0 else 0.0
+    return stats
@@ -1,7 +1,6 @@
 # stocks/services/news_on_demand.py
 from __future__ import annotations
 
-import math
 from datetime import datetime, timedelta, date as date_type
 from typing import Any, Optional
 
@@ -10,6 +9,9 @@ from django.utils import timezone
 
 from stocks.models import Stock, StockNews, FeatureDaily
 from stocks.services.naver_news_client import NaverNewsClient
+from stocks.services.news_crawler import build_news_objects, save_news
+from stocks.services.news_scores import update_news_scores
+from stocks.services.feature_cache import bump_feature_version
 
 
 def _aware_range_for_asof(as_of: date_type, days: int) -> tuple[datetime, datetime]:
@@ -60,51 +62,19 @@ def ensure_stock_news(
 
     items = client.search(query=query, display=min(max(display, 1), 100), sort="date")
 
-    saved = 0
     skipped_old = 0
 
-    for it in items:
-        pub = it.get("published_at")
-        if not pub:
-            continue
+    def _keep(pub) -> bool:
+        nonlocal skipped_old
         if pub.date() < cutoff_date:
             skipped_old += 1
-            continue
-
-        link = (it.get("link") or "").strip()
-        if not link:
-            continue
-
-        # link unique라 중복 저장 방지됨
-        _, created = StockNews.objects.get_or_create(
-            link=link,
-            defaults={
-                "stock": stock,
-                "published_at": pub,
-                "title": (it.get("title") or "")[:500],
-                "description": it.get("description") or "",
-                "originallink": it.get("originallink") or "",
-                "source": "NAVER",
-                "query_used": query[:200],
-            },
-        )
-        if created:
-            saved += 1
+            return False
+        return True
 
-    return {"fetched": True, "reason": "fetched_now", "saved": saved, "skipped_old": skipped_old}
-
-
-def _news_score(stock: Stock, as_of: date_type, window_days: int, tau: float) -> float:
-    start_dt, end_dt = _aware_range_for_asof(as_of, window_days)
-    qs = StockNews.objects.filter(stock=stock, published_at__gte=start_dt, published_at__lt=end_dt)
+    # link unique라 중복 저장 방지됨
+    saved = save_news(build_news_objects(stock, items, query=query, keep=_keep))
 
-    s = 0.0
-    for n in qs:
-        delta = (as_of - n.published_at.date()).days
-        if delta < 0:
-            continue
-        s += math.exp(-delta / tau)
-    return float(s)
+    return {"fetched": True, "reason": "fetched_now", "saved": saved, "skipped_old": skipped_old}
 
 
 def update_feature_news_scores_if_exists(*, stock: Stock, as_of: date_type) -> dict[str, Any]:
@@ -112,15 +82,12 @@ def update_feature_news_scores_if_exists(*, stock: Stock, as_of: date_type) -> d
     ✅ FeatureDaily가 이미 존재하면, 그 날짜(as_of)의 news3/news7/news30만 즉시 업데이트
     (build_features로 피처가 만들어진 날에만 의미 있음)
     """
-    fd = FeatureDaily.objects.filter(stock=stock, date=as_of).first()
-    if not fd:
+    if not update_news_scores([stock.id], as_of):
         return {"updated": False, "reason": "no_feature_daily"}
 
-    fd.news3 = _news_score(stock, as_of, window_days=3, tau=1.5)
-    fd.news7 = _news_score(stock, as_of, window_days=7, tau=3.0)
-    fd.news30 = _news_score(stock, as_of, window_days=30, tau=10.0)
-    fd.save(update_fields=["news3", "news7", "news30"])
-    return {"updated": True, "news3": fd.news3, "news7": fd.news7, "news30": fd.news30}
+    bump_feature_version(as_of)
+    fd = FeatureDaily.objects.filter(stock=stock, date=as_of).values("news3", "news7", "news30").first()
+    return {"updated": True, **fd}
 
 
 def get_news_topk_for_asof(*, stock: Stock, as_of: date_type, days: int = 7, k: int = 3) -> list[dict[str, Any]]:
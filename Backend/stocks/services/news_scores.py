@@ -0,0 +1,89 @@
+# stocks/services/news_scores.py
+"""
+FeatureDaily 뉴스 점수(news3/news7/news30) 일괄 계산
+- 종목 여러 개의 (stock_id, published_at)을 30일 창 기준 쿼리 1번으로 읽고
+- 지수 감쇠 점수 exp(-Δday/τ) (τ=1.5/3/10) 세 개를 한 번에 배열 연산
+- FeatureDaily는 bulk_update 1번으로 반영
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable
+
+import numpy as np
+from django.utils import timezone
+
+from stocks.models import FeatureDaily, StockNews
+
+
+# (필드, 창 일수, τ)
+NEWS_WINDOWS = (
+    ("news3", 3, 1.5),
+    ("news7", 7, 3.0),
+    ("news30", 30, 10.0),
+)
+NEWS_FIELDS = [f for f, _, _ in NEWS_WINDOWS]
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _local_midnight(d: date) -> datetime:
+    tz = timezone.get_current_timezone()
+    return timezone.make_aware(datetime.combine(d, datetime.min.time()), tz)
+
+
+def compute_news_scores(stock_ids: Iterable[int], as_of: date) -> Dict[int, Dict[str, float]]:
+    """
+    stock_id -> {"news3", "news7", "news30"}
+    - 창: [as_of-days 00:00, as_of+1 00:00) (현지 시각)
+    - Δday = as_of - published_at.date() (DB에서 읽은 datetime 기준, 음수는 제외)
+    """
+    ids = list(dict.fromkeys(int(i) for i in stock_ids))
+    scores = {sid: {f: 0.0 for f in NEWS_FIELDS} for sid in ids}
+    if not ids:
+        return scores
+
+    max_days = max(days for _, days, _ in NEWS_WINDOWS)
+    start_dt = _local_midnight(as_of - timedelta(days=max_days))
+    end_dt = _local_midnight(as_of + timedelta(days=1))
+    rows = list(
+        StockNews.objects
+        .filter(stock_id__in=ids, published_at__gte=start_dt, published_at__lt=end_dt)
+        .values_list("stock_id", "published_at")
+    )
+    if not rows:
+        return scores
+
+    pos = {sid: i for i, sid in enumerate(ids)}
+    owner = np.fromiter((pos[sid] for sid, _ in rows), dtype=np.int64, count=len(rows))
+    ts = np.fromiter((p.timestamp() for _, p in rows), dtype=np.float64, count=len(rows))
+    # published_at.date(): DB datetime은 UTC aware → epoch 일수 = UTC 날짜
+    pub_day = np.array([p.date() for _, p in rows], dtype="datetime64[D]").astype(np.int64)
+    delta = (as_of - _EPOCH).days - pub_day
+
+    for field, days, tau in NEWS_WINDOWS:
+        mask = (ts >= _local_midnight(as_of - timedelta(days=days)).timestamp()) & (delta >= 0)
+        weights = np.where(mask, np.exp(-np.maximum(delta, 0) / tau), 0.0)
+        col = np.bincount(owner, weights=weights, minlength=len(ids))
+        for sid, v in zip(ids, col.tolist()):
+            scores[sid][field] = float(v)
+    return scores
+
+
+def update_news_scores(stock_ids: Iterable[int], as_of: date) -> int:
+    """
+    FeatureDaily(date=as_of, stock in stock_ids)의 뉴스 점수를 한 번에 갱신
+    반환: 갱신한 FeatureDaily 수 (피처가 없는 종목은 건너뜀)
+    """
+    ids = list(stock_ids)
+    fds = list(FeatureDaily.objects.filter(date=as_of, stock_id__in=ids).only("id", "stock_id", *NEWS_FIELDS))
+    if not fds:
+        return 0
+
+    scores = compute_news_scores([fd.stock_id for fd in fds], as_of)
+    for fd in fds:
+        for field, value in scores[fd.stock_id].items():
+            setattr(fd, field, value)
+
+    FeatureDaily.objects.bulk_update(fds, NEWS_FIELDS, batch_size=1000)
+    return len(fds)
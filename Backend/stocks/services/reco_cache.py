@@ -0,0 +1,236 @@
+# stocks/services/reco_cache.py
+"""
+기본 추천 랭킹 캐시 (risk × horizon × effort × include_news = 36개/일)
+- 프로필 배수 적용 전 랭킹은 (as_of, risk, horizon, effort, include_news)로만 결정됨
+- daily_update 마지막 단계에서 36개를 RecommendationCache 테이블에 미리 저장
+- 요청 시에는 캐시된 랭킹에 프로필 재가중 + Top N만 적용 (apply_profile)
+- FeatureVersion(as_of).version으로 스탬프 → 뉴스 재채점 등으로 버전이 오르면 다시 계산
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from django.db import transaction
+
+from stocks.models import RecommendationCache
+from stocks.services.feature_cache import VERSION_CHECK_SEC, MAX_ENTRIES, feature_version, get_feature_matrix
+from stocks.services.recommender import BaseRanking, _norm_key, apply_profile, build_base_ranking
+
+
+RISKS = ("LOW", "MID", "HIGH")
+HORIZONS = ("SHORT", "MID", "LONG")
+EFFORTS = ("SIMPLE", "OPTIMIZE")
+NEWS_FLAGS = (True, False)
+
+GRID_SIZE = len(RISKS) * len(HORIZONS) * len(EFFORTS) * len(NEWS_FLAGS)
+
+Key = Tuple[date, str, str, str, bool]
+
+
+def _key(as_of: date, risk: str, horizon: str, effort: str, include_news: bool) -> Key:
+    return (
+        as_of,
+        _norm_key(risk, RISKS, "MID"),
+        _norm_key(horizon, HORIZONS, "MID"),
+        _norm_key(effort, EFFORTS, "OPTIMIZE"),
+        bool(include_news),
+    )
+
+
+def _grid(as_of: date):
+    for risk in RISKS:
+        for horizon in HORIZONS:
+            for effort in EFFORTS:
+                for include_news in NEWS_FLAGS:
+                    yield (as_of, risk, horizon, effort, include_news)
+
+
+# -------------------------
+# process memo (DB 캐시 앞단)
+# -------------------------
+@dataclass
+class _Entry:
+    version: int
+    checked_at: float
+    ranking: BaseRanking
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+_stats = {"memo_hits": 0, "db_hits": 0, "computed": 0, "stale": 0}
+
+
+def _remember(key: Key, version: int, ranking: BaseRanking) -> None:
+    with _lock:
+        _entries[key] = _Entry(version=version, checked_at=time.monotonic(), ranking=ranking)
+        _entries.move_to_end(key)
+        while len(_entries) > GRID_SIZE * MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def _store(key: Key, version: int, ranking: BaseRanking) -> None:
+    as_of, risk, horizon, effort, include_news = key
+    RecommendationCache.objects.update_or_create(
+        as_of=as_of,
+        risk=risk,
+        horizon=horizon,
+        effort=effort,
+        include_news=include_news,
+        defaults={
+            "feature_version": version,
+            "size": len(ranking),
+            "payload": ranking.to_payload(),
+        },
+    )
+
+
+def get_base_ranking(
+    *,
+    as_of: date,
+    risk: str = "MID",
+    horizon: str = "MID",
+    effort: str = "OPTIMIZE",
+    include_news: bool = True,
+    store: bool = True,
+) -> Optional[BaseRanking]:
+    """
+    기본 랭킹 조회: 프로세스 memo → RecommendationCache(버전 일치) → FeatureMatrix로 계산
+    - 계산한 경우 store=True면 테이블에도 저장 (다음 요청/다른 프로세스가 재사용)
+    - FeatureDaily가 없으면 None
+    """
+    key = _key(as_of, risk, horizon, effort, include_news)
+    now = time.monotonic()
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and now - entry.checked_at < VERSION_CHECK_SEC:
+            _entries.move_to_end(key)
+            _stats["memo_hits"] += 1
+            return entry.ranking
+
+    version = feature_version(as_of)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry.version == version:
+            entry.checked_at = now
+            _entries.move_to_end(key)
+            _stats["memo_hits"] += 1
+            return entry.ranking
+
+    _, risk, horizon, effort, include_news = key
+    row = (
+        RecommendationCache.objects
+        .filter(as_of=as_of, risk=risk, horizon=horizon, effort=effort, include_news=include_news)
+        .values("feature_version", "payload")
+        .first()
+    )
+    if row is not None and row["feature_version"] == version:
+        ranking = BaseRanking.from_payload(
+            row["payload"], as_of=as_of, risk=risk, horizon=horizon, effort=effort, include_news=include_news
+        )
+        _stats["db_hits"] += 1
+        _remember(key, version, ranking)
+        return ranking
+
+    if row is not None:
+        _stats["stale"] += 1
+
+    # 버전은 실제로 계산에 쓴 매트릭스 것으로 (memo가 오래됐으면 recheck로 다시 읽음)
+    matrix = get_feature_matrix(as_of, recheck=True)
+    if matrix is None:
+        return None
+
+    ranking = build_base_ranking(matrix, risk=risk, horizon=horizon, include_news=include_news, effort=effort)
+    _stats["computed"] += 1
+    # 그사이 버전이 또 올랐으면 테이블에는 저장하지 않음 (다음 요청이 새 버전으로 계산)
+    if store and matrix.version == version:
+        _store(key, version, ranking)
+    _remember(key, matrix.version, ranking)
+    return ranking
+
+
+def materialize_base_rankings(as_of: date, *, dry_run: bool = False) -> int:
+    """
+    as_of의 36개 기본 랭킹을 계산해 RecommendationCache에 저장 (daily_update 마지막 단계)
+    - 반환: 생성한 랭킹 수 (FeatureDaily가 없으면 0)
+    """
+    matrix = get_feature_matrix(as_of, recheck=True)
+    if matrix is None:
+        return 0
+
+    version = matrix.version
+    built = []
+    for key in _grid(as_of):
+        _, risk, horizon, effort, include_news = key
+        ranking = build_base_ranking(matrix, risk=risk, horizon=horizon, include_news=include_news, effort=effort)
+        built.append((key, ranking))
+
+    if dry_run:
+        return len(built)
+
+    with transaction.atomic():
+        RecommendationCache.objects.filter(as_of=as_of).delete()
+        RecommendationCache.objects.bulk_create([
+            RecommendationCache(
+                as_of=as_of,
+                risk=risk,
+                horizon=horizon,
+                effort=effort,
+                include_news=include_news,
+                feature_version=version,
+                size=len(ranking),
+                payload=ranking.to_payload(),
+            )
+            for (_, risk, horizon, effort, include_news), ranking in built
+        ])
+
+    for key, ranking in built:
+        _remember(key, version, ranking)
+    return len(built)
+
+
+def recommend_cached(
+    *,
+    as_of: date,
+    risk: str = "MID",
+    horizon: str = "MID",
+    top_n: int = 20,
+    include_news: bool = True,
+    effort: str = "OPTIMIZE",
+    user_profile: Dict[str, Any] = None,
+) -> Dict[str, Any]:
+    """
+    recommend_stocks와 같은 응답을 캐시된 기본 랭킹으로 생성
+    (프로필 재가중 + Top N만 요청마다 계산)
+    """
+    ranking = get_base_ranking(
+        as_of=as_of,
+        risk=risk,
+        horizon=horizon,
+        effort=effort,
+        include_news=include_news,
+    )
+    if ranking is None:
+        return {"detail": f"FeatureDaily 데이터가 없습니다: date={as_of}"}
+
+    return apply_profile(ranking, top_n=top_n, user_profile=user_profile)
+
+
+def invalidate(as_of: Optional[date] = None) -> None:
+    """현재 프로세스 memo 비우기 (as_of=None이면 전체)"""
+    with _lock:
+        if as_of is None:
+            _entries.clear()
+        else:
+            for key in [k for k in _entries if k[0] == as_of]:
+                _entries.pop(key, None)
+
+
+def cache_stats() -> Dict[str, Any]:
+    with _lock:
+        return {**_stats, "entries": len(_entries)}
@@ -5,9 +5,9 @@ from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional, Tuple
 
-from django.db.models import QuerySet
+import numpy as np
 
-from stocks.models import FeatureDaily  # FeatureDaily(stock FK, date, r1/r5/..., vol.., mdd.., volume_z.., news..)
+from stocks.services.feature_cache import FeatureMatrix, get_feature_matrix
 
 
 # -------------------------
@@ -154,7 +154,8 @@ def _pick_news_raw(feature: Any, horizon: str) -> float:
     return _safe_get(feature, cfg["news_field"], 0.0)
 
 
-def recommend_stocks(
+def _recommend_rows_reference(
+    features: List[Any],
     *,
     as_of: date,
     risk: str = "MID",
@@ -165,9 +166,9 @@ def recommend_stocks(
     user_profile: Dict[str, Any] = None,
 ) -> Dict[str, Any]:
     """
-    FeatureDaily(date=as_of) 기반 추천.
-    - include_news=False면 N_raw=0으로 두고 추천(TopK 후보 뽑을 때 사용)
-    - user_profile: 사용자 프로필 정보 (나이, 소득, 투자 목표 등)
+    기존 행(row) 단위 추천 엔진.
+    - FeatureDaily 객체 리스트를 받아 종목마다 RawRow/dict를 만들어 점수 계산
+    - 서비스 경로는 rank_feature_matrix()를 사용하고, 이 함수는 결과 정합성/성능 비교용으로 유지
     """
     risk = _norm_key(risk, ("LOW", "MID", "HIGH"), "MID")
     horizon = _norm_key(horizon, ("SHORT", "MID", "LONG"), "MID")
@@ -180,13 +181,11 @@ def recommend_stocks(
 
     cfg = FEATURE_CONFIG[horizon]
 
-    qs: QuerySet = FeatureDaily.objects.select_related("stock").filter(date=as_of)
-    if not qs.exists():
+    if not features:
         return {"detail": f"FeatureDaily 데이터가 없습니다: date={as_of}"}
 
     # Raw 만들기
     rows: List[RawRow] = []
-    features = list(qs)
 
     # vol/mdd 필드 후보 중 실제 존재하는 필드 선택(첫 레코드 기준)
     any_fd = features[0]
@@ -364,7 +363,132 @@ def recommend_stocks(
 
     recs = recs[: max(1, int(top_n))]
 
-    # 사용자 프로필 정보를 응답에 포함
+    return {
+        "as_of": str(as_of),
+        "profile": _profile_info(risk, horizon, effort, user_profile),
+        "include_news": bool(include_news),
+        "weights": weights,
+        "feature_fields_used": {
+            "trend": [f"r{w}" for w in cfg["trend_windows"]],
+            "volume_z": volz_field or "(none)",
+            "vol": vol_field or "(none)",
+            "mdd": mdd_field or "(none)",
+            "news": cfg["news_field"],
+        },
+        "count": len(recs),
+        "recommendations": recs,
+    }
+
+
+# -------------------------
+# columnar (NumPy) engine
+# -------------------------
+def _first_existing_column(matrix: FeatureMatrix, fields: List[str]) -> str:
+    for f in fields:
+        if matrix.has(f):
+            return f
+    return ""
+
+
+def percentile_rank(values: np.ndarray) -> np.ndarray:
+    """
+    to_percentile()의 배열 버전: argsort 기반 0~1 순위
+    - 동점은 stable 정렬로 입력 순서대로 순위를 매김(to_percentile과 동일한 결과)
+    """
+    n = values.shape[0]
+    if n <= 1:
+        return np.full(n, 0.5, dtype=np.float64)
+
+    order = np.argsort(values, kind="stable")
+    rank = np.empty(n, dtype=np.float64)
+    rank[order] = np.arange(n, dtype=np.float64)
+    return rank / (n - 1)
+
+
+def _profile_adjusted_scores(
+    score: np.ndarray,
+    user_profile: Dict[str, Any],
+    T_raw: np.ndarray,
+    V_raw: np.ndarray,
+    D_raw: np.ndarray,
+) -> np.ndarray:
+    """
+    사용자 프로필(나이/투자목표/소득·저축) 기반 점수 배수를 배열 단위로 적용
+    - 조건/배수는 행 단위 엔진과 동일, 곱하는 순서도 동일하게 유지
+    - T_raw/V_raw/D_raw는 응답의 raw 값과 같은 6자리 반올림 값
+    """
+    score = score.copy()
+
+    # 나이 기반 필터링
+    age = user_profile.get('age')
+    if age:
+        # 젊은 투자자 (20-35세): 성장주 선호
+        if age < 35:
+            score = np.where(T_raw > 5.0, score * 1.1, score)
+        # 중년 투자자 (35-55세): 균형 → 기본 점수 유지
+        elif age < 55:
+            pass
+        # 시니어 투자자 (55세 이상): 안정성 중시
+        else:
+            score = np.where(V_raw < 2.0, score * 1.15, np.where(V_raw > 4.0, score * 0.85, score))
+
+    # 투자 목표 기반 필터링
+    investment_goal = user_profile.get('investment_goal', '').lower()
+    if investment_goal:
+        # 노후 준비: 안정성 중시
+        if '노후' in investment_goal or '연금' in investment_goal:
+            score = np.where(D_raw < 0.15, score * 1.1, score)
+        # 단기 수익: 추세 중시
+        elif '단기' in investment_goal or '수익' in investment_goal:
+            score = np.where(T_raw > 3.0, score * 1.1, score)
+        # 자녀 교육: 중장기 안정
+        elif '자녀' in investment_goal or '교육' in investment_goal:
+            score = np.where((V_raw > 2.0) & (V_raw < 3.5), score * 1.05, score)
+
+    # 소득/저축액 기반 필터링
+    income = user_profile.get('income')
+    savings = user_profile.get('savings')
+    if income and savings:
+        try:
+            income_val = float(income)
+            savings_val = float(savings)
+
+            # 고소득/고자산: 고위험 고수익 종목도 OK
+            if income_val >= 10000 or savings_val >= 10000:
+                pass
+            # 중소득/중자산: 극단적 변동성 종목 감점
+            elif income_val >= 5000 or savings_val >= 5000:
+                score = np.where((V_raw > 5.0) | (D_raw > 0.3), score * 0.9, score)
+            # 저소득/저자산: 고위험 강력 감점, 안정 종목 가산점
+            else:
+                risky = (V_raw > 3.5) | (D_raw > 0.2)
+                stable = ~risky & (V_raw < 2.5) & (D_raw < 0.15)
+                score = np.where(risky, score * 0.7, np.where(stable, score * 1.2, score))
+        except (ValueError, TypeError):
+            pass  # 변환 실패 시 무시
+
+    return score
+
+
+def _top_n_order(final: np.ndarray, base: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    final 점수 내림차순 Top N 인덱스
+    - argpartition으로 후보만 추린 뒤 정렬
+    - 동점은 (base 점수 내림차순, 입력 순서)로 정렬해 행 단위 엔진의 두 번의 stable sort와 같은 순서
+    """
+    n = final.shape[0]
+    k = min(n, top_n)
+    if k < n:
+        kth = np.partition(final, n - k)[n - k]
+        cand = np.nonzero(final >= kth)[0]
+    else:
+        cand = np.arange(n)
+
+    order = np.lexsort((cand, -base[cand], -final[cand]))
+    return cand[order][:k]
+
+
+def _profile_info(risk: str, horizon: str, effort: str, user_profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     profile_info = {"risk": risk, "horizon": horizon, "effort": effort}
     if user_profile:
         profile_info["user_applied"] = {
@@ -372,19 +496,268 @@ def recommend_stocks(
             "investment_goal": user_profile.get('investment_goal'),
             "income_level": "high" if (user_profile.get('income', 0) and float(user_profile.get('income', 0)) >= 10000) else "medium" if (user_profile.get('income', 0) and float(user_profile.get('income', 0)) >= 5000) else "low" if user_profile.get('income') else None,
         }
+    return profile_info
 
-    return {
-        "as_of": str(as_of),
-        "profile": profile_info,
-        "include_news": bool(include_news),
-        "weights": weights,
-        "feature_fields_used": {
+
+@dataclass
+class BaseRanking:
+    """
+    (as_of, risk, horizon, effort, include_news) 조합의 기본 랭킹 (프로필 배수 적용 전)
+    - 리스크 컷을 통과한 후보 전체를 base 점수 내림차순(동점은 입력 순서)으로 보관
+    - components/raw는 응답에 쓰는 6자리 반올림 값 그대로
+    - 프로필 재가중 + Top N은 apply_profile()에서 (하루 36개를 미리 만들어 캐시)
+    """
+    as_of: date
+    risk: str
+    horizon: str
+    effort: str
+    include_news: bool
+    weights: Dict[str, float]
+    feature_fields_used: Dict[str, Any]
+    codes: List[str]
+    names: List[str]
+    base: np.ndarray
+    components: Dict[str, np.ndarray]
+    raw: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """캐시 테이블(JSONField) 저장용 컬럼 단위 dict"""
+        return {
+            "weights": self.weights,
+            "feature_fields_used": self.feature_fields_used,
+            "codes": self.codes,
+            "names": self.names,
+            "base": self.base.tolist(),
+            "components": {k: v.tolist() for k, v in self.components.items()},
+            "raw": {k: v.tolist() for k, v in self.raw.items()},
+        }
+
+    @classmethod
+    def from_payload(
+        cls, payload: Dict[str, Any], *, as_of: date, risk: str, horizon: str, effort: str, include_news: bool
+    ) -> "BaseRanking":
+        def _arr(values):
+            return np.asarray(values, dtype=np.float64)
+
+        return cls(
+            as_of=as_of,
+            risk=risk,
+            horizon=horizon,
+            effort=effort,
+            include_news=bool(include_news),
+            weights=dict(payload["weights"]),
+            feature_fields_used=dict(payload["feature_fields_used"]),
+            codes=list(payload["codes"]),
+            names=list(payload["names"]),
+            base=_arr(payload["base"]),
+            components={k: _arr(v) for k, v in payload["components"].items()},
+            raw={k: _arr(v) for k, v in payload["raw"].items()},
+        )
+
+
+def build_base_ranking(
+    matrix: FeatureMatrix,
+    *,
+    risk: str = "MID",
+    horizon: str = "MID",
+    include_news: bool = True,
+    effort: str = "OPTIMIZE",
+) -> BaseRanking:
+    """
+    FeatureMatrix 기반 기본 랭킹(배열 연산).
+    MDD/변동성 컷, 퍼센타일, 가중 점수까지 계산하고 base 점수 순으로 정렬해 둔다.
+    """
+    risk = _norm_key(risk, ("LOW", "MID", "HIGH"), "MID")
+    horizon = _norm_key(horizon, ("SHORT", "MID", "LONG"), "MID")
+    effort = _norm_key(effort, ("SIMPLE", "OPTIMIZE"), "OPTIMIZE")
+
+    weights = dict(WEIGHTS_CONFIG[effort][risk])
+    if not include_news:
+        weights["w_N"] = 0.0
+    use_news = bool(include_news and weights.get("w_N", 0.0) > 0)
+
+    cfg = FEATURE_CONFIG[horizon]
+
+    vol_field = _first_existing_column(matrix, cfg["vol_field_candidates"])
+    mdd_field = _first_existing_column(matrix, cfg["mdd_field_candidates"])
+    volz_field = _first_existing_column(matrix, cfg["volume_z_field_candidates"])
+
+    # Raw 컬럼
+    T_all = np.zeros(len(matrix), dtype=np.float64)
+    for w, a in zip(cfg["trend_windows"], cfg["trend_weights"]):
+        T_all = T_all + a * matrix.get(f"r{w}")
+    U_all = matrix.get(volz_field)
+    V_all = matrix.get(vol_field)
+    D_all = matrix.get(mdd_field)
+    N_all = matrix.get(cfg["news_field"]) if use_news else np.zeros(len(matrix), dtype=np.float64)
+
+    # 1차: MDD 하드컷(리스크별), 전부 날아가면 fallback
+    max_mdd = RISK_FILTERS[risk]["max_mdd"]
+    idx = np.nonzero((D_all <= max_mdd) | (D_all == 0.0))[0]
+    if idx.size == 0:
+        idx = np.arange(len(matrix))
+
+    T_raw, U_raw, N_raw, V_raw, D_raw = T_all[idx], U_all[idx], N_all[idx], V_all[idx], D_all[idx]
+
+    # 퍼센타일 정규화(0~1)
+    T_pct = percentile_rank(T_raw)
+    U_pct = percentile_rank(U_raw)
+    N_pct = percentile_rank(N_raw) if use_news else np.zeros(idx.size, dtype=np.float64)
+    V_raw_pct = percentile_rank(V_raw)
+    D_raw_pct = percentile_rank(D_raw)
+
+    V_stab = 1.0 - V_raw_pct
+    D_stab = 1.0 - D_raw_pct
+
+    # 2차: 변동성 퍼센타일 컷(리스크별), 전부 날아가면 fallback
+    keep = np.nonzero(V_raw_pct <= RISK_FILTERS[risk]["max_vol_pct"])[0]
+    if keep.size == 0:
+        keep = np.arange(idx.size)
+
+    score = (
+        weights["w_T"] * T_pct[keep]
+        + weights["w_U"] * U_pct[keep]
+        + weights["w_N"] * N_pct[keep]
+        + weights["w_V"] * V_stab[keep]
+        + weights["w_D"] * D_stab[keep]
+    )
+    base = np.round(score, 6)
+
+    # base 내림차순, 동점은 입력 순서 → 이후 위치(index)가 곧 동점 우선순위
+    order = np.argsort(-base, kind="stable")
+    pos = keep[order]
+    src = idx[pos]
+
+    return BaseRanking(
+        as_of=matrix.as_of,
+        risk=risk,
+        horizon=horizon,
+        effort=effort,
+        include_news=bool(include_news),
+        weights=weights,
+        feature_fields_used={
             "trend": [f"r{w}" for w in cfg["trend_windows"]],
             "volume_z": volz_field or "(none)",
             "vol": vol_field or "(none)",
             "mdd": mdd_field or "(none)",
             "news": cfg["news_field"],
         },
+        codes=[matrix.codes[i] for i in src.tolist()],
+        names=[matrix.names[i] for i in src.tolist()],
+        base=base[order],
+        components={
+            "T": np.round(T_pct[pos], 6),
+            "U": np.round(U_pct[pos], 6),
+            "N": np.round(N_pct[pos], 6),
+            "V": np.round(V_stab[pos], 6),
+            "D": np.round(D_stab[pos], 6),
+        },
+        raw={
+            "T_raw": np.round(T_raw[pos], 6),
+            "U_raw": np.round(U_raw[pos], 6),
+            "N_raw": np.round(N_raw[pos], 6),
+            "V_raw": np.round(V_raw[pos], 6),
+            "D_raw": np.round(D_raw[pos], 6),
+        },
+    )
+
+
+def apply_profile(
+    ranking: BaseRanking,
+    *,
+    top_n: int = 20,
+    user_profile: Dict[str, Any] = None,
+) -> Dict[str, Any]:
+    """
+    기본 랭킹에 사용자 프로필 배수를 적용하고 Top N 응답 dict 생성
+    (응답 형태는 recommend_stocks와 동일)
+    """
+    base = ranking.base
+    final = base
+    if user_profile:
+        final = _profile_adjusted_scores(
+            base,
+            user_profile,
+            ranking.raw["T_raw"],
+            ranking.raw["V_raw"],
+            ranking.raw["D_raw"],
+        )
+
+    top = _top_n_order(final, base, max(1, int(top_n)))
+
+    recs = []
+    for i in top.tolist():
+        recs.append({
+            "code": ranking.codes[i],
+            "name": ranking.names[i],
+            "score": float(final[i]),
+            "components": {k: float(v[i]) for k, v in ranking.components.items()},
+            "raw": {k: float(v[i]) for k, v in ranking.raw.items()},
+        })
+
+    return {
+        "as_of": str(ranking.as_of),
+        "profile": _profile_info(ranking.risk, ranking.horizon, ranking.effort, user_profile),
+        "include_news": bool(ranking.include_news),
+        "weights": dict(ranking.weights),
+        "feature_fields_used": dict(ranking.feature_fields_used),
         "count": len(recs),
         "recommendations": recs,
     }
+
+
+def rank_feature_matrix(
+    matrix: FeatureMatrix,
+    *,
+    risk: str = "MID",
+    horizon: str = "MID",
+    top_n: int = 20,
+    include_news: bool = True,
+    effort: str = "OPTIMIZE",
+    user_profile: Dict[str, Any] = None,
+) -> Dict[str, Any]:
+    """
+    FeatureMatrix 기반 추천(배열 연산) = build_base_ranking + apply_profile
+    응답 dict는 반환되는 N개 종목에 대해서만 만든다.
+    """
+    ranking = build_base_ranking(
+        matrix,
+        risk=risk,
+        horizon=horizon,
+        include_news=include_news,
+        effort=effort,
+    )
+    return apply_profile(ranking, top_n=top_n, user_profile=user_profile)
+
+
+def recommend_stocks(
+    *,
+    as_of: date,
+    risk: str = "MID",
+    horizon: str = "MID",
+    top_n: int = 20,
+    include_news: bool = True,
+    effort: str = "OPTIMIZE",
+    user_profile: Dict[str, Any] = None,
+) -> Dict[str, Any]:
+    """
+    FeatureDaily(date=as_of) 기반 추천.
+    - include_news=False면 N_raw=0으로 두고 추천(TopK 후보 뽑을 때 사용)
+    - user_profile: 사용자 프로필 정보 (나이, 소득, 투자 목표 등)
+    """
+    matrix = get_feature_matrix(as_of)
+    if matrix is None:
+        return {"detail": f"FeatureDaily 데이터가 없습니다: date={as_of}"}
+
+    return rank_feature_matrix(
+        matrix,
+        risk=risk,
+        horizon=horizon,
+        top_n=top_n,
+        include_news=include_news,
+        effort=effort,
+        user_profile=user_profile,
+    )
@@ -1,9 +1,14 @@
+import math
 import os
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from stocks.services.http_retry import get_with_retry, pooled_session
+
 
 def _to_int(value: Any) -> Optional[int]:
     """
@@ -30,6 +35,29 @@ def _to_date_yyyymmdd(value: Any):
     return datetime.strptime(s, "%Y%m%d").date()
 
 
+class _RateLimiter:
+    """
+    스레드 공유 요청 간격 제한 (초당 max_rps회)
+    - 요청 시작 시각을 1/max_rps 간격으로 예약해서 순서대로 내보냄
+    """
+
+    def __init__(self, max_rps: Optional[float]):
+        self.interval = (1.0 / max_rps) if max_rps and max_rps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        delay = at - now
+        if delay > 0:
+            time.sleep(delay)
+
+
 class StockPriceAPIClient:
     """
     금융위원회 주식시세정보 계열 API 호출 클라이언트.
@@ -42,23 +70,88 @@ class StockPriceAPIClient:
         base_url: Optional[str] = None,
         service_key: Optional[str] = None,
         timeout: int = 20,
+        max_rps: Optional[float] = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 8,
     ):
         self.base_url = base_url or os.getenv("STOCK_PRICE_API_URL", "").strip()
         self.service_key = service_key or os.getenv("STOCK_PRICE_API_KEY", "").strip()
         self.timeout = timeout
+        self.max_retries = max(0, int(max_retries))
+        self.backoff = backoff
 
         if not self.base_url:
             raise RuntimeError("STOCK_PRICE_API_URL 환경변수가 비어있습니다.")
         if not self.service_key:
             raise RuntimeError("STOCK_PRICE_API_KEY 환경변수가 비어있습니다.")
 
-    def fetch_by_date(self, bas_dt: str, rows: int = 1000, sleep_sec: float = 0.1) -> List[Dict[str, Any]]:
+        # keep-alive 세션 (동시 요청 수만큼 커넥션 풀 유지)
+        self.session = pooled_session(pool_size)
+
+        # 초당 요청 수 제한 (None이면 STOCK_PRICE_API_MAX_RPS, 그것도 없으면 제한 없음)
+        if max_rps is None:
+            env_rps = os.getenv("STOCK_PRICE_API_MAX_RPS", "").strip()
+            max_rps = float(env_rps) if env_rps else None
+        self._limiter = _RateLimiter(max_rps)
+
+    def fetch_by_date(
+        self,
+        bas_dt: str,
+        rows: int = 1000,
+        sleep_sec: float = 0.1,
+        workers: int = 1,
+    ) -> List[Dict[str, Any]]:
         """
         basDt(YYYYMMDD) 하루치 스냅샷을 페이지네이션으로 전부 가져와서
         표준화된 dict 리스트로 반환.
+        - workers > 1: 첫 페이지의 totalCount로 페이지 수를 미리 계산해 나머지 페이지를 동시에 요청
         """
+        if workers > 1:
+            all_items = self._fetch_pages_concurrent(bas_dt, rows=rows, workers=workers)
+        else:
+            all_items = self._fetch_pages_sequential(bas_dt, rows=rows, sleep_sec=sleep_sec)
+
+        # 표준화(필드 매핑)해서 반환
+        normalized = []
+        for raw in all_items:
+            norm = self._normalize_item(raw)
+            if norm is not None:
+                normalized.append(norm)
+
+        return normalized
+
+    def _fetch_pages_concurrent(self, bas_dt: str, rows: int, workers: int) -> List[Dict[str, Any]]:
+        payload = self._request(bas_dt=bas_dt, page_no=1, rows=rows)
+        first_items, total = self._extract_items(payload)
+
+        # totalCount가 없으면 페이지 수를 알 수 없으니 순차 방식으로 이어서
+        if total is None:
+            if not first_items or len(first_items) < rows:
+                return list(first_items)
+            return list(first_items) + self._fetch_pages_sequential(bas_dt, rows=rows, sleep_sec=0.0, start_page=2)
+
+        pages = max(1, math.ceil(total / rows))
+        if pages == 1:
+            return list(first_items)
+
+        def _page(page_no: int) -> List[Dict[str, Any]]:
+            items, _ = self._extract_items(self._request(bas_dt=bas_dt, page_no=page_no, rows=rows))
+            return items
+
+        with ThreadPoolExecutor(max_workers=min(workers, pages - 1)) as pool:
+            rest = list(pool.map(_page, range(2, pages + 1)))
+
+        all_items = list(first_items)
+        for items in rest:
+            all_items.extend(items)
+        return all_items
+
+    def _fetch_pages_sequential(
+        self, bas_dt: str, rows: int, sleep_sec: float, start_page: int = 1
+    ) -> List[Dict[str, Any]]:
         all_items: List[Dict[str, Any]] = []
-        page_no = 1
+        page_no = start_page
         total_count = None
 
         while True:
@@ -82,16 +175,10 @@ class StockPriceAPIClient:
                 break
 
             page_no += 1
-            time.sleep(sleep_sec)
+            if sleep_sec:
+                time.sleep(sleep_sec)
 
-        # 표준화(필드 매핑)해서 반환
-        normalized = []
-        for raw in all_items:
-            norm = self._normalize_item(raw)
-            if norm is not None:
-                normalized.append(norm)
-
-        return normalized
+        return all_items
 
     def _request(self, bas_dt: str, page_no: int, rows: int) -> Dict[str, Any]:
         params = {
@@ -101,8 +188,7 @@ class StockPriceAPIClient:
             "pageNo": page_no,
             "numOfRows": rows,
         }
-        r = requests.get(self.base_url, params=params, timeout=self.timeout)
-        r.raise_for_status()
+        r = self._get_with_retry(params)
 
         try:
             return r.json()
@@ -110,6 +196,17 @@ class StockPriceAPIClient:
             # JSON이 아닌 응답(XML 등)이면 여기서 바로 잡힘
             raise RuntimeError(f"API 응답이 JSON이 아닙니다. URL/params 확인 필요. 원인: {e}")
 
+    def _get_with_retry(self, params: Dict[str, Any]) -> requests.Response:
+        """
+        rate limit + 재시도(연결 오류/타임아웃/429/5xx, 지수 backoff)
+        - Retry-After 헤더가 있으면 그 시간만큼 대기
+        """
+        return get_with_retry(
+            self.session, self.base_url,
+            max_retries=self.max_retries, backoff=self.backoff, timeout=self.timeout,
+            before_request=self._limiter.wait, params=params,
+        )
+
     def _extract_items(self, payload: Dict[str, Any]) -> (List[Dict[str, Any]], Optional[int]):
         """
         1) data.go.kr 표준 구조:
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, date as date_type
 
+import numpy as np
 from django.db.models import Sum
 from django.db.models import Q
 from django.utils import timezone
@@ -13,10 +14,12 @@ from rest_framework.response import Response
 from rest_framework import status as drf_status
 
 from .models import Stock, DailyPrice, FeatureDaily, StockNews, UpdateLog
-from .services.recommender import recommend_stocks
-from .services.news_bundle import attach_news_topk
+from .services.reco_cache import recommend_cached
+from .services.news_bundle import attach_news_topk, news_topk_by_stock
 from stocks.services.reco_utils import resolve_best_as_of
+from stocks.services.feature_cache import get_feature_matrix, get_feature_row
 from stocks.services.naver_news_client import NaverNewsClient
+from stocks.services.news_crawler import build_news_objects, save_news
 
 from stocks.services.llm_client import gms_chat
 from stocks.services.explain import build_explain_messages
@@ -51,6 +54,10 @@ def bool_q(v) -> bool:
     return str(v).lower() in ("1", "true", "yes", "y")
 
 
+def _latest_feature_date(stock: Stock) -> date_type | None:
+    return FeatureDaily.objects.filter(stock=stock).order_by("-date").values_list("date", flat=True).first()
+
+
 def serialize_feature(fd: FeatureDaily) -> dict:
     """
     FeatureDaily 필드가 프로젝트마다 조금씩 다를 수 있어서
@@ -124,34 +131,14 @@ def fetch_and_store_news(
     except Exception as e:
         return {"ok": False, "saved": 0, "reason": f"naver_fetch_failed: {e}"}
 
-    saved = 0
-    for it in items:
-        pub = it.get("published_at")
-        link = it.get("link") or ""
-        if not pub or not link:
-            continue
-
+    def _keep(pub) -> bool:
         # 오래된 뉴스 제외
         try:
-            if pub < cutoff:
-                continue
+            return pub >= cutoff
         except Exception:
-            pass
-
-        obj, created = StockNews.objects.get_or_create(
-            link=link,
-            defaults={
-                "stock": stock,
-                "published_at": pub,
-                "title": (it.get("title") or "")[:500],
-                "description": it.get("description") or "",
-                "originallink": it.get("originallink") or "",
-                "source": "NAVER",
-                "query_used": query[:200],
-            },
-        )
-        if created:
-            saved += 1
+            return True
+
+    saved = save_news(build_news_objects(stock, items, query=query, keep=_keep))
 
     return {"ok": True, "saved": saved, "reason": "fetched_now"}
 
@@ -199,9 +186,9 @@ def recommendations(request):
     auto_q = request.query_params.get("auto")
     auto = True if auto_q is None else bool_q(auto_q)
 
-    # 1) 먼저 요청 날짜로 추천 시도 (사용자 프로필 포함)
+    # 1) 먼저 요청 날짜로 추천 시도 (미리 계산된 기본 랭킹 + 사용자 프로필 재가중)
     as_of_used = requested_as_of
-    result = recommend_stocks(
+    result = recommend_cached(
         as_of=as_of_used,
         risk=risk,
         horizon=horizon,
@@ -217,7 +204,7 @@ def recommendations(request):
             best = resolve_best_as_of()
             if best and best != as_of_used:
                 as_of_used = best
-                result = recommend_stocks(
+                result = recommend_cached(
                     as_of=as_of_used,
                     risk=risk,
                     horizon=horizon,
@@ -403,15 +390,15 @@ def stock_detail(request, code: str):
             status=drf_status.HTTP_404_NOT_FOUND,
         )
 
-    fd = FeatureDaily.objects.filter(stock=stock, date=requested_as_of).first()
-    latest_fd = FeatureDaily.objects.filter(stock=stock).order_by("-date").first()
+    fd = get_feature_row(stock.code, requested_as_of)
+    latest_date = _latest_feature_date(stock)
 
     as_of_used = requested_as_of
     detail = None
 
-    if not fd and auto and latest_fd:
-        fd = latest_fd
-        as_of_used = latest_fd.date
+    if not fd and auto and latest_date:
+        fd = get_feature_row(stock.code, latest_date)
+        as_of_used = latest_date
         detail = f"요청 날짜({requested_as_of})의 지표가 없어 최신 지표({as_of_used})로 대체했습니다."
 
     return Response(
@@ -426,7 +413,7 @@ def stock_detail(request, code: str):
             "auto": bool(auto),
 
             "feature": serialize_feature(fd) if fd else None,
-            "latest_feature_date": str(latest_fd.date) if latest_fd else None,
+            "latest_feature_date": str(latest_date) if latest_date else None,
 
             "detail": detail,
             "error": None,
@@ -468,34 +455,8 @@ def stock_news(request, code: str):
             status=drf_status.HTTP_404_NOT_FOUND,
         )
 
-    dt_field = _news_datetime_field()
-
     def _load_items():
-        qs = StockNews.objects.filter(stock=stock)
-        if dt_field:
-            since = timezone.now() - timedelta(days=days)
-            qs = qs.filter(**{f"{dt_field}__gte": since}).order_by(f"-{dt_field}")
-        else:
-            qs = qs.order_by("-id")
-        qs = qs[:limit]
-
-        out = []
-        for n in qs:
-            item = {
-                "title": getattr(n, "title", None),
-                "description": getattr(n, "description", None),
-                "link": getattr(n, "link", None),
-                "originallink": getattr(n, "originallink", None),
-                "source": getattr(n, "source", None),
-            }
-            if dt_field:
-                dt = getattr(n, dt_field, None)
-                try:
-                    item["published_at"] = dt.isoformat() if dt else None
-                except Exception:
-                    item["published_at"] = str(dt) if dt else None
-            out.append(item)
-        return out
+        return news_topk_by_stock([stock.id], days=days, k=limit)[stock.id]
 
     items = _load_items()
     news_fetch = {"fetched": False, "saved": 0, "reason": "already_has_news" if items else "no_news_in_db"}
@@ -576,61 +537,36 @@ def stock_explain(request, code: str):
         )
 
     # feature: 요청일 -> 없으면 최신으로 fallback (auto=1)
-    fd = FeatureDaily.objects.filter(stock=stock, date=requested_as_of).first()
-    latest_fd = FeatureDaily.objects.filter(stock=stock).order_by("-date").first()
+    fd = get_feature_row(stock.code, requested_as_of)
+    latest_date = _latest_feature_date(stock)
 
     as_of_used = requested_as_of
     detail = None
-    if not fd and auto and latest_fd:
-        fd = latest_fd
-        as_of_used = latest_fd.date
+    if not fd and auto and latest_date:
+        fd = get_feature_row(stock.code, latest_date)
+        as_of_used = latest_date
         detail = f"요청 날짜({requested_as_of})의 지표가 없어 최신 지표({as_of_used})로 대체했습니다."
 
     feature = serialize_feature(fd) if fd else None
     as_of_str = str(as_of_used)
 
-    dt_field = _news_datetime_field()
-
     def _load_top3():
-        qs = StockNews.objects.filter(stock=stock)
-        if dt_field:
-            since = timezone.now() - timedelta(days=7)
-            qs = qs.filter(**{f"{dt_field}__gte": since}).order_by(f"-{dt_field}")
-        else:
-            qs = qs.order_by("-id")
-        return list(qs[:3])
+        return news_topk_by_stock([stock.id], days=7, k=3)[stock.id]
 
     news_fetch_info = None
-    news_objs = _load_top3()
+    news_top3 = _load_top3()
 
-    if refresh_news or (len(news_objs) == 0):
+    if refresh_news or (len(news_top3) == 0):
         res = fetch_and_store_news(stock=stock, display=30, lookback_days=30, suffix="주가")
         news_fetch_info = {
             "fetched": bool(res.get("ok")),
             "saved": int(res.get("saved") or 0),
             "reason": res.get("reason"),
         }
-        news_objs = _load_top3()
+        news_top3 = _load_top3()
     else:
         news_fetch_info = {"fetched": False, "saved": 0, "reason": "already_has_news"}
 
-    news_top3 = []
-    for n in news_objs:
-        item = {
-            "title": getattr(n, "title", None),
-            "description": getattr(n, "description", None),
-            "link": getattr(n, "link", None),
-            "originallink": getattr(n, "originallink", None),
-            "source": getattr(n, "source", None),
-        }
-        if dt_field:
-            dt = getattr(n, dt_field, None)
-            try:
-                item["published_at"] = dt.isoformat() if dt else None
-            except Exception:
-                item["published_at"] = str(dt) if dt else None
-        news_top3.append(item)
-
     messages = build_explain_messages(
         code=stock.code,
         name=stock.name,
@@ -991,23 +927,27 @@ def market_summary(request):
     market = (request.query_params.get("market") or "ALL").upper()
 
     as_of_used = requested_as_of
-    base = FeatureDaily.objects.filter(date=as_of_used)
+    matrix = get_feature_matrix(as_of_used)
 
-    if not base.exists() and auto:
+    if matrix is None and auto:
         best = resolve_best_as_of()
         if best:
             as_of_used = best
-            base = FeatureDaily.objects.filter(date=as_of_used)
+            matrix = get_feature_matrix(as_of_used)
 
     # market 필터 (stock.market가 비어있으면 ALL로 동작)
-    if market != "ALL":
-        base = base.filter(stock__market=market)
+    if matrix is not None:
+        rows = matrix.market_index(market)
+        r1 = matrix.raw("r1")[rows]
+    else:
+        rows = np.empty(0, dtype=np.int64)
+        r1 = np.empty(0, dtype=np.float64)
 
-    total = base.count()
-    adv = base.filter(r1__gt=0).count()
-    dec = base.filter(r1__lt=0).count()
-    unch = base.filter(r1=0).count()
-    unknown = base.filter(r1__isnull=True).count()
+    total = int(rows.size)
+    adv = int((r1 > 0).sum())
+    dec = int((r1 < 0).sum())
+    unch = int((r1 == 0).sum())
+    unknown = int(np.isnan(r1).sum())
 
     # 거래량/대금 합계 (DailyPrice 기준)
     price_qs = DailyPrice.objects.filter(date=as_of_used)
@@ -1020,8 +960,18 @@ def market_summary(request):
     )
 
     # Top movers (r1 기준)
-    gainers = list(base.filter(r1__isnull=False).order_by("-r1").values("stock__code","stock__name","r1")[:5])
-    losers = list(base.filter(r1__isnull=False).order_by("r1").values("stock__code","stock__name","r1")[:5])
+    known = rows[~np.isnan(r1)]
+    known_r1 = r1[~np.isnan(r1)]
+
+    def _movers(order):
+        out = []
+        for j in order[:5].tolist():
+            i = int(known[j])
+            out.append({"stock__code": matrix.codes[i], "stock__name": matrix.names[i], "r1": float(known_r1[j])})
+        return out
+
+    gainers = _movers(np.argsort(-known_r1, kind="stable"))
+    losers = _movers(np.argsort(known_r1, kind="stable"))
 
     # close 붙이기
     codes = [x["stock__code"] for x in gainers] + [x["stock__code"] for x in losers]